@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+from load_utils import add_calendar, float64_view, iter_typed_csv
+from schema import dataset_schema
+from sql_analysis import equal_width_edges
+from stats_utils import CoMoments, GroupSums, Moments, TopRows, ValueCounts, as_scalar
+
+# Out-of-core version of CustomDataAnalysis.all_analysis: RunningReport keeps
+# only mergeable partial aggregates, so the CSV can be streamed through it in
+# chunks and appended rows (CustomDataAnalysis.append_data) cost O(new rows).
+# The weather ranges are kept per distinct reading (one decimal, so a few
+# hundred values) and binned when printed, once min and max are known.
+numeric_cols = [
+    "PM2_5",
+    "PM10",
+    "NO2",
+    "SO2",
+    "CO",
+    "O3",
+    "Temperature_C",
+    "Humidity",
+    "Wind_Speed_kmh",
+    "AQI",
+]
+pollutants = ["PM2_5", "PM10", "NO2", "SO2", "CO", "O3"]
+weather_cols = [("Temperature_C", "Temperature"), ("Humidity", "Humidity"), ("Wind_Speed_kmh", "Wind Speed")]
+
+
+def add_derived(chunk):
+    add_calendar(chunk, "Month")
+    chunk["PM_Ratio"] = chunk["PM2_5"] / chunk["PM10"].replace(0, np.nan)
+    chunk["Pollution_Burden"] = chunk[pollutants].sum(axis=1)
+    chunk["Extreme_AQI"] = (chunk["AQI"] > 100).fillna(False).astype(int)
+    chunk["Unhealthy_Day"] = (chunk["AQI"] > 50).fillna(False).astype(int)
+    return chunk
+
+
+def describe(moments, quantiles, dtypes):
+    rows = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    table = {}
+    for i, col in enumerate(moments.columns):
+        q = quantiles.quantile(col, [0.25, 0.5, 0.75])
+        values = [moments.count[i], moments.mean[i], moments.std()[i], moments.min[i], *q, moments.max[i]]
+        dtype = "Float64" if pd.api.types.is_extension_array_dtype(dtypes[col]) else np.float64
+        table[col] = pd.Series(values, index=rows, dtype=dtype)
+    return pd.DataFrame(table)
+
+
+class RunningReport:
+    def __init__(self):
+        self.rows, self.columns, self.dtypes, self.missing = 0, None, None, None
+        self.moments = Moments(numeric_cols)
+        self.derived = Moments(["PM_Ratio", "Extreme_AQI"])
+        self.quantiles = ValueCounts(numeric_cols)
+        self.comoments = CoMoments(numeric_cols)
+        self.by_country = GroupSums([*numeric_cols, "Unhealthy_Day"])
+        self.by_city = GroupSums(["AQI"])
+        self.by_month = GroupSums(["AQI"])
+        self.by_weather = {col: GroupSums(["AQI"], max_groups=200_000) for col, _ in weather_cols}
+        self.burden = TopRows(5, "Pollution_Burden")
+
+    def update(self, chunk):
+        # Columns of the first chunk define the report; later chunks are
+        # projected to them. float32 columns are summarized as float64, like
+        # all_analysis does. The caller's frame is not modified.
+        chunk = float64_view(chunk)
+        if self.columns is None:
+            self.columns, self.dtypes = list(chunk.columns), chunk.dtypes
+        chunk = chunk[self.columns]
+        self.rows += len(chunk)
+        missing = chunk.isna().sum()
+        self.missing = missing if self.missing is None else self.missing + missing
+        self.moments.update(chunk)
+        self.quantiles.update(chunk)
+        self.comoments.update(chunk)
+        chunk = add_derived(chunk.copy(deep=False))
+        self.derived.update(chunk)
+        self.by_country.update(chunk, "Country")
+        self.by_city.update(chunk, "City")
+        self.by_month.update(chunk, "Month")
+        for col, sums in self.by_weather.items():
+            sums.update(chunk, col)
+        self.burden.update(chunk[["Country", "City", "Pollution_Burden"]])
+        return self
+
+    def print(self, title="chunked"):
+        if self.dtypes is None:
+            print("⚠️ No rows to report.")
+            return
+        rows, dtypes, missing = self.rows, self.dtypes, self.missing
+        aqi = dtypes["AQI"]
+        mean = dict(zip(numeric_cols, self.moments.mean))
+        print(f"\n--- All Analysis ({title}) ---")
+
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", (rows, len(dtypes)))
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", describe(self.moments, self.quantiles, dtypes))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. AQI Analysis
+        # ===============================
+        print("\nOverall Average AQI:", as_scalar(mean["AQI"], aqi))
+        aqi_by_country = self.by_country.mean("AQI", aqi).sort_values(ascending=False)
+        print("\nAverage AQI by Country:\n", aqi_by_country.head(10))
+        aqi_by_city = self.by_city.mean("AQI", aqi).sort_values(ascending=False)
+        print("\nAverage AQI by City:\n", aqi_by_city.head(10))
+        print("\nAverage AQI by Month:\n", self.by_month.mean("AQI", aqi))
+
+        # ===============================
+        # 3. Pollutant Analysis
+        # ===============================
+        means = self.moments.series("mean")[numeric_cols[:-3]]
+        print("\nMean Pollutant Concentrations:\n", means.sort_values(ascending=False))
+        maxima = self.moments.series("max")[numeric_cols[:-3]]
+        print("\nMaximum Recorded Pollutant Levels:\n", maxima.sort_values(ascending=False))
+
+        country_means = pd.DataFrame({col: self.by_country.mean(col, dtypes[col]) for col in numeric_cols})
+        pollutant_vs_aqi = country_means.drop(columns="AQI").corrwith(country_means["AQI"])
+        print("\nCorrelation of Pollutants with AQI (by Country averages):\n", pollutant_vs_aqi)
+
+        # ===============================
+        # 4. Weather & AQI Relationships
+        # ===============================
+        ranges = dict(zip(numeric_cols, zip(self.moments.min, self.moments.max)))
+        for col, label in weather_cols:
+            edges = equal_width_edges(*ranges[col])
+            print(f"\nAQI by {label} Range:\n", self.by_weather[col].binned_mean("AQI", edges, aqi))
+
+        # ===============================
+        # 5. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", self.comoments.corr())
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        derived_mean = dict(zip(self.derived.columns, self.derived.mean))
+        print("\nAverage PM2.5 to PM10 Ratio:", as_scalar(derived_mean["PM_Ratio"], dtypes["PM2_5"]))
+        print("\nTop 5 Records with Highest Pollution Burden:\n", self.burden.rows)
+        print("\nProportion of Extreme AQI Days (>100):", derived_mean["Extreme_AQI"])
+        unhealthy_rate = self.by_country.mean("Unhealthy_Day").sort_values(ascending=False)
+        print("\nTop 10 Countries by Proportion of Unhealthy Days:\n", unhealthy_rate.head(10))
+
+
+def chunked_report(file_path, chunk_size=1_000_000, columns=None, filters=None):
+    # columns / filters as in load_utils.read_typed_csv, applied to every chunk.
+    report = RunningReport()
+    for chunk in iter_typed_csv(file_path, dataset_schema, chunk_size, columns, filters):
+        report.update(chunk)
+    if report.dtypes is None:
+        print("⚠️ Data file is empty.")
+        return
+    report.print()
+    return report
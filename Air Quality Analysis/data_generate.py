@@ -1,454 +1,509 @@
 import pandas as pd
 import numpy as np
 import random
+from generate_utils import (
+    append_rows,
+    apply_dirty_args,
+    apply_output_args,
+    build_parser,
+    csv_output,
+    date_lookup,
+    dirty_config,
+    draw_nested,
+    generate_frame,
+    nested_lookup,
+    record_ids,
+    set_missing,
+    write_chunked,
+    write_frame,
+    write_sharded,
+)
 
 file_name = "Q1_air_quality.csv"
 
-try:
-    np.random.seed(321)
-    random.seed(321)
+default_rows = 18000
+default_seed = 321
 
-    n_rows = 18000
+countries = [
+    "USA",
+    "India",
+    "Brazil",
+    "UK",
+    "France",
+    "Germany",
+    "Italy",
+    "Spain",
+    "Russia",
+    "China",
+    "Japan",
+    "South Korea",
+    "Canada",
+    "Australia",
+    "Mexico",
+    "South Africa",
+    "Turkey",
+    "Iran",
+]
+
+usa_cities = [
+    "New York",
+    "Los Angeles",
+    "Chicago",
+    "Houston",
+    "Phoenix",
+    "Philadelphia",
+    "San Antonio",
+    "San Diego",
+    "Dallas",
+    "San Jose",
+    "Austin",
+    "Jacksonville",
+    "Fort Worth",
+    "Columbus",
+    "Indianapolis",
+    "Charlotte",
+    "San Francisco",
+    "Seattle",
+    "Denver",
+    "Washington",
+]
+india_cities = [
+    "Mumbai",
+    "Delhi",
+    "Bangalore",
+    "Hyderabad",
+    "Ahmedabad",
+    "Chennai",
+    "Kolkata",
+    "Surat",
+    "Pune",
+    "Jaipur",
+    "Lucknow",
+    "Kanpur",
+    "Nagpur",
+    "Indore",
+    "Thane",
+    "Bhopal",
+    "Visakhapatnam",
+    "Patna",
+    "Vadodara",
+    "Ghaziabad",
+]
+brazil_cities = [
+    "Sao Paulo",
+    "Rio de Janeiro",
+    "Brasilia",
+    "Salvador",
+    "Fortaleza",
+    "Belo Horizonte",
+    "Manaus",
+    "Curitiba",
+    "Recife",
+    "Goiania",
+    "Porto Alegre",
+    "Belem",
+    "Guarulhos",
+    "Campinas",
+    "Sao Luis",
+    "Sao Goncalo",
+    "Maceio",
+    "Duque de Caxias",
+    "Natal",
+    "Teresina",
+]
+uk_cities = [
+    "London",
+    "Birmingham",
+    "Manchester",
+    "Liverpool",
+    "Leeds",
+    "Newcastle",
+    "Sheffield",
+    "Bristol",
+    "Nottingham",
+    "Leicester",
+    "Coventry",
+    "Hull",
+    "Bradford",
+    "Cardiff",
+    "Belfast",
+    "Glasgow",
+    "Edinburgh",
+    "Southampton",
+    "Portsmouth",
+    "Brighton",
+]
+france_cities = [
+    "Paris",
+    "Marseille",
+    "Lyon",
+    "Toulouse",
+    "Nice",
+    "Nantes",
+    "Strasbourg",
+    "Montpellier",
+    "Bordeaux",
+    "Lille",
+    "Rennes",
+    "Reims",
+    "Le Havre",
+    "Saint-Etienne",
+    "Toulon",
+    "Grenoble",
+    "Dijon",
+    "Angers",
+    "Nimes",
+    "Villeurbanne",
+]
+germany_cities = [
+    "Berlin",
+    "Hamburg",
+    "Munich",
+    "Cologne",
+    "Frankfurt",
+    "Stuttgart",
+    "Dusseldorf",
+    "Dortmund",
+    "Essen",
+    "Leipzig",
+    "Bremen",
+    "Dresden",
+    "Hannover",
+    "Nuremberg",
+    "Duisburg",
+    "Bochum",
+    "Wuppertal",
+    "Bielefeld",
+    "Bonn",
+    "Mannheim",
+]
+italy_cities = [
+    "Rome",
+    "Milan",
+    "Naples",
+    "Turin",
+    "Palermo",
+    "Genoa",
+    "Bologna",
+    "Florence",
+    "Bari",
+    "Catania",
+    "Venice",
+    "Verona",
+    "Messina",
+    "Padua",
+    "Trieste",
+    "Taranto",
+    "Brescia",
+    "Prato",
+    "Modena",
+    "Reggio Calabria",
+]
+spain_cities = [
+    "Madrid",
+    "Barcelona",
+    "Valencia",
+    "Seville",
+    "Zaragoza",
+    "Malaga",
+    "Murcia",
+    "Palma",
+    "Las Palmas",
+    "Bilbao",
+    "Alicante",
+    "Cordoba",
+    "Valladolid",
+    "Vigo",
+    "Gijon",
+    "Hospitalet",
+    "La Coruna",
+    "Granada",
+    "Vitoria",
+    "Elche",
+]
+russia_cities = [
+    "Moscow",
+    "Saint Petersburg",
+    "Novosibirsk",
+    "Yekaterinburg",
+    "Kazan",
+    "Nizhny Novgorod",
+    "Chelyabinsk",
+    "Samara",
+    "Omsk",
+    "Rostov",
+    "Ufa",
+    "Krasnoyarsk",
+    "Voronezh",
+    "Perm",
+    "Volgograd",
+    "Krasnodar",
+    "Saratov",
+    "Tyumen",
+    "Tolyatti",
+    "Izhevsk",
+]
+china_cities = [
+    "Beijing",
+    "Shanghai",
+    "Guangzhou",
+    "Shenzhen",
+    "Chengdu",
+    "Chongqing",
+    "Tianjin",
+    "Nanjing",
+    "Wuhan",
+    "Xi'an",
+    "Hangzhou",
+    "Dongguan",
+    "Foshan",
+    "Shenyang",
+    "Harbin",
+    "Qingdao",
+    "Dalian",
+    "Jinan",
+    "Zhengzhou",
+    "Changsha",
+]
+japan_cities = [
+    "Tokyo",
+    "Yokohama",
+    "Osaka",
+    "Nagoya",
+    "Sapporo",
+    "Kobe",
+    "Kyoto",
+    "Fukuoka",
+    "Kawasaki",
+    "Saitama",
+    "Hiroshima",
+    "Sendai",
+    "Kitakyushu",
+    "Chiba",
+    "Sakai",
+    "Niigata",
+    "Hamamatsu",
+    "Kumamoto",
+    "Sagamihara",
+    "Okayama",
+]
+sk_cities = [
+    "Seoul",
+    "Busan",
+    "Incheon",
+    "Daegu",
+    "Daejeon",
+    "Gwangju",
+    "Ulsan",
+    "Suwon",
+    "Changwon",
+    "Goyang",
+    "Yongin",
+    "Seongnam",
+    "Cheongju",
+    "Ansan",
+    "Jeonju",
+    "Anyang",
+    "Pohang",
+    "Bucheon",
+    "Gimhae",
+    "Masan",
+]
+canada_cities = [
+    "Toronto",
+    "Montreal",
+    "Vancouver",
+    "Calgary",
+    "Edmonton",
+    "Ottawa",
+    "Winnipeg",
+    "Quebec City",
+    "Hamilton",
+    "Kitchener",
+    "London",
+    "Victoria",
+    "Halifax",
+    "Oshawa",
+    "Windsor",
+    "Saskatoon",
+    "Regina",
+    "St. John's",
+    "Barrie",
+    "Kelowna",
+]
+australia_cities = [
+    "Sydney",
+    "Melbourne",
+    "Brisbane",
+    "Perth",
+    "Adelaide",
+    "Gold Coast",
+    "Newcastle",
+    "Canberra",
+    "Wollongong",
+    "Sunshine Coast",
+    "Hobart",
+    "Geelong",
+    "Townsville",
+    "Cairns",
+    "Darwin",
+    "Toowoomba",
+    "Ballarat",
+    "Bendigo",
+    "Albury",
+    "Launceston",
+]
+mexico_cities = [
+    "Mexico City",
+    "Guadalajara",
+    "Monterrey",
+    "Puebla",
+    "Tijuana",
+    "León",
+    "Juárez",
+    "Zapopan",
+    "Nezahualcóyotl",
+    "Cancún",
+    "Mérida",
+    "Chihuahua",
+    "San Luis Potosí",
+    "Aguascalientes",
+    "Hermosillo",
+    "Saltillo",
+    "Mexicali",
+    "Culiacán",
+    "Acapulco",
+    "Morelia",
+]
+sa_cities = [
+    "Johannesburg",
+    "Cape Town",
+    "Durban",
+    "Pretoria",
+    "Port Elizabeth",
+    "East London",
+    "Bloemfontein",
+    "Pietermaritzburg",
+    "Kimberley",
+    "Polokwane",
+    "Nelspruit",
+    "Rustenburg",
+    "Welkom",
+    "Newcastle",
+    "George",
+    "Midrand",
+    "Centurion",
+    "Vereeniging",
+    "Soweto",
+    "Pietersburg",
+]
+turkey_cities = [
+    "Istanbul",
+    "Ankara",
+    "Izmir",
+    "Bursa",
+    "Adana",
+    "Gaziantep",
+    "Konya",
+    "Antalya",
+    "Kayseri",
+    "Mersin",
+    "Eskisehir",
+    "Diyarbakir",
+    "Denzli",
+    "Samsun",
+    "Malatya",
+    "Kahramanmaras",
+    "Erzurum",
+    "Van",
+    "Batman",
+    "Elazig",
+]
+iran_cities = [
+    "Tehran",
+    "Mashhad",
+    "Isfahan",
+    "Karaj",
+    "Tabriz",
+    "Shiraz",
+    "Qom",
+    "Ahvaz",
+    "Kermanshah",
+    "Urmia",
+    "Rasht",
+    "Zahedan",
+    "Hamadan",
+    "Kerman",
+    "Yazd",
+    "Arak",
+    "Ardabil",
+    "Bandar Abbas",
+    "Sanandaj",
+    "Qazvin",
+]
+
+country_cities = {
+    "USA": usa_cities,
+    "India": india_cities,
+    "Brazil": brazil_cities,
+    "UK": uk_cities,
+    "France": france_cities,
+    "Germany": germany_cities,
+    "Italy": italy_cities,
+    "Spain": spain_cities,
+    "Russia": russia_cities,
+    "China": china_cities,
+    "Japan": japan_cities,
+    "South Korea": sk_cities,
+    "Canada": canada_cities,
+    "Australia": australia_cities,
+    "Mexico": mexico_cities,
+    "South Africa": sa_cities,
+    "Turkey": turkey_cities,
+    "Iran": iran_cities,
+}
+
+numeric_columns = [
+    "PM2_5",
+    "PM10",
+    "NO2",
+    "SO2",
+    "CO",
+    "O3",
+    "Temperature_C",
+    "Humidity",
+    "Wind_Speed_kmh",
+    "AQI",
+]
+
+# Duplicate / missing-value rates of the original script, per generated row.
+duplicate_rate = (100 / default_rows, 200 / default_rows)
+missing_rate = (1000 / default_rows, 3000 / default_rows)
+dirty_data = dirty_config(numeric_columns, duplicate_rate, missing_rate)
+
+# Natural partition key for --partition (see generate_utils.output_config).
+partition_by = ("Date", "month")
+
+# ===============================
+# Lookup arrays (index-coded countries, cities and dates)
+# ===============================
+country_levels = np.array(countries)
+city_levels, city_codes, city_offsets, city_counts = nested_lookup(country_cities)
+month_days = np.array([31, 28, 31])
+month_offsets = np.concatenate([[0], np.cumsum(month_days)[:-1]])
+date_levels = np.concatenate(
+    [date_lookup([2025], [m + 1], days) for m, days in enumerate(month_days)]
+)
+
+
+# ===============================
+# Original generator (exact Q1_air_quality.csv for seed 321)
+# ===============================
+def generate_legacy(n_rows=default_rows, seed=default_seed):
+    np.random.seed(seed)
+    random.seed(seed)
 
     record_ids = [f"AQ_{str(i).zfill(6)}" for i in range(1, n_rows + 1)]
-    countries = [
-        "USA",
-        "India",
-        "Brazil",
-        "UK",
-        "France",
-        "Germany",
-        "Italy",
-        "Spain",
-        "Russia",
-        "China",
-        "Japan",
-        "South Korea",
-        "Canada",
-        "Australia",
-        "Mexico",
-        "South Africa",
-        "Turkey",
-        "Iran",
-    ]
-
-    usa_cities = [
-        "New York",
-        "Los Angeles",
-        "Chicago",
-        "Houston",
-        "Phoenix",
-        "Philadelphia",
-        "San Antonio",
-        "San Diego",
-        "Dallas",
-        "San Jose",
-        "Austin",
-        "Jacksonville",
-        "Fort Worth",
-        "Columbus",
-        "Indianapolis",
-        "Charlotte",
-        "San Francisco",
-        "Seattle",
-        "Denver",
-        "Washington",
-    ]
-    india_cities = [
-        "Mumbai",
-        "Delhi",
-        "Bangalore",
-        "Hyderabad",
-        "Ahmedabad",
-        "Chennai",
-        "Kolkata",
-        "Surat",
-        "Pune",
-        "Jaipur",
-        "Lucknow",
-        "Kanpur",
-        "Nagpur",
-        "Indore",
-        "Thane",
-        "Bhopal",
-        "Visakhapatnam",
-        "Patna",
-        "Vadodara",
-        "Ghaziabad",
-    ]
-    brazil_cities = [
-        "Sao Paulo",
-        "Rio de Janeiro",
-        "Brasilia",
-        "Salvador",
-        "Fortaleza",
-        "Belo Horizonte",
-        "Manaus",
-        "Curitiba",
-        "Recife",
-        "Goiania",
-        "Porto Alegre",
-        "Belem",
-        "Guarulhos",
-        "Campinas",
-        "Sao Luis",
-        "Sao Goncalo",
-        "Maceio",
-        "Duque de Caxias",
-        "Natal",
-        "Teresina",
-    ]
-    uk_cities = [
-        "London",
-        "Birmingham",
-        "Manchester",
-        "Liverpool",
-        "Leeds",
-        "Newcastle",
-        "Sheffield",
-        "Bristol",
-        "Nottingham",
-        "Leicester",
-        "Coventry",
-        "Hull",
-        "Bradford",
-        "Cardiff",
-        "Belfast",
-        "Glasgow",
-        "Edinburgh",
-        "Southampton",
-        "Portsmouth",
-        "Brighton",
-    ]
-    france_cities = [
-        "Paris",
-        "Marseille",
-        "Lyon",
-        "Toulouse",
-        "Nice",
-        "Nantes",
-        "Strasbourg",
-        "Montpellier",
-        "Bordeaux",
-        "Lille",
-        "Rennes",
-        "Reims",
-        "Le Havre",
-        "Saint-Etienne",
-        "Toulon",
-        "Grenoble",
-        "Dijon",
-        "Angers",
-        "Nimes",
-        "Villeurbanne",
-    ]
-    germany_cities = [
-        "Berlin",
-        "Hamburg",
-        "Munich",
-        "Cologne",
-        "Frankfurt",
-        "Stuttgart",
-        "Dusseldorf",
-        "Dortmund",
-        "Essen",
-        "Leipzig",
-        "Bremen",
-        "Dresden",
-        "Hannover",
-        "Nuremberg",
-        "Duisburg",
-        "Bochum",
-        "Wuppertal",
-        "Bielefeld",
-        "Bonn",
-        "Mannheim",
-    ]
-    italy_cities = [
-        "Rome",
-        "Milan",
-        "Naples",
-        "Turin",
-        "Palermo",
-        "Genoa",
-        "Bologna",
-        "Florence",
-        "Bari",
-        "Catania",
-        "Venice",
-        "Verona",
-        "Messina",
-        "Padua",
-        "Trieste",
-        "Taranto",
-        "Brescia",
-        "Prato",
-        "Modena",
-        "Reggio Calabria",
-    ]
-    spain_cities = [
-        "Madrid",
-        "Barcelona",
-        "Valencia",
-        "Seville",
-        "Zaragoza",
-        "Malaga",
-        "Murcia",
-        "Palma",
-        "Las Palmas",
-        "Bilbao",
-        "Alicante",
-        "Cordoba",
-        "Valladolid",
-        "Vigo",
-        "Gijon",
-        "Hospitalet",
-        "La Coruna",
-        "Granada",
-        "Vitoria",
-        "Elche",
-    ]
-    russia_cities = [
-        "Moscow",
-        "Saint Petersburg",
-        "Novosibirsk",
-        "Yekaterinburg",
-        "Kazan",
-        "Nizhny Novgorod",
-        "Chelyabinsk",
-        "Samara",
-        "Omsk",
-        "Rostov",
-        "Ufa",
-        "Krasnoyarsk",
-        "Voronezh",
-        "Perm",
-        "Volgograd",
-        "Krasnodar",
-        "Saratov",
-        "Tyumen",
-        "Tolyatti",
-        "Izhevsk",
-    ]
-    china_cities = [
-        "Beijing",
-        "Shanghai",
-        "Guangzhou",
-        "Shenzhen",
-        "Chengdu",
-        "Chongqing",
-        "Tianjin",
-        "Nanjing",
-        "Wuhan",
-        "Xi'an",
-        "Hangzhou",
-        "Dongguan",
-        "Foshan",
-        "Shenyang",
-        "Harbin",
-        "Qingdao",
-        "Dalian",
-        "Jinan",
-        "Zhengzhou",
-        "Changsha",
-    ]
-    japan_cities = [
-        "Tokyo",
-        "Yokohama",
-        "Osaka",
-        "Nagoya",
-        "Sapporo",
-        "Kobe",
-        "Kyoto",
-        "Fukuoka",
-        "Kawasaki",
-        "Saitama",
-        "Hiroshima",
-        "Sendai",
-        "Kitakyushu",
-        "Chiba",
-        "Sakai",
-        "Niigata",
-        "Hamamatsu",
-        "Kumamoto",
-        "Sagamihara",
-        "Okayama",
-    ]
-    sk_cities = [
-        "Seoul",
-        "Busan",
-        "Incheon",
-        "Daegu",
-        "Daejeon",
-        "Gwangju",
-        "Ulsan",
-        "Suwon",
-        "Changwon",
-        "Goyang",
-        "Yongin",
-        "Seongnam",
-        "Cheongju",
-        "Ansan",
-        "Jeonju",
-        "Anyang",
-        "Pohang",
-        "Bucheon",
-        "Gimhae",
-        "Masan",
-    ]
-    canada_cities = [
-        "Toronto",
-        "Montreal",
-        "Vancouver",
-        "Calgary",
-        "Edmonton",
-        "Ottawa",
-        "Winnipeg",
-        "Quebec City",
-        "Hamilton",
-        "Kitchener",
-        "London",
-        "Victoria",
-        "Halifax",
-        "Oshawa",
-        "Windsor",
-        "Saskatoon",
-        "Regina",
-        "St. John's",
-        "Barrie",
-        "Kelowna",
-    ]
-    australia_cities = [
-        "Sydney",
-        "Melbourne",
-        "Brisbane",
-        "Perth",
-        "Adelaide",
-        "Gold Coast",
-        "Newcastle",
-        "Canberra",
-        "Wollongong",
-        "Sunshine Coast",
-        "Hobart",
-        "Geelong",
-        "Townsville",
-        "Cairns",
-        "Darwin",
-        "Toowoomba",
-        "Ballarat",
-        "Bendigo",
-        "Albury",
-        "Launceston",
-    ]
-    mexico_cities = [
-        "Mexico City",
-        "Guadalajara",
-        "Monterrey",
-        "Puebla",
-        "Tijuana",
-        "León",
-        "Juárez",
-        "Zapopan",
-        "Nezahualcóyotl",
-        "Cancún",
-        "Mérida",
-        "Chihuahua",
-        "San Luis Potosí",
-        "Aguascalientes",
-        "Hermosillo",
-        "Saltillo",
-        "Mexicali",
-        "Culiacán",
-        "Acapulco",
-        "Morelia",
-    ]
-    sa_cities = [
-        "Johannesburg",
-        "Cape Town",
-        "Durban",
-        "Pretoria",
-        "Port Elizabeth",
-        "East London",
-        "Bloemfontein",
-        "Pietermaritzburg",
-        "Kimberley",
-        "Polokwane",
-        "Nelspruit",
-        "Rustenburg",
-        "Welkom",
-        "Newcastle",
-        "George",
-        "Midrand",
-        "Centurion",
-        "Vereeniging",
-        "Soweto",
-        "Pietersburg",
-    ]
-    turkey_cities = [
-        "Istanbul",
-        "Ankara",
-        "Izmir",
-        "Bursa",
-        "Adana",
-        "Gaziantep",
-        "Konya",
-        "Antalya",
-        "Kayseri",
-        "Mersin",
-        "Eskisehir",
-        "Diyarbakir",
-        "Denzli",
-        "Samsun",
-        "Malatya",
-        "Kahramanmaras",
-        "Erzurum",
-        "Van",
-        "Batman",
-        "Elazig",
-    ]
-    iran_cities = [
-        "Tehran",
-        "Mashhad",
-        "Isfahan",
-        "Karaj",
-        "Tabriz",
-        "Shiraz",
-        "Qom",
-        "Ahvaz",
-        "Kermanshah",
-        "Urmia",
-        "Rasht",
-        "Zahedan",
-        "Hamadan",
-        "Kerman",
-        "Yazd",
-        "Arak",
-        "Ardabil",
-        "Bandar Abbas",
-        "Sanandaj",
-        "Qazvin",
-    ]
-
-    country_cities = {
-        "USA": usa_cities,
-        "India": india_cities,
-        "Brazil": brazil_cities,
-        "UK": uk_cities,
-        "France": france_cities,
-        "Germany": germany_cities,
-        "Italy": italy_cities,
-        "Spain": spain_cities,
-        "Russia": russia_cities,
-        "China": china_cities,
-        "Japan": japan_cities,
-        "South Korea": sk_cities,
-        "Canada": canada_cities,
-        "Australia": australia_cities,
-        "Mexico": mexico_cities,
-        "South Africa": sa_cities,
-        "Turkey": turkey_cities,
-        "Iran": iran_cities,
-    }
 
     selected_countries = []
     selected_cities = []
@@ -519,34 +574,165 @@ try:
 
     duplicate_count = random.randint(100, 200)
     duplicate_indices = random.sample(range(n_rows), duplicate_count)
-    duplicates = df.iloc[duplicate_indices].copy()
-    df = pd.concat([df, duplicates], ignore_index=True)
-
-    numeric_columns = [
-        "PM2_5",
-        "PM10",
-        "NO2",
-        "SO2",
-        "CO",
-        "O3",
-        "Temperature_C",
-        "Humidity",
-        "Wind_Speed_kmh",
-        "AQI",
-    ]
+    df = append_rows(df, duplicate_indices)
+
     empty_count = random.randint(1000, 3000)
     empty_indices = random.sample(range(len(df)), empty_count)
-    for idx in empty_indices:
-        col = random.choice(numeric_columns)
-        df.at[idx, col] = np.nan
-
-    df = df.sample(frac=1, random_state=321).reset_index(drop=True)
-except BaseException as e:
-    print(f"Error occurred: {e}")
-else:
-    df.to_csv(file_name, index=False)
-    print(
-        f"Synthetic air quality data generated and saved as a CSV file named as {file_name}"
+    empty_columns = [random.choice(numeric_columns) for _ in empty_indices]
+    df = set_missing(df, empty_indices, empty_columns)
+
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df
+
+
+# ===============================
+# Vectorized generator
+# ===============================
+def generate_chunk(rng, start, n_rows):
+    country_idx = rng.integers(0, len(countries), n_rows).astype(np.int8)
+    city_idx = draw_nested(rng, country_idx, city_codes, city_offsets, city_counts)
+
+    month = rng.integers(0, 3, n_rows)
+    day = (rng.random(n_rows) * month_days[month]).astype(np.int64)
+    date_idx = month_offsets[month] + day
+
+    pm25 = np.clip(np.round(rng.lognormal(3.0, 0.8, n_rows), 1), 5, 500)
+    pm10 = np.clip(np.round(pm25 * rng.uniform(1.2, 2.5, n_rows), 1), 10, 600)
+    no2 = np.clip(np.round(rng.lognormal(2.5, 0.7, n_rows), 1), 5, 200)
+    so2 = np.clip(np.round(rng.lognormal(1.8, 0.6, n_rows), 1), 2, 100)
+    co = np.clip(np.round(rng.lognormal(0.8, 0.5, n_rows), 1), 0.1, 20)
+    o3 = np.clip(np.round(rng.lognormal(2.2, 0.6, n_rows), 1), 10, 180)
+    temperature = np.clip(np.round(rng.normal(15, 10, n_rows), 1), -10, 40)
+    humidity = np.clip(np.round(rng.normal(65, 20, n_rows), 1), 10, 100)
+    wind_speed = np.clip(np.round(rng.lognormal(1.5, 0.5, n_rows), 1), 0, 30)
+    aqi = np.round(
+        pm25 * 0.4 + pm10 * 0.2 + no2 * 0.15 + so2 * 0.1 + co * 0.08 + o3 * 0.07, 0
     )
-finally:
-    print("Data generation process completed.")
+    aqi = np.clip(aqi, 0, 500)
+
+    return pd.DataFrame(
+        {
+            "Record_ID": record_ids("AQ_", start, n_rows),
+            "Country": pd.Categorical.from_codes(country_idx, country_levels),
+            "City": pd.Categorical.from_codes(city_idx, city_levels),
+            "Date": pd.Categorical.from_codes(date_idx, date_levels),
+            "PM2_5": pm25,
+            "PM10": pm10,
+            "NO2": no2,
+            "SO2": so2,
+            "CO": co,
+            "O3": o3,
+            "Temperature_C": temperature,
+            "Humidity": humidity,
+            "Wind_Speed_kmh": wind_speed,
+            "AQI": aqi,
+        }
+    )
+
+
+def generate_fast(n_rows=default_rows, seed=default_seed, dirty=dirty_data):
+    return generate_frame(generate_chunk, n_rows, seed, dirty)
+
+
+def write_streaming(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    chunk_size=1_000_000,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_chunked(
+        generate_chunk, file_name, n_rows, seed, chunk_size, dirty, output=output
+    )
+
+
+def write_parallel(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    workers=4,
+    chunk_size=1_000_000,
+    merge=True,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_sharded(
+        generate_chunk,
+        file_name,
+        n_rows,
+        seed,
+        workers,
+        chunk_size,
+        dirty,
+        merge,
+        output=output,
+    )
+
+
+# ===============================
+# In-process API
+# ===============================
+def generate(
+    n_rows=default_rows,
+    seed=default_seed,
+    fast=False,
+    dirty=dirty_data,
+    output=None,
+    output_format=csv_output,
+):
+    # Returns the dataset as a DataFrame (the exact bundled dataset by
+    # default) and optionally also writes it to `output` (CSV unless
+    # output_format says otherwise).
+    if fast:
+        df = generate_fast(n_rows, seed, dirty)
+    else:
+        df = generate_legacy(n_rows, seed)
+    if output is not None:
+        write_frame(df, output, output_format)
+    return df
+
+
+def main():
+    parser = build_parser(
+        "Generate the synthetic air quality dataset.", file_name, default_rows, default_seed
+    )
+    args = parser.parse_args()
+
+    sample = generate_chunk(np.random.default_rng(0), 0, 1)
+    legacy = not (args.fast or args.chunked or args.workers)
+    dirty = apply_dirty_args(dirty_data, args, parser, sample, legacy)
+    output = apply_output_args(args, partition_by)
+    df = None
+    try:
+        if args.workers:
+            write_parallel(
+                args.output,
+                args.rows,
+                args.seed,
+                args.workers,
+                args.chunk_size,
+                not args.parts,
+                dirty,
+                output=output,
+            )
+        elif args.chunked:
+            write_streaming(
+                args.output, args.rows, args.seed, args.chunk_size, dirty, output=output
+            )
+        else:
+            df = generate(args.rows, args.seed, args.fast, dirty)
+    except BaseException as e:
+        print(f"Error occurred: {e}")
+    else:
+        if df is not None:
+            write_frame(df, args.output, output)
+        print(
+            f"Synthetic air quality data generated and saved as a CSV file named as {args.output}"
+        )
+    finally:
+        print("Data generation process completed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+import re
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import (
+    ExtensionArray,
+    ExtensionDtype,
+    register_extension_dtype,
+    take,
+)
+from pandas.api.indexers import check_array_indexer
+
+# Record keys such as STK_000242 are a fixed prefix plus a zero-padded
+# number. KeyArray keeps the prefix and pad width once on its dtype and the
+# numbers in a uint32 array (plus a missing mask), i.e. 5 bytes a row instead
+# of one Python string each; strings are only built for display and export.
+max_key = np.iinfo(np.uint32).max
+
+
+# ===============================
+# Dtype / array
+# ===============================
+@register_extension_dtype
+class KeyDtype(ExtensionDtype):
+    type = str
+    kind = "O"
+    na_value = np.nan
+    _metadata = ("prefix", "width")
+    _match = re.compile(r"^key\[(?P<prefix>.*),(?P<width>\d+)\]$")
+
+    def __init__(self, prefix="", width=1):
+        self.prefix = prefix
+        self.width = int(width)
+
+    @property
+    def name(self):
+        return f"key[{self.prefix},{self.width}]"
+
+    @classmethod
+    def construct_from_string(cls, string):
+        if not isinstance(string, str):
+            raise TypeError(f"'construct_from_string' expects a string, got {type(string)}")
+        match = cls._match.match(string)
+        if match is None:
+            raise TypeError(f"Cannot construct a 'KeyDtype' from '{string}'")
+        return cls(match["prefix"], match["width"])
+
+    @classmethod
+    def construct_array_type(cls):
+        return KeyArray
+
+    def _get_common_dtype(self, dtypes):
+        # Keys with another prefix or width concatenate as plain strings.
+        return self if all(dtype == self for dtype in dtypes) else np.dtype(object)
+
+
+class KeyArray(ExtensionArray):
+    def __init__(self, numbers, mask, dtype):
+        self._numbers = np.asarray(numbers, dtype=np.uint32)
+        self._mask = np.asarray(mask, dtype=bool)
+        self._dtype = dtype
+
+    # Construction
+    @classmethod
+    def _from_sequence(cls, scalars, *, dtype=None, copy=False):
+        if isinstance(scalars, cls) and (dtype is None or scalars.dtype == dtype):
+            return scalars.copy() if copy else scalars
+        text = pd.Series(np.asarray(scalars, dtype=object)).astype("str")
+        if dtype is None or isinstance(dtype, str):
+            dtype = KeyDtype.construct_from_string(dtype) if dtype else infer_key(text)
+            if dtype is None:
+                raise ValueError("Values do not follow a prefix + zero-padded number pattern")
+        numbers, mask = encode(text, dtype)
+        if numbers is None:
+            raise ValueError(f"Values do not match {dtype.name}")
+        return cls(numbers, mask, dtype)
+
+    @classmethod
+    def _from_factorized(cls, values, original):
+        return cls(np.where(values < 0, 0, values), values < 0, original.dtype)
+
+    # Basics
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def nbytes(self):
+        return self._numbers.nbytes + self._mask.nbytes
+
+    def __len__(self):
+        return len(self._numbers)
+
+    def __getitem__(self, item):
+        if isinstance(item, (int, np.integer)):
+            return np.nan if self._mask[item] else f"{self._dtype.prefix}{self._numbers[item]:0{self._dtype.width}d}"
+        item = check_array_indexer(self, item)
+        return type(self)(self._numbers[item], self._mask[item], self._dtype)
+
+    def __setitem__(self, key, value):
+        key = check_array_indexer(self, key)
+        value = KeyArray._from_sequence(np.atleast_1d(np.asarray(value, dtype=object)), dtype=self._dtype)
+        self._numbers[key] = value._numbers if len(value) > 1 else value._numbers[0]
+        self._mask[key] = value._mask if len(value) > 1 else value._mask[0]
+
+    def __iter__(self):
+        return iter(self.astype(object))
+
+    def isna(self):
+        return self._mask.copy()
+
+    def copy(self):
+        return type(self)(self._numbers.copy(), self._mask.copy(), self._dtype)
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        if allow_fill and fill_value is not None and not pd.isna(fill_value):
+            raise ValueError("Only missing values can be used as fill_value")
+        numbers = take(self._numbers, indices, allow_fill=allow_fill, fill_value=0)
+        mask = take(self._mask, indices, allow_fill=allow_fill, fill_value=True)
+        return type(self)(numbers, mask, self._dtype)
+
+    @classmethod
+    def _concat_same_type(cls, to_concat):
+        numbers = np.concatenate([array._numbers for array in to_concat])
+        mask = np.concatenate([array._mask for array in to_concat])
+        return cls(numbers, mask, to_concat[0].dtype)
+
+    # Hashing, sorting and comparison work on the integers.
+    def _values_for_factorize(self):
+        return np.where(self._mask, -1, self._numbers.astype(np.int64)), -1
+
+    def _values_for_argsort(self):
+        return self._numbers
+
+    def _keys(self):
+        return pd.Index(np.where(self._mask, -1, self._numbers.astype(np.int64)) if self._mask.any() else self._numbers)
+
+    def duplicated(self, keep="first"):
+        return self._keys().duplicated(keep=keep)
+
+    def unique(self):
+        first = ~self.duplicated()
+        return type(self)(self._numbers[first], self._mask[first], self._dtype)
+
+    def __eq__(self, other):
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        if isinstance(other, KeyArray) and other.dtype == self.dtype:
+            return (self._numbers == other._numbers) & ~self._mask & ~other._mask
+        return self.astype(object) == np.asarray(other, dtype=object)
+
+    def isin(self, values):
+        wanted = encode(pd.Series(list(values), dtype="str").dropna(), self._dtype, strict=False)
+        return np.isin(self._numbers, wanted) & ~self._mask
+
+    # Display and export
+    def _format(self, numbers):
+        return np.char.mod(f"{self._dtype.prefix}%0{self._dtype.width}d", numbers).astype(object)
+
+    def astype(self, dtype, copy=True):
+        dtype = pd.api.types.pandas_dtype(dtype)
+        if dtype == self._dtype:
+            return self.copy() if copy else self
+        if isinstance(dtype, np.dtype) and dtype.kind in "iuf":
+            if self._mask.any() and dtype.kind != "f":
+                raise ValueError("Cannot convert missing keys to integers")
+            return np.where(self._mask, np.nan, self._numbers).astype(dtype)
+        values = self._format(self._numbers)
+        values[self._mask] = np.nan
+        if isinstance(dtype, np.dtype) and dtype == object:
+            return values
+        return pd.array(values, dtype=dtype)
+
+    def __array__(self, dtype=None, copy=None):
+        return self.astype(object if dtype is None else dtype)
+
+    def __arrow_array__(self, type=None):
+        import pyarrow as pa
+
+        return pa.array(self.astype(object), type=type or pa.string(), from_pandas=True)
+
+    def numbers(self):
+        return self._numbers
+
+    # Series.str methods run on the formatted strings (object array).
+    def __getattr__(self, name):
+        if name.startswith("_str_"):
+            return getattr(pd.array(self.astype(object), dtype=object), name)
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+
+# ===============================
+# Encoding
+# ===============================
+def infer_key(text):
+    # KeyDtype for string values that share one prefix followed by digits
+    # zero-padded to a common width; None when they do not.
+    present = text.dropna()
+    if present.empty:
+        return None
+    match = re.match(r"^(.*?)(\d+)$", present.iloc[0])
+    if match is None:
+        return None
+    prefix = match.group(1)
+    if not present.str.startswith(prefix).all():
+        return None
+    lengths = present.str.len() - len(prefix)
+    dtype = KeyDtype(prefix, max(int(lengths.min()), 1))
+    return dtype if encode(present, dtype)[0] is not None else None
+
+
+def encode(text, dtype, strict=True):
+    # (uint32 numbers, missing mask) for text written as dtype.prefix + digits.
+    # Values that would not format back to the same string make strict
+    # encoding fail (None, None); otherwise only the numbers of the values
+    # that do match are returned.
+    mask = text.isna().to_numpy().copy()
+    digits = text.fillna(dtype.prefix + "0" * dtype.width).str.slice(len(dtype.prefix))
+    valid = text.fillna(dtype.prefix).str.startswith(dtype.prefix).to_numpy() & digits.str.isdigit().to_numpy()
+    lengths = digits.str.len().to_numpy()
+    valid &= (lengths == dtype.width) | ((lengths > dtype.width) & ~digits.str.startswith("0").to_numpy())
+    valid &= lengths <= 10
+    numbers = pd.to_numeric(digits.where(valid, "0")).to_numpy()
+    valid &= numbers <= max_key
+    if not strict:
+        return numbers[valid & ~mask].astype(np.uint32)
+    if not (valid | mask).all():
+        return None, None
+    return np.where(mask, 0, numbers).astype(np.uint32), mask
+
+
+def key_number(value, dtype):
+    # The number behind a single key string, None when it does not match.
+    if not isinstance(value, str) or not value.startswith(dtype.prefix):
+        return None
+    digits = value[len(dtype.prefix) :]
+    if not digits.isdigit() or len(digits) > 10:
+        return None
+    number = int(digits)
+    return number if number <= max_key and f"{number:0{dtype.width}d}" == digits else None
+
+
+def encode_keys(df, schema):
+    # Columns typed "key" in the schema become KeyArrays when their values
+    # follow the pattern and stay strings otherwise.
+    for col in df.columns:
+        if schema["dtypes"].get(col) != "key" or isinstance(df[col].dtype, KeyDtype):
+            continue
+        text = df[col].astype("str") if not pd.api.types.is_string_dtype(df[col]) else df[col]
+        dtype = infer_key(text)
+        if dtype is not None:
+            numbers, mask = encode(text, dtype)
+            df[col] = pd.array(KeyArray(numbers, mask, dtype))
+    return df
+
+
+# ===============================
+# Hash index
+# ===============================
+class KeyIndex:
+    # Hash index on a key column, built once: the distinct keys go into a
+    # hashed pd.Index and the row positions are grouped by key, so a lookup
+    # is one hash probe plus a slice. KeyArray columns hash their uint32
+    # numbers; any other column (e.g. Titanic's PassengerId) its values.
+    def __init__(self, values):
+        self.dtype = values.dtype
+        self.encoded = isinstance(values.dtype, KeyDtype)
+        codes, uniques = pd.factorize(values.array._keys() if self.encoded else values.array)
+        self.keys = pd.Index(uniques)
+        self.codes = codes
+        self.order = np.argsort(codes, kind="stable")
+        # Rows of key c are order[bounds[c]:bounds[c + 1]]; missing keys come first.
+        self.bounds = np.cumsum(np.bincount(codes + 1, minlength=len(uniques) + 1))
+
+    def key(self, value):
+        return key_number(value, self.dtype) if self.encoded else value
+
+    def rows(self, value):
+        # Positions of the rows holding value (empty when there are none).
+        key = self.key(value)
+        if key is None or key not in self.keys:
+            return self.order[:0]
+        code = self.keys.get_loc(key)
+        return self.order[self.bounds[code] : self.bounds[code + 1]]
+
+    def __contains__(self, value):
+        key = self.key(value)
+        return key is not None and key in self.keys
+
+    def isin(self, values):
+        # Vectorized __contains__ for a Series: one hash probe per value.
+        # Keys of another prefix or width are matched through their strings.
+        if self.encoded and values.dtype == self.dtype:
+            keys = values.array._keys()
+        elif self.encoded:
+            keys = pd.Index([self.key(value) for value in values.astype(object)], dtype=object)
+        else:
+            keys = values.array
+        return (self.keys.get_indexer(keys) >= 0) & ~values.isna().to_numpy()
+
+    def duplicated(self, keep="first"):
+        # Same as values.duplicated(keep), from the grouped positions.
+        sizes = np.diff(self.bounds, prepend=0)
+        if keep is False:
+            return sizes[self.codes + 1] > 1
+        kept = self.bounds - sizes if keep == "first" else self.bounds - 1
+        mask = np.ones(len(self.codes), dtype=bool)
+        mask[self.order[kept[sizes > 0]]] = False
+        return mask
+
+    @property
+    def is_unique(self):
+        return self.bounds[0] <= 1 and len(self.keys) + self.bounds[0] == len(self.codes)
+
+
+def key_index(df, column):
+    return KeyIndex(df[column])
+
+
+def repeated_keys(indexes, values):
+    # (mask of the values whose key is in one of indexes or earlier in values,
+    # KeyIndex of values). Only values is hashed, so checking a batch of new
+    # rows against indexes of the loaded ones costs O(len(values)) per index.
+    index = KeyIndex(values)
+    repeated = index.duplicated() & ~values.isna().to_numpy()
+    for other in indexes:
+        repeated |= other.isin(values)
+    return repeated, index
@@ -5,47 +5,117 @@ import seaborn as sns
 import os
 from time import sleep as delay
 from random import randint as rand
+from data_generate import generate
+from load_utils import (
+    add_calendar,
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport, chunked_report
+from sql_analysis import sql_report
 
 
 class CustomDataAnalysis:
+    # Columns each menu action reads; load_data only materializes these.
+    action_columns = {
+        "all_analysis": [
+            "Country",
+            "City",
+            "Date",
+            "PM2_5",
+            "PM10",
+            "NO2",
+            "SO2",
+            "CO",
+            "O3",
+            "Temperature_C",
+            "Humidity",
+            "Wind_Speed_kmh",
+            "AQI",
+        ],
+        "all_visualizations": [
+            "Country",
+            "City",
+            "Date",
+            "PM2_5",
+            "PM10",
+            "NO2",
+            "SO2",
+            "CO",
+            "O3",
+            "Temperature_C",
+            "Humidity",
+            "Wind_Speed_kmh",
+            "AQI",
+        ],
+        "append_data": [dataset_schema["key"]],
+    }
+
     def __init__(self, file_path):
         self.file_path = file_path
         self.df = None
+        self.results = ResultCache()  # memoized tables of self.df, see memo_utils
+        self.running = None  # all_analysis aggregates kept by append_data
+        self.appended = []  # frames added by append_data, see collect_appended
+        self.key_indexes = []  # KeyIndex of the loaded rows and of each append
 
     # 1. Generate Data
     def generate_data(self):
-        if os.path.exists("data_generate.py") and not os.path.exists(
-            "Q1_air_quality.csv"
-        ):
-            os.system("python data_generate.py")
-            print("✅ Data generated successfully.")
-        elif not os.path.exists("Q1_air_quality.csv"):
-            print("❌ data already exists!")
-        elif not os.path.exists("data_generate.py"):
-            print("❌ data_generate.py not found!")
+        persist = not os.path.exists(self.file_path)
+        self.df = typed_frame(generate(output=self.file_path if persist else None), dataset_schema)
+        self.results.bump()
+        self.running = None
+        self.appended = []
+        print("✅ Data generated successfully.")
+        print("Shape:", self.df.shape)
+        if persist:
+            print(f"✅ Data saved to {self.file_path}.")
+        else:
+            print("⚠️ Data file already exists, generated data kept in memory only.")
 
     # 2. Load Data
-    def load_data(self):
-        if not os.path.exists(self.file_path):
+    def load_data(self, columns=None, filters=None, workers=None):
+        if not dataset_exists(self.file_path):
             print("⚠️ Data file not found!")
             return
-        self.df = pd.read_csv(self.file_path)
+        # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+        # workers > 1 parses large CSVs in that many processes.
+        columns = needed_columns(self.action_columns) if columns is None else columns
+        self.df = read_dataset(self.file_path, dataset_schema, columns, filters, workers=workers)
+        self.results.bump()
+        self.running = None
+        self.appended = []
         print("✅ Data loaded successfully.")
         print("Shape:", self.df.shape)
+        memory_report(self.df)
 
     # 3. Basic Info
     def basic_info(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
         print("\n--- Basic Info ---")
         print("Dataset Shape:", self.df.shape)
         print("\nColumn Data Types:\n", self.df.dtypes)
-        print("\nMissing Values:\n", self.df.isna().sum())
-        print("\nMissing Values (%):\n", (self.df.isna().sum() / len(self.df)) * 100)
+        print("\nMissing Values:\n", self.results.missing(self.df))
+        print("\nMissing Values (%):\n", (self.results.missing(self.df) / len(self.df)) * 100)
 
     # 4. Handle Missing Values
     def handle_missing_values(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
@@ -65,17 +135,16 @@ class CustomDataAnalysis:
                     )
                     if func in ["mean", "median"]:
                         for col in numeric_cols:
-                            if func == "mean":
-                                self.df[col] = self.df[col].fillna(self.df[col].mean())
-                            else:
-                                self.df[col] = self.df[col].fillna(
-                                    self.df[col].median()
-                                )
+                            self.df[col] = fill_missing(self.df[col], func)
+                        self.results.bump()
+                        self.running = None
                         print(f"✅ Missing values filled using {func}.")
                     else:
                         print("❌ Invalid function!")
                 case 2:
                     self.df.dropna(inplace=True)
+                    self.results.bump()
+                    self.running = None
                     print("✅ Rows with missing values dropped.")
                 case 0:
                     print("Exiting missing value handler...")
@@ -85,17 +154,22 @@ class CustomDataAnalysis:
 
     # 5. All Analysis
     def all_analysis(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
-        df = self.df
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # Stats run on float64 copies of the float32 columns (see
+        # load_utils.float64_view), so they print without float32 noise.
+        df = float64_view(self.df)
         print("\n--- All Analysis ---")
         # ===============================
         # 1. Basic Info
         # ===============================
         print("Dataset Shape:", df.shape)
         print("\nColumn Data Types:\n", df.dtypes)
-        print("\nMissing Values:\n", df.isna().sum())
+        print("\nMissing Values:\n", self.results.missing(df))
 
         numeric_cols = [
             "PM2_5",
@@ -110,27 +184,41 @@ class CustomDataAnalysis:
             "AQI",
         ]
 
-        print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
+        print("\nSummary Statistics:\n", self.results.describe(df, numeric_cols, include="all"))
 
-        missing_percent = (df.isna().sum() / len(df)) * 100
+        missing_percent = (self.results.missing(df) / len(df)) * 100
         print("\nMissing Values (%):\n", missing_percent)
 
+        # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+        add_calendar(df, "Month")
+        unhealthy_day = (df["AQI"] > 50).fillna(False).astype(int).rename("Unhealthy_Day")
+        groups = self.results.get(
+            "all_analysis groups",
+            lambda: (
+                GroupPlan(df)
+                .add("Country", numeric_cols + [unhealthy_day])
+                .add("City", ["AQI"])
+                .add("Month", ["AQI"])
+                .add(pd.cut(df["Temperature_C"], bins=5), ["AQI"])
+                .add(pd.cut(df["Humidity"], bins=5), ["AQI"])
+                .add(pd.cut(df["Wind_Speed_kmh"], bins=5), ["AQI"])
+                .run()
+            ),
+        )
+
         # ===============================
         # 2. AQI Analysis
         # ===============================
         avg_aqi = df["AQI"].mean()
         print("\nOverall Average AQI:", avg_aqi)
 
-        aqi_by_country = (
-            df.groupby("Country")["AQI"].mean().sort_values(ascending=False)
-        )
+        aqi_by_country = groups.mean("Country", "AQI").sort_values(ascending=False)
         print("\nAverage AQI by Country:\n", aqi_by_country.head(10))
 
-        aqi_by_city = df.groupby("City")["AQI"].mean().sort_values(ascending=False)
+        aqi_by_city = groups.mean("City", "AQI").sort_values(ascending=False)
         print("\nAverage AQI by City:\n", aqi_by_city.head(10))
 
-        df["Month"] = pd.to_datetime(df["Date"]).dt.month
-        aqi_by_month = df.groupby("Month")["AQI"].mean()
+        aqi_by_month = groups.mean("Month", "AQI")
         print("\nAverage AQI by Month:\n", aqi_by_month)
 
         # ===============================
@@ -143,7 +231,7 @@ class CustomDataAnalysis:
         print("\nMaximum Recorded Pollutant Levels:\n", pollutant_max)
 
         # ✅ Fixed correlation calculation
-        country_means = df.groupby("Country")[numeric_cols].mean()
+        country_means = groups.table("Country", numeric_cols)
         aqi_means = country_means["AQI"]
         pollutant_means_only = country_means.drop(columns="AQI")
         pollutant_vs_aqi = pollutant_means_only.corrwith(aqi_means)
@@ -156,19 +244,19 @@ class CustomDataAnalysis:
         # ===============================
         # 4. Weather & AQI Relationships
         # ===============================
-        avg_temp_aqi = df.groupby(pd.cut(df["Temperature_C"], bins=5))["AQI"].mean()
+        avg_temp_aqi = groups.mean("Temperature_C", "AQI")
         print("\nAQI by Temperature Range:\n", avg_temp_aqi)
 
-        avg_humidity_aqi = df.groupby(pd.cut(df["Humidity"], bins=5))["AQI"].mean()
+        avg_humidity_aqi = groups.mean("Humidity", "AQI")
         print("\nAQI by Humidity Range:\n", avg_humidity_aqi)
 
-        avg_wind_aqi = df.groupby(pd.cut(df["Wind_Speed_kmh"], bins=5))["AQI"].mean()
+        avg_wind_aqi = groups.mean("Wind_Speed_kmh", "AQI")
         print("\nAQI by Wind Speed Range:\n", avg_wind_aqi)
 
         # ===============================
         # 5. Correlations
         # ===============================
-        corr_matrix = df[numeric_cols].corr()
+        corr_matrix = self.results.corr(df, numeric_cols)
         print("\nCorrelation Matrix:\n", corr_matrix)
 
         # ===============================
@@ -188,15 +276,13 @@ class CustomDataAnalysis:
         )
 
         # Example: Extreme Pollution Flag
-        df["Extreme_AQI"] = (df["AQI"] > 100).astype(int)
+        df["Extreme_AQI"] = (df["AQI"] > 100).fillna(False).astype(int)
         extreme_aqi_rate = df["Extreme_AQI"].mean()
         print("\nProportion of Extreme AQI Days (>100):", extreme_aqi_rate)
 
         # Example: Healthy vs Unhealthy Days (AQI threshold 50)
-        df["Unhealthy_Day"] = (df["AQI"] > 50).astype(int)
-        unhealthy_rate = (
-            df.groupby("Country")["Unhealthy_Day"].mean().sort_values(ascending=False)
-        )
+        df["Unhealthy_Day"] = unhealthy_day
+        unhealthy_rate = groups.mean("Country", "Unhealthy_Day").sort_values(ascending=False)
         print(
             "\nTop 10 Countries by Proportion of Unhealthy Days:\n",
             unhealthy_rate.head(10),
@@ -204,9 +290,12 @@ class CustomDataAnalysis:
 
     # 5. All Visualizations
     def all_visualizations(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
+        if missing_columns(self.df, self.action_columns["all_visualizations"]):
+            return
         df = self.df
         numeric_cols = [
             "PM2_5",
@@ -252,7 +341,7 @@ class CustomDataAnalysis:
 
         # Correlation Heatmap
         plt.figure(figsize=(10, 6))
-        sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+        sns.heatmap(self.results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
         plt.title("Correlation Heatmap")
         plt.show()
 
@@ -266,7 +355,9 @@ class CustomDataAnalysis:
 
         # AQI distribution by Country
         plt.figure(figsize=(12, 6))
-        sns.boxplot(data=df, x="Country", y="AQI")
+        seaborn_bxp(plt.gca(), self.results.box_stats(df, "AQI", "Country", df["Country"].cat.categories))
+        plt.xlabel("Country")
+        plt.ylabel("AQI")
         plt.xticks(rotation=90)
         plt.title("AQI Distribution by Country")
         plt.show()
@@ -274,7 +365,9 @@ class CustomDataAnalysis:
         # AQI distribution by City (top 15)
         top_cities = df["City"].value_counts().head(15).index
         plt.figure(figsize=(12, 6))
-        sns.boxplot(data=df[df["City"].isin(top_cities)], x="City", y="AQI")
+        seaborn_bxp(plt.gca(), self.results.box_stats(df, "AQI", "City", top_cities))
+        plt.xlabel("City")
+        plt.ylabel("AQI")
         plt.xticks(rotation=90)
         plt.title("AQI Distribution in Top 15 Cities")
         plt.show()
@@ -292,10 +385,10 @@ class CustomDataAnalysis:
             plt.show()
 
         # Heatmap: Average AQI by Country & Month
-        df["Month"] = pd.to_datetime(df["Date"]).dt.month
+        add_calendar(df, "Month")
         pivot = df.pivot_table(
-            values="AQI", index="Country", columns="Month", aggfunc="mean"
-        )
+            values="AQI", index="Country", columns="Month", aggfunc="mean", observed=True
+        ).astype(float)
         plt.figure(figsize=(12, 6))
         sns.heatmap(pivot, annot=False, cmap="YlGnBu", cbar_kws={"label": "Avg AQI"})
         plt.title("Average AQI by Country & Month")
@@ -309,6 +402,75 @@ class CustomDataAnalysis:
         g.set_axis_labels("PM2.5", "Count")
         plt.show()
 
+    # 7. All Analysis (chunked, for files larger than memory)
+    def chunked_analysis(self, chunk_size=1_000_000):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        chunked_report(self.file_path, chunk_size, self.action_columns["all_analysis"])
+
+    # 8. All Analysis (SQL store, indexed queries)
+    def sql_analysis(self, filters=None):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+        sql_report(self.file_path, self.action_columns["all_analysis"], filters)
+
+    # 9. Append Data (running all_analysis aggregates)
+    def append_data(self, source=None):
+        if self.df is None:
+            print("⚠️ Data not loaded.")
+            return
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+        if source is None:
+            source = input("Enter the data file (or glob) to append: ").strip()
+        if isinstance(source, pd.DataFrame):
+            new = typed_frame(source, dataset_schema)
+        elif dataset_exists(source):
+            new = read_dataset(source, dataset_schema, needed_columns(self.action_columns))
+        else:
+            print("⚠️ Data file not found!")
+            return
+        columns = [col for col in self.df.columns if col in dataset_schema["dtypes"]]
+        if missing_columns(new, columns):
+            return
+        key = dataset_schema["key"]
+        # The loaded rows are folded in once, on the first append; after that
+        # the report only costs the new rows (see chunked_analysis.RunningReport).
+        if self.running is None:
+            self.df = self.df[columns].reset_index(drop=True)
+            self.running = RunningReport().update(self.df)
+            self.key_indexes = [key_index(self.df, key)] if key in columns else []
+        # New rows are kept aside and concatenated by the next action that
+        # needs the whole frame (collect_appended); their row labels continue
+        # after the rows before them, as in the concatenated frame.
+        rows = len(self.df) + sum(len(frame) for frame in self.appended)
+        new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+        # New keys are probed against the hash index of each earlier block:
+        # one probe per new row and block, no pass over the loaded rows
+        # (see key_utils.KeyIndex).
+        if key in columns:
+            repeated, index = repeated_keys(self.key_indexes, new[key])
+            self.key_indexes.append(index)
+            if repeated.any():
+                print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+        self.running.update(new)
+        self.appended.append(new)
+        self.results.bump()
+        print(f"✅ {len(new)} rows appended.")
+        print("Shape:", (rows + len(new), len(columns)))
+        self.running.print("running")
+
+    def collect_appended(self):
+        # One concatenation for all the frames appended since the last call.
+        if self.appended:
+            columns = list(self.appended[0].columns)
+            self.df = concat_frames([self.df[columns], *self.appended], dataset_schema)
+            self.appended = []
+
 
 # ==========================
 # 🚀 Menu-driven interaction
@@ -324,6 +486,9 @@ def main():
         4: ("Handle Missing Values", analyzer.handle_missing_values),
         5: ("All Analysis", analyzer.all_analysis),
         6: ("All Visualizations", analyzer.all_visualizations),
+        7: ("All Analysis (chunked, large files)", analyzer.chunked_analysis),
+        8: ("All Analysis (SQL store)", analyzer.sql_analysis),
+        9: ("Append Data", analyzer.append_data),
         0: ("Exit", None),
     }
 
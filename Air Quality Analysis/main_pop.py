@@ -5,31 +5,105 @@ import seaborn as sns
 import os
 from time import sleep as delay
 from random import randint as rand
+from data_generate import generate
+from load_utils import (
+    add_calendar,
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport, chunked_report
+from sql_analysis import sql_report
+
+results = ResultCache()  # memoized tables of the loaded df, see memo_utils
+running = None  # all_analysis aggregates kept by append_data
+appended = []  # frames added by append_data, see collect_appended
+key_indexes = []  # KeyIndex of the loaded rows and of each append
+
+# Columns each menu action reads; load_data only materializes these.
+action_columns = {
+    "all_analysis": [
+        "Country",
+        "City",
+        "Date",
+        "PM2_5",
+        "PM10",
+        "NO2",
+        "SO2",
+        "CO",
+        "O3",
+        "Temperature_C",
+        "Humidity",
+        "Wind_Speed_kmh",
+        "AQI",
+    ],
+    "all_visualizations": [
+        "Country",
+        "City",
+        "Date",
+        "PM2_5",
+        "PM10",
+        "NO2",
+        "SO2",
+        "CO",
+        "O3",
+        "Temperature_C",
+        "Humidity",
+        "Wind_Speed_kmh",
+        "AQI",
+    ],
+    "append_data": [dataset_schema["key"]],
+}
 
 
 # ===============================
 # 1. Generate Data
 # ===============================
-def generate_data():
-    if os.path.exists("data_generate.py") and not os.path.exists("Q1_air_quality.csv"):
-        os.system("python data_generate.py")
-        print("✅ Data generated successfully.")
-    elif not os.path.exists("Q1_air_quality.csv"):
-        print("❌ data already exists!")
-    elif not os.path.exists("data_generate.py"):
-        print("❌ data_generate.py not found!")
+def generate_data(file_path="Q1_air_quality.csv"):
+    global running, appended
+    persist = not os.path.exists(file_path)
+    df = typed_frame(generate(output=file_path if persist else None), dataset_schema)
+    results.bump()
+    running = None
+    appended = []
+    print("✅ Data generated successfully.")
+    print("Shape:", df.shape)
+    if persist:
+        print(f"✅ Data saved to {file_path}.")
+    else:
+        print("⚠️ Data file already exists, generated data kept in memory only.")
+    return df
 
 
 # ===============================
 # 2. Load Data
 # ===============================
-def load_data(file_path):
-    if not os.path.exists(file_path):
+def load_data(file_path, columns=None, filters=None, workers=None):
+    global running, appended
+    if not dataset_exists(file_path):
         print("⚠️ Data file not found!")
         return None
-    df = pd.read_csv(file_path)
+    # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+    # workers > 1 parses large CSVs in that many processes.
+    columns = needed_columns(action_columns) if columns is None else columns
+    df = read_dataset(file_path, dataset_schema, columns, filters, workers=workers)
+    results.bump()
+    running = None
+    appended = []
     print("✅ Data loaded successfully.")
     print("Shape:", df.shape)
+    memory_report(df)
     return df
 
 
@@ -43,14 +117,15 @@ def basic_info(df):
     print("\n--- Basic Info ---")
     print("Dataset Shape:", df.shape)
     print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
-    print("\nMissing Values (%):\n", (df.isna().sum() / len(df)) * 100)
+    print("\nMissing Values:\n", results.missing(df))
+    print("\nMissing Values (%):\n", (results.missing(df) / len(df)) * 100)
 
 
 # ===============================
 # 4. Handle Missing Values
 # ===============================
 def handle_missing_values(df):
+    global running
     if df is None:
         print("⚠️ Data not loaded.")
         return df
@@ -66,15 +141,16 @@ def handle_missing_values(df):
                 func = input("Enter aggregate function (mean/median): ").strip().lower()
                 if func in ["mean", "median"]:
                     for col in numeric_cols:
-                        if func == "mean":
-                            df[col] = df[col].fillna(df[col].mean())
-                        else:
-                            df[col] = df[col].fillna(df[col].median())
+                        df[col] = fill_missing(df[col], func)
+                    results.bump()
+                    running = None
                     print(f"✅ Missing values filled using {func}.")
                 else:
                     print("❌ Invalid function!")
             case 2:
                 df.dropna(inplace=True)
+                results.bump()
+                running = None
                 print("✅ Rows with missing values dropped.")
             case 0:
                 print("Exiting missing value handler...")
@@ -91,6 +167,11 @@ def all_analysis(df):
     if df is None:
         print("⚠️ Data not loaded.")
         return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # Stats run on float64 copies of the float32 columns (see
+    # load_utils.float64_view), so they print without float32 noise.
+    df = float64_view(df)
     print("\n--- All Analysis ---")
 
     numeric_cols = [
@@ -109,22 +190,38 @@ def all_analysis(df):
     # Basic Info
     print("Dataset Shape:", df.shape)
     print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
-    print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
-    print("\nMissing Values (%):\n", (df.isna().sum() / len(df)) * 100)
+    print("\nMissing Values:\n", results.missing(df))
+    print("\nSummary Statistics:\n", results.describe(df, numeric_cols, include="all"))
+    print("\nMissing Values (%):\n", (results.missing(df) / len(df)) * 100)
+
+    # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+    add_calendar(df, "Month")
+    unhealthy_day = (df["AQI"] > 50).fillna(False).astype(int).rename("Unhealthy_Day")
+    groups = results.get(
+        "all_analysis groups",
+        lambda: (
+            GroupPlan(df)
+            .add("Country", numeric_cols + [unhealthy_day])
+            .add("City", ["AQI"])
+            .add("Month", ["AQI"])
+            .add(pd.cut(df["Temperature_C"], bins=5), ["AQI"])
+            .add(pd.cut(df["Humidity"], bins=5), ["AQI"])
+            .add(pd.cut(df["Wind_Speed_kmh"], bins=5), ["AQI"])
+            .run()
+        ),
+    )
 
     # AQI Analysis
     print("\nOverall Average AQI:", df["AQI"].mean())
     print(
         "\nAverage AQI by Country:\n",
-        df.groupby("Country")["AQI"].mean().sort_values(ascending=False).head(10),
+        groups.mean("Country", "AQI").sort_values(ascending=False).head(10),
     )
     print(
         "\nAverage AQI by City:\n",
-        df.groupby("City")["AQI"].mean().sort_values(ascending=False).head(10),
+        groups.mean("City", "AQI").sort_values(ascending=False).head(10),
     )
-    df["Month"] = pd.to_datetime(df["Date"]).dt.month
-    print("\nAverage AQI by Month:\n", df.groupby("Month")["AQI"].mean())
+    print("\nAverage AQI by Month:\n", groups.mean("Month", "AQI"))
 
     # Pollutant Analysis
     print(
@@ -135,7 +232,7 @@ def all_analysis(df):
         "\nMaximum Recorded Pollutant Levels:\n",
         df[numeric_cols[:-3]].max().sort_values(ascending=False),
     )
-    country_means = df.groupby("Country")[numeric_cols].mean()
+    country_means = groups.table("Country", numeric_cols)
     pollutant_vs_aqi = country_means.drop(columns="AQI").corrwith(country_means["AQI"])
     print(
         "\nCorrelation of Pollutants with AQI (by Country averages):\n",
@@ -145,19 +242,19 @@ def all_analysis(df):
     # Weather & AQI Relationships
     print(
         "\nAQI by Temperature Range:\n",
-        df.groupby(pd.cut(df["Temperature_C"], bins=5))["AQI"].mean(),
+        groups.mean("Temperature_C", "AQI"),
     )
     print(
         "\nAQI by Humidity Range:\n",
-        df.groupby(pd.cut(df["Humidity"], bins=5))["AQI"].mean(),
+        groups.mean("Humidity", "AQI"),
     )
     print(
         "\nAQI by Wind Speed Range:\n",
-        df.groupby(pd.cut(df["Wind_Speed_kmh"], bins=5))["AQI"].mean(),
+        groups.mean("Wind_Speed_kmh", "AQI"),
     )
 
     # Correlation Matrix
-    print("\nCorrelation Matrix:\n", df[numeric_cols].corr())
+    print("\nCorrelation Matrix:\n", results.corr(df, numeric_cols))
 
     # Derived Metrics
     df["PM_Ratio"] = df["PM2_5"] / df["PM10"].replace(0, np.nan)
@@ -167,15 +264,12 @@ def all_analysis(df):
         "\nTop 5 Records with Highest Pollution Burden:\n",
         df.nlargest(5, "Pollution_Burden")[["Country", "City", "Pollution_Burden"]],
     )
-    df["Extreme_AQI"] = (df["AQI"] > 100).astype(int)
+    df["Extreme_AQI"] = (df["AQI"] > 100).fillna(False).astype(int)
     print("\nProportion of Extreme AQI Days (>100):", df["Extreme_AQI"].mean())
-    df["Unhealthy_Day"] = (df["AQI"] > 50).astype(int)
+    df["Unhealthy_Day"] = unhealthy_day
     print(
         "\nTop 10 Countries by Proportion of Unhealthy Days:\n",
-        df.groupby("Country")["Unhealthy_Day"]
-        .mean()
-        .sort_values(ascending=False)
-        .head(10),
+        groups.mean("Country", "Unhealthy_Day").sort_values(ascending=False).head(10),
     )
 
 
@@ -186,6 +280,8 @@ def all_visualizations(df):
     if df is None:
         print("⚠️ Data not loaded.")
         return
+    if missing_columns(df, action_columns["all_visualizations"]):
+        return
 
     numeric_cols = [
         "PM2_5",
@@ -223,7 +319,7 @@ def all_visualizations(df):
 
     # Correlation Heatmap
     plt.figure(figsize=(10, 6))
-    sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+    sns.heatmap(results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
     plt.title("Correlation Heatmap")
     plt.show()
 
@@ -233,7 +329,9 @@ def all_visualizations(df):
 
     # AQI distribution by Country
     plt.figure(figsize=(12, 6))
-    sns.boxplot(data=df, x="Country", y="AQI")
+    seaborn_bxp(plt.gca(), results.box_stats(df, "AQI", "Country", df["Country"].cat.categories))
+    plt.xlabel("Country")
+    plt.ylabel("AQI")
     plt.xticks(rotation=90)
     plt.title("AQI Distribution by Country")
     plt.show()
@@ -241,7 +339,9 @@ def all_visualizations(df):
     # AQI distribution by City (top 15)
     top_cities = df["City"].value_counts().head(15).index
     plt.figure(figsize=(12, 6))
-    sns.boxplot(data=df[df["City"].isin(top_cities)], x="City", y="AQI")
+    seaborn_bxp(plt.gca(), results.box_stats(df, "AQI", "City", top_cities))
+    plt.xlabel("City")
+    plt.ylabel("AQI")
     plt.xticks(rotation=90)
     plt.title("AQI Distribution in Top 15 Cities")
     plt.show()
@@ -255,10 +355,10 @@ def all_visualizations(df):
         plt.show()
 
     # Heatmap: Average AQI by Country & Month
-    df["Month"] = pd.to_datetime(df["Date"]).dt.month
+    add_calendar(df, "Month")
     pivot = df.pivot_table(
-        values="AQI", index="Country", columns="Month", aggfunc="mean"
-    )
+        values="AQI", index="Country", columns="Month", aggfunc="mean", observed=True
+    ).astype(float)
     plt.figure(figsize=(12, 6))
     sns.heatmap(pivot, annot=False, cmap="YlGnBu", cbar_kws={"label": "Avg AQI"})
     plt.title("Average AQI by Country & Month")
@@ -273,6 +373,82 @@ def all_visualizations(df):
     plt.show()
 
 
+# 7. All Analysis (chunked, for files larger than memory)
+def chunked_analysis(file_path, chunk_size=1_000_000):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    chunked_report(file_path, chunk_size, action_columns["all_analysis"])
+
+
+# 8. All Analysis (SQL store, indexed queries)
+def sql_analysis(file_path, filters=None):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+    sql_report(file_path, action_columns["all_analysis"], filters)
+
+
+# 9. Append Data (running all_analysis aggregates)
+def append_data(df, source=None):
+    global running, key_indexes
+    if df is None:
+        print("⚠️ Data not loaded.")
+        return df
+    if missing_columns(df, action_columns["all_analysis"]):
+        return df
+    # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+    if source is None:
+        source = input("Enter the data file (or glob) to append: ").strip()
+    if isinstance(source, pd.DataFrame):
+        new = typed_frame(source, dataset_schema)
+    elif dataset_exists(source):
+        new = read_dataset(source, dataset_schema, needed_columns(action_columns))
+    else:
+        print("⚠️ Data file not found!")
+        return df
+    columns = [col for col in df.columns if col in dataset_schema["dtypes"]]
+    if missing_columns(new, columns):
+        return df
+    key = dataset_schema["key"]
+    # The loaded rows are folded in once, on the first append; after that
+    # the report only costs the new rows (see chunked_analysis.RunningReport).
+    if running is None:
+        df = df[columns].reset_index(drop=True)
+        running = RunningReport().update(df)
+        key_indexes = [key_index(df, key)] if key in columns else []
+    # New rows are kept aside and concatenated by the next action that needs
+    # the whole frame (collect_appended); their row labels continue after the
+    # rows before them, as in the concatenated frame.
+    rows = len(df) + sum(len(frame) for frame in appended)
+    new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+    # New keys are probed against the hash index of each earlier block: one
+    # probe per new row and block, no pass over the loaded rows (see key_utils).
+    if key in columns:
+        repeated, index = repeated_keys(key_indexes, new[key])
+        key_indexes.append(index)
+        if repeated.any():
+            print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+    running.update(new)
+    appended.append(new)
+    results.bump()
+    print(f"✅ {len(new)} rows appended.")
+    print("Shape:", (rows + len(new), len(columns)))
+    running.print("running")
+    return df
+
+
+def collect_appended(df):
+    # One concatenation for all the frames appended since the last call.
+    global appended
+    if appended:
+        columns = list(appended[0].columns)
+        df = concat_frames([df[columns], *appended], dataset_schema)
+        appended = []
+    return df
+
+
 # ==========================
 # 🚀 Menu-driven interaction
 # ==========================
@@ -281,12 +457,15 @@ def main():
     df = None
 
     menu = {
-        1: ("Create Data", lambda: generate_data()),
+        1: ("Create Data", lambda: generate_data(file_path)),
         2: ("Load Data", lambda: globals().update(df := load_data(file_path))),
         3: ("Basic Info", lambda: basic_info(df)),
         4: ("Handle Missing Values", lambda: handle_missing_values(df)),
         5: ("All Analysis", lambda: all_analysis(df)),
         6: ("All Visualizations", lambda: all_visualizations(df)),
+        7: ("All Analysis (chunked, large files)", lambda: chunked_analysis(file_path)),
+        8: ("All Analysis (SQL store)", lambda: sql_analysis(file_path)),
+        9: ("Append Data", lambda: append_data(df)),
         0: ("Exit", None),
     }
 
@@ -301,9 +480,14 @@ def main():
             delay(rand(1, 3))
             break
         elif choice in menu:
-            if choice == 2:
+            if choice == 1:
+                df = generate_data(file_path)
+            elif choice == 2:
                 df = load_data(file_path)
+            elif choice == 9:
+                df = append_data(df)
             else:
+                df = collect_appended(df)
                 menu[choice][1]()
         else:
             print("❌ Invalid choice!")
@@ -0,0 +1,34 @@
+import pandas as pd
+from data_generate import countries, city_levels
+
+# Column dtypes applied at parse time (see load_utils.read_typed_csv). The
+# readings have one decimal, so float32 halves their memory and the reports
+# still recover the exact decimals as float64 (load_utils.float64_view); AQI
+# is a whole index value.
+dataset_schema = {
+    "dtypes": {
+        "Record_ID": "key",
+        "Country": "category",
+        "City": "category",
+        "Date": "date",
+        "PM2_5": "float32",
+        "PM10": "float32",
+        "NO2": "float32",
+        "SO2": "float32",
+        "CO": "float32",
+        "O3": "float32",
+        "Temperature_C": "float32",
+        "Humidity": "float32",
+        "Wind_Speed_kmh": "float32",
+        "AQI": "Int16",
+    },
+    "levels": {
+        "Country": countries,
+        "City": list(pd.unique(city_levels)),
+    },
+    "date_format": "%Y-%m-%d",
+    # Row identifier; append_data reports new rows that repeat one.
+    "key": "Record_ID",
+    # Natural query keys, indexed in the SQL store (see sql_utils).
+    "indexes": [["Country", "City", "Date"]],
+}
@@ -0,0 +1,117 @@
+import argparse
+import numpy as np
+import pandas as pd
+from schema import dataset_schema
+from sql_utils import open_sql_store, sql_store_path, write_sql_store
+from stats_utils import as_scalar
+
+# AirQualityAnalysis.all_analysis on the SQL store: every groupby, mean, sum
+# and correlation runs in SQLite and only the aggregated rows reach pandas.
+numeric_cols = [
+    "PM2_5",
+    "PM10",
+    "NO2",
+    "SO2",
+    "CO",
+    "O3",
+    "Temperature_C",
+    "Humidity",
+    "Wind_Speed_kmh",
+    "AQI",
+]
+pollutants = ["PM2_5", "PM10", "NO2", "SO2", "CO", "O3"]
+month = {"Month": "CAST(strftime('%m', Date) AS INTEGER)"}
+
+
+def equal_width_edges(low, high, bins=5):
+    # The edges pd.cut(values, bins) picks for values spanning low..high.
+    return pd.cut(pd.Series([low, high], dtype=np.float64), bins, retbins=True)[1]
+
+
+def sql_report(file_path, columns=None, filters=None, db_path=None):
+    # columns / filters as in load_data; the store is built on first use.
+    store = open_sql_store(file_path, dataset_schema, db_path, filters, columns)
+    try:
+        rows = store.rows()
+        if rows == 0:
+            print("⚠️ No rows match.")
+            return
+        dtypes = store.dtypes
+        stats = store.moments(numeric_cols)
+        missing = store.missing()
+        print("\n--- All Analysis (SQL) ---")
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", store.shape())
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", store.describe(numeric_cols))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. AQI Analysis
+        # ===============================
+        print("\nOverall Average AQI:", stats.series("mean")["AQI"])
+        aqi_by_country = store.group_mean("Country", "AQI").sort_values(ascending=False)
+        print("\nAverage AQI by Country:\n", aqi_by_country.head(10))
+        aqi_by_city = store.group_mean("City", "AQI").sort_values(ascending=False)
+        print("\nAverage AQI by City:\n", aqi_by_city.head(10))
+        aqi_by_month = store.group(month, {"AQI": "AVG(AQI)"})["AQI"].astype("Float64")
+        print("\nAverage AQI by Month:\n", aqi_by_month)
+
+        # ===============================
+        # 3. Pollutant Analysis
+        # ===============================
+        means = stats.series("mean")[numeric_cols[:-3]]
+        print("\nMean Pollutant Concentrations:\n", means.sort_values(ascending=False))
+        maxima = stats.series("max")[numeric_cols[:-3]]
+        print("\nMaximum Recorded Pollutant Levels:\n", maxima.sort_values(ascending=False))
+
+        country_means = store.group("Country", {col: f"AVG({col})" for col in numeric_cols})
+        pollutant_vs_aqi = country_means.drop(columns="AQI").corrwith(country_means["AQI"])
+        print("\nCorrelation of Pollutants with AQI (by Country averages):\n", pollutant_vs_aqi)
+
+        # ===============================
+        # 4. Weather & AQI Relationships
+        # ===============================
+        ranges = dict(zip(numeric_cols, zip(stats.min, stats.max)))
+        for col, label in [("Temperature_C", "Temperature"), ("Humidity", "Humidity"), ("Wind_Speed_kmh", "Wind Speed")]:
+            edges = equal_width_edges(*ranges[col])
+            print(f"\nAQI by {label} Range:\n", store.binned_mean(col, edges, "AQI"))
+
+        # ===============================
+        # 5. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", store.corr(numeric_cols))
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        pm_ratio = store.value("AVG(PM2_5 / NULLIF(PM10, 0))")
+        print("\nAverage PM2.5 to PM10 Ratio:", as_scalar(pm_ratio, dtypes["PM2_5"]))
+
+        # Missing readings count as 0, like DataFrame.sum(axis=1).
+        burden = " + ".join(f"COALESCE({col}, 0)" for col in pollutants)
+        top_burden = store.top(5, burden, "Pollution_Burden", ["Country", "City"])
+        print("\nTop 5 Records with Highest Pollution Burden:\n", top_burden)
+
+        extreme = store.value("AVG(CASE WHEN AQI > 100 THEN 1.0 ELSE 0 END)")
+        print("\nProportion of Extreme AQI Days (>100):", extreme)
+        unhealthy = store.group("Country", {"Unhealthy_Day": "AVG(CASE WHEN AQI > 50 THEN 1.0 ELSE 0 END)"})
+        unhealthy_rate = unhealthy["Unhealthy_Day"].sort_values(ascending=False)
+        print("\nTop 10 Countries by Proportion of Unhealthy Days:\n", unhealthy_rate.head(10))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the SQL store for the air quality data or report from it.")
+    parser.add_argument("command", choices=["ingest", "report"])
+    parser.add_argument("--data", default="Q1_air_quality.csv")
+    parser.add_argument("--db", default=None, help="defaults to .cache/<data>.sqlite next to the CSV")
+    args = parser.parse_args()
+    if args.command == "ingest":
+        print(f"✅ SQL store written to {write_sql_store(args.data, args.db or sql_store_path(args.data), dataset_schema)}")
+    else:
+        sql_report(args.data, db_path=args.db)
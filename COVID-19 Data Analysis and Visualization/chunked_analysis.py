@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+from load_utils import float64_view, iter_typed_csv
+from schema import dataset_schema
+from stats_utils import CoMoments, GroupSums, Moments, ValueCounts, as_scalar
+
+# Out-of-core version of CovidDataAnalysis.all_analysis: RunningReport keeps
+# only mergeable partial aggregates, so the CSV can be streamed through it in
+# chunks and appended rows (CovidDataAnalysis.append_data) cost O(new rows).
+numeric_cols = [
+    "Confirmed_Cases",
+    "Deaths",
+    "Recovered",
+    "Active_Cases",
+    "Tests_Conducted",
+    "Vaccination_Rate",
+    "Hospitalization_Rate",
+    "ICU_Cases",
+]
+series_cols = ["Confirmed_Cases", "Deaths", "Recovered", "Active_Cases"]
+total_cols = [*series_cols, "Tests_Conducted"]
+
+
+def add_derived(chunk):
+    chunk["Death_Rate"] = chunk["Deaths"] / chunk["Confirmed_Cases"].replace(0, np.nan)
+    chunk["Recovery_Rate"] = chunk["Recovered"] / chunk["Confirmed_Cases"].replace(0, np.nan)
+    return chunk
+
+
+def describe(moments, quantiles, dtypes):
+    rows = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    table = {}
+    for i, col in enumerate(moments.columns):
+        q = quantiles.quantile(col, [0.25, 0.5, 0.75])
+        values = [moments.count[i], moments.mean[i], moments.std()[i], moments.min[i], *q, moments.max[i]]
+        dtype = "Float64" if pd.api.types.is_extension_array_dtype(dtypes[col]) else np.float64
+        table[col] = pd.Series(values, index=rows, dtype=dtype)
+    return pd.DataFrame(table)
+
+
+class RunningReport:
+    def __init__(self):
+        self.rows, self.columns, self.dtypes, self.missing = 0, None, None, None
+        self.moments = Moments(numeric_cols)
+        self.rates = Moments(["Death_Rate", "Recovery_Rate"])
+        self.quantiles = ValueCounts(numeric_cols)
+        self.comoments = CoMoments(numeric_cols)
+        self.by_country = GroupSums(["Confirmed_Cases", "Deaths", "Vaccination_Rate", "ICU_Cases", "Hospitalization_Rate"])
+        self.by_date = GroupSums(series_cols)
+        self.by_state = GroupSums(["Confirmed_Cases"])
+        self.totals = dict.fromkeys(total_cols, 0)
+
+    def update(self, chunk):
+        # Columns of the first chunk define the report; later chunks are
+        # projected to them. float32 columns are summarized as float64, like
+        # all_analysis does. The caller's frame is not modified.
+        chunk = float64_view(chunk)
+        if self.columns is None:
+            self.columns, self.dtypes = list(chunk.columns), chunk.dtypes
+        chunk = chunk[self.columns]
+        self.rows += len(chunk)
+        missing = chunk.isna().sum()
+        self.missing = missing if self.missing is None else self.missing + missing
+        for col in total_cols:
+            self.totals[col] += chunk[col].sum()
+        self.moments.update(chunk)
+        self.quantiles.update(chunk)
+        self.comoments.update(chunk)
+        self.rates.update(add_derived(chunk.copy(deep=False)))
+        self.by_country.update(chunk, "Country")
+        self.by_date.update(chunk, "Date")
+        self.by_state.update(chunk, ["Country", "State_Region"])
+        return self
+
+    def print(self, title="chunked"):
+        if self.dtypes is None:
+            print("⚠️ No rows to report.")
+            return
+        rows, dtypes, missing, totals = self.rows, self.dtypes, self.missing, self.totals
+        by_country = self.by_country
+        mean = dict(zip(numeric_cols, self.moments.mean))
+        rate = dict(zip(self.rates.columns, self.rates.mean))
+        print(f"\n--- All Analysis ({title}) ---")
+        print("Dataset Shape:", (rows, len(dtypes)))
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", describe(self.moments, self.quantiles, dtypes))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        country_cases = by_country.sum("Confirmed_Cases", dtypes["Confirmed_Cases"]).sort_values(ascending=False)
+        print("\nTop 10 Countries by Confirmed Cases:\n", country_cases.head(10))
+        country_deaths = by_country.sum("Deaths", dtypes["Deaths"]).sort_values(ascending=False)
+        print("\nTop 10 Countries by Deaths:\n", country_deaths.head(10))
+        country_vax = by_country.mean("Vaccination_Rate", dtypes["Vaccination_Rate"]).sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg Vaccination Rate:\n", country_vax.head(10))
+
+        time_series = pd.DataFrame({col: self.by_date.sum(col, dtypes[col]) for col in series_cols})
+        print("\nOverall Time Series (first 10 rows):\n", time_series.head(10))
+        time_series["Daily_New_Cases"] = time_series["Confirmed_Cases"].diff()
+        print("\nDaily New Cases (first 10 rows):\n", time_series["Daily_New_Cases"].head(10))
+
+        print("\nCorrelation Matrix:\n", self.comoments.corr())
+
+        icu_by_country = by_country.mean("ICU_Cases", dtypes["ICU_Cases"]).sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg ICU Cases:\n", icu_by_country.head(10))
+        hosp_rate = by_country.mean("Hospitalization_Rate", dtypes["Hospitalization_Rate"]).sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg Hospitalization Rate:\n", hosp_rate.head(10))
+        state_cases = self.by_state.sum("Confirmed_Cases", dtypes["Confirmed_Cases"]).sort_values(ascending=False)
+        print("\nTop 10 States/Regions by Confirmed Cases:\n", state_cases.head(10))
+
+        print("\nGlobal Average Death Rate:", rate["Death_Rate"])
+        print("Global Average Recovery Rate:", rate["Recovery_Rate"])
+
+        # Additional Insights
+        print("\n--- Additional Insights ---")
+        print("Total Confirmed Cases:", totals["Confirmed_Cases"])
+        print("Total Deaths:", totals["Deaths"])
+        print("Total Recovered:", totals["Recovered"])
+        print("Total Active Cases:", totals["Active_Cases"])
+        print("Total Tests Conducted:", totals["Tests_Conducted"])
+        print("Average Vaccination Rate:", as_scalar(mean["Vaccination_Rate"], dtypes["Vaccination_Rate"]))
+        print("Average Hospitalization Rate:", as_scalar(mean["Hospitalization_Rate"], dtypes["Hospitalization_Rate"]))
+        print("Average ICU Cases:", as_scalar(mean["ICU_Cases"], dtypes["ICU_Cases"]))
+        print("Average Death Rate:", rate["Death_Rate"])
+        print("Average Recovery Rate:", rate["Recovery_Rate"])
+
+
+def chunked_report(file_path, chunk_size=1_000_000, columns=None, filters=None):
+    # columns / filters as in load_utils.read_typed_csv, applied to every chunk.
+    report = RunningReport()
+    for chunk in iter_typed_csv(file_path, dataset_schema, chunk_size, columns, filters):
+        report.update(chunk)
+    if report.dtypes is None:
+        print("⚠️ Data file is empty.")
+        return
+    report.print()
+    return report
@@ -1,260 +1,319 @@
 import pandas as pd
 import numpy as np
 import random
+from generate_utils import (
+    FrameSink,
+    append_rows,
+    apply_dirty_args,
+    apply_output_args,
+    build_parser,
+    clear_output,
+    csv_output,
+    date_lookup,
+    dirty_config,
+    draw_nested,
+    generate_frame,
+    make_missing,
+    nested_lookup,
+    record_ids,
+    set_missing,
+    write_chunked,
+    write_frame,
+    write_sharded,
+)
 
 file_name = "covid19_global_data.csv"
 
-try:
-    np.random.seed(456)
-    random.seed(456)
+default_rows = 18000
+default_seed = 456
 
-    n_rows = 18000
+countries = [
+    "USA",
+    "India",
+    "Brazil",
+    "UK",
+    "France",
+    "Germany",
+    "Italy",
+    "Spain",
+    "Russia",
+    "China",
+    "Japan",
+    "South Korea",
+    "Canada",
+    "Australia",
+    "Mexico",
+    "South Africa",
+    "Turkey",
+    "Iran",
+]
+
+usa_states = [
+    "California",
+    "Texas",
+    "Florida",
+    "New York",
+    "Illinois",
+    "Pennsylvania",
+    "Ohio",
+    "Georgia",
+    "North Carolina",
+    "Michigan",
+]
+india_states = [
+    "Maharashtra",
+    "Tamil Nadu",
+    "Kerala",
+    "Karnataka",
+    "Andhra Pradesh",
+    "Uttar Pradesh",
+    "Delhi",
+    "West Bengal",
+    "Rajasthan",
+    "Gujarat",
+]
+brazil_states = [
+    "Sao Paulo",
+    "Rio de Janeiro",
+    "Minas Gerais",
+    "Bahia",
+    "Parana",
+    "Rio Grande do Sul",
+    "Pernambuco",
+    "Ceara",
+    "Santa Catarina",
+    "Goias",
+]
+uk_regions = ["England", "Scotland", "Wales", "Northern Ireland"]
+france_regions = [
+    "Ile-de-France",
+    "Auvergne-Rhone-Alpes",
+    "Provence-Alpes-Cote d'Azur",
+    "Hauts-de-France",
+    "Grand Est",
+    "Occitanie",
+    "Pays de la Loire",
+    "Brittany",
+    "Normandy",
+    "Nouvelle-Aquitaine",
+]
+germany_states = [
+    "North Rhine-Westphalia",
+    "Bavaria",
+    "Baden-Wurttemberg",
+    "Lower Saxony",
+    "Hesse",
+    "Saxony",
+    "Rhineland-Palatinate",
+    "Berlin",
+    "Schleswig-Holstein",
+    "Hamburg",
+]
+italy_regions = [
+    "Lombardy",
+    "Lazio",
+    "Campania",
+    "Veneto",
+    "Emilia-Romagna",
+    "Piedmont",
+    "Sicily",
+    "Apulia",
+    "Tuscany",
+    "Calabria",
+]
+spain_regions = [
+    "Madrid",
+    "Catalonia",
+    "Andalusia",
+    "Valencia",
+    "Castile and Leon",
+    "Basque Country",
+    "Castilla-La Mancha",
+    "Galicia",
+    "Aragon",
+    "Murcia",
+]
+russia_regions = [
+    "Moscow",
+    "Saint Petersburg",
+    "Moscow Oblast",
+    "Krasnodar Krai",
+    "Sverdlovsk Oblast",
+    "Rostov Oblast",
+    "Republic of Bashkortostan",
+    "Republic of Tatarstan",
+    "Chelyabinsk Oblast",
+    "Novosibirsk Oblast",
+]
+china_provinces = [
+    "Hubei",
+    "Guangdong",
+    "Henan",
+    "Zhejiang",
+    "Hunan",
+    "Anhui",
+    "Jiangxi",
+    "Jiangsu",
+    "Chongqing",
+    "Sichuan",
+]
+japan_prefectures = [
+    "Tokyo",
+    "Osaka",
+    "Kanagawa",
+    "Aichi",
+    "Saitama",
+    "Chiba",
+    "Hyogo",
+    "Hokkaido",
+    "Fukuoka",
+    "Kyoto",
+]
+sk_provinces = [
+    "Seoul",
+    "Busan",
+    "Incheon",
+    "Daegu",
+    "Daejeon",
+    "Gwangju",
+    "Ulsan",
+    "Gyeonggi",
+    "Gangwon",
+    "Chungcheong",
+]
+canada_provinces = [
+    "Ontario",
+    "Quebec",
+    "British Columbia",
+    "Alberta",
+    "Manitoba",
+    "Saskatchewan",
+    "Nova Scotia",
+    "New Brunswick",
+    "Newfoundland and Labrador",
+    "Prince Edward Island",
+]
+australia_states = [
+    "New South Wales",
+    "Victoria",
+    "Queensland",
+    "Western Australia",
+    "South Australia",
+    "Tasmania",
+    "Australian Capital Territory",
+    "Northern Territory",
+]
+mexico_states = [
+    "Mexico City",
+    "State of Mexico",
+    "Jalisco",
+    "Nuevo Leon",
+    "Guanajuato",
+    "Puebla",
+    "Veracruz",
+    "Baja California",
+    "Chihuahua",
+    "Sonora",
+]
+sa_provinces = [
+    "Gauteng",
+    "Western Cape",
+    "KwaZulu-Natal",
+    "Eastern Cape",
+    "Free State",
+    "Mpumalanga",
+    "North West",
+    "Limpopo",
+    "Northern Cape",
+]
+turkey_provinces = [
+    "Istanbul",
+    "Ankara",
+    "Izmir",
+    "Bursa",
+    "Antalya",
+    "Konya",
+    "Adana",
+    "Gaziantep",
+    "Kocaeli",
+    "Mersin",
+]
+iran_provinces = [
+    "Tehran",
+    "Isfahan",
+    "Razavi Khorasan",
+    "Fars",
+    "East Azerbaijan",
+    "Mazandaran",
+    "Alborz",
+    "Kerman",
+    "Gilan",
+    "Golestan",
+]
+
+country_states = {
+    "USA": usa_states,
+    "India": india_states,
+    "Brazil": brazil_states,
+    "UK": uk_regions,
+    "France": france_regions,
+    "Germany": germany_states,
+    "Italy": italy_regions,
+    "Spain": spain_regions,
+    "Russia": russia_regions,
+    "China": china_provinces,
+    "Japan": japan_prefectures,
+    "South Korea": sk_provinces,
+    "Canada": canada_provinces,
+    "Australia": australia_states,
+    "Mexico": mexico_states,
+    "South Africa": sa_provinces,
+    "Turkey": turkey_provinces,
+    "Iran": iran_provinces,
+}
+
+numeric_columns = [
+    "Confirmed_Cases",
+    "Deaths",
+    "Recovered",
+    "Active_Cases",
+    "Tests_Conducted",
+    "Vaccination_Rate",
+    "Hospitalization_Rate",
+    "ICU_Cases",
+]
+
+# Duplicate / missing-value rates of the original script, per generated row.
+duplicate_rate = (100 / default_rows, 200 / default_rows)
+missing_rate = (1000 / default_rows, 3000 / default_rows)
+dirty_data = dirty_config(numeric_columns, duplicate_rate, missing_rate)
+
+# Natural partition key for --partition (see generate_utils.output_config).
+partition_by = ("Country", None)
+
+# ===============================
+# Lookup arrays (index-coded countries, regions and dates)
+# ===============================
+country_levels = np.array(countries)
+state_levels, state_codes, state_offsets, state_counts = nested_lookup(country_states)
+date_levels = date_lookup([2020, 2021, 2022, 2023], range(1, 13))
+
+# Panel mode: one row per region and day, regions in country order.
+panel_start = "2020-01-22"
+panel_days = 4 * 365
+panel_waves = 4
+base_countries = np.repeat(np.arange(len(countries)), state_counts)
+base_states = np.array([state for states in country_states.values() for state in states])
+
+
+# ===============================
+# Original generator (exact covid19_global_data.csv for seed 456)
+# ===============================
+def generate_legacy(n_rows=default_rows, seed=default_seed):
+    np.random.seed(seed)
+    random.seed(seed)
 
     record_ids = [f"COVID_{str(i).zfill(6)}" for i in range(1, n_rows + 1)]
-    countries = [
-        "USA",
-        "India",
-        "Brazil",
-        "UK",
-        "France",
-        "Germany",
-        "Italy",
-        "Spain",
-        "Russia",
-        "China",
-        "Japan",
-        "South Korea",
-        "Canada",
-        "Australia",
-        "Mexico",
-        "South Africa",
-        "Turkey",
-        "Iran",
-    ]
-
-    usa_states = [
-        "California",
-        "Texas",
-        "Florida",
-        "New York",
-        "Illinois",
-        "Pennsylvania",
-        "Ohio",
-        "Georgia",
-        "North Carolina",
-        "Michigan",
-    ]
-    india_states = [
-        "Maharashtra",
-        "Tamil Nadu",
-        "Kerala",
-        "Karnataka",
-        "Andhra Pradesh",
-        "Uttar Pradesh",
-        "Delhi",
-        "West Bengal",
-        "Rajasthan",
-        "Gujarat",
-    ]
-    brazil_states = [
-        "Sao Paulo",
-        "Rio de Janeiro",
-        "Minas Gerais",
-        "Bahia",
-        "Parana",
-        "Rio Grande do Sul",
-        "Pernambuco",
-        "Ceara",
-        "Santa Catarina",
-        "Goias",
-    ]
-    uk_regions = ["England", "Scotland", "Wales", "Northern Ireland"]
-    france_regions = [
-        "Ile-de-France",
-        "Auvergne-Rhone-Alpes",
-        "Provence-Alpes-Cote d'Azur",
-        "Hauts-de-France",
-        "Grand Est",
-        "Occitanie",
-        "Pays de la Loire",
-        "Brittany",
-        "Normandy",
-        "Nouvelle-Aquitaine",
-    ]
-    germany_states = [
-        "North Rhine-Westphalia",
-        "Bavaria",
-        "Baden-Wurttemberg",
-        "Lower Saxony",
-        "Hesse",
-        "Saxony",
-        "Rhineland-Palatinate",
-        "Berlin",
-        "Schleswig-Holstein",
-        "Hamburg",
-    ]
-    italy_regions = [
-        "Lombardy",
-        "Lazio",
-        "Campania",
-        "Veneto",
-        "Emilia-Romagna",
-        "Piedmont",
-        "Sicily",
-        "Apulia",
-        "Tuscany",
-        "Calabria",
-    ]
-    spain_regions = [
-        "Madrid",
-        "Catalonia",
-        "Andalusia",
-        "Valencia",
-        "Castile and Leon",
-        "Basque Country",
-        "Castilla-La Mancha",
-        "Galicia",
-        "Aragon",
-        "Murcia",
-    ]
-    russia_regions = [
-        "Moscow",
-        "Saint Petersburg",
-        "Moscow Oblast",
-        "Krasnodar Krai",
-        "Sverdlovsk Oblast",
-        "Rostov Oblast",
-        "Republic of Bashkortostan",
-        "Republic of Tatarstan",
-        "Chelyabinsk Oblast",
-        "Novosibirsk Oblast",
-    ]
-    china_provinces = [
-        "Hubei",
-        "Guangdong",
-        "Henan",
-        "Zhejiang",
-        "Hunan",
-        "Anhui",
-        "Jiangxi",
-        "Jiangsu",
-        "Chongqing",
-        "Sichuan",
-    ]
-    japan_prefectures = [
-        "Tokyo",
-        "Osaka",
-        "Kanagawa",
-        "Aichi",
-        "Saitama",
-        "Chiba",
-        "Hyogo",
-        "Hokkaido",
-        "Fukuoka",
-        "Kyoto",
-    ]
-    sk_provinces = [
-        "Seoul",
-        "Busan",
-        "Incheon",
-        "Daegu",
-        "Daejeon",
-        "Gwangju",
-        "Ulsan",
-        "Gyeonggi",
-        "Gangwon",
-        "Chungcheong",
-    ]
-    canada_provinces = [
-        "Ontario",
-        "Quebec",
-        "British Columbia",
-        "Alberta",
-        "Manitoba",
-        "Saskatchewan",
-        "Nova Scotia",
-        "New Brunswick",
-        "Newfoundland and Labrador",
-        "Prince Edward Island",
-    ]
-    australia_states = [
-        "New South Wales",
-        "Victoria",
-        "Queensland",
-        "Western Australia",
-        "South Australia",
-        "Tasmania",
-        "Australian Capital Territory",
-        "Northern Territory",
-    ]
-    mexico_states = [
-        "Mexico City",
-        "State of Mexico",
-        "Jalisco",
-        "Nuevo Leon",
-        "Guanajuato",
-        "Puebla",
-        "Veracruz",
-        "Baja California",
-        "Chihuahua",
-        "Sonora",
-    ]
-    sa_provinces = [
-        "Gauteng",
-        "Western Cape",
-        "KwaZulu-Natal",
-        "Eastern Cape",
-        "Free State",
-        "Mpumalanga",
-        "North West",
-        "Limpopo",
-        "Northern Cape",
-    ]
-    turkey_provinces = [
-        "Istanbul",
-        "Ankara",
-        "Izmir",
-        "Bursa",
-        "Antalya",
-        "Konya",
-        "Adana",
-        "Gaziantep",
-        "Kocaeli",
-        "Mersin",
-    ]
-    iran_provinces = [
-        "Tehran",
-        "Isfahan",
-        "Razavi Khorasan",
-        "Fars",
-        "East Azerbaijan",
-        "Mazandaran",
-        "Alborz",
-        "Kerman",
-        "Gilan",
-        "Golestan",
-    ]
-
-    country_states = {
-        "USA": usa_states,
-        "India": india_states,
-        "Brazil": brazil_states,
-        "UK": uk_regions,
-        "France": france_regions,
-        "Germany": germany_states,
-        "Italy": italy_regions,
-        "Spain": spain_regions,
-        "Russia": russia_regions,
-        "China": china_provinces,
-        "Japan": japan_prefectures,
-        "South Korea": sk_provinces,
-        "Canada": canada_provinces,
-        "Australia": australia_states,
-        "Mexico": mexico_states,
-        "South Africa": sa_provinces,
-        "Turkey": turkey_provinces,
-        "Iran": iran_provinces,
-    }
 
     selected_countries = []
     selected_states = []
@@ -316,30 +375,300 @@ try:
 
     duplicate_count = random.randint(100, 200)
     duplicate_indices = random.sample(range(n_rows), duplicate_count)
-    duplicates = df.iloc[duplicate_indices].copy()
-    df = pd.concat([df, duplicates], ignore_index=True)
-
-    numeric_columns = [
-        "Confirmed_Cases",
-        "Deaths",
-        "Recovered",
-        "Active_Cases",
-        "Tests_Conducted",
-        "Vaccination_Rate",
-        "Hospitalization_Rate",
-        "ICU_Cases",
-    ]
+    df = append_rows(df, duplicate_indices)
+
     empty_count = random.randint(1000, 3000)
     empty_indices = random.sample(range(len(df)), empty_count)
-    for idx in empty_indices:
-        col = random.choice(numeric_columns)
-        df.at[idx, col] = np.nan
-
-    df = df.sample(frac=1, random_state=456).reset_index(drop=True)
-except BaseException as e:
-    print(f"An error occurred: {e}")
-else:
-    df.to_csv(file_name, index=False)
-    print(f"Dataset '{file_name}' generated with {len(df)} records.")
-finally:
-    print("Data generation process completed.")
+    empty_columns = [random.choice(numeric_columns) for _ in empty_indices]
+    df = set_missing(df, empty_indices, empty_columns)
+
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df
+
+
+# ===============================
+# Vectorized generator
+# ===============================
+def generate_chunk(rng, start, n_rows):
+    country_idx = rng.integers(0, len(countries), n_rows).astype(np.int8)
+    state_idx = draw_nested(rng, country_idx, state_codes, state_offsets, state_counts)
+    date_idx = rng.integers(0, len(date_levels), n_rows)
+
+    confirmed_cases = np.clip(rng.poisson(500, n_rows), 0, 10000)
+    deaths = np.clip(np.round(confirmed_cases * rng.uniform(0.01, 0.15, n_rows)), 0, 2000)
+    recovered = np.round(confirmed_cases * rng.uniform(0.6, 0.95, n_rows))
+    recovered = np.clip(recovered, 0, confirmed_cases)
+    active_cases = np.clip(confirmed_cases - deaths - recovered, 0, confirmed_cases)
+    tests_conducted = np.clip(rng.poisson(2000, n_rows), confirmed_cases, 50000)
+    vaccination_rate = np.round(rng.uniform(10, 95, n_rows), 1)
+    hospitalization_rate = np.round(rng.uniform(2, 20, n_rows), 1)
+    icu_cases = np.clip(np.round(active_cases * hospitalization_rate * 0.1 / 100), 0, 500)
+
+    return pd.DataFrame(
+        {
+            "Record_ID": record_ids("COVID_", start, n_rows),
+            "Country": pd.Categorical.from_codes(country_idx, country_levels),
+            "State_Region": pd.Categorical.from_codes(state_idx, state_levels),
+            "Date": pd.Categorical.from_codes(date_idx, date_levels),
+            "Confirmed_Cases": confirmed_cases,
+            "Deaths": deaths,
+            "Recovered": recovered,
+            "Active_Cases": active_cases,
+            "Tests_Conducted": tests_conducted,
+            "Vaccination_Rate": vaccination_rate,
+            "Hospitalization_Rate": hospitalization_rate,
+            "ICU_Cases": icu_cases,
+        }
+    )
+
+
+def generate_fast(n_rows=default_rows, seed=default_seed, dirty=dirty_data):
+    return generate_frame(generate_chunk, n_rows, seed, dirty)
+
+
+def write_streaming(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    chunk_size=1_000_000,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_chunked(
+        generate_chunk, file_name, n_rows, seed, chunk_size, dirty, output=output
+    )
+
+
+def write_parallel(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    workers=4,
+    chunk_size=1_000_000,
+    merge=True,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_sharded(
+        generate_chunk,
+        file_name,
+        n_rows,
+        seed,
+        workers,
+        chunk_size,
+        dirty,
+        merge,
+        output=output,
+    )
+
+
+# ===============================
+# Panel generator (dense Country x State_Region x day time series)
+# ===============================
+def panel_regions(n_regions):
+    # The real country/state pairs first; further regions repeat them with
+    # a numeric suffix ("Texas 2", ...), so any region count is possible.
+    base = np.arange(n_regions) % len(base_states)
+    copy = np.arange(n_regions) // len(base_states)
+    names = base_states[base].astype(object)
+    names[copy > 0] = names[copy > 0] + " " + (copy[copy > 0] + 1).astype(str)
+    return base_countries[base], names
+
+
+def generate_panel_block(rng, first_region, n_regions, days, start=panel_start):
+    # Daily counts come from a (region x day) intensity built from a few
+    # Gaussian waves per region; cumulative columns are cumsums along the
+    # day axis, so every region's series is a monotone epidemic curve.
+    day = np.arange(days, dtype=np.float64)
+    scale = rng.lognormal(4, 1, n_regions)
+    centers = rng.uniform(0, days, (n_regions, panel_waves, 1))
+    widths = rng.uniform(15, 60, (n_regions, panel_waves, 1))
+    heights = scale[:, None, None] * rng.lognormal(0, 0.5, (n_regions, panel_waves, 1))
+    intensity = (heights * np.exp(-0.5 * ((day - centers) / widths) ** 2)).sum(axis=1)
+
+    new_cases = rng.poisson(intensity)
+    new_deaths = rng.binomial(new_cases, rng.uniform(0.005, 0.03, (n_regions, 1)))
+    new_recovered = np.zeros_like(new_cases)
+    lag = min(14, days)
+    new_recovered[:, lag:] = (new_cases - new_deaths)[:, : days - lag]
+    new_tests = rng.poisson(
+        new_cases * rng.uniform(5, 20, (n_regions, 1)) + rng.uniform(50, 500, (n_regions, 1))
+    )
+
+    confirmed_cases = np.cumsum(new_cases, axis=1)
+    deaths = np.cumsum(new_deaths, axis=1)
+    recovered = np.cumsum(new_recovered, axis=1)
+    active_cases = confirmed_cases - deaths - recovered
+    tests_conducted = np.cumsum(new_tests, axis=1)
+
+    # Vaccination follows a logistic ramp from mid-December 2020 up to a
+    # per-region plateau; hospitalization jitters around a regional level.
+    dates = pd.date_range(start, periods=days)
+    rollout = (dates - pd.Timestamp("2020-12-15")).days.to_numpy(dtype=np.float64)
+    plateau = rng.uniform(10, 95, (n_regions, 1))
+    speed = rng.uniform(20, 60, (n_regions, 1))
+    vaccination_rate = np.round(plateau / (1 + np.exp(-(rollout - 3 * speed) / speed)), 1)
+    hospitalization_rate = rng.uniform(2, 20, (n_regions, 1)) + rng.normal(0, 0.5, (n_regions, days))
+    hospitalization_rate = np.round(np.clip(hospitalization_rate, 0.1, 100), 1)
+    icu_cases = np.round(active_cases * hospitalization_rate * 0.1 / 100)
+
+    country_idx, state_names = panel_regions(first_region + n_regions)
+    country_idx = country_idx[first_region:]
+    state_names = state_names[first_region:]
+    n_rows = n_regions * days
+    return pd.DataFrame(
+        {
+            "Record_ID": record_ids("COVID_", first_region * days, n_rows),
+            "Country": pd.Categorical.from_codes(np.repeat(country_idx, days), country_levels),
+            "State_Region": pd.Categorical.from_codes(
+                np.repeat(np.arange(n_regions), days), state_names
+            ),
+            "Date": pd.Categorical.from_codes(
+                np.tile(np.arange(days), n_regions), dates.strftime("%Y-%m-%d")
+            ),
+            "Confirmed_Cases": confirmed_cases.ravel(),
+            "Deaths": deaths.ravel(),
+            "Recovered": recovered.ravel(),
+            "Active_Cases": active_cases.ravel(),
+            "Tests_Conducted": tests_conducted.ravel(),
+            "Vaccination_Rate": vaccination_rate.ravel(),
+            "Hospitalization_Rate": hospitalization_rate.ravel(),
+            "ICU_Cases": icu_cases.ravel(),
+        }
+    )
+
+
+def panel_blocks(rng, n_regions, days, chunk_size, dirty, start=panel_start):
+    # Yields the panel in blocks of whole regions (about chunk_size rows).
+    # Only missing values are injected: duplicates and shuffling would
+    # break the (region, date) order.
+    step = max(chunk_size // days, 1)
+    for first in range(0, n_regions, step):
+        block = generate_panel_block(rng, first, min(step, n_regions - first), days, start)
+        yield make_missing(block, rng, dirty)
+
+
+def generate_panel(
+    n_regions=len(base_states),
+    days=panel_days,
+    seed=default_seed,
+    dirty=dirty_data,
+    start=panel_start,
+    chunk_size=1_000_000,
+):
+    rng = np.random.default_rng(seed)
+    return pd.concat(
+        panel_blocks(rng, n_regions, days, chunk_size, dirty, start), ignore_index=True
+    )
+
+
+def write_panel(
+    file_name,
+    n_regions=len(base_states),
+    days=panel_days,
+    seed=default_seed,
+    chunk_size=1_000_000,
+    dirty=dirty_data,
+    start=panel_start,
+    output=csv_output,
+):
+    rng = np.random.default_rng(seed)
+    written = 0
+    clear_output(file_name, output)
+    sink = FrameSink(file_name, output)
+    try:
+        for block in panel_blocks(rng, n_regions, days, chunk_size, dirty, start):
+            sink.write(block)
+            written += len(block)
+    finally:
+        sink.close()
+    return written
+
+
+# ===============================
+# In-process API
+# ===============================
+def generate(
+    n_rows=default_rows,
+    seed=default_seed,
+    fast=False,
+    dirty=dirty_data,
+    output=None,
+    output_format=csv_output,
+):
+    # Returns the dataset as a DataFrame (the exact bundled dataset by
+    # default) and optionally also writes it to `output` (CSV unless
+    # output_format says otherwise).
+    if fast:
+        df = generate_fast(n_rows, seed, dirty)
+    else:
+        df = generate_legacy(n_rows, seed)
+    if output is not None:
+        write_frame(df, output, output_format)
+    return df
+
+
+def main():
+    parser = build_parser(
+        "Generate the synthetic COVID-19 dataset.", file_name, default_rows, default_seed
+    )
+    parser.add_argument(
+        "--panel",
+        action="store_true",
+        help="write a sorted region x day panel with cumulative counts (ignores --rows)",
+    )
+    parser.add_argument("--regions", type=int, default=len(base_states))
+    parser.add_argument("--days", type=int, default=panel_days)
+    parser.add_argument("--start", default=panel_start, help="first panel date")
+    args = parser.parse_args()
+    if args.panel and args.workers:
+        parser.error("--panel is written by a single process, drop --workers")
+
+    sample = generate_chunk(np.random.default_rng(0), 0, 1)
+    legacy = not (args.fast or args.chunked or args.workers or args.panel)
+    dirty = apply_dirty_args(dirty_data, args, parser, sample, legacy)
+    output = apply_output_args(args, partition_by)
+    df = None
+    try:
+        if args.panel:
+            write_panel(
+                args.output,
+                args.regions,
+                args.days,
+                args.seed,
+                args.chunk_size,
+                dirty,
+                args.start,
+                output,
+            )
+        elif args.workers:
+            write_parallel(
+                args.output,
+                args.rows,
+                args.seed,
+                args.workers,
+                args.chunk_size,
+                not args.parts,
+                dirty,
+                output=output,
+            )
+        elif args.chunked:
+            write_streaming(
+                args.output, args.rows, args.seed, args.chunk_size, dirty, output=output
+            )
+        else:
+            df = generate(args.rows, args.seed, args.fast, dirty)
+    except BaseException as e:
+        print(f"An error occurred: {e}")
+    else:
+        if df is not None:
+            write_frame(df, args.output, output)
+            print(f"Dataset '{args.output}' generated with {len(df)} records.")
+        else:
+            print(f"Dataset '{args.output}' generated.")
+    finally:
+        print("Data generation process completed.")
+
+
+if __name__ == "__main__":
+    main()
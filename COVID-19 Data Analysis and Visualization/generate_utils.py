@@ -0,0 +1,559 @@
+import argparse
+import os
+import pickle
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Upper bound on open bucket files during the streaming shuffle.
+max_buckets = 512
+
+
+# ===============================
+# Lookup helpers for vectorized generation
+# ===============================
+def record_ids(prefix, start, n_rows):
+    return np.char.mod(f"{prefix}%06d", np.arange(start + 1, start + n_rows + 1))
+
+
+def nested_lookup(mapping):
+    # Flattens {outer: [inner, ...]} into unique inner levels plus, per outer
+    # index, the offset/count of its slice in the flattened code table.
+    inner = [value for values in mapping.values() for value in values]
+    levels = np.array(sorted(set(inner)))
+    codes = np.searchsorted(levels, inner)
+    counts = np.array([len(values) for values in mapping.values()])
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    return levels, codes, offsets, counts
+
+
+def draw_nested(rng, outer_idx, codes, offsets, counts):
+    # Uniform inner choice within each row's outer group (same as
+    # random.choice(mapping[outer]) per row).
+    inner_idx = (rng.random(len(outer_idx)) * counts[outer_idx]).astype(np.int64)
+    return codes[offsets[outer_idx] + inner_idx]
+
+
+def joined_levels(left, right, sep=""):
+    # Every left[i] + sep + right[j] as one flat array; the value for the
+    # code pair (i, j) sits at i * len(right) + j.
+    left = np.asarray(left).astype(str)
+    right = np.asarray(right).astype(str)
+    return np.char.add(np.char.add(left[:, None], sep), right[None, :]).ravel()
+
+
+def date_lookup(years, months, days=28):
+    return np.array(
+        [f"{y}-{m:02d}-{d:02d}" for y in years for m in months for d in range(1, days + 1)]
+    )
+
+
+# ===============================
+# Dirty data engine (duplicates, near-duplicates, missing values)
+# ===============================
+def dirty_config(
+    numeric_columns,
+    duplicate_rate,
+    missing_rate,
+    near_duplicate_rate=0.0,
+    column_rates=None,
+    mnar=None,
+    jitter=0.01,
+):
+    # duplicate_rate / missing_rate are (low, high) shares of rows, drawn once
+    # per frame or chunk like the original randint(...) counts; column_rates
+    # adds an independent per-column missing rate and mnar maps a column to a
+    # strength that makes high (> 0) or low (< 0) values more likely to go
+    # missing.
+    return {
+        "numeric_columns": list(numeric_columns),
+        "duplicate_rate": duplicate_rate,
+        "missing_rate": missing_rate,
+        "near_duplicate_rate": near_duplicate_rate,
+        "column_rates": dict(column_rates or {}),
+        "mnar": dict(mnar or {}),
+        "jitter": jitter,
+    }
+
+
+def append_rows(df, rows):
+    # Index-gather replacement for pd.concat([df, df.iloc[rows]]).
+    positions = np.concatenate([np.arange(len(df)), np.asarray(rows, dtype=np.int64)])
+    return df.take(positions).reset_index(drop=True)
+
+
+def set_missing(df, rows, columns):
+    # Sets df[columns[i]] at row position rows[i] to NaN, one boolean mask
+    # per column instead of a df.at call per cell.
+    rows = np.asarray(rows, dtype=np.int64)
+    columns = np.asarray(columns, dtype=object)
+    for col in pd.unique(columns):
+        mask = np.zeros(len(df), dtype=bool)
+        mask[rows[columns == col]] = True
+        df[col] = df[col].mask(mask)
+    return df
+
+
+def inject_duplicates(df, rng, rate, near_rate=0.0, near_columns=(), jitter=0.01, decimals=2):
+    # Exact duplicates and near-duplicates (numeric columns perturbed by a
+    # relative N(0, jitter) noise) are appended by one gather, which also
+    # applies the shuffle.
+    n_rows = len(df)
+    duplicate_count = min(int(round(n_rows * rng.uniform(*rate))), n_rows)
+    near_count = min(int(round(n_rows * near_rate)), n_rows)
+    duplicates = rng.choice(n_rows, duplicate_count, replace=False)
+    near = rng.choice(n_rows, near_count, replace=False)
+    rows = np.concatenate([np.arange(n_rows), duplicates, near])
+    order = rng.permutation(len(rows))
+    df = df.take(rows[order]).reset_index(drop=True)
+
+    if near_count:
+        is_near = order >= n_rows + duplicate_count
+        for col in near_columns:
+            values = df[col].to_numpy(dtype=np.float64, copy=True)
+            noisy = values[is_near] * (1 + rng.normal(0, jitter, is_near.sum()))
+            if np.issubdtype(df[col].dtype, np.integer):
+                values[is_near] = np.round(noisy)
+            else:
+                values[is_near] = np.round(noisy, decimals)
+            df[col] = values.astype(df[col].dtype, copy=False)
+    return df
+
+
+def add_missing(df, rng, columns, rate):
+    # One random column blanked in a (low, high) share of rows, as in the
+    # original scripts.
+    empty_count = min(int(round(len(df) * rng.uniform(*rate))), len(df))
+    empty_indices = rng.choice(len(df), empty_count, replace=False)
+    empty_columns = np.asarray(columns, dtype=object)[
+        rng.integers(0, len(columns), empty_count)
+    ]
+    return set_missing(df, empty_indices, empty_columns)
+
+
+def inject_missing(df, rng, rates, mnar=None):
+    # Independent per-column missingness with boolean masks. MCAR columns use
+    # a constant probability; MNAR columns scale it by a logistic function of
+    # the standardized value, keeping the average rate unchanged.
+    mnar = mnar or {}
+    for col, rate in rates.items():
+        values = df[col].to_numpy(dtype=np.float64, copy=True)
+        if col in mnar:
+            z = (values - np.nanmean(values)) / (np.nanstd(values) or 1.0)
+            weight = 1 / (1 + np.exp(-mnar[col] * np.nan_to_num(z)))
+            probability = np.clip(rate * weight / weight.mean(), 0, 1)
+        else:
+            probability = rate
+        values[rng.random(len(values)) < probability] = np.nan
+        df[col] = values
+    return df
+
+
+def make_dirty(df, rng, config):
+    df = inject_duplicates(
+        df,
+        rng,
+        config["duplicate_rate"],
+        config["near_duplicate_rate"],
+        config["numeric_columns"],
+        config["jitter"],
+    )
+    return make_missing(df, rng, config)
+
+
+def make_missing(df, rng, config):
+    # Missing-value part of make_dirty; leaves the row order untouched.
+    # Columns that can go missing are always float64, so every chunk (and
+    # every partition of it) has the same schema.
+    df = add_missing(df, rng, config["numeric_columns"], config["missing_rate"])
+    if config["column_rates"]:
+        df = inject_missing(df, rng, config["column_rates"], config["mnar"])
+    for col in [*config["numeric_columns"], *config["column_rates"]]:
+        if df[col].dtype != np.float64:
+            df[col] = df[col].astype(np.float64)
+    return df
+
+
+def generate_frame(make_chunk, n_rows, seed, dirty):
+    rng = np.random.default_rng(seed)
+    df = make_chunk(rng, 0, n_rows)
+    return make_dirty(df, rng, dirty)
+
+
+# ===============================
+# Output formats (CSV, Parquet, Feather) and partitioning
+# ===============================
+extensions = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+
+def output_config(fmt="csv", partition=None, row_group_size=1_000_000):
+    # partition is (column, None) to split by the column's values or
+    # (column, "month") to split by the YYYY-MM prefix of a date column.
+    if fmt not in extensions:
+        raise ValueError(f"Unknown output format: {fmt}")
+    return {"format": fmt, "partition": partition, "row_group_size": row_group_size}
+
+
+csv_output = output_config()
+
+
+def import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet/Feather output needs pyarrow (pip install pyarrow)")
+    return pyarrow
+
+
+def as_categories(df, max_ratio=0.5):
+    # Low-cardinality string columns become categoricals, which pyarrow
+    # writes as dictionary-encoded columns.
+    df = df.copy(deep=False)
+    for col in df.columns:
+        if pd.api.types.is_string_dtype(df[col]) and not isinstance(
+            df[col].dtype, pd.CategoricalDtype
+        ):
+            if df[col].nunique() <= max_ratio * len(df):
+                df[col] = df[col].astype("category")
+    return df
+
+
+def partition_keys(df, partition):
+    column, by = partition
+    values = df[column]
+    if by == "month":
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            months = values.cat.categories.astype(str).str[:7].to_numpy()
+            return f"{column}_Month", months[values.cat.codes.to_numpy()]
+        return f"{column}_Month", values.astype(str).str[:7].to_numpy()
+    return column, values.to_numpy()
+
+
+class FrameSink:
+    # Appends DataFrames to one output: a single file, or a hive-style
+    # directory (<key>=<value>/part-NNNNN.<ext>) when partitioned. `part`
+    # numbers the files written by one shard of a sharded run.
+    def __init__(self, file_name, output=csv_output, part=None):
+        self.file_name = file_name
+        self.output = output
+        self.part = part
+        self.writers = {}
+        self.schemas = {}
+        if output["format"] != "csv":
+            self.pa = import_pyarrow()
+
+    def path(self, key=None):
+        ext = extensions[self.output["format"]]
+        name = f"part-{self.part or 0:05d}{ext}"
+        if key is not None:
+            folder = os.path.join(self.file_name, key)
+        elif self.part is not None:
+            folder = self.file_name
+        else:
+            return self.file_name
+        os.makedirs(folder, exist_ok=True)
+        return os.path.join(folder, name)
+
+    def write(self, df):
+        if self.output["partition"] is None:
+            self.write_piece(None, df)
+            return
+        name, keys = partition_keys(df, self.output["partition"])
+        if self.output["partition"][1] is None:
+            df = df.drop(columns=name)
+        codes, values = pd.factorize(keys)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        for i, value in enumerate(values):
+            self.write_piece(f"{name}={value}", df.take(order[bounds[i] : bounds[i + 1]]))
+
+    def write_piece(self, key, df):
+        fmt = self.output["format"]
+        if fmt == "csv":
+            header = key not in self.writers
+            if header:
+                self.writers[key] = open(self.path(key), "w", newline="")
+            df.to_csv(self.writers[key], header=header, index=False)
+            return
+
+        pa = self.pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if key not in self.writers:
+            self.schemas[key] = table.schema
+            if fmt == "parquet":
+                self.writers[key] = pa.parquet.ParquetWriter(self.path(key), table.schema)
+            else:
+                options = pa.ipc.IpcWriteOptions(compression="lz4")
+                self.writers[key] = pa.ipc.new_file(self.path(key), table.schema, options=options)
+        elif not table.schema.equals(self.schemas[key]):
+            table = table.cast(self.schemas[key])
+        if fmt == "parquet":
+            self.writers[key].write_table(table, row_group_size=self.output["row_group_size"])
+        else:
+            self.writers[key].write_table(table, max_chunksize=self.output["row_group_size"])
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+
+def clear_output(file_name, output):
+    # Partitioned outputs are directories; drop files of an earlier run.
+    if output["partition"] is not None and os.path.isdir(file_name):
+        shutil.rmtree(file_name)
+
+
+def write_frame(df, file_name, output=csv_output):
+    if output["format"] == "csv" and output["partition"] is None:
+        df.to_csv(file_name, index=False)
+        return len(df)
+    clear_output(file_name, output)
+    sink = FrameSink(file_name, output)
+    try:
+        sink.write(as_categories(df))
+    finally:
+        sink.close()
+    return len(df)
+
+
+# ===============================
+# Streaming (constant-memory) writer
+# ===============================
+def write_chunked(
+    make_chunk,
+    file_name,
+    n_rows,
+    seed,
+    chunk_size,
+    dirty,
+    first_row=0,
+    output=csv_output,
+    part=None,
+):
+    # Pass 1 generates and dirties one chunk at a time and scatters its rows
+    # into random bucket files; pass 2 shuffles each bucket in memory and
+    # appends it to the output. Peak memory is about one chunk, so the row
+    # count is bounded by disk rather than RAM. Duplicates are drawn within
+    # a chunk. `seed` may be an int or a SeedSequence; `first_row` offsets
+    # the record ids and `part` numbers the output files when writing one
+    # shard of a larger dataset.
+    rng = np.random.default_rng(seed)
+    if part is None:
+        clear_output(file_name, output)
+    n_chunks = -(-n_rows // chunk_size)
+    n_buckets = min(max(n_chunks, 1), max_buckets)
+    out_dir = os.path.dirname(os.path.abspath(file_name))
+    written = 0
+
+    with tempfile.TemporaryDirectory(dir=out_dir, prefix=".generate_") as tmp:
+        paths = [os.path.join(tmp, f"bucket_{i:05d}.pkl") for i in range(n_buckets)]
+        handles = [open(path, "wb") for path in paths]
+        try:
+            for start in range(0, n_rows, chunk_size):
+                chunk = make_chunk(rng, first_row + start, min(chunk_size, n_rows - start))
+                chunk = make_dirty(chunk, rng, dirty)
+                bucket = rng.integers(0, n_buckets, len(chunk))
+                order = np.argsort(bucket, kind="stable")
+                bounds = np.searchsorted(bucket[order], np.arange(n_buckets + 1))
+                for i in range(n_buckets):
+                    if bounds[i] < bounds[i + 1]:
+                        piece = chunk.take(order[bounds[i] : bounds[i + 1]])
+                        pickle.dump(piece, handles[i], protocol=pickle.HIGHEST_PROTOCOL)
+                del chunk
+        finally:
+            for handle in handles:
+                handle.close()
+
+        sink = FrameSink(file_name, output, part)
+        try:
+            for path in paths:
+                pieces = []
+                with open(path, "rb") as handle:
+                    while True:
+                        try:
+                            pieces.append(pickle.load(handle))
+                        except EOFError:
+                            break
+                os.remove(path)
+                if not pieces:
+                    continue
+                block = pd.concat(pieces, ignore_index=True)
+                block = block.take(rng.permutation(len(block)))
+                sink.write(block)
+                written += len(block)
+        finally:
+            sink.close()
+    return written
+
+
+# ===============================
+# Sharded (process-parallel) writer
+# ===============================
+def write_sharded(
+    make_chunk,
+    file_name,
+    n_rows,
+    seed,
+    workers,
+    chunk_size,
+    dirty,
+    merge=True,
+    output=csv_output,
+):
+    # Rows are split into `workers` contiguous shards, each with its own
+    # stream from SeedSequence(seed).spawn(workers), and streamed to
+    # part-NNNNN.csv in parallel. The output only depends on (seed, workers,
+    # n_rows, chunk_size), never on scheduling; chunk_size counts because each
+    # shard is written by write_chunked, which draws duplicates, missing
+    # values and the shuffle per chunk. With merge=True the parts are
+    # concatenated in shard order into `file_name`; otherwise `file_name` is
+    # the directory of part files. Parquet/Feather and partitioned outputs
+    # are always such a directory, each shard writing its own part files.
+    seeds = np.random.SeedSequence(seed).spawn(workers)
+    bounds = np.linspace(0, n_rows, workers + 1).astype(np.int64)
+    if output["format"] != "csv" or output["partition"] is not None:
+        clear_output(file_name, output)
+        merge = False
+        targets = [file_name] * workers
+        numbers = list(range(workers))
+    else:
+        part_dir = file_name + ".parts" if merge else file_name
+        os.makedirs(part_dir, exist_ok=True)
+        parts = [os.path.join(part_dir, f"part-{i:05d}.csv") for i in range(workers)]
+        targets = parts
+        numbers = [None] * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                write_chunked,
+                make_chunk,
+                targets[i],
+                int(bounds[i + 1] - bounds[i]),
+                seeds[i],
+                chunk_size,
+                dirty,
+                int(bounds[i]),
+                output,
+                numbers[i],
+            )
+            for i in range(workers)
+        ]
+        written = sum(future.result() for future in futures)
+
+    if merge:
+        with open(file_name, "wb") as out:
+            header_written = False
+            for part in parts:
+                with open(part, "rb") as handle:
+                    header = handle.readline()
+                    if not header:
+                        continue
+                    if not header_written:
+                        out.write(header)
+                        header_written = True
+                    shutil.copyfileobj(handle, out)
+        shutil.rmtree(part_dir)
+    return written
+
+
+# ===============================
+# Command line
+# ===============================
+def build_parser(description, file_name, default_rows, default_seed):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--rows", type=int, default=default_rows, help="number of unique rows")
+    parser.add_argument("--seed", type=int, default=default_seed)
+    parser.add_argument("--output", default=file_name)
+    parser.add_argument("--fast", action="store_true", help="use the vectorized generator")
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="stream fixed-size chunks to the output with bounded memory",
+    )
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="generate N shards in parallel processes (reproducible per seed/workers/rows/chunk-size)",
+    )
+    parser.add_argument(
+        "--parts",
+        action="store_true",
+        help="with --workers, keep a directory of part files instead of merging",
+    )
+    parser.add_argument(
+        "--format",
+        choices=sorted(extensions),
+        default="csv",
+        help="output format; parquet and feather need pyarrow",
+    )
+    parser.add_argument(
+        "--partition",
+        action="store_true",
+        help="write a hive-style directory partitioned by the dataset's natural key",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=1_000_000,
+        help="rows per Parquet row group / Feather record batch",
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        type=float,
+        default=0.0,
+        help="share of rows re-added with slightly perturbed numeric values",
+    )
+    parser.add_argument(
+        "--missing",
+        action="append",
+        default=[],
+        metavar="COLUMN=RATE",
+        help="extra per-column missing rate (repeatable)",
+    )
+    parser.add_argument(
+        "--mnar",
+        action="append",
+        default=[],
+        metavar="COLUMN=STRENGTH",
+        help="make missingness of COLUMN depend on its value (repeatable)",
+    )
+    return parser
+
+
+def apply_output_args(args, partition_by):
+    partition = partition_by if args.partition else None
+    return output_config(args.format, partition, args.row_group_size)
+
+
+def apply_dirty_args(dirty, args, parser, sample, legacy=False):
+    # Overlays --near-duplicates / --missing / --mnar onto a dirty_config().
+    # Column names are checked against the numeric columns of sample, a
+    # generated frame, so a typo stops at the command line. legacy says the
+    # run takes the original generator, which recreates the bundled dataset
+    # and has no dirty options, so giving any of them is an error.
+    given = [flag for flag, value in (("--near-duplicates", args.near_duplicates), ("--missing", args.missing), ("--mnar", args.mnar)) if value]
+    if legacy and given:
+        parser.error(f"{', '.join(given)}: dirty-data options are only used with --fast, --chunked or --workers")
+    dirty = dict(dirty, column_rates=dict(dirty["column_rates"]), mnar=dict(dirty["mnar"]))
+    dirty["near_duplicate_rate"] = args.near_duplicates
+    numeric = [col for col in sample.columns if pd.api.types.is_numeric_dtype(sample[col])]
+    options = (("--missing", args.missing, "column_rates"), ("--mnar", args.mnar, "mnar"))
+    for flag, option, target in options:
+        for item in option:
+            col, _, value = item.partition("=")
+            if col not in numeric:
+                parser.error(f"{flag} {item}: unknown column {col!r} (one of {', '.join(numeric)})")
+            try:
+                dirty[target][col] = float(value)
+            except ValueError:
+                parser.error(f"{flag} {item}: {value!r} is not a number")
+    for col in dirty["mnar"]:
+        dirty["column_rates"].setdefault(col, 0.05)
+    return dirty
@@ -0,0 +1,815 @@
+import glob
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from key_utils import KeyArray, KeyDtype, encode_keys
+
+# A schema maps every column to a dtype: "category", "date", "string" (left
+# as read_csv's default string column), "key" (record ids such as STK_000242,
+# stored as a prefix plus uint32 numbers, see key_utils) or any numpy/pandas
+# dtype name such as "float32" or "Int64". Optional "levels" fix the category order, unknown
+# values found in a file are appended after them.
+
+
+# ===============================
+# Schema helpers
+# ===============================
+def csv_dtypes(schema, columns):
+    dtypes = {}
+    for col in columns:
+        kind = schema["dtypes"].get(col)
+        if kind is not None and kind not in ("date", "string", "key"):
+            dtypes[col] = kind
+    return dtypes
+
+
+def date_columns(schema, columns):
+    return [col for col in columns if schema["dtypes"].get(col) == "date"]
+
+
+def with_levels(values, levels):
+    extra = values.cat.categories.difference(levels)
+    return values.cat.set_categories([*levels, *extra])
+
+
+def apply_levels(df, schema):
+    for col, levels in schema.get("levels", {}).items():
+        if col in df and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = with_levels(df[col], levels)
+    return df
+
+
+def typed_columns(df, schema):
+    # Steps read_csv's dtype= cannot do: dates, category levels and keys.
+    return encode_keys(apply_levels(parse_dates(df, schema), schema), schema)
+
+
+def parse_dates(df, schema):
+    # Unparseable dates become NaT instead of failing the whole load.
+    for col in date_columns(schema, df.columns):
+        df[col] = parse_date_values(df[col], schema.get("date_format"))
+    return df
+
+
+def parse_date_values(values, fmt=None):
+    # A few hundred distinct days repeat over millions of rows: each distinct
+    # value is parsed once and broadcast back through the factorized codes.
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    codes, uniques = pd.factorize(values)
+    parsed = pd.to_datetime(np.asarray(uniques, dtype=object), format=fmt, errors="coerce")
+    return pd.DatetimeIndex(parsed).take(codes, allow_fill=True, fill_value=pd.NaT)
+
+
+# ===============================
+# Calendar features
+# ===============================
+# Derived date columns are computed on the distinct dates and broadcast,
+# then kept on the frame: later analyses and plots reuse the column instead
+# of deriving it again. Missing dates give <NA>.
+calendar_parts = {
+    "Year": (lambda dates: dates.year, "int16"),
+    "Quarter": (lambda dates: dates.quarter, "int8"),
+    "Month": (lambda dates: dates.month, "int8"),
+    "Week": (lambda dates: dates.isocalendar().week.to_numpy(), "int8"),
+    "Day_Of_Week": (lambda dates: dates.dayofweek, "int8"),
+}
+
+
+def add_calendar(df, *names, column="Date"):
+    # add_calendar(df, "Month", "Week") adds the columns that are not there yet.
+    missing = [name for name in names if name not in df.columns]
+    if not missing:
+        return df
+    codes, uniques = pd.factorize(df[column])
+    dates = pd.DatetimeIndex(uniques)
+    for name in missing:
+        part, dtype = calendar_parts[name]
+        values = np.asarray(part(dates), dtype=dtype)
+        if (codes < 0).any():
+            df[name] = pd.array(values, dtype=dtype.capitalize()).take(codes, allow_fill=True)
+        else:
+            df[name] = values[codes]
+    return df
+
+
+def read_typed_csv(file_path, schema, columns=None, filters=None, chunk_size=1_000_000, **kwargs):
+    # Without filters the whole (projected) file is parsed in one go; with
+    # filters it is parsed chunk by chunk and only matching rows are kept.
+    if filters:
+        frames = list(iter_typed_csv(file_path, schema, chunk_size, columns, filters, **kwargs))
+        if frames:
+            return concat_frames(frames, schema)
+        kwargs["nrows"] = 0
+    header = pd.read_csv(file_path, nrows=0).columns
+    usecols = read_columns(header, columns, filters)
+    df = pd.read_csv(file_path, dtype=csv_dtypes(schema, header), usecols=usecols, **kwargs)
+    return project(typed_columns(df, schema), columns)
+
+
+def iter_typed_csv(file_path, schema, chunk_size, columns=None, filters=None, **kwargs):
+    # read_typed_csv one chunk at a time; categoricals share the schema levels.
+    header = pd.read_csv(file_path, nrows=0).columns
+    if columns is not None or filters:
+        kwargs["usecols"] = read_columns(header, columns, filters)
+    reader = pd.read_csv(file_path, dtype=csv_dtypes(schema, header), chunksize=chunk_size, **kwargs)
+    with reader:
+        for chunk in reader:
+            chunk = typed_columns(chunk, schema)
+            yield project(filter_rows(chunk, filters), columns) if filters else chunk
+
+
+def typed_frame(df, schema):
+    # Same dtypes as read_typed_csv for a frame that is already in memory.
+    df = parse_dates(df.copy(), schema).astype(csv_dtypes(schema, df.columns))
+    for col in df.columns:
+        if schema["dtypes"].get(col) in ("string", "key") and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype(df[col].cat.categories.dtype)
+    return encode_keys(apply_levels(df, schema), schema)
+
+
+def exact_float64(values):
+    # float32 values as the float64 of the decimals they were read from. A
+    # float32 holds 7 significant digits, so rounding to 7 digits turns e.g.
+    # 1333.22998046875 back into 1333.23, and stats computed on the result
+    # print like those of a float64 read of the file.
+    x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        digits = np.nan_to_num(6 - np.floor(np.log10(np.abs(x))), posinf=0, neginf=0)
+    scale = 10.0 ** np.abs(digits)
+    x = np.where(digits >= 0, np.round(x * scale) / scale, np.round(x / scale) * scale)
+    return pd.Series(x, index=values.index, name=values.name)
+
+
+def float64_view(df):
+    # df with its float32 columns replaced by exact_float64 copies, for the
+    # printed reports; the other columns are shared, not copied.
+    view = df.copy(deep=False)
+    for col in df.columns:
+        if df[col].dtype == np.float32:
+            view[col] = exact_float64(df[col])
+    return view
+
+
+def fill_missing(values, func):
+    fill = values.mean() if func == "mean" else values.median()
+    if pd.api.types.is_integer_dtype(values) and pd.notna(fill):
+        fill = round(fill)
+    return values.fillna(fill)
+
+
+# ===============================
+# Column projection and row filters
+# ===============================
+# columns lists the columns to materialize (None for all of them). filters
+# maps a column to a (low, high) range, inclusive with None for an open end,
+# or to a list of values to keep, e.g.
+#   {"Date": ("2024-01-01", "2024-06-30"), "Country": ["India", "Japan"]}
+# Both are pushed into the reader: usecols and chunk-wise filtering for CSV,
+# column selection and row-group / partition pruning for Parquet and Feather.
+columnar_formats = {".parquet": "parquet", ".feather": "ipc", ".arrow": "ipc"}
+
+
+def needed_columns(action_columns):
+    # Union of the columns declared by each menu action, in declaration order.
+    return list(dict.fromkeys(col for columns in action_columns.values() for col in columns))
+
+
+def missing_columns(df, columns):
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        print(f"⚠️ Columns not loaded: {', '.join(missing)}. Reload the data with them.")
+    return missing
+
+
+def read_columns(available, columns, filters):
+    # Columns the reader has to produce: the requested ones plus the ones the
+    # filters look at, in file order.
+    if columns is None:
+        return list(available)
+    wanted = {*columns, *(filters or {})}
+    unknown = wanted.difference(available)
+    if unknown:
+        raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+    return [col for col in available if col in wanted]
+
+
+def project(df, columns):
+    # Drops the filter-only columns; a no-op (no copy) when there are none.
+    if columns is None:
+        return df
+    keep = [col for col in df.columns if col in set(columns)]
+    return df if len(keep) == len(df.columns) else df[keep]
+
+
+def filter_bound(values, bound):
+    return pd.Timestamp(bound) if pd.api.types.is_datetime64_any_dtype(values) else bound
+
+
+def filter_rows(df, filters):
+    if not filters:
+        return df
+    keep = np.ones(len(df), dtype=bool)
+    for col, condition in filters.items():
+        values = df[col]
+        if isinstance(condition, tuple):
+            low, high = condition
+            if low is not None:
+                keep &= (values >= filter_bound(values, low)).fillna(False).to_numpy(dtype=bool)
+            if high is not None:
+                keep &= (values <= filter_bound(values, high)).fillna(False).to_numpy(dtype=bool)
+        else:
+            keep &= values.isin(list(condition)).to_numpy(dtype=bool)
+    return df[keep].reset_index(drop=True)
+
+
+def concat_frames(frames, schema):
+    return encode_keys(pd.concat(unify_dtypes(frames, schema), ignore_index=True), schema)
+
+
+def unify_dtypes(frames, schema):
+    # Chunks parsed separately get their own categories; give every frame the
+    # categories one read_csv of the whole file would have (schema levels
+    # first, then the sorted rest) so they concatenate as categoricals. Keys
+    # whose chunks inferred different prefixes or widths go back to strings
+    # and are encoded again once concatenated.
+    for col in frames[0].columns:
+        if isinstance(frames[0][col].dtype, KeyDtype):
+            if any(frame[col].dtype != frames[0][col].dtype for frame in frames):
+                for frame in frames:
+                    frame[col] = frame[col].astype("str")
+            continue
+        if not isinstance(frames[0][col].dtype, pd.CategoricalDtype):
+            continue
+        seen = frames[0][col].cat.categories
+        for frame in frames[1:]:
+            seen = seen.union(frame[col].cat.categories)
+        levels = schema.get("levels", {}).get(col, [])
+        categories = [*levels, *seen.difference(levels)]
+        for frame in frames:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return frames
+
+
+def arrow_filter(arrow_schema, schema, filters):
+    # pyarrow expression for the filters, used to skip row groups and
+    # partitions. It only has to be a superset: filter_rows runs afterwards
+    # on the typed frame. Dates stored as ISO text compare as strings, and a
+    # <column>_Month partition (see generate_utils) is pruned by month.
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    names = set(arrow_schema.names)
+    iso = schema.get("date_format") == "%Y-%m-%d"
+    parts = []
+    for col, condition in (filters or {}).items():
+        if col not in names:
+            continue
+        field = ds.field(col)
+        if not isinstance(condition, tuple):
+            parts.append(field.isin(list(condition)))
+            continue
+        kind = arrow_schema.field(col).type
+        if pa.types.is_dictionary(kind):
+            kind = kind.value_type
+        is_date = schema["dtypes"].get(col) == "date"
+        for bound, compare in zip(condition, ("__ge__", "__le__")):
+            if bound is None:
+                continue
+            if is_date and (pa.types.is_string(kind) or pa.types.is_large_string(kind)):
+                if not iso:
+                    continue
+                value = pd.Timestamp(bound).strftime("%Y-%m-%d")
+            elif is_date and (pa.types.is_timestamp(kind) or pa.types.is_date(kind)):
+                value = pa.scalar(pd.Timestamp(bound)).cast(kind)
+            elif pa.types.is_integer(kind) or pa.types.is_floating(kind):
+                value = bound
+            else:
+                continue
+            parts.append(getattr(field, compare)(value))
+            month = f"{col}_Month"
+            if is_date and month in names:
+                parts.append(getattr(ds.field(month), compare)(pd.Timestamp(bound).strftime("%Y-%m")))
+    expression = None
+    for part in parts:
+        expression = part if expression is None else expression & part
+    return expression
+
+
+def columnar_format(file_path):
+    # Parquet/Feather file, or a directory of them (partitioned output).
+    if os.path.isdir(file_path):
+        for _, _, files in os.walk(file_path):
+            for name in sorted(files):
+                fmt = columnar_formats.get(os.path.splitext(name)[1])
+                if fmt:
+                    return fmt
+        return None
+    return columnar_formats.get(os.path.splitext(file_path)[1])
+
+
+def read_columnar(file_path, schema, columns=None, filters=None):
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(file_path, format=columnar_format(file_path), partitioning="hive")
+    table = dataset.to_table(
+        columns=read_columns(dataset.schema.names, columns, filters),
+        filter=arrow_filter(dataset.schema, schema, filters),
+    )
+    df = typed_frame(table.to_pandas(), schema)
+    return project(filter_rows(df, filters), columns)
+
+
+# ===============================
+# NumPy column store
+# ===============================
+# A directory with one .npy file per column plus manifest.json: numbers and
+# dates as raw arrays, categoricals as integer codes (categories live in the
+# manifest), keys as their uint32 numbers (prefix and width in the dtype name)
+# and other text as fixed-width UTF-8 bytes. Columns with missing
+# values also get a packed validity bitmap. Arrays are opened with
+# np.load(mmap_mode="c"): pages come from the OS page cache, shared by every
+# process that opens the store, and are only copied when the frame is written.
+manifest_name = "manifest.json"
+
+
+def is_column_store(path):
+    return os.path.isfile(os.path.join(path, manifest_name))
+
+
+def column_array(values):
+    # (kind, array) stored for one column; missing slots hold a placeholder.
+    dtype = values.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return "category", values.cat.codes.to_numpy()
+    if isinstance(dtype, np.dtype) and dtype.kind == "M":
+        return "datetime", values.to_numpy().view(np.int64)
+    if isinstance(dtype, KeyDtype):
+        return "key", values.array.numbers()
+    if pd.api.types.is_extension_array_dtype(dtype) and hasattr(dtype, "numpy_dtype"):
+        return "numeric", values.to_numpy(dtype=dtype.numpy_dtype, na_value=0)
+    if isinstance(dtype, np.dtype) and dtype.kind in "biuf":
+        return "numeric", values.to_numpy()
+    if pd.api.types.is_string_dtype(dtype):
+        return "string", np.array(values.fillna("").str.encode("utf-8").tolist(), dtype=np.bytes_)
+    raise TypeError(f"Column {values.name!r} has an unsupported dtype {dtype}")
+
+
+def write_column_store(df, folder):
+    os.makedirs(folder, exist_ok=True)
+    entries = []
+    for i, col in enumerate(df.columns):
+        kind, data = column_array(df[col])
+        entry = {"name": col, "kind": kind, "dtype": str(df[col].dtype), "values": f"c{i:04d}.npy", "valid": None}
+        if kind == "category":
+            entry["categories"] = df[col].cat.categories.tolist()
+            entry["ordered"] = bool(df[col].cat.ordered)
+        np.save(os.path.join(folder, entry["values"]), data)
+        missing = df[col].isna().to_numpy()
+        if missing.any():
+            entry["valid"] = f"c{i:04d}.valid.npy"
+            np.save(os.path.join(folder, entry["valid"]), np.packbits(~missing, bitorder="little"))
+        entries.append(entry)
+    with open(os.path.join(folder, manifest_name), "w") as handle:
+        json.dump({"rows": len(df), "columns": entries}, handle, indent=1)
+
+
+def load_column(folder, entry, rows):
+    # Empty arrays cannot be memory-mapped.
+    values = np.load(os.path.join(folder, entry["values"]), mmap_mode="c" if rows else None)
+    valid = None
+    if entry["valid"]:
+        bits = np.load(os.path.join(folder, entry["valid"]))
+        valid = np.unpackbits(bits, count=rows, bitorder="little").astype(bool)
+    if entry["kind"] == "category":
+        dtype = pd.CategoricalDtype(entry["categories"], ordered=entry["ordered"])
+        return pd.Categorical.from_codes(values, dtype=dtype)
+    if entry["kind"] == "datetime":
+        return pd.Series(values.view(entry["dtype"]), copy=False)
+    dtype = pd.api.types.pandas_dtype(entry["dtype"])
+    if entry["kind"] == "key":
+        return KeyArray(values, np.zeros(rows, dtype=bool) if valid is None else ~valid, dtype)
+    if entry["kind"] == "string":
+        text = pd.Series(np.char.decode(values, "utf-8"), dtype=dtype)
+        return text if valid is None else text.where(valid)
+    if pd.api.types.is_extension_array_dtype(dtype):
+        mask = np.zeros(rows, dtype=bool) if valid is None else ~valid
+        return dtype.construct_array_type()(values, mask)
+    return pd.Series(values, copy=False)
+
+
+def read_column_store(folder, columns=None, filters=None):
+    with open(os.path.join(folder, manifest_name)) as handle:
+        manifest = json.load(handle)
+    entries = {entry["name"]: entry for entry in manifest["columns"]}
+    wanted = read_columns(list(entries), columns, filters)
+    df = pd.DataFrame({col: load_column(folder, entries[col], manifest["rows"]) for col in wanted}, copy=False)
+    return project(filter_rows(df, filters), columns)
+
+
+# ===============================
+# Parallel parsing
+# ===============================
+# A large CSV is split into byte ranges that start right after a newline;
+# each range is parsed in its own process with the header's column names and
+# the pieces are concatenated with unified categories. Quoted fields must not
+# span lines, which holds for every dataset here.
+min_range_bytes = 32 * 1024 * 1024
+
+
+def env_workers():
+    # DATA_LOAD_WORKERS=N parses with N processes, 0 means one per core.
+    workers = int(os.environ.get("DATA_LOAD_WORKERS", "1"))
+    return workers if workers > 0 else os.cpu_count() or 1
+
+
+def byte_ranges(file_path, parts):
+    size = os.path.getsize(file_path)
+    with open(file_path, "rb") as handle:
+        handle.readline()
+        bounds = [handle.tell()]
+        for i in range(1, parts):
+            handle.seek(max(bounds[0] + (size - bounds[0]) * i // parts, bounds[-1]))
+            handle.readline()
+            bounds.append(handle.tell())
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def parse_range(file_path, start, end, schema, columns=None, filters=None):
+    header = pd.read_csv(file_path, nrows=0).columns
+    with open(file_path, "rb") as handle:
+        handle.seek(start)
+        data = handle.read(end - start)
+    df = pd.read_csv(
+        io.BytesIO(data),
+        header=None,
+        names=list(header),
+        dtype=csv_dtypes(schema, header),
+        usecols=read_columns(header, columns, filters),
+    )
+    return project(filter_rows(typed_columns(df, schema), filters), columns)
+
+
+def read_parallel_csv(file_path, schema, workers, columns=None, filters=None, min_bytes=min_range_bytes):
+    # Same frame as read_typed_csv; files under two ranges of min_bytes are
+    # parsed in this process, where the pool would only add overhead.
+    parts = min(workers, os.path.getsize(file_path) // max(min_bytes, 1))
+    if parts < 2:
+        return read_typed_csv(file_path, schema, columns, filters)
+    ranges = byte_ranges(file_path, parts)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        futures = [
+            pool.submit(parse_range, file_path, start, end, schema, columns, filters)
+            for start, end in ranges
+        ]
+        frames = [future.result() for future in futures]
+    return concat_frames(frames, schema)
+
+
+def parse_csv(file_path, schema, columns=None, filters=None, workers=1):
+    if workers > 1:
+        return read_parallel_csv(file_path, schema, workers, columns, filters)
+    return read_typed_csv(file_path, schema, columns, filters)
+
+
+# ===============================
+# Sidecar cache
+# ===============================
+# After the first parse a typed copy of the CSV is stored as a NumPy column
+# store (or an uncompressed Feather / a Parquet file) and memory-mapped on
+# later loads; the column store needs no pyarrow and no conversion. Sidecars are
+# named by the CSV's content hash and the schema; index.json remembers the
+# size and mtime each source had when it was hashed, so an unchanged file is
+# not hashed again. A regenerated but identical CSV keeps its sidecar.
+cache_formats = {"npy": ".columns", "feather": ".feather", "parquet": ".parquet"}
+index_name = "index.json"
+hash_block = 8 * 1024 * 1024
+# Partitions are loaded on threads that share cache folders; index.json is
+# only read and rewritten while holding this lock.
+index_lock = threading.Lock()
+
+
+def cache_config(directory=None, max_bytes=2 * 1024**3, fmt="npy", enabled=True):
+    # directory=None keeps sidecars in a .cache folder next to each CSV.
+    if fmt not in cache_formats:
+        raise ValueError(f"Unknown cache format {fmt!r}, expected one of {sorted(cache_formats)}")
+    return {"directory": directory, "max_bytes": max_bytes, "format": fmt, "enabled": enabled}
+
+
+def env_cache_config():
+    # Menu apps take their cache settings from DATA_CACHE (off to disable),
+    # DATA_CACHE_DIR, DATA_CACHE_MAX_MB and DATA_CACHE_FORMAT.
+    max_mb = os.environ.get("DATA_CACHE_MAX_MB")
+    return cache_config(
+        directory=os.environ.get("DATA_CACHE_DIR") or None,
+        max_bytes=int(float(max_mb) * 1024**2) if max_mb else 2 * 1024**3,
+        fmt=os.environ.get("DATA_CACHE_FORMAT", "npy"),
+        enabled=os.environ.get("DATA_CACHE", "on").lower() not in ("0", "off", "false", "no"),
+    )
+
+
+def cache_dir(file_path, cache):
+    return cache["directory"] or os.path.join(os.path.dirname(os.path.abspath(file_path)), ".cache")
+
+
+def content_hash(file_path):
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as handle:
+        for block in iter(lambda: handle.read(hash_block), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def schema_hash(schema):
+    text = json.dumps(schema, sort_keys=True, default=list)
+    return hashlib.blake2b(text.encode(), digest_size=4).hexdigest()
+
+
+def read_index(folder):
+    try:
+        with open(os.path.join(folder, index_name)) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_index(folder, index):
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    with os.fdopen(fd, "w") as handle:
+        json.dump(index, handle, indent=1)
+    os.replace(tmp, os.path.join(folder, index_name))
+
+
+def update_index(folder, file_path, entry, max_bytes=None):
+    # Re-read under the lock so concurrent loads keep each other's entries.
+    with index_lock:
+        index = read_index(folder)
+        index[os.path.abspath(file_path)] = entry
+        write_index(folder, index if max_bytes is None else evict(folder, index, max_bytes))
+
+
+def fingerprint(file_path, index):
+    # (size, mtime_ns, content hash); the hash is reused while size and mtime match.
+    stat = os.stat(file_path)
+    entry = index.get(os.path.abspath(file_path), {})
+    if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+        return stat.st_size, stat.st_mtime_ns, entry["hash"]
+    return stat.st_size, stat.st_mtime_ns, content_hash(file_path)
+
+
+def sidecar_name(file_path, digest, schema, cache):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return f"{stem}-{digest[:16]}-{schema_hash(schema)}{cache_formats[cache['format']]}"
+
+
+def read_sidecar(path, schema, columns=None, filters=None):
+    # Only the requested columns are converted; the rest of the memory-mapped
+    # file is never touched. Parquet sidecars also skip row groups.
+    if path.endswith(cache_formats["npy"]):
+        return read_column_store(path, columns, filters)
+
+    import pyarrow as pa
+
+    if path.endswith(cache_formats["parquet"]):
+        import pyarrow.parquet as pq
+
+        arrow_schema = pq.read_schema(path)
+        table = pq.read_table(
+            path,
+            columns=read_columns(arrow_schema.names, columns, filters),
+            filters=arrow_filter(arrow_schema, schema, filters),
+            memory_map=True,
+        )
+    else:
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        table = table.select(read_columns(table.column_names, columns, filters))
+    df = encode_keys(table.to_pandas(split_blocks=True), schema)
+    return project(filter_rows(df, filters), columns)
+
+
+def sidecar_bytes(path):
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def remove_sidecar(path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+def write_sidecar(df, path):
+    folder = os.path.dirname(path)
+    if path.endswith(cache_formats["npy"]):
+        tmp = tempfile.mkdtemp(dir=folder, suffix=".tmp")
+        try:
+            write_column_store(df, tmp)
+            if os.path.exists(path):
+                shutil.rmtree(path)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                shutil.rmtree(tmp)
+        return
+
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    fd, tmp = tempfile.mkstemp(dir=folder, suffix=".tmp")
+    os.close(fd)
+    try:
+        if path.endswith(cache_formats["parquet"]):
+            import pyarrow.parquet as pq
+
+            pq.write_table(table, tmp)
+        else:
+            # Uncompressed so the file can be memory-mapped without decoding.
+            with pa.OSFile(tmp, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def evict(folder, index, max_bytes):
+    # Stale sidecars (no longer referenced by any source) go first, then the
+    # least recently used ones until the folder fits in max_bytes.
+    live = {entry["sidecar"] for entry in index.values()}
+    sidecars = [name for name in os.listdir(folder) if name.endswith(tuple(cache_formats.values()))]
+    for name in sidecars:
+        if name not in live:
+            remove_sidecar(os.path.join(folder, name))
+    kept = sorted(
+        (os.stat(os.path.join(folder, name)).st_mtime, name) for name in sidecars if name in live
+    )
+    total = sum(sidecar_bytes(os.path.join(folder, name)) for _, name in kept)
+    for _, name in kept:
+        if total <= max_bytes:
+            break
+        total -= sidecar_bytes(os.path.join(folder, name))
+        remove_sidecar(os.path.join(folder, name))
+        index = {source: entry for source, entry in index.items() if entry["sidecar"] != name}
+    return index
+
+
+def read_dataset(file_path, schema, columns=None, filters=None, cache=None, workers=None):
+    # Typed load of the columns / rows asked for. Column stores, Parquet and
+    # Feather sources are read directly; CSVs go through the sidecar cache, and
+    # any cache problem falls back to parsing the CSV, which is always the
+    # source of truth. workers > 1 parses the CSV in that many processes
+    # (default from env_workers). A directory of CSVs or a glob pattern loads
+    # every matching file, see read_partitions.
+    files = partition_files(file_path)
+    if files is not None:
+        return read_partitions(files, schema, columns, filters, cache, workers)
+    if is_column_store(file_path):
+        return read_column_store(file_path, columns, filters)
+    if columnar_format(file_path):
+        return read_columnar(file_path, schema, columns, filters)
+    cache = env_cache_config() if cache is None else cache
+    workers = env_workers() if workers is None else workers
+    if not cache["enabled"]:
+        return parse_csv(file_path, schema, columns, filters, workers)
+    if cache["format"] != "npy":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            print("⚠️ pyarrow is not installed, loading without the cache.")
+            return parse_csv(file_path, schema, columns, filters, workers)
+
+    folder = cache_dir(file_path, cache)
+    os.makedirs(folder, exist_ok=True)
+    with index_lock:
+        index = read_index(folder)
+    size, mtime_ns, digest = fingerprint(file_path, index)
+    name = sidecar_name(file_path, digest, schema, cache)
+    path = os.path.join(folder, name)
+    # Registered before the sidecar is written so a concurrent evict keeps it.
+    entry = {"size": size, "mtime_ns": mtime_ns, "hash": digest, "sidecar": name}
+    update_index(folder, file_path, entry)
+    if os.path.exists(path):
+        try:
+            df = read_sidecar(path, schema, columns, filters)
+            os.utime(path)
+            print(f"⚡ Loaded cached copy {path}")
+        except Exception as e:
+            print(f"⚠️ Cache read failed ({e}), parsing the CSV.")
+            df = None
+        if df is not None:
+            return df
+
+    # The sidecar always holds every column so any later projection can use
+    # it; the first load parses the whole file once.
+    df = parse_csv(file_path, schema, workers=workers)
+    try:
+        write_sidecar(df, path)
+        update_index(folder, file_path, entry, cache["max_bytes"])
+    except Exception as e:
+        print(f"⚠️ Could not write the cache ({e}).")
+    read_columns(df.columns, columns, filters)  # same errors as the other paths
+    return project(filter_rows(df, filters), columns)
+
+
+# ===============================
+# Partitioned datasets
+# ===============================
+# Quarterly files (Q1_stock_market.csv, Q2_stock_market.csv, ...) load as one
+# frame from a glob such as "Q*_stock_market.csv" or from their directory,
+# including the key=value subdirectories of a partitioned dataset.
+source_column = "Source"
+
+
+def partition_files(path):
+    # CSVs of a glob, or of a directory and its subdirectories (hive-style
+    # <key>=<value>/part-NNNNN.csv, as data_generate.py --partition writes).
+    if glob.has_magic(path):
+        return sorted(glob.glob(path))
+    if os.path.isdir(path) and not is_column_store(path) and not columnar_format(path):
+        return sorted(
+            os.path.join(folder, name)
+            for folder, _, names in os.walk(path)
+            for name in names
+            if name.lower().endswith(".csv")
+        )
+    return None
+
+
+def partition_names(files):
+    # Each file's path relative to the folder they share, without extension,
+    # so part-00000.csv in several key=value folders stays distinct.
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in files])
+    return [os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0] for path in files]
+
+
+def partition_values(name):
+    # {key: value} of the key=value folders in a partition name.
+    folders = name.replace(os.sep, "/").split("/")[:-1]
+    return dict(folder.split("=", 1) for folder in folders if "=" in folder)
+
+
+def dataset_exists(path):
+    files = partition_files(path)
+    return os.path.exists(path) if files is None else bool(files)
+
+
+def read_partitions(files, schema, columns=None, filters=None, cache=None, workers=None):
+    # One frame per file, read in parallel and concatenated, with a Source
+    # column naming the file and the hive partition keys restored as columns.
+    if not files:
+        raise FileNotFoundError("No data files match.")
+    with ThreadPoolExecutor(max_workers=min(len(files), 32)) as pool:
+        futures = [pool.submit(read_dataset, path, schema, columns, filters, cache, workers) for path in files]
+        frames = [future.result() for future in futures]
+    names = partition_names(files)
+    keys = [partition_values(name) for name in names]
+    key_names = list(dict.fromkeys(key for values in keys for key in values))
+    source = pd.CategoricalDtype(names)
+    for code, frame in enumerate(frames):
+        codes = np.full(len(frame), code, dtype=np.int8 if len(names) < 128 else np.int32)
+        frame[source_column] = pd.Categorical.from_codes(codes, dtype=source)
+        for key in key_names:
+            if key not in frame.columns and (columns is None or key in columns):
+                # One category per file, or none where the file has no such folder.
+                value = keys[code].get(key)
+                codes = np.full(len(frame), -1 if value is None else 0, dtype=np.int8)
+                frame[key] = pd.Categorical.from_codes(codes, categories=[] if value is None else [value])
+    return concat_frames(frames, schema)
+
+
+# ===============================
+# Memory report
+# ===============================
+def default_bytes(values, sample_rows=100_000):
+    # read_csv's defaults: int64/float64 for numbers and the installed pandas'
+    # default text dtype (object, or pyarrow strings on pandas 3) for the rest.
+    # Text columns are measured on a sample and scaled to the full length.
+    if isinstance(values.dtype, pd.CategoricalDtype) or not (
+        pd.api.types.is_numeric_dtype(values) or pd.api.types.is_datetime64_any_dtype(values)
+    ):
+        sample = values.iloc[:sample_rows]
+        return int(sample.astype(str).memory_usage(deep=True, index=False) * len(values) / max(len(sample), 1))
+    return len(values) * np.dtype(np.float64).itemsize
+
+
+def memory_report(df):
+    # Compares the typed frame with an estimate of the same data under default
+    # dtypes, so the file is not parsed twice just for the report.
+    before = sum(default_bytes(df[col]) for col in df.columns)
+    after = int(df.memory_usage(deep=True, index=False).sum())
+    print(
+        f"💾 Memory: {before / 1e6:,.1f} MB with default dtypes -> {after / 1e6:,.1f} MB typed"
+        f" ({before / max(after, 1):.1f}x smaller)"
+    )
+    return before, after
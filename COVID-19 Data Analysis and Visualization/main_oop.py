@@ -3,45 +3,109 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from data_generate import generate
+from load_utils import (
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport, chunked_report
+from sql_analysis import sql_report
 
 
 class CovidDataAnalysis:
+    # Columns each menu action reads; load_data only materializes these.
+    action_columns = {
+        "all_analysis": [
+            "Country",
+            "State_Region",
+            "Date",
+            "Confirmed_Cases",
+            "Deaths",
+            "Recovered",
+            "Active_Cases",
+            "Tests_Conducted",
+            "Vaccination_Rate",
+            "Hospitalization_Rate",
+            "ICU_Cases",
+        ],
+        "all_visualizations": [
+            "Country",
+            "Date",
+            "Confirmed_Cases",
+            "Deaths",
+            "Recovered",
+            "Active_Cases",
+            "Tests_Conducted",
+            "Vaccination_Rate",
+            "Hospitalization_Rate",
+            "ICU_Cases",
+        ],
+        "append_data": [dataset_schema["key"]],
+    }
+
     def __init__(self, file_path):
         self.file_path = file_path
         self.df = None
+        self.results = ResultCache()  # memoized tables of self.df, see memo_utils
+        self.running = None  # all_analysis aggregates kept by append_data
+        self.appended = []  # frames added by append_data, see collect_appended
+        self.key_indexes = []  # KeyIndex of the loaded rows and of each append
 
-    # 1. Generate Data (runs data_generate.py using os)
+    # 1. Generate Data (in-process, via data_generate.generate)
     def generate_data(self):
-        if os.path.exists("data_generate.py") and not os.path.exists(
-            "covid19_global_data.csv"
-        ):
-            os.system("python data_generate.py")
-            print("✅ Data generated successfully.")
-        elif not os.path.exists("covid19_global_data.csv"):
-            print("❌ data already exists!")
-        elif not os.path.exists("data_generate.py"):
-            print("❌ data_generate.py not found!")
+        persist = not os.path.exists(self.file_path)
+        self.df = typed_frame(generate(output=self.file_path if persist else None), dataset_schema)
+        self.results.bump()
+        self.running = None
+        self.appended = []
+        print("✅ Data generated successfully.")
+        print("Shape:", self.df.shape)
+        if persist:
+            print(f"✅ Data saved to {self.file_path}.")
+        else:
+            print("⚠️ Data file already exists, generated data kept in memory only.")
 
     # 2. Load Data
-    def load_data(self):
-        if not os.path.exists(self.file_path):
+    def load_data(self, columns=None, filters=None, workers=None):
+        if not dataset_exists(self.file_path):
             print("⚠️ Data file not found. Generating new data...")
             self.generate_data()
+            return
 
-        self.df = pd.read_csv(self.file_path)
-        self.df["Date"] = pd.to_datetime(self.df["Date"], errors="coerce")
+        # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+        # workers > 1 parses large CSVs in that many processes.
+        columns = needed_columns(self.action_columns) if columns is None else columns
+        self.df = read_dataset(self.file_path, dataset_schema, columns, filters, workers=workers)
+        self.results.bump()
+        self.running = None
+        self.appended = []
         print("✅ Data loaded successfully.")
         print("Shape:", self.df.shape)
+        memory_report(self.df)
 
     # 3. Basic Info
     def basic_info(self):
+        self.collect_appended()
         print("\n--- Basic Info ---")
         print(self.df.info())
-        print("\nMissing Values:\n", self.df.isna().sum())
-        print("\nMissing Values (%):\n", (self.df.isna().sum() / len(self.df)) * 100)
+        print("\nMissing Values:\n", self.results.missing(self.df))
+        print("\nMissing Values (%):\n", (self.results.missing(self.df) / len(self.df)) * 100)
 
     # 4. Handle Missing Values
     def handle_missing_values(self):
+        self.collect_appended()
         numeric_cols = [
             "Confirmed_Cases",
             "Deaths",
@@ -68,17 +132,16 @@ class CovidDataAnalysis:
                     )
                     if func in ["mean", "median"]:
                         for col in numeric_cols:
-                            if func == "mean":
-                                self.df[col] = self.df[col].fillna(self.df[col].mean())
-                            else:
-                                self.df[col] = self.df[col].fillna(
-                                    self.df[col].median()
-                                )
+                            self.df[col] = fill_missing(self.df[col], func)
+                        self.results.bump()
+                        self.running = None
                         print("✅ Missing values filled using", func)
                     else:
                         print("❌ Invalid function!")
                 case 2:
                     self.df.dropna(inplace=True)
+                    self.results.bump()
+                    self.running = None
                     print("✅ Rows with missing values dropped.")
                 case 0:
                     print("No changes made.")
@@ -89,14 +152,19 @@ class CovidDataAnalysis:
 
     # 5. All Analysis
     def all_analysis(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded. Please load data first.")
             return
-        df = self.df
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # Stats run on float64 copies of the float32 columns (see
+        # load_utils.float64_view), so they print without float32 noise.
+        df = float64_view(self.df)
         print("\n--- All Analysis ---")
         print("Dataset Shape:", df.shape)
         print("\nColumn Data Types:\n", df.dtypes)
-        print("\nMissing Values:\n", df.isna().sum())
+        print("\nMissing Values:\n", self.results.missing(df))
 
         numeric_cols = [
             "Confirmed_Cases",
@@ -108,31 +176,35 @@ class CovidDataAnalysis:
             "Hospitalization_Rate",
             "ICU_Cases",
         ]
-        print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
+        print("\nSummary Statistics:\n", self.results.describe(df, numeric_cols, include="all"))
 
-        missing_percent = (df.isna().sum() / len(df)) * 100
+        missing_percent = (self.results.missing(df) / len(df)) * 100
         print("\nMissing Values (%):\n", missing_percent)
 
-        country_cases = (
-            df.groupby("Country")["Confirmed_Cases"].sum().sort_values(ascending=False)
+        # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+        series_cols = ["Confirmed_Cases", "Deaths", "Recovered", "Active_Cases"]
+        country_cols = ["Confirmed_Cases", "Deaths", "Vaccination_Rate", "ICU_Cases", "Hospitalization_Rate"]
+        groups = self.results.get(
+            "all_analysis groups",
+            lambda: (
+                GroupPlan(df)
+                .add("Country", country_cols)
+                .add("Date", series_cols)
+                .add(["Country", "State_Region"], ["Confirmed_Cases"])
+                .run()
+            ),
         )
+
+        country_cases = groups.sum("Country", "Confirmed_Cases").sort_values(ascending=False)
         print("\nTop 10 Countries by Confirmed Cases:\n", country_cases.head(10))
 
-        country_deaths = (
-            df.groupby("Country")["Deaths"].sum().sort_values(ascending=False)
-        )
+        country_deaths = groups.sum("Country", "Deaths").sort_values(ascending=False)
         print("\nTop 10 Countries by Deaths:\n", country_deaths.head(10))
 
-        country_vax = (
-            df.groupby("Country")["Vaccination_Rate"]
-            .mean()
-            .sort_values(ascending=False)
-        )
+        country_vax = groups.mean("Country", "Vaccination_Rate").sort_values(ascending=False)
         print("\nTop 10 Countries by Avg Vaccination Rate:\n", country_vax.head(10))
 
-        time_series = df.groupby("Date")[
-            ["Confirmed_Cases", "Deaths", "Recovered", "Active_Cases"]
-        ].sum()
+        time_series = groups.table("Date", series_cols, "sum")
         print("\nOverall Time Series (first 10 rows):\n", time_series.head(10))
 
         # Daily growth rate (Confirmed Cases)
@@ -142,37 +214,16 @@ class CovidDataAnalysis:
             time_series["Daily_New_Cases"].head(10),
         )
 
-        corr_matrix = df[
-            [
-                "Confirmed_Cases",
-                "Deaths",
-                "Recovered",
-                "Active_Cases",
-                "Tests_Conducted",
-                "Vaccination_Rate",
-                "Hospitalization_Rate",
-                "ICU_Cases",
-            ]
-        ].corr()
+        corr_matrix = self.results.corr(df, numeric_cols)
         print("\nCorrelation Matrix:\n", corr_matrix)
 
-        icu_by_country = (
-            df.groupby("Country")["ICU_Cases"].mean().sort_values(ascending=False)
-        )
+        icu_by_country = groups.mean("Country", "ICU_Cases").sort_values(ascending=False)
         print("\nTop 10 Countries by Avg ICU Cases:\n", icu_by_country.head(10))
 
-        hosp_rate = (
-            df.groupby("Country")["Hospitalization_Rate"]
-            .mean()
-            .sort_values(ascending=False)
-        )
+        hosp_rate = groups.mean("Country", "Hospitalization_Rate").sort_values(ascending=False)
         print("\nTop 10 Countries by Avg Hospitalization Rate:\n", hosp_rate.head(10))
 
-        state_cases = (
-            df.groupby(["Country", "State_Region"])["Confirmed_Cases"]
-            .sum()
-            .sort_values(ascending=False)
-        )
+        state_cases = groups.sum(("Country", "State_Region"), "Confirmed_Cases").sort_values(ascending=False)
         print("\nTop 10 States/Regions by Confirmed Cases:\n", state_cases.head(10))
 
         df["Death_Rate"] = df["Deaths"] / df["Confirmed_Cases"].replace(0, np.nan)
@@ -195,9 +246,12 @@ class CovidDataAnalysis:
         print("Average Recovery Rate:", df["Recovery_Rate"].mean())
 
     def all_visualizations(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded. Please load data first.")
             return
+        if missing_columns(self.df, self.action_columns["all_visualizations"]):
+            return
         df = self.df
         numeric_cols = [
             "Confirmed_Cases",
@@ -232,7 +286,7 @@ class CovidDataAnalysis:
             plt.show()
 
         plt.figure(figsize=(10,6))
-        sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+        sns.heatmap(self.results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
         plt.title("Correlation Heatmap")
         plt.show()
 
@@ -258,34 +312,104 @@ class CovidDataAnalysis:
         plt.title("Vaccination Rate vs Confirmed Cases Over Time")
         plt.show()
 
-        top_countries = df.groupby("Country")["Confirmed_Cases"].sum().nlargest(10)
+        top_countries = df.groupby("Country", observed=True)["Confirmed_Cases"].sum().nlargest(10)
         plt.figure(figsize=(10,6))
-        sns.barplot(x=top_countries.values, y=top_countries.index)
+        sns.barplot(x=top_countries.values, y=top_countries.index.astype(str))
         plt.title("Top 10 Countries by Confirmed Cases")
         plt.show()
 
         top5 = df["Country"].value_counts().head(5).index
         plt.figure(figsize=(10,6))
-        sns.boxplot(data=df[df["Country"].isin(top5)],
-                    x="Country", y="Hospitalization_Rate")
+        seaborn_bxp(plt.gca(), self.results.box_stats(df, "Hospitalization_Rate", "Country", top5))
+        plt.xlabel("Country")
+        plt.ylabel("Hospitalization_Rate")
         plt.title("Hospitalization Rate Distribution (Top 5 Countries)")
         plt.xticks(rotation=90)
         plt.show()
 
-        pivot = df.pivot_table(values="ICU_Cases", index="Date", columns="Country", aggfunc="mean")
+        pivot = df.pivot_table(values="ICU_Cases", index="Date", columns="Country", aggfunc="mean", observed=True).astype(float)
         plt.figure(figsize=(12,6))
         sns.heatmap(pivot.T, cmap="Reds", cbar_kws={'label': 'ICU Cases'})
         plt.title("ICU Cases Heatmap by Country and Date")
         plt.show()
 
         sample_countries = df["Country"].value_counts().head(6).index
-        g = sns.FacetGrid(df[df["Country"].isin(sample_countries)], col="Country", col_wrap=3, height=3.5)
+        g = sns.FacetGrid(df[df["Country"].isin(sample_countries)], col="Country", col_order=sample_countries, col_wrap=3, height=3.5)
         g.map_dataframe(sns.lineplot, x="Date", y="Active_Cases")
         g.set_titles("{col_name}")
         g.set_axis_labels("Date","Active Cases")
         g.set_xticklabels(rotation=90)
         plt.show()
 
+    # 7. All Analysis (chunked, for files larger than memory)
+    def chunked_analysis(self, chunk_size=1_000_000):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        chunked_report(self.file_path, chunk_size, self.action_columns["all_analysis"])
+
+    # 8. All Analysis (SQL store, indexed queries)
+    def sql_analysis(self, filters=None):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+        sql_report(self.file_path, self.action_columns["all_analysis"], filters)
+
+    # 9. Append Data (running all_analysis aggregates)
+    def append_data(self, source=None):
+        if self.df is None:
+            print("⚠️ Data not loaded.")
+            return
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+        if source is None:
+            source = input("Enter the data file (or glob) to append: ").strip()
+        if isinstance(source, pd.DataFrame):
+            new = typed_frame(source, dataset_schema)
+        elif dataset_exists(source):
+            new = read_dataset(source, dataset_schema, needed_columns(self.action_columns))
+        else:
+            print("⚠️ Data file not found!")
+            return
+        columns = [col for col in self.df.columns if col in dataset_schema["dtypes"]]
+        if missing_columns(new, columns):
+            return
+        key = dataset_schema["key"]
+        # The loaded rows are folded in once, on the first append; after that
+        # the report only costs the new rows (see chunked_analysis.RunningReport).
+        if self.running is None:
+            self.df = self.df[columns].reset_index(drop=True)
+            self.running = RunningReport().update(self.df)
+            self.key_indexes = [key_index(self.df, key)] if key in columns else []
+        # New rows are kept aside and concatenated by the next action that
+        # needs the whole frame (collect_appended); their row labels continue
+        # after the rows before them, as in the concatenated frame.
+        rows = len(self.df) + sum(len(frame) for frame in self.appended)
+        new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+        # New keys are probed against the hash index of each earlier block:
+        # one probe per new row and block, no pass over the loaded rows
+        # (see key_utils.KeyIndex).
+        if key in columns:
+            repeated, index = repeated_keys(self.key_indexes, new[key])
+            self.key_indexes.append(index)
+            if repeated.any():
+                print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+        self.running.update(new)
+        self.appended.append(new)
+        self.results.bump()
+        print(f"✅ {len(new)} rows appended.")
+        print("Shape:", (rows + len(new), len(columns)))
+        self.running.print("running")
+
+    def collect_appended(self):
+        # One concatenation for all the frames appended since the last call.
+        if self.appended:
+            columns = list(self.appended[0].columns)
+            self.df = concat_frames([self.df[columns], *self.appended], dataset_schema)
+            self.appended = []
+
 
 # ==========================
 # 🚀 Menu-driven interaction
@@ -295,12 +419,15 @@ def main():
     analyzer = CovidDataAnalysis(file_path)
 
     menu = {
-        1: ("Generate Data (Run data_generate.py)", analyzer.generate_data),
+        1: ("Generate Data", analyzer.generate_data),
         2: ("Load Data", analyzer.load_data),
         3: ("Basic Info", analyzer.basic_info),
         4: ("Handle Missing Values", analyzer.handle_missing_values),
         5: ("All Analysis", analyzer.all_analysis),
         6: ("All Visualizations", analyzer.all_visualizations),
+        7: ("All Analysis (chunked, large files)", analyzer.chunked_analysis),
+        8: ("All Analysis (SQL store)", analyzer.sql_analysis),
+        9: ("Append Data", analyzer.append_data),
         0: ("Exit", None),
     }
 
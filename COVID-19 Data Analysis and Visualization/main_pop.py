@@ -3,48 +3,115 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from data_generate import generate
+from load_utils import (
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport, chunked_report
+from sql_analysis import sql_report
 
 # Global dataframe
 df = None
+results = ResultCache()  # memoized tables of df, see memo_utils
+running = None  # all_analysis aggregates kept by append_data
+appended = []  # frames added by append_data, see collect_appended
+key_indexes = []  # KeyIndex of the loaded rows and of each append
 file_path = "covid19_global_data.csv"
 
+# Columns each menu action reads; load_data only materializes these.
+action_columns = {
+    "all_analysis": [
+        "Country",
+        "State_Region",
+        "Date",
+        "Confirmed_Cases",
+        "Deaths",
+        "Recovered",
+        "Active_Cases",
+        "Tests_Conducted",
+        "Vaccination_Rate",
+        "Hospitalization_Rate",
+        "ICU_Cases",
+    ],
+    "all_visualizations": [
+        "Country",
+        "Date",
+        "Confirmed_Cases",
+        "Deaths",
+        "Recovered",
+        "Active_Cases",
+        "Tests_Conducted",
+        "Vaccination_Rate",
+        "Hospitalization_Rate",
+        "ICU_Cases",
+    ],
+    "append_data": [dataset_schema["key"]],
+}
+
 
 # 1. Generate Data
 def generate_data():
-    if os.path.exists("data_generate.py") and not os.path.exists(file_path):
-        os.system("python data_generate.py")
-        print("✅ Data generated successfully.")
-    elif os.path.exists(file_path):
-        print("⚠️ Data already exists!")
+    global df, running, appended
+    persist = not os.path.exists(file_path)
+    df = typed_frame(generate(output=file_path if persist else None), dataset_schema)
+    results.bump()
+    running = None
+    appended = []
+    print("✅ Data generated successfully.")
+    print("Shape:", df.shape)
+    if persist:
+        print(f"✅ Data saved to {file_path}.")
     else:
-        print("❌ data_generate.py not found!")
+        print("⚠️ Data file already exists, generated data kept in memory only.")
 
 
 # 2. Load Data
-def load_data():
-    global df
-    if not os.path.exists(file_path):
+def load_data(columns=None, filters=None, workers=None):
+    global df, running, appended
+    if not dataset_exists(file_path):
         print("⚠️ Data file not found. Generating new data...")
         generate_data()
+        return
 
-    df = pd.read_csv(file_path)
-    df["Date"] = pd.to_datetime(df["Date"], errors="coerce")
+    # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+    # workers > 1 parses large CSVs in that many processes.
+    columns = needed_columns(action_columns) if columns is None else columns
+    df = read_dataset(file_path, dataset_schema, columns, filters, workers=workers)
+    results.bump()
+    running = None
+    appended = []
     print("✅ Data loaded successfully.")
     print("Shape:", df.shape)
+    memory_report(df)
 
 
 # 3. Basic Info
 def basic_info():
     global df
+    collect_appended()
     print("\n--- Basic Info ---")
     print(df.info())
-    print("\nMissing Values:\n", df.isna().sum())
-    print("\nMissing Values (%):\n", (df.isna().sum() / len(df)) * 100)
+    print("\nMissing Values:\n", results.missing(df))
+    print("\nMissing Values (%):\n", (results.missing(df) / len(df)) * 100)
 
 
 # 4. Handle Missing Values
 def handle_missing_values():
-    global df
+    global df, running
+    collect_appended()
     numeric_cols = [
         "Confirmed_Cases",
         "Deaths",
@@ -67,15 +134,16 @@ def handle_missing_values():
                 func = input("Enter aggregate function (mean/median): ").strip().lower()
                 if func in ["mean", "median"]:
                     for col in numeric_cols:
-                        if func == "mean":
-                            df[col] = df[col].fillna(df[col].mean())
-                        else:
-                            df[col] = df[col].fillna(df[col].median())
+                        df[col] = fill_missing(df[col], func)
+                    results.bump()
+                    running = None
                     print(f"✅ Missing values filled using {func}")
                 else:
                     print("❌ Invalid function!")
             case 2:
                 df.dropna(inplace=True)
+                results.bump()
+                running = None
                 print("✅ Rows with missing values dropped.")
             case 0:
                 print("Exiting missing value handler...")
@@ -87,14 +155,20 @@ def handle_missing_values():
 # 5. All Analysis
 def all_analysis():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded. Please load data first.")
         return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # Stats run on float64 copies of the float32 columns (see
+    # load_utils.float64_view), so they print without float32 noise.
+    data = float64_view(df)
 
     print("\n--- All Analysis ---")
-    print("Dataset Shape:", df.shape)
-    print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
+    print("Dataset Shape:", data.shape)
+    print("\nColumn Data Types:\n", data.dtypes)
+    print("\nMissing Values:\n", results.missing(data))
 
     numeric_cols = [
         "Confirmed_Cases",
@@ -106,58 +180,73 @@ def all_analysis():
         "Hospitalization_Rate",
         "ICU_Cases",
     ]
-    print("\nSummary Statistics:\n", df[numeric_cols].describe())
+    print("\nSummary Statistics:\n", results.describe(data, numeric_cols))
+
+    # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+    series_cols = ["Confirmed_Cases", "Deaths", "Recovered", "Active_Cases"]
+    country_cols = ["Confirmed_Cases", "Deaths", "Vaccination_Rate", "ICU_Cases", "Hospitalization_Rate"]
+    groups = results.get(
+        "all_analysis groups",
+        lambda: (
+            GroupPlan(data)
+            .add("Country", country_cols)
+            .add("Date", series_cols)
+            .add(["Country", "State_Region"], ["Confirmed_Cases"])
+            .run()
+        ),
+    )
 
     print(
         "\nTop 10 Countries by Confirmed Cases:\n",
-        df.groupby("Country")["Confirmed_Cases"].sum().nlargest(10),
+        groups.sum("Country", "Confirmed_Cases").nlargest(10),
     )
 
     print(
         "\nTop 10 Countries by Deaths:\n",
-        df.groupby("Country")["Deaths"].sum().nlargest(10),
+        groups.sum("Country", "Deaths").nlargest(10),
     )
 
     print(
         "\nTop 10 Countries by Avg Vaccination Rate:\n",
-        df.groupby("Country")["Vaccination_Rate"].mean().nlargest(10),
+        groups.mean("Country", "Vaccination_Rate").nlargest(10),
     )
 
-    time_series = df.groupby("Date")[
-        ["Confirmed_Cases", "Deaths", "Recovered", "Active_Cases"]
-    ].sum()
+    time_series = groups.table("Date", series_cols, "sum")
     time_series["Daily_New_Cases"] = time_series["Confirmed_Cases"].diff()
     print("\nTime Series (first 10 rows):\n", time_series.head(10))
 
-    print("\nCorrelation Matrix:\n", df[numeric_cols].corr())
+    print("\nCorrelation Matrix:\n", results.corr(data, numeric_cols))
 
     print(
         "\nTop 10 Countries by Avg ICU Cases:\n",
-        df.groupby("Country")["ICU_Cases"].mean().nlargest(10),
+        groups.mean("Country", "ICU_Cases").nlargest(10),
     )
 
     print(
         "\nTop 10 Countries by Avg Hospitalization Rate:\n",
-        df.groupby("Country")["Hospitalization_Rate"].mean().nlargest(10),
+        groups.mean("Country", "Hospitalization_Rate").nlargest(10),
     )
 
     print(
         "\nTop 10 States/Regions by Confirmed Cases:\n",
-        df.groupby(["Country", "State_Region"])["Confirmed_Cases"].sum().nlargest(10),
+        groups.sum(("Country", "State_Region"), "Confirmed_Cases").nlargest(10),
     )
 
-    df["Death_Rate"] = df["Deaths"] / df["Confirmed_Cases"].replace(0, np.nan)
-    df["Recovery_Rate"] = df["Recovered"] / df["Confirmed_Cases"].replace(0, np.nan)
-    print("\nGlobal Avg Death Rate:", df["Death_Rate"].mean())
-    print("Global Avg Recovery Rate:", df["Recovery_Rate"].mean())
+    data["Death_Rate"] = data["Deaths"] / data["Confirmed_Cases"].replace(0, np.nan)
+    data["Recovery_Rate"] = data["Recovered"] / data["Confirmed_Cases"].replace(0, np.nan)
+    print("\nGlobal Avg Death Rate:", data["Death_Rate"].mean())
+    print("Global Avg Recovery Rate:", data["Recovery_Rate"].mean())
 
 
 # 6. All Visualizations
 def all_visualizations():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded. Please load data first.")
         return
+    if missing_columns(df, action_columns["all_visualizations"]):
+        return
     numeric_cols = [
         "Confirmed_Cases",
         "Deaths",
@@ -193,7 +282,7 @@ def all_visualizations():
         plt.show()
 
     plt.figure(figsize=(10, 6))
-    sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+    sns.heatmap(results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
     plt.title("Correlation Heatmap")
     plt.show()
 
@@ -221,24 +310,24 @@ def all_visualizations():
     plt.title("Vaccination Rate vs Confirmed Cases Over Time")
     plt.show()
 
-    top_countries = df.groupby("Country")["Confirmed_Cases"].sum().nlargest(10)
+    top_countries = df.groupby("Country", observed=True)["Confirmed_Cases"].sum().nlargest(10)
     plt.figure(figsize=(10, 6))
-    sns.barplot(x=top_countries.values, y=top_countries.index)
+    sns.barplot(x=top_countries.values, y=top_countries.index.astype(str))
     plt.title("Top 10 Countries by Confirmed Cases")
     plt.show()
 
     top5 = df["Country"].value_counts().head(5).index
     plt.figure(figsize=(10, 6))
-    sns.boxplot(
-        data=df[df["Country"].isin(top5)], x="Country", y="Hospitalization_Rate"
-    )
+    seaborn_bxp(plt.gca(), results.box_stats(df, "Hospitalization_Rate", "Country", top5))
+    plt.xlabel("Country")
+    plt.ylabel("Hospitalization_Rate")
     plt.title("Hospitalization Rate Distribution (Top 5 Countries)")
     plt.xticks(rotation=90)
     plt.show()
 
     pivot = df.pivot_table(
-        values="ICU_Cases", index="Date", columns="Country", aggfunc="mean"
-    )
+        values="ICU_Cases", index="Date", columns="Country", aggfunc="mean", observed=True
+    ).astype(float)
     plt.figure(figsize=(12, 6))
     sns.heatmap(pivot.T, cmap="Reds", cbar_kws={"label": "ICU Cases"})
     plt.title("ICU Cases Heatmap by Country and Date")
@@ -246,7 +335,7 @@ def all_visualizations():
 
     sample_countries = df["Country"].value_counts().head(6).index
     g = sns.FacetGrid(
-        df[df["Country"].isin(sample_countries)], col="Country", col_wrap=3, height=3.5
+        df[df["Country"].isin(sample_countries)], col="Country", col_order=sample_countries, col_wrap=3, height=3.5
     )
     g.map_dataframe(sns.lineplot, x="Date", y="Active_Cases")
     g.set_titles("{col_name}")
@@ -255,17 +344,94 @@ def all_visualizations():
     plt.show()
 
 
+# 7. All Analysis (chunked, for files larger than memory)
+def chunked_analysis(chunk_size=1_000_000):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    chunked_report(file_path, chunk_size, action_columns["all_analysis"])
+
+
+# 8. All Analysis (SQL store, indexed queries)
+def sql_analysis(filters=None):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+    sql_report(file_path, action_columns["all_analysis"], filters)
+
+
+# 9. Append Data (running all_analysis aggregates)
+def append_data(source=None):
+    global df, running, key_indexes
+    if df is None:
+        print("⚠️ Data not loaded.")
+        return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+    if source is None:
+        source = input("Enter the data file (or glob) to append: ").strip()
+    if isinstance(source, pd.DataFrame):
+        new = typed_frame(source, dataset_schema)
+    elif dataset_exists(source):
+        new = read_dataset(source, dataset_schema, needed_columns(action_columns))
+    else:
+        print("⚠️ Data file not found!")
+        return
+    columns = [col for col in df.columns if col in dataset_schema["dtypes"]]
+    if missing_columns(new, columns):
+        return
+    key = dataset_schema["key"]
+    # The loaded rows are folded in once, on the first append; after that
+    # the report only costs the new rows (see chunked_analysis.RunningReport).
+    if running is None:
+        df = df[columns].reset_index(drop=True)
+        running = RunningReport().update(df)
+        key_indexes = [key_index(df, key)] if key in columns else []
+    # New rows are kept aside and concatenated by the next action that needs
+    # the whole frame (collect_appended); their row labels continue after the
+    # rows before them, as in the concatenated frame.
+    rows = len(df) + sum(len(frame) for frame in appended)
+    new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+    # New keys are probed against the hash index of each earlier block: one
+    # probe per new row and block, no pass over the loaded rows (see key_utils).
+    if key in columns:
+        repeated, index = repeated_keys(key_indexes, new[key])
+        key_indexes.append(index)
+        if repeated.any():
+            print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+    running.update(new)
+    appended.append(new)
+    results.bump()
+    print(f"✅ {len(new)} rows appended.")
+    print("Shape:", (rows + len(new), len(columns)))
+    running.print("running")
+
+
+def collect_appended():
+    # One concatenation for all the frames appended since the last call.
+    global df, appended
+    if appended:
+        columns = list(appended[0].columns)
+        df = concat_frames([df[columns], *appended], dataset_schema)
+        appended = []
+
+
 # ==========================
 # 🚀 Menu-driven interaction
 # ==========================
 def main():
     menu = {
-        1: ("Generate Data (Run data_generate.py)", generate_data),
+        1: ("Generate Data", generate_data),
         2: ("Load Data", load_data),
         3: ("Basic Info", basic_info),
         4: ("Handle Missing Values", handle_missing_values),
         5: ("All Analysis", all_analysis),
         6: ("All Visualizations", all_visualizations),
+        7: ("All Analysis (chunked, large files)", chunked_analysis),
+        8: ("All Analysis (SQL store)", sql_analysis),
+        9: ("Append Data", append_data),
         0: ("Exit", None),
     }
 
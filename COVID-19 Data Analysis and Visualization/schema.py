@@ -0,0 +1,31 @@
+import pandas as pd
+from data_generate import countries, state_levels
+
+# Column dtypes applied at parse time (see load_utils.read_typed_csv). Counts
+# are nullable whole numbers (the CSV writes them as 482.0), rates have one
+# decimal and fit float32.
+dataset_schema = {
+    "dtypes": {
+        "Record_ID": "key",
+        "Country": "category",
+        "State_Region": "category",
+        "Date": "date",
+        "Confirmed_Cases": "Int64",
+        "Deaths": "Int64",
+        "Recovered": "Int64",
+        "Active_Cases": "Int64",
+        "Tests_Conducted": "Int64",
+        "Vaccination_Rate": "float32",
+        "Hospitalization_Rate": "float32",
+        "ICU_Cases": "Int64",
+    },
+    "levels": {
+        "Country": countries,
+        "State_Region": list(pd.unique(state_levels)),
+    },
+    "date_format": "%Y-%m-%d",
+    # Row identifier; append_data reports new rows that repeat one.
+    "key": "Record_ID",
+    # Natural query keys, indexed in the SQL store (see sql_utils).
+    "indexes": [["Country", "State_Region", "Date"]],
+}
@@ -0,0 +1,95 @@
+import argparse
+from schema import dataset_schema
+from sql_utils import open_sql_store, sql_store_path, write_sql_store
+from stats_utils import as_scalar
+
+# CovidDataAnalysis.all_analysis on the SQL store: every groupby, mean, sum
+# and correlation runs in SQLite and only the aggregated rows reach pandas.
+numeric_cols = [
+    "Confirmed_Cases",
+    "Deaths",
+    "Recovered",
+    "Active_Cases",
+    "Tests_Conducted",
+    "Vaccination_Rate",
+    "Hospitalization_Rate",
+    "ICU_Cases",
+]
+series_cols = ["Confirmed_Cases", "Deaths", "Recovered", "Active_Cases"]
+total_cols = [*series_cols, "Tests_Conducted"]
+death_rate = "AVG(Deaths * 1.0 / NULLIF(Confirmed_Cases, 0))"
+recovery_rate = "AVG(Recovered * 1.0 / NULLIF(Confirmed_Cases, 0))"
+
+
+def sql_report(file_path, columns=None, filters=None, db_path=None):
+    # columns / filters as in load_data; the store is built on first use.
+    store = open_sql_store(file_path, dataset_schema, db_path, filters, columns)
+    try:
+        rows = store.rows()
+        if rows == 0:
+            print("⚠️ No rows match.")
+            return
+        dtypes = store.dtypes
+        stats = store.moments(numeric_cols)
+        missing = store.missing()
+        mean = dict(zip(numeric_cols, stats.mean))
+        rate = {"Death_Rate": store.value(death_rate), "Recovery_Rate": store.value(recovery_rate)}
+        print("\n--- All Analysis (SQL) ---")
+        print("Dataset Shape:", store.shape())
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", store.describe(numeric_cols))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        country_cases = store.group_sum("Country", "Confirmed_Cases").sort_values(ascending=False)
+        print("\nTop 10 Countries by Confirmed Cases:\n", country_cases.head(10))
+        country_deaths = store.group_sum("Country", "Deaths").sort_values(ascending=False)
+        print("\nTop 10 Countries by Deaths:\n", country_deaths.head(10))
+        country_vax = store.group_mean("Country", "Vaccination_Rate").sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg Vaccination Rate:\n", country_vax.head(10))
+
+        sums = {col: f"COALESCE(SUM({col}), 0)" for col in series_cols}
+        time_series = store.group("Date", sums).astype({col: dtypes[col] for col in series_cols})
+        print("\nOverall Time Series (first 10 rows):\n", time_series.head(10))
+        time_series["Daily_New_Cases"] = time_series["Confirmed_Cases"].diff()
+        print("\nDaily New Cases (first 10 rows):\n", time_series["Daily_New_Cases"].head(10))
+
+        print("\nCorrelation Matrix:\n", store.corr(numeric_cols))
+
+        icu_by_country = store.group_mean("Country", "ICU_Cases").sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg ICU Cases:\n", icu_by_country.head(10))
+        hosp_rate = store.group_mean("Country", "Hospitalization_Rate").sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg Hospitalization Rate:\n", hosp_rate.head(10))
+        state_cases = store.group_sum(["Country", "State_Region"], "Confirmed_Cases").sort_values(ascending=False)
+        print("\nTop 10 States/Regions by Confirmed Cases:\n", state_cases.head(10))
+
+        print("\nGlobal Average Death Rate:", rate["Death_Rate"])
+        print("Global Average Recovery Rate:", rate["Recovery_Rate"])
+
+        # Additional Insights
+        totals = dict(zip(total_cols, store.query(", ".join(f"COALESCE(SUM({col}), 0)" for col in total_cols))[0]))
+        print("\n--- Additional Insights ---")
+        print("Total Confirmed Cases:", totals["Confirmed_Cases"])
+        print("Total Deaths:", totals["Deaths"])
+        print("Total Recovered:", totals["Recovered"])
+        print("Total Active Cases:", totals["Active_Cases"])
+        print("Total Tests Conducted:", totals["Tests_Conducted"])
+        print("Average Vaccination Rate:", as_scalar(mean["Vaccination_Rate"], dtypes["Vaccination_Rate"]))
+        print("Average Hospitalization Rate:", as_scalar(mean["Hospitalization_Rate"], dtypes["Hospitalization_Rate"]))
+        print("Average ICU Cases:", as_scalar(mean["ICU_Cases"], dtypes["ICU_Cases"]))
+        print("Average Death Rate:", rate["Death_Rate"])
+        print("Average Recovery Rate:", rate["Recovery_Rate"])
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the SQL store for the COVID-19 data or report from it.")
+    parser.add_argument("command", choices=["ingest", "report"])
+    parser.add_argument("--data", default="covid19_global_data.csv")
+    parser.add_argument("--db", default=None, help="defaults to .cache/<data>.sqlite next to the CSV")
+    args = parser.parse_args()
+    if args.command == "ingest":
+        print(f"✅ SQL store written to {write_sql_store(args.data, args.db or sql_store_path(args.data), dataset_schema)}")
+    else:
+        sql_report(args.data, db_path=args.db)
@@ -0,0 +1,323 @@
+import json
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+from load_utils import cache_dir, env_cache_config, exact_float64, iter_typed_csv, schema_hash
+from stats_utils import CoMoments, Moments, grouped_dtype
+
+# Embedded SQLite copy of a dataset: one "data" table with the CSV's columns,
+# indexes on the schema's "indexes" (the natural query keys) and a "meta"
+# table with the source fingerprint and the typed dtypes. Categories and keys
+# are stored as text, dates as ISO text (so they sort and compare as dates)
+# and float32 values as the decimals printed in the CSV. SqlStore runs the
+# grouping and aggregation in SQL, so a report or an ad-hoc slice only pulls
+# the aggregated rows into pandas.
+table_name = "data"
+sql_date_format = "%Y-%m-%d"
+
+
+def quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+# ===============================
+# Ingestion
+# ===============================
+def sql_store_path(file_path):
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_dir(file_path, env_cache_config()), f"{stem}.sqlite")
+
+
+def source_fingerprint(file_path, schema):
+    stat = os.stat(file_path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "schema": schema_hash(schema)}
+
+
+def sql_type(kind):
+    if kind is None or kind in ("category", "string", "key", "date"):
+        return "TEXT"
+    return "INTEGER" if pd.api.types.is_integer_dtype(pd.api.types.pandas_dtype(kind)) else "REAL"
+
+
+def sql_frame(chunk):
+    # The chunk with values SQLite can bind: dates as ISO text, categories
+    # and keys as strings, float32 as the decimals it was read from (92.42,
+    # not 92.41999816894531) and missing values as None.
+    out = {}
+    for col in chunk.columns:
+        values = chunk[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime(sql_date_format)
+        elif values.dtype == np.float32:
+            values = exact_float64(values)
+        elif not pd.api.types.is_numeric_dtype(values) or pd.api.types.is_extension_array_dtype(values):
+            values = values.astype(object)
+        out[col] = values.astype(object).where(values.notna(), None)
+    return pd.DataFrame(out)
+
+
+def write_sql_store(file_path, db_path, schema, chunk_size=500_000):
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    tmp = db_path + ".tmp"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    header = pd.read_csv(file_path, nrows=0).columns
+    con = sqlite3.connect(tmp)
+    try:
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        columns = ", ".join(f"{quote(col)} {sql_type(schema['dtypes'].get(col))}" for col in header)
+        con.execute(f"CREATE TABLE {table_name} ({columns})")
+        insert = f"INSERT INTO {table_name} VALUES ({', '.join('?' * len(header))})"
+        rows, dtypes = 0, None
+        for chunk in iter_typed_csv(file_path, schema, chunk_size):
+            dtypes = chunk.dtypes if dtypes is None else dtypes
+            con.executemany(insert, sql_frame(chunk).itertuples(index=False, name=None))
+            rows += len(chunk)
+        for keys in schema.get("indexes", []):
+            name = quote("idx_" + "_".join(keys))
+            con.execute(f"CREATE INDEX {name} ON {table_name} ({', '.join(map(quote, keys))})")
+        con.execute("ANALYZE")
+        meta = {
+            "source": source_fingerprint(file_path, schema),
+            "rows": rows,
+            "dtypes": {col: str(dtype) for col, dtype in (dtypes if dtypes is not None else {}).items()},
+        }
+        con.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        con.executemany("INSERT INTO meta VALUES (?, ?)", [(key, json.dumps(value)) for key, value in meta.items()])
+        con.commit()
+    finally:
+        con.close()
+    os.replace(tmp, db_path)
+    return db_path
+
+
+def read_meta(con):
+    return {key: json.loads(value) for key, value in con.execute("SELECT key, value FROM meta")}
+
+
+def is_fresh(db_path, file_path, schema):
+    if not os.path.exists(db_path):
+        return False
+    con = sqlite3.connect(db_path)
+    try:
+        return read_meta(con)["source"] == source_fingerprint(file_path, schema)
+    except (sqlite3.Error, KeyError):
+        return False
+    finally:
+        con.close()
+
+
+def open_sql_store(file_path, schema, db_path=None, filters=None, columns=None):
+    # SqlStore for the CSV, (re)building the database when it is missing or
+    # the CSV / schema changed since it was written.
+    db_path = db_path or sql_store_path(file_path)
+    if not is_fresh(db_path, file_path, schema):
+        print(f"🗄️ Building SQL store {db_path} ...")
+        write_sql_store(file_path, db_path, schema)
+    return SqlStore(db_path, filters, columns)
+
+
+# ===============================
+# Queries
+# ===============================
+def sql_value(value, dtype):
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return pd.Timestamp(value).strftime(sql_date_format)
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class SqlStore:
+    # Read side of a store. filters take the load_utils form ({col: (low,
+    # high)} ranges or {col: [values]}) and apply to every query; columns
+    # limits the frame-level summaries (dtypes, missing values) like a
+    # projected load_data.
+    def __init__(self, db_path, filters=None, columns=None):
+        self.con = sqlite3.connect(db_path)
+        meta = read_meta(self.con)
+        dtypes = {col: pd.api.types.pandas_dtype(dtype) for col, dtype in meta["dtypes"].items()}
+        # float32 columns are stored and summarized as float64, the dtype the
+        # in-memory reports compute them in (see load_utils.float64_view).
+        dtypes = {col: np.dtype(np.float64) if dtype == np.float32 else dtype for col, dtype in dtypes.items()}
+        self.dtypes = pd.Series(dtypes if columns is None else {col: dtypes[col] for col in columns})
+        self.conditions, self.params = [], []
+        for col, condition in (filters or {}).items():
+            dtype = dtypes[col]
+            if isinstance(condition, tuple):
+                low, high = condition
+                if low is not None:
+                    self.conditions.append(f"{quote(col)} >= ?")
+                    self.params.append(sql_value(low, dtype))
+                if high is not None:
+                    self.conditions.append(f"{quote(col)} <= ?")
+                    self.params.append(sql_value(high, dtype))
+            else:
+                values = [sql_value(value, dtype) for value in condition]
+                self.conditions.append(f"{quote(col)} IN ({', '.join('?' * len(values))})")
+                self.params.extend(values)
+
+    def close(self):
+        self.con.close()
+
+    def where_sql(self, where=()):
+        conditions = [*self.conditions, *where]
+        return " WHERE " + " AND ".join(f"({condition})" for condition in conditions) if conditions else ""
+
+    def query(self, select, where=(), group=None, order=None, limit=None):
+        sql = f"SELECT {select} FROM {table_name}{self.where_sql(where)}"
+        if group:
+            sql += f" GROUP BY {group}"
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += f" LIMIT {int(limit)}"
+        return self.con.execute(sql, self.params).fetchall()
+
+    # Frame-level summaries
+    def rows(self):
+        return self.value("COUNT(*)")
+
+    def shape(self):
+        return self.rows(), len(self.dtypes)
+
+    def missing(self):
+        counts = self.query(", ".join(f"COALESCE(SUM({quote(col)} IS NULL), 0)" for col in self.dtypes.index))[0]
+        return pd.Series(counts, index=self.dtypes.index, dtype=np.int64)
+
+    def moments(self, columns):
+        stats = Moments(columns)
+        first = self.query(", ".join(f"COUNT({quote(col)}), AVG({quote(col)}), MIN({quote(col)}), MAX({quote(col)})" for col in columns))
+        values = np.array(first[0], dtype=np.float64).reshape(len(columns), 4)
+        stats.count = values[:, 0]
+        stats.mean = np.nan_to_num(values[:, 1])
+        stats.min, stats.max = values[:, 2], values[:, 3]
+        # Second pass around the means, so the squares do not cancel.
+        squares = ", ".join(
+            f"COALESCE(SUM(({quote(col)} - {float(mean)!r}) * ({quote(col)} - {float(mean)!r})), 0)"
+            for col, mean in zip(columns, stats.mean)
+        )
+        stats.m2 = np.array(self.query(squares)[0], dtype=np.float64)
+        return stats
+
+    def quantile(self, column, q):
+        # Linear interpolation between order statistics, like pandas. One
+        # sort numbers the present values and only the rows at the needed
+        # positions come back.
+        n = self.value(f"COUNT({quote(column)})")
+        if n == 0:
+            return np.full(np.size(q), np.nan)
+        position = np.atleast_1d(np.asarray(q, dtype=np.float64)) * (n - 1)
+        low = np.floor(position).astype(np.int64)
+        high = np.minimum(low + 1, n - 1)
+        wanted = sorted({*low.tolist(), *high.tolist()})
+        numbered = (
+            f"SELECT {quote(column)} AS value, ROW_NUMBER() OVER (ORDER BY {quote(column)}) - 1 AS position"
+            f" FROM {table_name}{self.where_sql([f'{quote(column)} IS NOT NULL'])}"
+        )
+        sql = f"SELECT position, value FROM ({numbered}) WHERE position IN ({', '.join(map(str, wanted))})"
+        values = dict(self.con.execute(sql, self.params).fetchall())
+        below = np.array([values[i] for i in low], dtype=np.float64)
+        above = np.array([values[i] for i in high], dtype=np.float64)
+        return below + (above - below) * (position - low)
+
+    def describe(self, columns):
+        # Same table as DataFrame.describe() on the numeric columns.
+        stats = self.moments(columns)
+        rows = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+        table = {}
+        for i, col in enumerate(columns):
+            q = self.quantile(col, [0.25, 0.5, 0.75])
+            values = [stats.count[i], stats.mean[i] if stats.count[i] else np.nan, stats.std()[i], stats.min[i], *q, stats.max[i]]
+            dtype = "Float64" if pd.api.types.is_extension_array_dtype(self.dtypes.get(col)) else np.float64
+            table[col] = pd.Series(values, index=rows, dtype=dtype)
+        return pd.DataFrame(table)
+
+    def corr(self, columns):
+        # Pairwise-complete Pearson correlation like DataFrame.corr(), from
+        # one scan grouped by which columns are missing: within a group every
+        # row has the same columns present, so plain sums and products of the
+        # values (shifted by the column means) are enough, and each pair adds
+        # up the groups where both are present. The sums fill a CoMoments.
+        k = len(columns)
+        shift = np.nan_to_num(self.moments(columns).mean)
+        x = [f"({quote(col)} - {float(value)!r})" for col, value in zip(columns, shift)]
+        pattern = " + ".join(f"({quote(col)} IS NULL) * {1 << i}" for i, col in enumerate(columns))
+        upper = [(i, j) for i in range(k) for j in range(i, k)]
+        terms = ["COUNT(*)", *(f"SUM({value})" for value in x), *(f"SUM({x[i]} * {x[j]})" for i, j in upper)]
+        groups = self.query(f"{pattern} AS pattern, {', '.join(terms)}", group="pattern")
+        n, sums, squares, products = (np.zeros((k, k)) for _ in range(4))
+        for row in groups:
+            # Sums of columns missing from the whole group come back as NULL.
+            values = np.nan_to_num(np.array(row[1:], dtype=np.float64))
+            present = ~((row[0] >> np.arange(k)) & 1).astype(bool)
+            both = np.outer(present, present)
+            prod = np.zeros((k, k))
+            prod[tuple(np.array(upper).T)] = values[1 + k :]
+            prod = prod + np.triu(prod, 1).T
+            n += values[0] * both
+            sums += values[1 : 1 + k][:, None] * both
+            squares += np.diag(prod)[:, None] * both
+            products += prod * both
+        stats = CoMoments(columns)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            local = np.where(n > 0, sums / n, 0.0)
+            stats.m2 = np.where(n > 0, squares - sums * local, 0.0)
+            stats.cross = np.where(n > 0, products - sums * local.T, 0.0)
+        stats.n = n
+        stats.mean = local + shift[:, None]
+        return stats.corr()
+
+    # Aggregates
+    def value(self, expression, where=()):
+        return self.query(expression, where)[0][0]
+
+    def group(self, keys, aggregates, where=()):
+        # DataFrame of named SQL aggregates per group, indexed like a pandas
+        # groupby: missing keys are dropped and dates come back as datetimes.
+        # keys are column names or a {name: SQL expression} dict.
+        if not isinstance(keys, dict):
+            keys = {key: quote(key) for key in ([keys] if isinstance(keys, str) else keys)}
+        select = ", ".join(f"{sql} AS {quote(name)}" for name, sql in [*keys.items(), *aggregates.items()])
+        present = [f"{sql} IS NOT NULL" for sql in keys.values()]
+        group = ", ".join(map(quote, keys))
+        rows = self.query(select, [*present, *where], group=group, order=group)
+        frame = pd.DataFrame(rows, columns=[*keys, *aggregates])
+        for key in keys:
+            if pd.api.types.is_datetime64_any_dtype(self.dtypes.get(key)):
+                frame[key] = pd.to_datetime(frame[key], format=sql_date_format)
+        return frame.set_index(list(keys))
+
+    def group_mean(self, keys, column):
+        means = self.group(keys, {column: f"AVG({quote(column)})"})[column]
+        return means.astype(grouped_dtype(self.dtypes[column]))
+
+    def group_sum(self, keys, column):
+        sums = self.group(keys, {column: f"COALESCE(SUM({quote(column)}), 0)"})[column]
+        return sums.astype(grouped_dtype(self.dtypes[column], "sum"))
+
+    def binned_mean(self, column, edges, value, include_lowest=False):
+        # Mean of value per right-closed bin of column, as a groupby on
+        # pd.cut(column, edges) would print it (empty bins left out).
+        labels = pd.cut(pd.Series(edges, dtype=np.float64), edges, include_lowest=include_lowest).cat.categories
+        cases = []
+        for i, interval in enumerate(labels):
+            low = ">=" if include_lowest and i == 0 else ">"
+            cases.append(f"WHEN {quote(column)} {low} {float(edges[i])!r} AND {quote(column)} <= {float(edges[i + 1])!r} THEN {i}")
+        expression = f"CASE {' '.join(cases)} END"
+        rows = self.query(
+            f"{expression} AS bin, AVG({quote(value)})", [f"{expression} IS NOT NULL"], group="bin", order="bin"
+        )
+        index = pd.CategoricalIndex(labels[[row[0] for row in rows]], categories=labels, ordered=True, name=column)
+        return pd.Series([row[1] for row in rows], index=index, name=value).astype(grouped_dtype(self.dtypes[value]))
+
+    def top(self, n, expression, name, columns):
+        # nlargest(n) of an expression, with the row positions as the index.
+        select = ", ".join(["rowid - 1", *map(quote, columns), expression])
+        rows = self.query(select, [f"({expression}) IS NOT NULL"], order=f"{expression} DESC, rowid", limit=n)
+        frame = pd.DataFrame(rows, columns=["row", *columns, name]).set_index("row")
+        frame.index.name = None
+        for col in columns:
+            if pd.api.types.is_datetime64_any_dtype(self.dtypes.get(col)):
+                frame[col] = pd.to_datetime(frame[col], format=sql_date_format)
+        return frame
@@ -0,0 +1,613 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Mergeable accumulators: each one is updated chunk by chunk (or built per
+# chunk and merged), so a report over a file larger than memory only keeps
+# these partial aggregates around. Merges follow Chan et al.'s pairwise
+# update, which stays accurate for large means and long streams.
+
+
+# ===============================
+# Result dtypes
+# ===============================
+def grouped_dtype(dtype, how="mean"):
+    # dtype pandas gives a grouped sum/mean of a column with this dtype, so
+    # merged results print like the in-memory ones (float32 stays float32,
+    # nullable integers give Float64/Int64).
+    probe = pd.DataFrame({"key": [0], "value": pd.array([1], dtype=dtype)})
+    return getattr(probe.groupby("key")["value"], how)().dtype
+
+
+def wide_dtype(dtype):
+    # 64-bit dtype of the same kind, for running sums.
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        return np.float64
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return np.int64
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "Int64"
+    if pd.api.types.is_float_dtype(dtype):
+        return "Float64"
+    return dtype
+
+
+def as_scalar(value, dtype):
+    # A numpy scalar of the dtype the in-memory Series.mean()/max() returns.
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        return dtype.type(value)
+    return np.float64(value)
+
+
+# ===============================
+# Per-column moments
+# ===============================
+class Moments:
+    # count, mean, M2 (sum of squared deviations), min and max per column.
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.count = np.zeros(k)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.min = np.full(k, np.nan)
+        self.max = np.full(k, np.nan)
+
+    @classmethod
+    def from_frame(cls, frame, columns):
+        stats = cls(columns)
+        x = frame[stats.columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(x)
+        stats.count = present.sum(axis=0).astype(np.float64)
+        seen = stats.count > 0
+        stats.mean[seen] = np.nansum(x[:, seen], axis=0) / stats.count[seen]
+        stats.m2[seen] = np.nansum((x[:, seen] - stats.mean[seen]) ** 2, axis=0)
+        stats.min[seen] = np.nanmin(x[:, seen], axis=0)
+        stats.max[seen] = np.nanmax(x[:, seen], axis=0)
+        return stats
+
+    def update(self, frame):
+        return self.merge(Moments.from_frame(frame, self.columns))
+
+    def merge(self, other):
+        n = self.count + other.count
+        safe = np.where(n > 0, n, 1)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / safe
+        self.m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / safe
+        self.count = n
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+    def var(self, ddof=1):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self.count > ddof, self.m2 / (self.count - ddof), np.nan)
+
+    def std(self, ddof=1):
+        return np.sqrt(self.var(ddof))
+
+    def series(self, name):
+        values = {"count": self.count, "mean": self.mean, "std": self.std(), "min": self.min, "max": self.max}
+        return pd.Series(values[name], index=self.columns)
+
+
+# ===============================
+# Pairwise co-moments (correlation / covariance)
+# ===============================
+class CoMoments:
+    # Pairwise-complete statistics like DataFrame.corr()/cov(): entry (i, j)
+    # only uses rows where both columns are present. For every pair it keeps
+    # n, the mean of i over those rows, the co-moment and both M2 terms.
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.n = np.zeros((k, k))
+        self.mean = np.zeros((k, k))  # mean[i, j]: column i over rows where j is present
+        self.m2 = np.zeros((k, k))  # m2[i, j]: squared deviations of i on those rows
+        self.cross = np.zeros((k, k))
+
+    @classmethod
+    def from_array(cls, x, columns):
+        stats = cls(columns)
+        present = ~np.isnan(x)
+        # Shift by the chunk means first, so the sums below do not cancel.
+        shift = np.zeros(x.shape[1])
+        counts = present.sum(axis=0)
+        shift[counts > 0] = np.nansum(x[:, counts > 0], axis=0) / counts[counts > 0]
+        mask = present.astype(np.float64)
+        centered = np.where(present, x - shift, 0.0)
+        n = mask.T @ mask
+        sums = centered.T @ mask
+        squares = (centered**2).T @ mask
+        products = centered.T @ centered
+        with np.errstate(divide="ignore", invalid="ignore"):
+            local = np.where(n > 0, sums / n, 0.0)
+            stats.m2 = np.where(n > 0, squares - sums * local, 0.0)
+            stats.cross = np.where(n > 0, products - sums * local.T, 0.0)
+        stats.n = n
+        stats.mean = local + shift[:, None]
+        return stats
+
+    @classmethod
+    def from_frame(cls, frame, columns):
+        return cls.from_array(frame[list(columns)].to_numpy(dtype=np.float64, na_value=np.nan), columns)
+
+    def update(self, frame):
+        return self.merge(CoMoments.from_frame(frame, self.columns))
+
+    def merge(self, other):
+        n = self.n + other.n
+        safe = np.where(n > 0, n, 1)
+        delta = other.mean - self.mean
+        weight = self.n * other.n / safe
+        self.cross = self.cross + other.cross + delta * delta.T * weight
+        self.m2 = self.m2 + other.m2 + delta**2 * weight
+        self.mean = self.mean + delta * other.n / safe
+        self.n = n
+        return self
+
+    def cov(self, ddof=1):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = np.where(self.n > ddof, self.cross / (self.n - ddof), np.nan)
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def corr(self):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = self.cross / np.sqrt(self.m2 * self.m2.T)
+        values = np.where(self.n > 1, np.clip(values, -1, 1), np.nan)
+        np.fill_diagonal(values, np.where(np.diag(self.m2) > 0, 1.0, np.nan))
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    @property
+    def nbytes(self):
+        return self.n.nbytes + self.mean.nbytes + self.m2.nbytes + self.cross.nbytes
+
+
+def average_ranks(x):
+    # Column-wise ranks 1..n of the present values, ties sharing their mean
+    # rank and NaN staying NaN, like DataFrame.rank() but from one np.unique
+    # per column.
+    ranks = np.full(x.shape, np.nan)
+    for i in range(x.shape[1]):
+        present = ~np.isnan(x[:, i])
+        _, inverse, counts = np.unique(x[present, i], return_inverse=True, return_counts=True)
+        ranks[present, i] = (np.cumsum(counts) - (counts - 1) / 2)[inverse]
+    return ranks
+
+
+def frame_comoments(frame, columns, method="pearson", block_rows=250_000, workers=None):
+    # CoMoments of an in-memory frame: rows are converted to float64 and
+    # multiplied a block at a time (so the temporaries stay block-sized) on
+    # a thread pool, since the matrix products release the GIL, and the
+    # blocks are merged. method="spearman" runs on the average ranks of each
+    # column. Every column is ranked once over its present values, so with
+    # missing values a pair's ranks can differ from DataFrame.corr, which
+    # re-ranks each pair on the rows both columns have.
+    columns = list(columns)
+    if method == "spearman":
+        ranks = average_ranks(frame[columns].to_numpy(dtype=np.float64, na_value=np.nan))
+        block = lambda start: CoMoments.from_array(ranks[start : start + block_rows], columns)
+    elif method == "pearson":
+        block = lambda start: CoMoments.from_frame(frame.iloc[start : start + block_rows], columns)
+    else:
+        raise ValueError(f"Unknown correlation method: {method}")
+    starts = range(0, max(len(frame), 1), block_rows)
+    workers = min(len(starts), workers or os.cpu_count() or 1)
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            blocks = list(pool.map(block, starts))
+    else:
+        blocks = [block(start) for start in starts]
+    stats = CoMoments(columns)
+    for other in blocks:
+        stats.merge(other)
+    return stats
+
+
+# ===============================
+# Grouped sums / counts
+# ===============================
+class GroupSums:
+    # Per-group sums and non-null counts; means are sums / counts. Keys can be
+    # column names or Series aligned with the chunk (e.g. pd.cut bins).
+    def __init__(self, columns, max_groups=None):
+        self.columns = list(columns)
+        self.max_groups = max_groups
+        self.sums = None
+        self.counts = None
+        self.sizes = None
+
+    def update(self, frame, keys):
+        # Sums are kept in 64 bits so long streams neither lose precision
+        # (float32) nor wrap around (Int16, int8, ...) as chunks are merged.
+        wide = {col: wide_dtype(frame[col].dtype) for col in self.columns}
+        grouped = frame.astype(wide).groupby(keys, observed=True)[self.columns]
+        sums, counts, sizes = grouped.sum(), grouped.count(), grouped.size()
+        if self.sums is None:
+            self.sums, self.counts, self.sizes = sums, counts, sizes
+        else:
+            self.sums = self.sums.add(sums, fill_value=0)
+            self.counts = self.counts.add(counts, fill_value=0)
+            self.sizes = self.sizes.add(sizes, fill_value=0)
+        # Sums keyed by a numeric column's values (see binned_mean) are kept
+        # to max_groups keys by rounding the keys to fewer significant digits.
+        digits = 12
+        while self.max_groups is not None and len(self.sums) > self.max_groups and digits > 1:
+            digits -= 1
+            rounded = pd.Index(significant(self.sums.index.to_numpy(dtype=np.float64), digits), name=self.sums.index.name)
+            self.sums = self.sums.groupby(rounded).sum()
+            self.counts = self.counts.groupby(rounded).sum()
+            self.sizes = self.sizes.groupby(rounded).sum()
+        return self
+
+    def sum(self, column, dtype=None):
+        values = self.sums[column].sort_index()
+        return values.astype(grouped_dtype(dtype, "sum")) if dtype is not None else values
+
+    def mean(self, column, dtype=None):
+        values = (self.sums[column] / self.counts[column].replace(0, np.nan)).sort_index()
+        return values.astype(grouped_dtype(dtype)) if dtype is not None else values
+
+    def binned_mean(self, column, bins, dtype=None, **kwargs):
+        # For sums keyed by the values of a numeric column: the mean per
+        # pd.cut(values, bins, **kwargs) interval. Binning the distinct values
+        # lets the edges (quantiles, min/max ranges) change as data arrives.
+        values = pd.Series(self.sums.index.to_numpy(dtype=np.float64), index=self.sums.index, name=self.sums.index.name)
+        intervals = pd.cut(values, bins, **kwargs)
+        sums = self.sums[column].groupby(intervals, observed=True).sum()
+        counts = self.counts[column].groupby(intervals, observed=True).sum()
+        means = sums / counts.replace(0, np.nan)
+        return means.astype(grouped_dtype(dtype)) if dtype is not None else means
+
+
+# ===============================
+# Fused in-memory group aggregates
+# ===============================
+class GroupPlan:
+    # Collects every (key, column) a report groups by, then answers all of
+    # them in one run: each key is factorized once (categoricals reuse their
+    # codes), each column is converted once, and every pair is one
+    # np.bincount for counts and one for sums. Results match
+    # frame.groupby(key, observed=True)[column].mean() / .sum(), except that
+    # float32 columns are summed in float64 like GroupSums. Keys are column
+    # names, lists of them, or Series aligned with the frame (e.g. pd.cut
+    # bins); columns are names or named Series (derived values).
+    def __init__(self, frame):
+        self.frame = frame
+        self.keys = {}
+        self.columns = {}
+        self.wanted = {}
+        self.results = {}
+
+    def add(self, key, columns, name=None):
+        # name is how results are looked up; defaults to the key's name(s).
+        if name is None:
+            name = tuple(key) if isinstance(key, list) else key if isinstance(key, str) else key.name
+        self.keys[name] = key
+        for column in columns:
+            label = column if isinstance(column, str) else column.name
+            self.columns.setdefault(label, column)
+            self.wanted.setdefault(label, []).append(name)
+        return self
+
+    def key_codes(self, key):
+        # (codes with missing keys in an extra last bin, number of groups, group index)
+        if isinstance(key, list):
+            parts = [self.key_codes(part) for part in key]
+            codes, size = np.zeros(len(self.frame), dtype=np.intp), 1
+            missing = np.zeros(len(self.frame), dtype=bool)
+            for part_codes, part_size, _ in parts:
+                missing |= part_codes == part_size
+                codes = codes * part_size + part_codes
+                size *= part_size
+            codes[missing] = -1
+            codes, combined = pd.factorize(codes, sort=True)
+            if len(combined) and combined[0] == -1:
+                codes, combined = codes - 1, combined[1:]
+            arrays, rest = [], combined
+            for _, part_size, index in reversed(parts):
+                arrays.insert(0, index.take(rest % part_size))
+                rest = rest // part_size
+            index = pd.MultiIndex.from_arrays(arrays, names=key)
+            return np.where(codes < 0, len(index), codes), len(index), index
+        values = self.frame[key] if isinstance(key, str) else key
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            codes = values.cat.codes.to_numpy().astype(np.intp)
+            index = pd.CategoricalIndex(values.cat.categories, dtype=values.dtype, name=values.name)
+        else:
+            codes, uniques = pd.factorize(values, sort=True)
+            index = pd.Index(uniques, name=values.name)
+        return np.where(codes < 0, len(index), codes), len(index), index
+
+    def run(self):
+        codes = {name: self.key_codes(key) for name, key in self.keys.items()}
+        sizes = {name: np.bincount(bins, minlength=n + 1)[:n] for name, (bins, n, _) in codes.items()}
+        for label, column in self.columns.items():
+            values = self.frame[column] if isinstance(column, str) else column
+            x = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.flatnonzero(np.isnan(x))
+            if len(missing):
+                x = x.copy()  # may be a read-only view of a memory-mapped column
+                x[missing] = 0.0
+            for name in self.wanted[label]:
+                bins, n, index = codes[name]
+                seen = sizes[name] > 0
+                # Counts are the group sizes less the (usually few) missing values.
+                counts = sizes[name] - np.bincount(bins[missing], minlength=n + 1)[:n]
+                sums = np.bincount(bins, weights=x, minlength=n + 1)[:n]
+                self.results[name, label] = (index[seen], sums[seen], counts[seen], values.dtype)
+        # Only the results are kept, so a finished plan is small enough to memoize.
+        self.frame, self.keys, self.columns = None, {}, {}
+        return self
+
+    @property
+    def nbytes(self):
+        return sum(
+            index.memory_usage(deep=True) + sums.nbytes + counts.nbytes
+            for index, sums, counts, _ in self.results.values()
+        )
+
+    def sum(self, name, column):
+        index, sums, _, dtype = self.results[name, column]
+        return pd.Series(sums, index=index, name=column).astype(grouped_dtype(dtype, "sum"))
+
+    def mean(self, name, column):
+        index, sums, counts, dtype = self.results[name, column]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(counts > 0, sums / counts, np.nan)
+        return pd.Series(means, index=index, name=column).astype(grouped_dtype(dtype))
+
+    def table(self, name, columns, how="mean"):
+        # groupby(key)[columns].mean() / .sum() as one frame.
+        return pd.DataFrame({column: getattr(self, how)(name, column) for column in columns})
+
+
+# ===============================
+# Quantiles and top-k
+# ===============================
+class ValueCounts:
+    # Exact value counts per column, so quantiles match Series.quantile. Once
+    # a column holds more than max_distinct values its counts move into a
+    # QuantileSketch, which bounds memory at a small rank error.
+    def __init__(self, columns, max_distinct=200_000, error=None):
+        self.columns = list(columns)
+        self.max_distinct = max_distinct
+        self.error = error
+        self.counts = {col: pd.Series(dtype=np.float64) for col in self.columns}
+        self.sketches = {}
+
+    def update(self, frame):
+        for col in self.columns:
+            values = frame[col].dropna().astype(np.float64)
+            if col in self.sketches:
+                self.sketches[col].update(values.to_numpy())
+            else:
+                self.add_counts(col, values.value_counts(sort=False))
+        return self
+
+    def add_counts(self, col, counts):
+        if col in self.sketches:
+            self.sketches[col].update(counts.index.to_numpy(), counts.to_numpy())
+            return
+        merged = self.counts[col].add(counts, fill_value=0)
+        if len(merged) > self.max_distinct:
+            self.sketches[col] = QuantileSketch(self.error).update(merged.index.to_numpy(), merged.to_numpy())
+            merged = merged.iloc[:0]
+        self.counts[col] = merged
+
+    def merge(self, other):
+        for col in self.columns:
+            if col in other.sketches:
+                sketch = QuantileSketch(self.error).merge(other.sketches[col])
+                self.add_counts(col, pd.Series(dtype=np.float64))
+                if col in self.sketches:
+                    self.sketches[col].merge(sketch)
+                else:
+                    counts = self.counts[col]
+                    self.sketches[col] = sketch.update(counts.index.to_numpy(), counts.to_numpy())
+                    self.counts[col] = counts.iloc[:0]
+            else:
+                self.add_counts(col, other.counts[col])
+        return self
+
+    def quantile(self, column, q):
+        if column in self.sketches:
+            return self.sketches[column].quantile(q)
+        counts = self.counts[column].sort_index()
+        return weighted_quantile(counts.index.to_numpy(dtype=np.float64), counts.to_numpy(), q)
+
+
+def significant(values, digits):
+    with np.errstate(divide="ignore"):
+        scale = np.floor(np.log10(np.abs(np.where(values == 0, 1, values))))
+    factor = 10.0 ** (digits - 1 - scale)
+    return np.round(values * factor) / factor
+
+
+def weighted_quantile(values, weights, q):
+    # Linear interpolation between order statistics, like pandas, for sorted
+    # values that each stand for `weights` rows.
+    if len(values) == 0:
+        return np.full(np.size(q), np.nan)
+    upper = np.cumsum(weights)
+    position = np.asarray(q, dtype=np.float64) * (upper[-1] - 1)
+    low = np.floor(position)
+    below = values[np.searchsorted(upper, low, side="right")]
+    above = values[np.searchsorted(upper, np.minimum(low + 1, upper[-1] - 1), side="right")]
+    return below + (above - below) * (position - low)
+
+
+# ===============================
+# Quantile sketches
+# ===============================
+def env_sketch_error():
+    # DATA_SKETCH_ERROR is the rank error sketches are sized for, as a share
+    # of the rows (default 0.001: a median lands between the 49.9% and 50.1%
+    # values).
+    return float(os.environ.get("DATA_SKETCH_ERROR", "0.001"))
+
+
+class QuantileSketch:
+    # KLL sketch of one column: level h holds items that each stand for 2**h
+    # values. A level over its capacity is sorted and every other item
+    # (random start) moves up a level, so the sketch keeps O(1/error) items
+    # however many values pass through. Sketches of chunks, groups or
+    # workers merge by pooling their levels. min and max are kept exactly.
+    def __init__(self, error=None, seed=0):
+        self.error = env_sketch_error() if error is None else error
+        # k = 3 / error keeps the rank error under `error` on 1M-row streams.
+        self.k = max(16, int(np.ceil(3 / self.error)))
+        self.levels = [np.empty(0)]
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.rng = np.random.default_rng(seed)
+
+    def update(self, values, counts=None):
+        # counts gives each value's multiplicity (e.g. from value_counts); a
+        # count is split over the levels of its binary digits.
+        values = np.asarray(values, dtype=np.float64)
+        present = ~np.isnan(values)
+        values = values[present]
+        if len(values) == 0:
+            return self
+        if counts is None:
+            self.add(0, values)
+            self.count += len(values)
+        else:
+            counts = np.asarray(counts, dtype=np.int64)[present]
+            for h in range(int(counts.max()).bit_length()):
+                self.add(h, values[(counts >> h) & 1 == 1])
+            self.count += int(counts.sum())
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        return self.compress()
+
+    def merge(self, other):
+        for h, level in enumerate(other.levels):
+            self.add(h, level)
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self.compress()
+
+    def add(self, h, values):
+        while len(self.levels) <= h:
+            self.levels.append(np.empty(0))
+        self.levels[h] = np.concatenate([self.levels[h], values])
+
+    def capacity(self, h):
+        # Lower levels get geometrically less room (KLL's 2/3 decay).
+        return max(8, int(self.k * (2 / 3) ** (len(self.levels) - 1 - h)))
+
+    def compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self.capacity(h):
+                level = np.sort(self.levels[h])
+                odd = len(level) % 2
+                self.levels[h] = level[:odd]
+                self.add(h + 1, level[odd + self.rng.integers(2) :: 2])
+            h += 1
+        return self
+
+    def items(self):
+        # Retained values in order, with the number of values each stands for.
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2**h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values, kind="stable")
+        return values[order], weights[order]
+
+    def quantile(self, q):
+        values, weights = self.items()
+        result = weighted_quantile(values, weights, q)
+        q = np.asarray(q, dtype=np.float64)
+        return np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+
+    @property
+    def nbytes(self):
+        return sum(level.nbytes for level in self.levels)
+
+
+class GroupQuantiles:
+    # A QuantileSketch of one column per group (keys as for GroupSums), for
+    # per-group medians, quartiles and boxplot whiskers.
+    def __init__(self, column, error=None):
+        self.column = column
+        self.error = error
+        self.sketches = {}
+
+    def update(self, frame, keys):
+        for key, values in frame.groupby(keys, observed=True)[self.column]:
+            if key not in self.sketches:
+                self.sketches[key] = QuantileSketch(self.error)
+            self.sketches[key].update(values.to_numpy(dtype=np.float64, na_value=np.nan))
+        return self
+
+    def merge(self, other):
+        for key, sketch in other.sketches.items():
+            if key not in self.sketches:
+                self.sketches[key] = QuantileSketch(self.error)
+            self.sketches[key].merge(sketch)
+        return self
+
+    def quantile(self, q):
+        return pd.DataFrame({key: sketch.quantile(q) for key, sketch in self.sketches.items()}, index=np.atleast_1d(q)).T
+
+    def box_stats(self, order=None, whis=1.5, frame=None, keys=None):
+        # Boxes for matplotlib's Axes.bxp, like seaborn's boxplot: quartiles,
+        # median, and whiskers at the most extreme value within whis * IQR of
+        # the box. order picks the groups (those without rows are skipped).
+        # Given the frame the sketches were built from (and its single key
+        # column), one pass over it makes the whiskers exact and collects the
+        # values beyond them as fliers; otherwise the whiskers come from the
+        # retained sketch items and there are no fliers.
+        order = [key for key in (self.sketches if order is None else order) if key in self.sketches]
+        stats = []
+        for key in order:
+            sketch = self.sketches[key]
+            q1, med, q3 = sketch.quantile([0.25, 0.5, 0.75])
+            values = np.concatenate([[sketch.min, sketch.max], sketch.items()[0]])
+            low, high = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+            inside = values[(values >= low) & (values <= high)]
+            whislo, whishi = (inside.min(), inside.max()) if len(inside) else (q1, q3)
+            stats.append({"label": key, "q1": q1, "med": med, "q3": q3, "whislo": whislo, "whishi": whishi, "fliers": []})
+        if frame is None or not stats:
+            return stats
+        group = pd.Index(order).get_indexer(frame[keys])
+        values = frame[self.column].to_numpy(dtype=np.float64, na_value=np.nan)
+        rows = (group >= 0) & ~np.isnan(values)
+        group, values = group[rows], values[rows]
+        q1, q3 = (np.array([box[name] for box in stats]) for name in ("q1", "q3"))
+        inside = (values >= (q1 - whis * (q3 - q1))[group]) & (values <= (q3 + whis * (q3 - q1))[group])
+        whislo = np.full(len(stats), np.inf)
+        whishi = np.full(len(stats), -np.inf)
+        np.minimum.at(whislo, group[inside], values[inside])
+        np.maximum.at(whishi, group[inside], values[inside])
+        outside = np.argsort(group[~inside], kind="stable")
+        bounds = np.searchsorted(group[~inside][outside], np.arange(len(stats) + 1))
+        fliers = values[~inside][outside]
+        for i, box in enumerate(stats):
+            if np.isfinite(whislo[i]):
+                box["whislo"], box["whishi"] = whislo[i], whishi[i]
+            box["fliers"] = fliers[bounds[i] : bounds[i + 1]]
+        return stats
+
+    @property
+    def nbytes(self):
+        return sum(sketch.nbytes for sketch in self.sketches.values())
+
+
+class TopRows:
+    # Rows with the n largest values of a column, kept as the chunks stream by.
+    def __init__(self, n, column):
+        self.n = n
+        self.column = column
+        self.rows = None
+
+    def update(self, frame):
+        best = frame.nlargest(self.n, self.column)
+        self.rows = best if self.rows is None else pd.concat([self.rows, best]).nlargest(self.n, self.column)
+        return self
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+from load_utils import float64_view, iter_typed_csv
+from schema import dataset_schema
+from stats_utils import CoMoments, GroupSums, Moments, ValueCounts, as_scalar
+
+# Out-of-core version of HappinessDataAnalysis.all_analysis: RunningReport
+# keeps only mergeable partial aggregates, so the CSV can be streamed through
+# it in chunks and appended rows (HappinessDataAnalysis.append_data) cost
+# O(new rows).
+numeric_cols = [
+    "Happiness_Score",
+    "GDP_Per_Capita",
+    "Social_Support",
+    "Healthy_Life_Expectancy",
+    "Freedom_To_Make_Life_Choices",
+    "Generosity",
+    "Perceptions_Of_Corruption",
+    "Positive_Affect",
+    "Negative_Affect",
+    "Confidence_In_Government",
+]
+series_cols = ["Happiness_Score", "Positive_Affect", "Negative_Affect"]
+country_cols = [
+    ("Happiness_Score", "Top 10 Countries by Average Happiness Score"),
+    ("GDP_Per_Capita", "Top 10 Countries by Avg GDP Per Capita"),
+    ("Social_Support", "Top 10 Countries by Avg Social Support"),
+    ("Healthy_Life_Expectancy", "Top 10 Countries by Healthy Life Expectancy"),
+]
+
+
+def add_derived(chunk):
+    chunk["Affect_Ratio"] = chunk["Positive_Affect"] / chunk["Negative_Affect"].replace(0, np.nan)
+    chunk["Happiness_to_GDP"] = chunk["Happiness_Score"] / chunk["GDP_Per_Capita"].replace(0, np.nan)
+    return chunk
+
+
+def describe(moments, quantiles, dtypes):
+    rows = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    table = {}
+    for i, col in enumerate(moments.columns):
+        q = quantiles.quantile(col, [0.25, 0.5, 0.75])
+        values = [moments.count[i], moments.mean[i], moments.std()[i], moments.min[i], *q, moments.max[i]]
+        dtype = "Float64" if pd.api.types.is_extension_array_dtype(dtypes[col]) else np.float64
+        table[col] = pd.Series(values, index=rows, dtype=dtype)
+    return pd.DataFrame(table)
+
+
+class RunningReport:
+    def __init__(self):
+        self.rows, self.columns, self.dtypes, self.missing = 0, None, None, None
+        self.moments = Moments(numeric_cols)
+        self.derived = Moments(["Affect_Ratio", "Happiness_to_GDP"])
+        self.derived_dtypes = None
+        self.quantiles = ValueCounts(numeric_cols)
+        self.comoments = CoMoments(numeric_cols)
+        self.by_country = GroupSums([col for col, _ in country_cols])
+        self.by_date = GroupSums(series_cols)
+        self.by_state = GroupSums(["Happiness_Score"])
+
+    def update(self, chunk):
+        # Columns of the first chunk define the report; later chunks are
+        # projected to them. float32 columns are summarized as float64, like
+        # all_analysis does. The caller's frame is not modified.
+        chunk = float64_view(chunk)
+        if self.columns is None:
+            self.columns, self.dtypes = list(chunk.columns), chunk.dtypes
+        chunk = chunk[self.columns]
+        self.rows += len(chunk)
+        missing = chunk.isna().sum()
+        self.missing = missing if self.missing is None else self.missing + missing
+        self.moments.update(chunk)
+        self.quantiles.update(chunk)
+        self.comoments.update(chunk)
+        self.by_country.update(chunk, "Country")
+        self.by_date.update(chunk, "Date")
+        self.by_state.update(chunk, ["Country", "State_Region"])
+        chunk = add_derived(chunk.copy(deep=False))
+        self.derived.update(chunk)
+        self.derived_dtypes = chunk[self.derived.columns].dtypes
+        return self
+
+    def print(self, title="chunked"):
+        if self.dtypes is None:
+            print("⚠️ No rows to report.")
+            return
+        rows, dtypes, missing = self.rows, self.dtypes, self.missing
+        derived = dict(zip(self.derived.columns, self.derived.mean))
+        print(f"\n--- All Analysis ({title}) ---")
+
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", (rows, len(dtypes)))
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", describe(self.moments, self.quantiles, dtypes))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. Country-level Analysis
+        # ===============================
+        for col, label in country_cols:
+            means = self.by_country.mean(col, dtypes[col]).sort_values(ascending=False)
+            print(f"\n{label}:\n", means.head(10))
+
+        # ===============================
+        # 3. Time Series Analysis
+        # ===============================
+        time_series = pd.DataFrame({col: self.by_date.mean(col, dtypes[col]) for col in series_cols})
+        print("\nOverall Time Series (first 10 rows):\n", time_series.head(10))
+        time_series["Daily_Happiness_Change"] = time_series["Happiness_Score"].diff()
+        print(
+            "\nDaily Change in Happiness Score (first 10 rows):\n",
+            time_series["Daily_Happiness_Change"].head(10),
+        )
+
+        # ===============================
+        # 4. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", self.comoments.corr())
+
+        # ===============================
+        # 5. Region-level Analysis
+        # ===============================
+        state_happiness = self.by_state.mean("Happiness_Score", dtypes["Happiness_Score"]).sort_values(ascending=False)
+        print("\nTop 10 States/Regions by Average Happiness Score:\n", state_happiness.head(10))
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        affect = as_scalar(derived["Affect_Ratio"], self.derived_dtypes["Affect_Ratio"])
+        print("\nGlobal Average Positive/Negative Affect Ratio:", affect)
+        happiness_to_gdp = as_scalar(derived["Happiness_to_GDP"], self.derived_dtypes["Happiness_to_GDP"])
+        print("Global Average Happiness-to-GDP Ratio:", happiness_to_gdp)
+
+
+def chunked_report(file_path, chunk_size=1_000_000, columns=None, filters=None):
+    # columns / filters as in load_utils.read_typed_csv, applied to every chunk.
+    report = RunningReport()
+    for chunk in iter_typed_csv(file_path, dataset_schema, chunk_size, columns, filters):
+        report.update(chunk)
+    if report.dtypes is None:
+        print("⚠️ Data file is empty.")
+        return
+    report.print()
+    return report
@@ -1,374 +1,457 @@
 import pandas as pd
 import numpy as np
 import random
+from functools import partial
+from generate_utils import (
+    append_rows,
+    apply_dirty_args,
+    apply_output_args,
+    build_parser,
+    csv_output,
+    date_lookup,
+    dirty_config,
+    draw_nested,
+    generate_frame,
+    nested_lookup,
+    record_ids,
+    set_missing,
+    write_chunked,
+    write_frame,
+    write_sharded,
+)
 
 file_name = "global_happiness_report.csv"
 
-try:
-    np.random.seed(789)
-    random.seed(789)
+default_rows = 16000
+default_seed = 789
 
-    n_rows = 16000
+countries = [
+    "USA",
+    "India",
+    "Brazil",
+    "UK",
+    "France",
+    "Germany",
+    "Italy",
+    "Spain",
+    "Russia",
+    "China",
+    "Japan",
+    "South Korea",
+    "Canada",
+    "Australia",
+    "Mexico",
+    "South Africa",
+    "Turkey",
+    "Iran",
+]
+
+usa_states = [
+    "California",
+    "Texas",
+    "Florida",
+    "New York",
+    "Illinois",
+    "Pennsylvania",
+    "Ohio",
+    "Georgia",
+    "North Carolina",
+    "Michigan",
+    "Washington",
+    "Colorado",
+    "Virginia",
+    "Massachusetts",
+    "Arizona",
+]
+india_states = [
+    "Maharashtra",
+    "Tamil Nadu",
+    "Kerala",
+    "Karnataka",
+    "Andhra Pradesh",
+    "Uttar Pradesh",
+    "Delhi",
+    "West Bengal",
+    "Rajasthan",
+    "Gujarat",
+    "Madhya Pradesh",
+    "Bihar",
+    "Punjab",
+    "Haryana",
+    "Odisha",
+]
+brazil_states = [
+    "Sao Paulo",
+    "Rio de Janeiro",
+    "Minas Gerais",
+    "Bahia",
+    "Parana",
+    "Rio Grande do Sul",
+    "Pernambuco",
+    "Ceara",
+    "Santa Catarina",
+    "Goias",
+    "Maranhao",
+    "Para",
+    "Amazonas",
+    "Espirito Santo",
+    "Paraiba",
+]
+uk_regions = [
+    "England",
+    "Scotland",
+    "Wales",
+    "Northern Ireland",
+    "London",
+    "South East",
+    "North West",
+    "East of England",
+    "West Midlands",
+    "South West",
+    "Yorkshire",
+    "East Midlands",
+    "North East",
+]
+france_regions = [
+    "Ile-de-France",
+    "Auvergne-Rhone-Alpes",
+    "Provence-Alpes-Cote d'Azur",
+    "Hauts-de-France",
+    "Grand Est",
+    "Occitanie",
+    "Pays de la Loire",
+    "Brittany",
+    "Normandy",
+    "Nouvelle-Aquitaine",
+    "Centre-Val de Loire",
+    "Bourgogne-Franche-Comte",
+    "Corsica",
+]
+germany_states = [
+    "North Rhine-Westphalia",
+    "Bavaria",
+    "Baden-Wurttemberg",
+    "Lower Saxony",
+    "Hesse",
+    "Saxony",
+    "Rhineland-Palatinate",
+    "Berlin",
+    "Schleswig-Holstein",
+    "Hamburg",
+    "Brandenburg",
+    "Mecklenburg-Vorpommern",
+    "Saarland",
+    "Thuringia",
+    "Saxony-Anhalt",
+]
+italy_regions = [
+    "Lombardy",
+    "Lazio",
+    "Campania",
+    "Veneto",
+    "Emilia-Romagna",
+    "Piedmont",
+    "Sicily",
+    "Apulia",
+    "Tuscany",
+    "Calabria",
+    "Liguria",
+    "Marche",
+    "Abruzzo",
+    "Umbria",
+    "Basilicata",
+    "Molise",
+    "Trentino",
+    "Friuli",
+    "Valle d'Aosta",
+]
+spain_regions = [
+    "Madrid",
+    "Catalonia",
+    "Andalusia",
+    "Valencia",
+    "Castile and Leon",
+    "Basque Country",
+    "Castilla-La Mancha",
+    "Galicia",
+    "Aragon",
+    "Murcia",
+    "Asturias",
+    "Extremadura",
+    "Balearic Islands",
+    "Canary Islands",
+    "Cantabria",
+    "Navarre",
+    "La Rioja",
+]
+russia_regions = [
+    "Moscow",
+    "Saint Petersburg",
+    "Moscow Oblast",
+    "Krasnodar Krai",
+    "Sverdlovsk Oblast",
+    "Rostov Oblast",
+    "Republic of Bashkortostan",
+    "Republic of Tatarstan",
+    "Chelyabinsk Oblast",
+    "Novosibirsk Oblast",
+    "Nizhny Novgorod Oblast",
+    "Samara Oblast",
+    "Krasnoyarsk Krai",
+    "Irkutsk Oblast",
+    "Volgograd Oblast",
+]
+china_provinces = [
+    "Hubei",
+    "Guangdong",
+    "Henan",
+    "Zhejiang",
+    "Hunan",
+    "Anhui",
+    "Jiangxi",
+    "Jiangsu",
+    "Chongqing",
+    "Sichuan",
+    "Shandong",
+    "Hebei",
+    "Fujian",
+    "Shaanxi",
+    "Guangxi",
+    "Heilongjiang",
+    "Yunnan",
+    "Jilin",
+    "Liaoning",
+    "Shanxi",
+]
+japan_prefectures = [
+    "Tokyo",
+    "Osaka",
+    "Kanagawa",
+    "Aichi",
+    "Saitama",
+    "Chiba",
+    "Hyogo",
+    "Hokkaido",
+    "Fukuoka",
+    "Kyoto",
+    "Hiroshima",
+    "Niigata",
+    "Miyagi",
+    "Nagano",
+    "Gifu",
+    "Ibaraki",
+    "Shizuoka",
+    "Okayama",
+    "Kumamoto",
+    "Tochigi",
+]
+sk_provinces = [
+    "Seoul",
+    "Busan",
+    "Incheon",
+    "Daegu",
+    "Daejeon",
+    "Gwangju",
+    "Ulsan",
+    "Gyeonggi",
+    "Gangwon",
+    "Chungcheong",
+    "Jeolla",
+    "Gyeongsang",
+    "Jeju",
+]
+canada_provinces = [
+    "Ontario",
+    "Quebec",
+    "British Columbia",
+    "Alberta",
+    "Manitoba",
+    "Saskatchewan",
+    "Nova Scotia",
+    "New Brunswick",
+    "Newfoundland and Labrador",
+    "Prince Edward Island",
+    "Yukon",
+    "Northwest Territories",
+    "Nunavut",
+]
+australia_states = [
+    "New South Wales",
+    "Victoria",
+    "Queensland",
+    "Western Australia",
+    "South Australia",
+    "Tasmania",
+    "Australian Capital Territory",
+    "Northern Territory",
+]
+mexico_states = [
+    "Mexico City",
+    "State of Mexico",
+    "Jalisco",
+    "Nuevo Leon",
+    "Guanajuato",
+    "Puebla",
+    "Veracruz",
+    "Baja California",
+    "Chihuahua",
+    "Sonora",
+    "Tamaulipas",
+    "Coahuila",
+    "Michoacan",
+    "Guerrero",
+    "Oaxaca",
+    "Chiapas",
+    "Sinaloa",
+    "Durango",
+    "San Luis Potosi",
+    "Zacatecas",
+]
+sa_provinces = [
+    "Gauteng",
+    "Western Cape",
+    "KwaZulu-Natal",
+    "Eastern Cape",
+    "Free State",
+    "Mpumalanga",
+    "North West",
+    "Limpopo",
+    "Northern Cape",
+]
+turkey_provinces = [
+    "Istanbul",
+    "Ankara",
+    "Izmir",
+    "Bursa",
+    "Antalya",
+    "Konya",
+    "Adana",
+    "Gaziantep",
+    "Kocaeli",
+    "Mersin",
+    "Kayseri",
+    "Diyarbakir",
+    "Hatay",
+    "Manisa",
+    "Samsun",
+    "Balikesir",
+    "Kahramanmaras",
+    "Van",
+    "Eskisehir",
+    "Malatya",
+]
+iran_provinces = [
+    "Tehran",
+    "Isfahan",
+    "Razavi Khorasan",
+    "Fars",
+    "East Azerbaijan",
+    "Mazandaran",
+    "Alborz",
+    "Kerman",
+    "Gilan",
+    "Golestan",
+    "West Azerbaijan",
+    "Kermanshah",
+    "Lorestan",
+    "Hormozgan",
+    "Sistan and Baluchestan",
+    "Qom",
+    "Kurdistan",
+    "Hamadan",
+    "Yazd",
+    "Ardabil",
+]
+
+country_states = {
+    "USA": usa_states,
+    "India": india_states,
+    "Brazil": brazil_states,
+    "UK": uk_regions,
+    "France": france_regions,
+    "Germany": germany_states,
+    "Italy": italy_regions,
+    "Spain": spain_regions,
+    "Russia": russia_regions,
+    "China": china_provinces,
+    "Japan": japan_prefectures,
+    "South Korea": sk_provinces,
+    "Canada": canada_provinces,
+    "Australia": australia_states,
+    "Mexico": mexico_states,
+    "South Africa": sa_provinces,
+    "Turkey": turkey_provinces,
+    "Iran": iran_provinces,
+}
+
+numeric_columns = [
+    "Happiness_Score",
+    "GDP_Per_Capita",
+    "Social_Support",
+    "Healthy_Life_Expectancy",
+    "Freedom_To_Make_Life_Choices",
+    "Generosity",
+    "Perceptions_Of_Corruption",
+    "Positive_Affect",
+    "Negative_Affect",
+    "Confidence_In_Government",
+]
+
+# Duplicate / missing-value rates of the original script, per generated row.
+duplicate_rate = (100 / default_rows, 200 / default_rows)
+missing_rate = (1000 / default_rows, 3000 / default_rows)
+dirty_data = dirty_config(numeric_columns, duplicate_rate, missing_rate)
+
+# Natural partition key for --partition (see generate_utils.output_config).
+partition_by = ("Country", None)
+
+# Default correlation structure of the --correlated generator (unlisted pairs
+# are uncorrelated) and the share of each factor's variance that comes from a
+# per-country latent effect.
+factor_correlations = {
+    ("Happiness_Score", "GDP_Per_Capita"): 0.7,
+    ("Happiness_Score", "Social_Support"): 0.65,
+    ("Happiness_Score", "Healthy_Life_Expectancy"): 0.6,
+    ("Happiness_Score", "Freedom_To_Make_Life_Choices"): 0.5,
+    ("Happiness_Score", "Generosity"): 0.15,
+    ("Happiness_Score", "Perceptions_Of_Corruption"): -0.4,
+    ("Happiness_Score", "Positive_Affect"): 0.5,
+    ("Happiness_Score", "Negative_Affect"): -0.4,
+    ("Happiness_Score", "Confidence_In_Government"): 0.3,
+    ("GDP_Per_Capita", "Social_Support"): 0.55,
+    ("GDP_Per_Capita", "Healthy_Life_Expectancy"): 0.7,
+    ("GDP_Per_Capita", "Freedom_To_Make_Life_Choices"): 0.35,
+    ("GDP_Per_Capita", "Perceptions_Of_Corruption"): -0.35,
+    ("GDP_Per_Capita", "Positive_Affect"): 0.3,
+    ("Social_Support", "Healthy_Life_Expectancy"): 0.5,
+    ("Social_Support", "Freedom_To_Make_Life_Choices"): 0.4,
+    ("Social_Support", "Positive_Affect"): 0.4,
+    ("Healthy_Life_Expectancy", "Freedom_To_Make_Life_Choices"): 0.3,
+    ("Healthy_Life_Expectancy", "Positive_Affect"): 0.3,
+    ("Freedom_To_Make_Life_Choices", "Positive_Affect"): 0.45,
+    ("Freedom_To_Make_Life_Choices", "Perceptions_Of_Corruption"): -0.3,
+    ("Freedom_To_Make_Life_Choices", "Confidence_In_Government"): 0.35,
+    ("Positive_Affect", "Negative_Affect"): -0.4,
+    ("Perceptions_Of_Corruption", "Confidence_In_Government"): -0.45,
+}
+country_share = 0.3
+
+# ===============================
+# Lookup arrays (index-coded countries, regions and dates)
+# ===============================
+country_levels = np.array(countries)
+state_levels, state_codes, state_offsets, state_counts = nested_lookup(country_states)
+date_levels = date_lookup(range(2015, 2025), range(1, 13))
+
+
+# ===============================
+# Original generator (exact global_happiness_report.csv for seed 789)
+# ===============================
+def generate_legacy(n_rows=default_rows, seed=default_seed):
+    np.random.seed(seed)
+    random.seed(seed)
 
     record_ids = [f"HAPPY_{str(i).zfill(6)}" for i in range(1, n_rows + 1)]
-    countries = [
-        "USA",
-        "India",
-        "Brazil",
-        "UK",
-        "France",
-        "Germany",
-        "Italy",
-        "Spain",
-        "Russia",
-        "China",
-        "Japan",
-        "South Korea",
-        "Canada",
-        "Australia",
-        "Mexico",
-        "South Africa",
-        "Turkey",
-        "Iran",
-    ]
-
-    usa_states = [
-        "California",
-        "Texas",
-        "Florida",
-        "New York",
-        "Illinois",
-        "Pennsylvania",
-        "Ohio",
-        "Georgia",
-        "North Carolina",
-        "Michigan",
-        "Washington",
-        "Colorado",
-        "Virginia",
-        "Massachusetts",
-        "Arizona",
-    ]
-    india_states = [
-        "Maharashtra",
-        "Tamil Nadu",
-        "Kerala",
-        "Karnataka",
-        "Andhra Pradesh",
-        "Uttar Pradesh",
-        "Delhi",
-        "West Bengal",
-        "Rajasthan",
-        "Gujarat",
-        "Madhya Pradesh",
-        "Bihar",
-        "Punjab",
-        "Haryana",
-        "Odisha",
-    ]
-    brazil_states = [
-        "Sao Paulo",
-        "Rio de Janeiro",
-        "Minas Gerais",
-        "Bahia",
-        "Parana",
-        "Rio Grande do Sul",
-        "Pernambuco",
-        "Ceara",
-        "Santa Catarina",
-        "Goias",
-        "Maranhao",
-        "Para",
-        "Amazonas",
-        "Espirito Santo",
-        "Paraiba",
-    ]
-    uk_regions = [
-        "England",
-        "Scotland",
-        "Wales",
-        "Northern Ireland",
-        "London",
-        "South East",
-        "North West",
-        "East of England",
-        "West Midlands",
-        "South West",
-        "Yorkshire",
-        "East Midlands",
-        "North East",
-    ]
-    france_regions = [
-        "Ile-de-France",
-        "Auvergne-Rhone-Alpes",
-        "Provence-Alpes-Cote d'Azur",
-        "Hauts-de-France",
-        "Grand Est",
-        "Occitanie",
-        "Pays de la Loire",
-        "Brittany",
-        "Normandy",
-        "Nouvelle-Aquitaine",
-        "Centre-Val de Loire",
-        "Bourgogne-Franche-Comte",
-        "Corsica",
-    ]
-    germany_states = [
-        "North Rhine-Westphalia",
-        "Bavaria",
-        "Baden-Wurttemberg",
-        "Lower Saxony",
-        "Hesse",
-        "Saxony",
-        "Rhineland-Palatinate",
-        "Berlin",
-        "Schleswig-Holstein",
-        "Hamburg",
-        "Brandenburg",
-        "Mecklenburg-Vorpommern",
-        "Saarland",
-        "Thuringia",
-        "Saxony-Anhalt",
-    ]
-    italy_regions = [
-        "Lombardy",
-        "Lazio",
-        "Campania",
-        "Veneto",
-        "Emilia-Romagna",
-        "Piedmont",
-        "Sicily",
-        "Apulia",
-        "Tuscany",
-        "Calabria",
-        "Liguria",
-        "Marche",
-        "Abruzzo",
-        "Umbria",
-        "Basilicata",
-        "Molise",
-        "Trentino",
-        "Friuli",
-        "Valle d'Aosta",
-    ]
-    spain_regions = [
-        "Madrid",
-        "Catalonia",
-        "Andalusia",
-        "Valencia",
-        "Castile and Leon",
-        "Basque Country",
-        "Castilla-La Mancha",
-        "Galicia",
-        "Aragon",
-        "Murcia",
-        "Asturias",
-        "Extremadura",
-        "Balearic Islands",
-        "Canary Islands",
-        "Cantabria",
-        "Navarre",
-        "La Rioja",
-    ]
-    russia_regions = [
-        "Moscow",
-        "Saint Petersburg",
-        "Moscow Oblast",
-        "Krasnodar Krai",
-        "Sverdlovsk Oblast",
-        "Rostov Oblast",
-        "Republic of Bashkortostan",
-        "Republic of Tatarstan",
-        "Chelyabinsk Oblast",
-        "Novosibirsk Oblast",
-        "Nizhny Novgorod Oblast",
-        "Samara Oblast",
-        "Krasnoyarsk Krai",
-        "Irkutsk Oblast",
-        "Volgograd Oblast",
-    ]
-    china_provinces = [
-        "Hubei",
-        "Guangdong",
-        "Henan",
-        "Zhejiang",
-        "Hunan",
-        "Anhui",
-        "Jiangxi",
-        "Jiangsu",
-        "Chongqing",
-        "Sichuan",
-        "Shandong",
-        "Hebei",
-        "Fujian",
-        "Shaanxi",
-        "Guangxi",
-        "Heilongjiang",
-        "Yunnan",
-        "Jilin",
-        "Liaoning",
-        "Shanxi",
-    ]
-    japan_prefectures = [
-        "Tokyo",
-        "Osaka",
-        "Kanagawa",
-        "Aichi",
-        "Saitama",
-        "Chiba",
-        "Hyogo",
-        "Hokkaido",
-        "Fukuoka",
-        "Kyoto",
-        "Hiroshima",
-        "Niigata",
-        "Miyagi",
-        "Nagano",
-        "Gifu",
-        "Ibaraki",
-        "Shizuoka",
-        "Okayama",
-        "Kumamoto",
-        "Tochigi",
-    ]
-    sk_provinces = [
-        "Seoul",
-        "Busan",
-        "Incheon",
-        "Daegu",
-        "Daejeon",
-        "Gwangju",
-        "Ulsan",
-        "Gyeonggi",
-        "Gangwon",
-        "Chungcheong",
-        "Jeolla",
-        "Gyeongsang",
-        "Jeju",
-    ]
-    canada_provinces = [
-        "Ontario",
-        "Quebec",
-        "British Columbia",
-        "Alberta",
-        "Manitoba",
-        "Saskatchewan",
-        "Nova Scotia",
-        "New Brunswick",
-        "Newfoundland and Labrador",
-        "Prince Edward Island",
-        "Yukon",
-        "Northwest Territories",
-        "Nunavut",
-    ]
-    australia_states = [
-        "New South Wales",
-        "Victoria",
-        "Queensland",
-        "Western Australia",
-        "South Australia",
-        "Tasmania",
-        "Australian Capital Territory",
-        "Northern Territory",
-    ]
-    mexico_states = [
-        "Mexico City",
-        "State of Mexico",
-        "Jalisco",
-        "Nuevo Leon",
-        "Guanajuato",
-        "Puebla",
-        "Veracruz",
-        "Baja California",
-        "Chihuahua",
-        "Sonora",
-        "Tamaulipas",
-        "Coahuila",
-        "Michoacan",
-        "Guerrero",
-        "Oaxaca",
-        "Chiapas",
-        "Sinaloa",
-        "Durango",
-        "San Luis Potosi",
-        "Zacatecas",
-    ]
-    sa_provinces = [
-        "Gauteng",
-        "Western Cape",
-        "KwaZulu-Natal",
-        "Eastern Cape",
-        "Free State",
-        "Mpumalanga",
-        "North West",
-        "Limpopo",
-        "Northern Cape",
-    ]
-    turkey_provinces = [
-        "Istanbul",
-        "Ankara",
-        "Izmir",
-        "Bursa",
-        "Antalya",
-        "Konya",
-        "Adana",
-        "Gaziantep",
-        "Kocaeli",
-        "Mersin",
-        "Kayseri",
-        "Diyarbakir",
-        "Hatay",
-        "Manisa",
-        "Samsun",
-        "Balikesir",
-        "Kahramanmaras",
-        "Van",
-        "Eskisehir",
-        "Malatya",
-    ]
-    iran_provinces = [
-        "Tehran",
-        "Isfahan",
-        "Razavi Khorasan",
-        "Fars",
-        "East Azerbaijan",
-        "Mazandaran",
-        "Alborz",
-        "Kerman",
-        "Gilan",
-        "Golestan",
-        "West Azerbaijan",
-        "Kermanshah",
-        "Lorestan",
-        "Hormozgan",
-        "Sistan and Baluchestan",
-        "Qom",
-        "Kurdistan",
-        "Hamadan",
-        "Yazd",
-        "Ardabil",
-    ]
-
-    country_states = {
-        "USA": usa_states,
-        "India": india_states,
-        "Brazil": brazil_states,
-        "UK": uk_regions,
-        "France": france_regions,
-        "Germany": germany_states,
-        "Italy": italy_regions,
-        "Spain": spain_regions,
-        "Russia": russia_regions,
-        "China": china_provinces,
-        "Japan": japan_prefectures,
-        "South Korea": sk_provinces,
-        "Canada": canada_provinces,
-        "Australia": australia_states,
-        "Mexico": mexico_states,
-        "South Africa": sa_provinces,
-        "Turkey": turkey_provinces,
-        "Iran": iran_provinces,
-    }
 
     selected_countries = []
     selected_states = []
@@ -437,32 +520,251 @@ try:
 
     duplicate_count = random.randint(100, 200)
     duplicate_indices = random.sample(range(n_rows), duplicate_count)
-    duplicates = df.iloc[duplicate_indices].copy()
-    df = pd.concat([df, duplicates], ignore_index=True)
-
-    numeric_columns = [
-        "Happiness_Score",
-        "GDP_Per_Capita",
-        "Social_Support",
-        "Healthy_Life_Expectancy",
-        "Freedom_To_Make_Life_Choices",
-        "Generosity",
-        "Perceptions_Of_Corruption",
-        "Positive_Affect",
-        "Negative_Affect",
-        "Confidence_In_Government",
-    ]
+    df = append_rows(df, duplicate_indices)
+
     empty_count = random.randint(1000, 3000)
     empty_indices = random.sample(range(len(df)), empty_count)
-    for idx in empty_indices:
-        col = random.choice(numeric_columns)
-        df.at[idx, col] = np.nan
-
-    df = df.sample(frac=1, random_state=789).reset_index(drop=True)
-except BaseException as e:
-    print(f"An error occurred: {e}")
-else:
-    df.to_csv(file_name, index=False)
-    print(f"Data successfully generated and saved as a CSV file named as \"{file_name}\"")
-finally:
-    print("Data generation process completed.")
+    empty_columns = [random.choice(numeric_columns) for _ in empty_indices]
+    df = set_missing(df, empty_indices, empty_columns)
+
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df
+
+
+# ===============================
+# Vectorized generator
+# ===============================
+def draw_keys(rng, n_rows):
+    country_idx = rng.integers(0, len(countries), n_rows).astype(np.int8)
+    state_idx = draw_nested(rng, country_idx, state_codes, state_offsets, state_counts)
+    date_idx = rng.integers(0, len(date_levels), n_rows)
+    return country_idx, state_idx, date_idx
+
+
+def draw_factors(rng, n_rows):
+    # The ten numeric factors with their original marginals, drawn
+    # independently, as an (n_rows x 10) matrix in numeric_columns order.
+    return np.column_stack(
+        [
+            np.round(rng.uniform(2.5, 8.5, n_rows), 3),
+            np.round(rng.lognormal(9.5, 0.8, n_rows), 2),
+            np.round(rng.beta(2, 1, n_rows) * 2, 3),
+            np.clip(np.round(rng.normal(65, 12, n_rows), 1), 45, 85),
+            np.round(rng.beta(3, 2, n_rows) * 1.5, 3),
+            np.clip(np.round(rng.normal(0, 0.3, n_rows), 3), -0.5, 0.5),
+            np.round(rng.beta(2, 3, n_rows), 3),
+            np.round(rng.beta(3, 2, n_rows), 3),
+            np.round(rng.beta(2, 3, n_rows), 3),
+            np.round(rng.beta(2, 3, n_rows), 3),
+        ]
+    )
+
+
+def build_frame(start, country_idx, state_idx, date_idx, factors):
+    return pd.DataFrame(
+        {
+            "Record_ID": record_ids("HAPPY_", start, len(factors)),
+            "Country": pd.Categorical.from_codes(country_idx, country_levels),
+            "State_Region": pd.Categorical.from_codes(state_idx, state_levels),
+            "Date": pd.Categorical.from_codes(date_idx, date_levels),
+            **dict(zip(numeric_columns, factors.T)),
+        }
+    )
+
+
+def generate_chunk(rng, start, n_rows):
+    country_idx, state_idx, date_idx = draw_keys(rng, n_rows)
+    return build_frame(start, country_idx, state_idx, date_idx, draw_factors(rng, n_rows))
+
+
+# ===============================
+# Correlated generator (Gaussian copula with per-country effects)
+# ===============================
+def correlation_matrix(columns, pairs):
+    # Builds a symmetric matrix from {(col_a, col_b): r} (unlisted pairs are
+    # 0) and returns its Cholesky factor; raises numpy.linalg.LinAlgError if
+    # the pairs do not form a valid correlation matrix.
+    index = {col: i for i, col in enumerate(columns)}
+    matrix = np.eye(len(columns))
+    for (a, b), r in pairs.items():
+        matrix[index[a], index[b]] = matrix[index[b], index[a]] = r
+    return np.linalg.cholesky(matrix)
+
+
+def reorder_by_rank(values, scores):
+    # Rearranges each column of `values` to follow the rank order of the
+    # matching column of `scores`, so the marginals stay exactly as drawn
+    # while the rank correlation comes from `scores` (Iman-Conover).
+    out = np.empty_like(values)
+    np.put_along_axis(out, np.argsort(scores, axis=0), np.sort(values, axis=0), axis=0)
+    return out
+
+
+def generate_correlated_chunk(rng, start, n_rows, factor, effects, country_share):
+    # One latent normal score per row and factor: a country effect plus
+    # row noise, both with correlation factor @ factor.T. The independently
+    # drawn marginals are then reordered to follow the scores' ranks.
+    country_idx, state_idx, date_idx = draw_keys(rng, n_rows)
+    noise = rng.standard_normal((n_rows, len(numeric_columns))) @ factor.T
+    scores = np.sqrt(country_share) * effects[country_idx] + np.sqrt(1 - country_share) * noise
+    factors = reorder_by_rank(draw_factors(rng, n_rows), scores)
+    return build_frame(start, country_idx, state_idx, date_idx, factors)
+
+
+def correlated_chunk(seed, pairs=factor_correlations, share=country_share):
+    # make_chunk for the generic writers. The country effects are drawn once
+    # from their own stream (entropy [seed, 1]) so all chunks and shards of a
+    # dataset share them.
+    factor = correlation_matrix(numeric_columns, pairs)
+    effects = np.random.default_rng([seed, 1]).standard_normal(
+        (len(countries), len(numeric_columns))
+    )
+    return partial(
+        generate_correlated_chunk,
+        factor=factor,
+        effects=effects @ factor.T,
+        country_share=share,
+    )
+
+
+def generate_fast(
+    n_rows=default_rows, seed=default_seed, dirty=dirty_data, make_chunk=generate_chunk
+):
+    return generate_frame(make_chunk, n_rows, seed, dirty)
+
+
+def write_streaming(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    chunk_size=1_000_000,
+    dirty=dirty_data,
+    make_chunk=generate_chunk,
+    output=csv_output,
+):
+    return write_chunked(
+        make_chunk, file_name, n_rows, seed, chunk_size, dirty, output=output
+    )
+
+
+def write_parallel(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    workers=4,
+    chunk_size=1_000_000,
+    merge=True,
+    dirty=dirty_data,
+    make_chunk=generate_chunk,
+    output=csv_output,
+):
+    return write_sharded(
+        make_chunk,
+        file_name,
+        n_rows,
+        seed,
+        workers,
+        chunk_size,
+        dirty,
+        merge,
+        output=output,
+    )
+
+
+# ===============================
+# In-process API
+# ===============================
+def generate(
+    n_rows=default_rows,
+    seed=default_seed,
+    fast=False,
+    dirty=dirty_data,
+    output=None,
+    correlated=False,
+    output_format=csv_output,
+):
+    # Returns the dataset as a DataFrame (the exact bundled dataset by
+    # default) and optionally also writes it to `output` (CSV unless
+    # output_format says otherwise).
+    # correlated=True uses the copula generator with the default structure.
+    if correlated:
+        df = generate_fast(n_rows, seed, dirty, correlated_chunk(seed))
+    elif fast:
+        df = generate_fast(n_rows, seed, dirty)
+    else:
+        df = generate_legacy(n_rows, seed)
+    if output is not None:
+        write_frame(df, output, output_format)
+    return df
+
+
+def main():
+    parser = build_parser(
+        "Generate the synthetic global happiness dataset.", file_name, default_rows, default_seed
+    )
+    parser.add_argument(
+        "--correlated",
+        action="store_true",
+        help="draw the numeric factors jointly (Gaussian copula with country effects)",
+    )
+    parser.add_argument("--country-share", type=float, default=country_share)
+    parser.add_argument(
+        "--correlation",
+        action="append",
+        default=[],
+        metavar="COL_A:COL_B=R",
+        help="override one pair of the --correlated structure (repeatable)",
+    )
+    args = parser.parse_args()
+
+    sample = generate_chunk(np.random.default_rng(0), 0, 1)
+    legacy = not (args.fast or args.chunked or args.workers or args.correlated)
+    dirty = apply_dirty_args(dirty_data, args, parser, sample, legacy)
+    output = apply_output_args(args, partition_by)
+    make_chunk = generate_chunk
+    df = None
+    try:
+        if args.correlated:
+            pairs = dict(factor_correlations)
+            for item in args.correlation:
+                cols, value = item.split("=", 1)
+                pairs[tuple(cols.split(":", 1))] = float(value)
+            make_chunk = correlated_chunk(args.seed, pairs, args.country_share)
+        if args.workers:
+            write_parallel(
+                args.output,
+                args.rows,
+                args.seed,
+                args.workers,
+                args.chunk_size,
+                not args.parts,
+                dirty,
+                make_chunk,
+                output,
+            )
+        elif args.chunked:
+            write_streaming(
+                args.output,
+                args.rows,
+                args.seed,
+                args.chunk_size,
+                dirty,
+                make_chunk,
+                output,
+            )
+        elif args.correlated:
+            df = generate_fast(args.rows, args.seed, dirty, make_chunk)
+        else:
+            df = generate(args.rows, args.seed, args.fast, dirty)
+    except BaseException as e:
+        print(f"An error occurred: {e}")
+    else:
+        if df is not None:
+            write_frame(df, args.output, output)
+        print(f"Data successfully generated and saved as a CSV file named as \"{args.output}\"")
+    finally:
+        print("Data generation process completed.")
+
+
+if __name__ == "__main__":
+    main()
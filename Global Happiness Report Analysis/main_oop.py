@@ -5,48 +5,115 @@ import seaborn as sns
 from time import sleep as delay
 from random import randint as rand
 import os
+from data_generate import generate
+from load_utils import (
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport
+from sql_analysis import sql_report
 
 
 class HappinessDataAnalysis:
+    # Columns each menu action reads; load_data only materializes these.
+    action_columns = {
+        "all_analysis": [
+            "Country",
+            "State_Region",
+            "Date",
+            "Happiness_Score",
+            "GDP_Per_Capita",
+            "Social_Support",
+            "Healthy_Life_Expectancy",
+            "Freedom_To_Make_Life_Choices",
+            "Generosity",
+            "Perceptions_Of_Corruption",
+            "Positive_Affect",
+            "Negative_Affect",
+            "Confidence_In_Government",
+        ],
+        "all_visualizations": [
+            "Country",
+            "Date",
+            "Happiness_Score",
+            "GDP_Per_Capita",
+            "Social_Support",
+            "Healthy_Life_Expectancy",
+            "Freedom_To_Make_Life_Choices",
+            "Generosity",
+            "Perceptions_Of_Corruption",
+            "Positive_Affect",
+            "Negative_Affect",
+            "Confidence_In_Government",
+        ],
+        "append_data": [dataset_schema["key"]],
+    }
+
     def __init__(self, file_path):
         self.file_path = file_path
         self.df = None
+        self.results = ResultCache()  # memoized tables of self.df, see memo_utils
+        self.running = None  # all_analysis aggregates kept by append_data
+        self.appended = []  # frames added by append_data, see collect_appended
+        self.key_indexes = []  # KeyIndex of the loaded rows and of each append
 
     # 1. Generate Data
     def generate_data(self):
-        if os.path.exists("data_generate.py") and not os.path.exists(
-            "global_happiness_report.csv"
-        ):
-            os.system("python data_generate.py")
-            print("✅ Data generated successfully.")
-        elif not os.path.exists("global_happiness_report.csv"):
-            print("❌ data already exists!")
-        elif not os.path.exists("data_generate.py"):
-            print("❌ data_generate.py not found!")
+        persist = not os.path.exists(self.file_path)
+        self.df = typed_frame(generate(output=self.file_path if persist else None), dataset_schema)
+        self.results.bump()
+        self.running = None
+        self.appended = []
+        print("✅ Data generated successfully.")
+        print("Shape:", self.df.shape)
+        if persist:
+            print(f"✅ Data saved to {self.file_path}.")
+        else:
+            print("⚠️ Data file already exists, generated data kept in memory only.")
 
     # 2. Load Data
-    def load_data(self):
-        if not os.path.exists(self.file_path):
+    def load_data(self, columns=None, filters=None, workers=None):
+        if not dataset_exists(self.file_path):
             print("⚠️ Data file not found!")
             return
 
-        self.df = pd.read_csv(self.file_path)
-        self.df["Date"] = pd.to_datetime(self.df["Date"], errors="coerce")
+        # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+        # workers > 1 parses large CSVs in that many processes.
+        columns = needed_columns(self.action_columns) if columns is None else columns
+        self.df = read_dataset(self.file_path, dataset_schema, columns, filters, workers=workers)
+        self.results.bump()
+        self.running = None
+        self.appended = []
         print("✅ Data loaded successfully.")
         print("Shape:", self.df.shape)
+        memory_report(self.df)
 
     # 3. Basic Info
     def basic_info(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
         print("\n--- Basic Info ---")
         print(self.df.info())
-        print("\nMissing Values:\n", self.df.isna().sum())
-        print("\nMissing Values (%):\n", (self.df.isna().sum() / len(self.df)) * 100)
+        print("\nMissing Values:\n", self.results.missing(self.df))
+        print("\nMissing Values (%):\n", (self.results.missing(self.df) / len(self.df)) * 100)
 
     # 4. Handle Missing Values
     def handle_missing_values(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
@@ -78,17 +145,16 @@ class HappinessDataAnalysis:
                     )
                     if func in ["mean", "median"]:
                         for col in numeric_cols:
-                            if func == "mean":
-                                self.df[col] = self.df[col].fillna(self.df[col].mean())
-                            else:
-                                self.df[col] = self.df[col].fillna(
-                                    self.df[col].median()
-                                )
+                            self.df[col] = fill_missing(self.df[col], func)
+                        self.results.bump()
+                        self.running = None
                         print(f"✅ Missing values filled using {func}.")
                     else:
                         print("❌ Invalid function!")
                 case 2:
                     self.df.dropna(inplace=True)
+                    self.results.bump()
+                    self.running = None
                     print("✅ Rows with missing values dropped.")
                 case 0:
                     print("No changes made.")
@@ -99,16 +165,21 @@ class HappinessDataAnalysis:
 
     # 5. All Analysis
     def all_analysis(self):
+        self.collect_appended()
         # ===============================
         # 1. Basic Info
         # ===============================
         if self.df is None:
             print("⚠️ Data not loaded. Please load data first.")
             return
-        df = self.df
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # Stats run on float64 copies of the float32 columns (see
+        # load_utils.float64_view), so they print without float32 noise.
+        df = float64_view(self.df)
         print("Dataset Shape:", df.shape)
         print("\nColumn Data Types:\n", df.dtypes)
-        print("\nMissing Values:\n", df.isna().sum())
+        print("\nMissing Values:\n", self.results.missing(df))
 
         numeric_cols = [
             "Happiness_Score",
@@ -122,38 +193,42 @@ class HappinessDataAnalysis:
             "Negative_Affect",
             "Confidence_In_Government",
         ]
-        print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
+        print("\nSummary Statistics:\n", self.results.describe(df, numeric_cols, include="all"))
 
-        missing_percent = (df.isna().sum() / len(df)) * 100
+        missing_percent = (self.results.missing(df) / len(df)) * 100
         print("\nMissing Values (%):\n", missing_percent)
 
+        # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+        series_cols = ["Happiness_Score", "Positive_Affect", "Negative_Affect"]
+        country_cols = ["Happiness_Score", "GDP_Per_Capita", "Social_Support", "Healthy_Life_Expectancy"]
+        groups = self.results.get(
+            "all_analysis groups",
+            lambda: (
+                GroupPlan(df)
+                .add("Country", country_cols)
+                .add("Date", series_cols)
+                .add(["Country", "State_Region"], ["Happiness_Score"])
+                .run()
+            ),
+        )
+
         # ===============================
         # 2. Country-level Analysis
         # ===============================
-        avg_happiness = (
-            df.groupby("Country")["Happiness_Score"].mean().sort_values(ascending=False)
-        )
+        avg_happiness = groups.mean("Country", "Happiness_Score").sort_values(ascending=False)
         print(
             "\nTop 10 Countries by Average Happiness Score:\n", avg_happiness.head(10)
         )
 
-        avg_gdp = (
-            df.groupby("Country")["GDP_Per_Capita"].mean().sort_values(ascending=False)
-        )
+        avg_gdp = groups.mean("Country", "GDP_Per_Capita").sort_values(ascending=False)
         print("\nTop 10 Countries by Avg GDP Per Capita:\n", avg_gdp.head(10))
 
-        avg_social_support = (
-            df.groupby("Country")["Social_Support"].mean().sort_values(ascending=False)
-        )
+        avg_social_support = groups.mean("Country", "Social_Support").sort_values(ascending=False)
         print(
             "\nTop 10 Countries by Avg Social Support:\n", avg_social_support.head(10)
         )
 
-        avg_life_expectancy = (
-            df.groupby("Country")["Healthy_Life_Expectancy"]
-            .mean()
-            .sort_values(ascending=False)
-        )
+        avg_life_expectancy = groups.mean("Country", "Healthy_Life_Expectancy").sort_values(ascending=False)
         print(
             "\nTop 10 Countries by Healthy Life Expectancy:\n",
             avg_life_expectancy.head(10),
@@ -162,9 +237,7 @@ class HappinessDataAnalysis:
         # ===============================
         # 3. Time Series Analysis
         # ===============================
-        time_series = df.groupby("Date")[
-            ["Happiness_Score", "Positive_Affect", "Negative_Affect"]
-        ].mean()
+        time_series = groups.table("Date", series_cols)
         print("\nOverall Time Series (first 10 rows):\n", time_series.head(10))
 
         # Daily change in Happiness Score
@@ -177,17 +250,13 @@ class HappinessDataAnalysis:
         # ===============================
         # 4. Correlations
         # ===============================
-        corr_matrix = df[numeric_cols].corr()
+        corr_matrix = self.results.corr(df, numeric_cols)
         print("\nCorrelation Matrix:\n", corr_matrix)
 
         # ===============================
         # 5. Region-level Analysis
         # ===============================
-        state_happiness = (
-            df.groupby(["Country", "State_Region"])["Happiness_Score"]
-            .mean()
-            .sort_values(ascending=False)
-        )
+        state_happiness = groups.mean(("Country", "State_Region"), "Happiness_Score").sort_values(ascending=False)
         print(
             "\nTop 10 States/Regions by Average Happiness Score:\n",
             state_happiness.head(10),
@@ -214,9 +283,12 @@ class HappinessDataAnalysis:
 
     # 6. All Visualizations
     def all_visualizations(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded. Please load data first.")
             return
+        if missing_columns(self.df, self.action_columns["all_visualizations"]):
+            return
         df = self.df
         numeric_cols = [
             "Happiness_Score",
@@ -267,7 +339,7 @@ class HappinessDataAnalysis:
 
         # Correlation heatmap
         plt.figure(figsize=(10, 6))
-        sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+        sns.heatmap(self.results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
         plt.title("Correlation Heatmap")
         plt.show()
 
@@ -301,16 +373,18 @@ class HappinessDataAnalysis:
         # 4. Country & Region Analysis
         # ===============================
         # Top 10 countries by Happiness Score
-        top_countries = df.groupby("Country")["Happiness_Score"].mean().nlargest(10)
+        top_countries = df.groupby("Country", observed=True)["Happiness_Score"].mean().nlargest(10)
         plt.figure(figsize=(10, 6))
-        sns.barplot(x=top_countries.values, y=top_countries.index)
+        sns.barplot(x=top_countries.values, y=top_countries.index.astype(str))
         plt.title("Top 10 Countries by Average Happiness Score")
         plt.show()
 
         # Boxplot of GDP by Country (top 5)
         top5 = df["Country"].value_counts().head(5).index
         plt.figure(figsize=(10, 6))
-        sns.boxplot(data=df[df["Country"].isin(top5)], x="Country", y="GDP_Per_Capita")
+        seaborn_bxp(plt.gca(), self.results.box_stats(df, "GDP_Per_Capita", "Country", top5))
+        plt.xlabel("Country")
+        plt.ylabel("GDP_Per_Capita")
         plt.title("GDP per Capita Distribution (Top 5 Countries)")
         plt.show()
 
@@ -319,8 +393,8 @@ class HappinessDataAnalysis:
         # ===============================
         # Heatmap of Happiness by Country & Date
         pivot = df.pivot_table(
-            values="Happiness_Score", index="Date", columns="Country", aggfunc="mean"
-        )
+            values="Happiness_Score", index="Date", columns="Country", aggfunc="mean", observed=True
+        ).astype(float)
         plt.figure(figsize=(12, 6))
         sns.heatmap(pivot.T, cmap="YlGnBu", cbar_kws={"label": "Happiness Score"})
         plt.title("Happiness Heatmap by Country and Date")
@@ -330,7 +404,7 @@ class HappinessDataAnalysis:
         sample_countries = df["Country"].value_counts().head(6).index
         g = sns.FacetGrid(
             df[df["Country"].isin(sample_countries)],
-            col="Country",
+            col="Country", col_order=sample_countries,
             col_wrap=3,
             height=3.5,
         )
@@ -340,6 +414,69 @@ class HappinessDataAnalysis:
         g.set_xticklabels(rotation=90)
         plt.show()
 
+    # 7. All Analysis (SQL store, indexed queries)
+    def sql_analysis(self, filters=None):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+        sql_report(self.file_path, self.action_columns["all_analysis"], filters)
+
+
+    # 8. Append Data (running all_analysis aggregates)
+    def append_data(self, source=None):
+        if self.df is None:
+            print("⚠️ Data not loaded.")
+            return
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+        if source is None:
+            source = input("Enter the data file (or glob) to append: ").strip()
+        if isinstance(source, pd.DataFrame):
+            new = typed_frame(source, dataset_schema)
+        elif dataset_exists(source):
+            new = read_dataset(source, dataset_schema, needed_columns(self.action_columns))
+        else:
+            print("⚠️ Data file not found!")
+            return
+        columns = [col for col in self.df.columns if col in dataset_schema["dtypes"]]
+        if missing_columns(new, columns):
+            return
+        key = dataset_schema["key"]
+        # The loaded rows are folded in once, on the first append; after that
+        # the report only costs the new rows (see chunked_analysis.RunningReport).
+        if self.running is None:
+            self.df = self.df[columns].reset_index(drop=True)
+            self.running = RunningReport().update(self.df)
+            self.key_indexes = [key_index(self.df, key)] if key in columns else []
+        # New rows are kept aside and concatenated by the next action that
+        # needs the whole frame (collect_appended); their row labels continue
+        # after the rows before them, as in the concatenated frame.
+        rows = len(self.df) + sum(len(frame) for frame in self.appended)
+        new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+        # New keys are probed against the hash index of each earlier block:
+        # one probe per new row and block, no pass over the loaded rows
+        # (see key_utils.KeyIndex).
+        if key in columns:
+            repeated, index = repeated_keys(self.key_indexes, new[key])
+            self.key_indexes.append(index)
+            if repeated.any():
+                print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+        self.running.update(new)
+        self.appended.append(new)
+        self.results.bump()
+        print(f"✅ {len(new)} rows appended.")
+        print("Shape:", (rows + len(new), len(columns)))
+        self.running.print("running")
+
+    def collect_appended(self):
+        # One concatenation for all the frames appended since the last call.
+        if self.appended:
+            columns = list(self.appended[0].columns)
+            self.df = concat_frames([self.df[columns], *self.appended], dataset_schema)
+            self.appended = []
+
 
 # ==========================
 # 🚀 Menu-driven interaction
@@ -355,6 +492,8 @@ def main():
         4: ("Handle Missing Values", analyzer.handle_missing_values),
         5: ("All Analysis", analyzer.all_analysis),
         6: ("All Visualizations", analyzer.all_visualizations),
+        7: ("All Analysis (SQL store)", analyzer.sql_analysis),
+        8: ("Append Data", analyzer.append_data),
         0: ("Exit", None),
     }
 
@@ -0,0 +1,32 @@
+import pandas as pd
+from data_generate import countries, state_levels
+
+# Column dtypes applied at parse time (see load_utils.read_typed_csv). Scores
+# have at most three decimals and fit float32; GDP_Per_Capita needs float64.
+dataset_schema = {
+    "dtypes": {
+        "Record_ID": "key",
+        "Country": "category",
+        "State_Region": "category",
+        "Date": "date",
+        "Happiness_Score": "float32",
+        "GDP_Per_Capita": "float64",
+        "Social_Support": "float32",
+        "Healthy_Life_Expectancy": "float32",
+        "Freedom_To_Make_Life_Choices": "float32",
+        "Generosity": "float32",
+        "Perceptions_Of_Corruption": "float32",
+        "Positive_Affect": "float32",
+        "Negative_Affect": "float32",
+        "Confidence_In_Government": "float32",
+    },
+    "levels": {
+        "Country": countries,
+        "State_Region": list(pd.unique(state_levels)),
+    },
+    "date_format": "%Y-%m-%d",
+    # Row identifier; append_data reports new rows that repeat one.
+    "key": "Record_ID",
+    # Natural query keys, indexed in the SQL store (see sql_utils).
+    "indexes": [["Country", "State_Region", "Date"]],
+}
@@ -0,0 +1,93 @@
+import argparse
+import numpy as np
+from schema import dataset_schema
+from sql_utils import open_sql_store, sql_store_path, write_sql_store
+
+# HappinessDataAnalysis.all_analysis on the SQL store: every groupby, mean
+# and correlation runs in SQLite and only the aggregated rows reach pandas.
+numeric_cols = [
+    "Happiness_Score",
+    "GDP_Per_Capita",
+    "Social_Support",
+    "Healthy_Life_Expectancy",
+    "Freedom_To_Make_Life_Choices",
+    "Generosity",
+    "Perceptions_Of_Corruption",
+    "Positive_Affect",
+    "Negative_Affect",
+    "Confidence_In_Government",
+]
+series_cols = ["Happiness_Score", "Positive_Affect", "Negative_Affect"]
+
+
+def sql_report(file_path, columns=None, filters=None, db_path=None):
+    # columns / filters as in load_data; the store is built on first use.
+    store = open_sql_store(file_path, dataset_schema, db_path, filters, columns)
+    try:
+        rows = store.rows()
+        if rows == 0:
+            print("⚠️ No rows match.")
+            return
+        dtypes = store.dtypes
+        missing = store.missing()
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", store.shape())
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", store.describe(numeric_cols))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. Country-level Analysis
+        # ===============================
+        avg_happiness = store.group_mean("Country", "Happiness_Score").sort_values(ascending=False)
+        print("\nTop 10 Countries by Average Happiness Score:\n", avg_happiness.head(10))
+        avg_gdp = store.group_mean("Country", "GDP_Per_Capita").sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg GDP Per Capita:\n", avg_gdp.head(10))
+        avg_social_support = store.group_mean("Country", "Social_Support").sort_values(ascending=False)
+        print("\nTop 10 Countries by Avg Social Support:\n", avg_social_support.head(10))
+        avg_life_expectancy = store.group_mean("Country", "Healthy_Life_Expectancy").sort_values(ascending=False)
+        print("\nTop 10 Countries by Healthy Life Expectancy:\n", avg_life_expectancy.head(10))
+
+        # ===============================
+        # 3. Time Series Analysis
+        # ===============================
+        time_series = store.group("Date", {col: f"AVG({col})" for col in series_cols}).astype(np.float64)
+        print("\nOverall Time Series (first 10 rows):\n", time_series.head(10))
+        time_series["Daily_Happiness_Change"] = time_series["Happiness_Score"].diff()
+        print("\nDaily Change in Happiness Score (first 10 rows):\n", time_series["Daily_Happiness_Change"].head(10))
+
+        # ===============================
+        # 4. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", store.corr(numeric_cols))
+
+        # ===============================
+        # 5. Region-level Analysis
+        # ===============================
+        state_happiness = store.group_mean(["Country", "State_Region"], "Happiness_Score").sort_values(ascending=False)
+        print("\nTop 10 States/Regions by Average Happiness Score:\n", state_happiness.head(10))
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        affect_ratio = store.value("AVG(Positive_Affect / NULLIF(Negative_Affect, 0))")
+        print("\nGlobal Average Positive/Negative Affect Ratio:", np.float64(affect_ratio))
+        happiness_to_gdp = store.value("AVG(Happiness_Score / NULLIF(GDP_Per_Capita, 0))")
+        print("Global Average Happiness-to-GDP Ratio:", np.float64(happiness_to_gdp))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the SQL store for the happiness data or report from it.")
+    parser.add_argument("command", choices=["ingest", "report"])
+    parser.add_argument("--data", default="global_happiness_report.csv")
+    parser.add_argument("--db", default=None, help="defaults to .cache/<data>.sqlite next to the CSV")
+    args = parser.parse_args()
+    if args.command == "ingest":
+        print(f"✅ SQL store written to {write_sql_store(args.data, args.db or sql_store_path(args.data), dataset_schema)}")
+    else:
+        sql_report(args.data, db_path=args.db)
@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+from load_utils import add_calendar, float64_view, iter_typed_csv
+from schema import dataset_schema
+from stats_utils import CoMoments, GroupSums, Moments, TopRows, ValueCounts, as_scalar
+
+# Out-of-core version of StockDataAnalysis.all_analysis: RunningReport keeps
+# only mergeable partial aggregates, so the CSV can be streamed through it in
+# chunks and appended rows (StockDataAnalysis.append_data) cost O(new rows).
+# The quintile means are kept per distinct Volume / PE_Ratio value and binned
+# when printed, once the edges are known.
+numeric_cols = [
+    "Open_Price",
+    "High_Price",
+    "Low_Price",
+    "Close_Price",
+    "Volume",
+    "Market_Cap",
+    "PE_Ratio",
+    "Dividend_Yield",
+    "RSI",
+]
+market_cols = ["Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]
+quintiles = np.linspace(0, 1, 6)
+rsi_bins = [0, 30, 70, 100]
+
+
+def add_derived(chunk):
+    add_calendar(chunk, "Month")
+    chunk["Daily_Range"] = chunk["High_Price"] - chunk["Low_Price"]
+    chunk["Volatility_Ratio"] = chunk["Daily_Range"] / chunk["Close_Price"].replace(0, np.nan)
+    chunk["Overbought"] = (chunk["RSI"] > 70).astype(int)
+    chunk["Oversold"] = (chunk["RSI"] < 30).astype(int)
+    chunk["Has_Dividend"] = (chunk["Dividend_Yield"] > 0).astype(int)
+    return chunk
+
+
+def describe(moments, quantiles, dtypes):
+    rows = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    table = {}
+    for i, col in enumerate(moments.columns):
+        q = quantiles.quantile(col, [0.25, 0.5, 0.75])
+        values = [moments.count[i], moments.mean[i], moments.std()[i], moments.min[i], *q, moments.max[i]]
+        dtype = "Float64" if pd.api.types.is_extension_array_dtype(dtypes[col]) else np.float64
+        table[col] = pd.Series(values, index=rows, dtype=dtype)
+    return pd.DataFrame(table)
+
+
+class RunningReport:
+    def __init__(self):
+        self.rows, self.columns, self.dtypes, self.missing = 0, None, None, None
+        self.moments = Moments(numeric_cols)
+        self.derived = Moments(["Daily_Range", "Overbought", "Oversold"])
+        self.quantiles = ValueCounts(numeric_cols)
+        self.comoments = CoMoments(numeric_cols)
+        self.by_sector = GroupSums([*numeric_cols, "Has_Dividend"])
+        self.by_symbol = GroupSums(["Close_Price"])
+        self.by_month = GroupSums(["Close_Price"])
+        self.by_rsi = GroupSums(["Close_Price"])
+        self.by_volume = GroupSums(["Close_Price"], max_groups=200_000)
+        self.by_pe = GroupSums(["Close_Price"], max_groups=200_000)
+        self.volatile = TopRows(5, "Volatility_Ratio")
+
+    def update(self, chunk):
+        # Columns of the first chunk define the report; later chunks are
+        # projected to them. float32 columns are summarized as float64, like
+        # all_analysis does. The caller's frame is not modified.
+        chunk = float64_view(chunk)
+        if self.columns is None:
+            self.columns, self.dtypes = list(chunk.columns), chunk.dtypes
+        chunk = chunk[self.columns]
+        self.rows += len(chunk)
+        missing = chunk.isna().sum()
+        self.missing = missing if self.missing is None else self.missing + missing
+        self.moments.update(chunk)
+        self.quantiles.update(chunk)
+        self.comoments.update(chunk)
+        chunk = add_derived(chunk.copy(deep=False))
+        self.derived.update(chunk)
+        self.by_sector.update(chunk, "Sector")
+        self.by_symbol.update(chunk, "Symbol")
+        self.by_month.update(chunk, "Month")
+        self.by_rsi.update(chunk, pd.cut(chunk["RSI"], bins=rsi_bins))
+        self.by_volume.update(chunk, "Volume")
+        self.by_pe.update(chunk, "PE_Ratio")
+        self.volatile.update(chunk[["Symbol", "Sector", "Date", "Volatility_Ratio"]])
+        return self
+
+    def print(self, title="chunked"):
+        if self.dtypes is None:
+            print("⚠️ No rows to report.")
+            return
+        rows, dtypes, missing = self.rows, self.dtypes, self.missing
+        close = dtypes["Close_Price"]
+        mean = dict(zip(numeric_cols, self.moments.mean))
+        print(f"\n--- All Analysis ({title}) ---")
+
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", (rows, len(dtypes)))
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", describe(self.moments, self.quantiles, dtypes))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. Stock Price Analysis
+        # ===============================
+        print("\nOverall Average Close Price:", as_scalar(mean["Close_Price"], close))
+        close_by_sector = self.by_sector.mean("Close_Price", close).sort_values(ascending=False)
+        print("\nAverage Close Price by Sector:\n", close_by_sector.head(10))
+        close_by_symbol = self.by_symbol.mean("Close_Price", close).sort_values(ascending=False)
+        print("\nAverage Close Price by Symbol:\n", close_by_symbol.head(10))
+        print("\nAverage Close Price by Month:\n", self.by_month.mean("Close_Price", close))
+
+        # ===============================
+        # 3. Market Metrics Analysis
+        # ===============================
+        market = self.moments.series("mean")[market_cols]
+        print("\nMean Market Metrics:\n", market.astype("Float64").sort_values(ascending=False))
+        market_max = self.moments.series("max")[market_cols]
+        print("\nMaximum Recorded Market Metrics:\n", market_max.astype("Float64").sort_values(ascending=False))
+
+        sector_means = pd.DataFrame({col: self.by_sector.mean(col, dtypes[col]) for col in numeric_cols})
+        metrics_vs_close = sector_means.drop(columns="Close_Price").corrwith(sector_means["Close_Price"])
+        print("\nCorrelation of Metrics with Close Price (by Sector averages):\n", metrics_vs_close)
+
+        # ===============================
+        # 4. Ranges & Relationships
+        # ===============================
+        for col, label, sums in [("Volume", "Volume", self.by_volume), ("PE_Ratio", "PE Ratio", self.by_pe)]:
+            edges = np.unique(self.quantiles.quantile(col, quintiles))
+            by_bin = sums.binned_mean("Close_Price", edges, close, include_lowest=True, precision=3)
+            print(f"\nAverage Close Price by {label} Quintile:\n", by_bin)
+        print("\nAverage Close Price by RSI Range:\n", self.by_rsi.mean("Close_Price", close))
+
+        # ===============================
+        # 5. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", self.comoments.corr())
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        derived_mean = dict(zip(self.derived.columns, self.derived.mean))
+        print("\nAverage Daily Price Range:", as_scalar(derived_mean["Daily_Range"], close))
+        print("\nTop 5 Records with Highest Volatility:\n", self.volatile.rows)
+        print("\nProportion of Overbought Days:", derived_mean["Overbought"])
+        print("Proportion of Oversold Days:", derived_mean["Oversold"])
+        by_sector = self.by_sector
+        dividend_rate = (by_sector.sums["Has_Dividend"] / by_sector.sizes).sort_values(ascending=False)
+        print("\nSectors with Highest Proportion of Dividend Stocks:\n", dividend_rate.rename("Has_Dividend").head(10))
+
+
+def chunked_report(file_path, chunk_size=1_000_000, columns=None, filters=None):
+    # columns / filters as in load_utils.read_typed_csv, applied to every chunk.
+    report = RunningReport()
+    for chunk in iter_typed_csv(file_path, dataset_schema, chunk_size, columns, filters):
+        report.update(chunk)
+    if report.dtypes is None:
+        print("⚠️ Data file is empty.")
+        return
+    report.print()
+    return report
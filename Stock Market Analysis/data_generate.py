@@ -1,55 +1,127 @@
 import pandas as pd
 import numpy as np
 import random
+from generate_utils import (
+    append_rows,
+    apply_dirty_args,
+    apply_output_args,
+    build_parser,
+    csv_output,
+    dirty_config,
+    generate_frame,
+    record_ids,
+    set_missing,
+    write_chunked,
+    write_frame,
+    write_sharded,
+)
 
 file_name = "Q1_stock_market.csv"
 
-try:
-    np.random.seed(555)
-    random.seed(555)
-
-    n_rows = 17500
-
-    symbols = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "JPM", "JNJ", "V", "PG", "UNH", "HD", "MA", "DIS", "ADBE", "NFLX", "PYPL", "CRM", "INTC", "CSCO", "PEP", "ABT", "TMO", "AVGO", "QCOM", "TXN", "ACN", "HON", "IBM", "ORCL", "NKE", "PM", "LIN", "AMGN", "MDT", "UPS", "SBUX", "CAT", "MMM", "GS", "BA", "RTX", "GE", "F", "GM", "AMD", "MU", "ATVI", "EA"]
-    company_names = {
-        "AAPL": "Apple Inc.", "MSFT": "Microsoft Corporation", "GOOGL": "Alphabet Inc.", 
-        "AMZN": "Amazon.com Inc.", "TSLA": "Tesla Inc.", "META": "Meta Platforms Inc.", 
-        "NVDA": "NVIDIA Corporation", "JPM": "JPMorgan Chase & Co.", "JNJ": "Johnson & Johnson", 
-        "V": "Visa Inc.", "PG": "Procter & Gamble Co.", "UNH": "UnitedHealth Group Inc.", 
-        "HD": "Home Depot Inc.", "MA": "Mastercard Inc.", "DIS": "Walt Disney Co.", 
-        "ADBE": "Adobe Inc.", "NFLX": "Netflix Inc.", "PYPL": "PayPal Holdings Inc.", 
-        "CRM": "Salesforce Inc.", "INTC": "Intel Corporation", "CSCO": "Cisco Systems Inc.", 
-        "PEP": "PepsiCo Inc.", "ABT": "Abbott Laboratories", "TMO": "Thermo Fisher Scientific Inc.", 
-        "AVGO": "Broadcom Inc.", "QCOM": "Qualcomm Inc.", "TXN": "Texas Instruments Inc.", 
-        "ACN": "Accenture plc", "HON": "Honeywell International Inc.", "IBM": "International Business Machines Corp.", 
-        "ORCL": "Oracle Corporation", "NKE": "Nike Inc.", "PM": "Philip Morris International Inc.", 
-        "LIN": "Linde plc", "AMGN": "Amgen Inc.", "MDT": "Medtronic plc", "UPS": "United Parcel Service Inc.", 
-        "SBUX": "Starbucks Corporation", "CAT": "Caterpillar Inc.", "MMM": "3M Company", 
-        "GS": "Goldman Sachs Group Inc.", "BA": "Boeing Co.", "RTX": "RTX Corporation", 
-        "GE": "General Electric Co.", "F": "Ford Motor Co.", "GM": "General Motors Co.", 
-        "AMD": "Advanced Micro Devices Inc.", "MU": "Micron Technology Inc.", 
-        "ATVI": "Activision Blizzard Inc.", "EA": "Electronic Arts Inc."
-    }
-
-    sectors = {
-        "AAPL": "Technology", "MSFT": "Technology", "GOOGL": "Technology", 
-        "AMZN": "Consumer Cyclical", "TSLA": "Automotive", "META": "Communication Services", 
-        "NVDA": "Technology", "JPM": "Financial Services", "JNJ": "Healthcare", 
-        "V": "Financial Services", "PG": "Consumer Defensive", "UNH": "Healthcare", 
-        "HD": "Consumer Cyclical", "MA": "Financial Services", "DIS": "Communication Services", 
-        "ADBE": "Technology", "NFLX": "Communication Services", "PYPL": "Financial Services", 
-        "CRM": "Technology", "INTC": "Technology", "CSCO": "Technology", 
-        "PEP": "Consumer Defensive", "ABT": "Healthcare", "TMO": "Healthcare", 
-        "AVGO": "Technology", "QCOM": "Technology", "TXN": "Technology", 
-        "ACN": "Technology", "HON": "Industrials", "IBM": "Technology", 
-        "ORCL": "Technology", "NKE": "Consumer Cyclical", "PM": "Consumer Defensive", 
-        "LIN": "Basic Materials", "AMGN": "Healthcare", "MDT": "Healthcare", 
-        "UPS": "Industrials", "SBUX": "Consumer Cyclical", "CAT": "Industrials", 
-        "MMM": "Industrials", "GS": "Financial Services", "BA": "Industrials", 
-        "RTX": "Industrials", "GE": "Industrials", "F": "Consumer Cyclical", 
-        "GM": "Consumer Cyclical", "AMD": "Technology", "MU": "Technology", 
-        "ATVI": "Communication Services", "EA": "Communication Services"
-    }
+default_rows = 17500
+default_seed = 555
+
+symbols = ["AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "META", "NVDA", "JPM", "JNJ", "V", "PG", "UNH", "HD", "MA", "DIS", "ADBE", "NFLX", "PYPL", "CRM", "INTC", "CSCO", "PEP", "ABT", "TMO", "AVGO", "QCOM", "TXN", "ACN", "HON", "IBM", "ORCL", "NKE", "PM", "LIN", "AMGN", "MDT", "UPS", "SBUX", "CAT", "MMM", "GS", "BA", "RTX", "GE", "F", "GM", "AMD", "MU", "ATVI", "EA"]
+company_names = {
+    "AAPL": "Apple Inc.", "MSFT": "Microsoft Corporation", "GOOGL": "Alphabet Inc.", 
+    "AMZN": "Amazon.com Inc.", "TSLA": "Tesla Inc.", "META": "Meta Platforms Inc.", 
+    "NVDA": "NVIDIA Corporation", "JPM": "JPMorgan Chase & Co.", "JNJ": "Johnson & Johnson", 
+    "V": "Visa Inc.", "PG": "Procter & Gamble Co.", "UNH": "UnitedHealth Group Inc.", 
+    "HD": "Home Depot Inc.", "MA": "Mastercard Inc.", "DIS": "Walt Disney Co.", 
+    "ADBE": "Adobe Inc.", "NFLX": "Netflix Inc.", "PYPL": "PayPal Holdings Inc.", 
+    "CRM": "Salesforce Inc.", "INTC": "Intel Corporation", "CSCO": "Cisco Systems Inc.", 
+    "PEP": "PepsiCo Inc.", "ABT": "Abbott Laboratories", "TMO": "Thermo Fisher Scientific Inc.", 
+    "AVGO": "Broadcom Inc.", "QCOM": "Qualcomm Inc.", "TXN": "Texas Instruments Inc.", 
+    "ACN": "Accenture plc", "HON": "Honeywell International Inc.", "IBM": "International Business Machines Corp.", 
+    "ORCL": "Oracle Corporation", "NKE": "Nike Inc.", "PM": "Philip Morris International Inc.", 
+    "LIN": "Linde plc", "AMGN": "Amgen Inc.", "MDT": "Medtronic plc", "UPS": "United Parcel Service Inc.", 
+    "SBUX": "Starbucks Corporation", "CAT": "Caterpillar Inc.", "MMM": "3M Company", 
+    "GS": "Goldman Sachs Group Inc.", "BA": "Boeing Co.", "RTX": "RTX Corporation", 
+    "GE": "General Electric Co.", "F": "Ford Motor Co.", "GM": "General Motors Co.", 
+    "AMD": "Advanced Micro Devices Inc.", "MU": "Micron Technology Inc.", 
+    "ATVI": "Activision Blizzard Inc.", "EA": "Electronic Arts Inc."
+}
+
+sectors = {
+    "AAPL": "Technology", "MSFT": "Technology", "GOOGL": "Technology", 
+    "AMZN": "Consumer Cyclical", "TSLA": "Automotive", "META": "Communication Services", 
+    "NVDA": "Technology", "JPM": "Financial Services", "JNJ": "Healthcare", 
+    "V": "Financial Services", "PG": "Consumer Defensive", "UNH": "Healthcare", 
+    "HD": "Consumer Cyclical", "MA": "Financial Services", "DIS": "Communication Services", 
+    "ADBE": "Technology", "NFLX": "Communication Services", "PYPL": "Financial Services", 
+    "CRM": "Technology", "INTC": "Technology", "CSCO": "Technology", 
+    "PEP": "Consumer Defensive", "ABT": "Healthcare", "TMO": "Healthcare", 
+    "AVGO": "Technology", "QCOM": "Technology", "TXN": "Technology", 
+    "ACN": "Technology", "HON": "Industrials", "IBM": "Technology", 
+    "ORCL": "Technology", "NKE": "Consumer Cyclical", "PM": "Consumer Defensive", 
+    "LIN": "Basic Materials", "AMGN": "Healthcare", "MDT": "Healthcare", 
+    "UPS": "Industrials", "SBUX": "Consumer Cyclical", "CAT": "Industrials", 
+    "MMM": "Industrials", "GS": "Financial Services", "BA": "Industrials", 
+    "RTX": "Industrials", "GE": "Industrials", "F": "Consumer Cyclical", 
+    "GM": "Consumer Cyclical", "AMD": "Technology", "MU": "Technology", 
+    "ATVI": "Communication Services", "EA": "Communication Services"
+}
+
+base_prices = {
+    "AAPL": 180, "MSFT": 380, "GOOGL": 140, "AMZN": 150, "TSLA": 220, 
+    "META": 320, "NVDA": 450, "JPM": 170, "JNJ": 155, "V": 250, 
+    "PG": 145, "UNH": 500, "HD": 330, "MA": 400, "DIS": 95, 
+    "ADBE": 520, "NFLX": 550, "PYPL": 65, "CRM": 230, "INTC": 40, 
+    "CSCO": 50, "PEP": 170, "ABT": 110, "TMO": 550, "AVGO": 1200, 
+    "QCOM": 140, "TXN": 165, "ACN": 320, "HON": 200, "IBM": 180, 
+    "ORCL": 120, "NKE": 100, "PM": 95, "LIN": 400, "AMGN": 280, 
+    "MDT": 85, "UPS": 160, "SBUX": 95, "CAT": 230, "MMM": 105, 
+    "GS": 380, "BA": 220, "RTX": 85, "GE": 130, "F": 12, 
+    "GM": 40, "AMD": 150, "MU": 85, "ATVI": 90, "EA": 130
+}
+
+base_caps = {
+    "AAPL": 2.8, "MSFT": 2.5, "GOOGL": 1.8, "AMZN": 1.6, "TSLA": 0.7, 
+    "META": 1.0, "NVDA": 1.1, "JPM": 0.5, "JNJ": 0.4, "V": 0.5, 
+    "PG": 0.35, "UNH": 0.45, "HD": 0.35, "MA": 0.4, "DIS": 0.18, 
+    "ADBE": 0.25, "NFLX": 0.24, "PYPL": 0.08, "CRM": 0.22, "INTC": 0.18, 
+    "CSCO": 0.2, "PEP": 0.23, "ABT": 0.19, "TMO": 0.22, "AVGO": 0.5, 
+    "QCOM": 0.16, "TXN": 0.15, "ACN": 0.2, "HON": 0.13, "IBM": 0.16, 
+    "ORCL": 0.32, "NKE": 0.16, "PM": 0.15, "LIN": 0.2, "AMGN": 0.15, 
+    "MDT": 0.11, "UPS": 0.14, "SBUX": 0.11, "CAT": 0.12, "MMM": 0.06, 
+    "GS": 0.13, "BA": 0.14, "RTX": 0.12, "GE": 0.14, "F": 0.05, 
+    "GM": 0.06, "AMD": 0.24, "MU": 0.09, "ATVI": 0.07, "EA": 0.04
+}
+
+numeric_columns = ["Open_Price", "High_Price", "Low_Price", "Close_Price", "Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]
+
+# Duplicate / missing-value rates of the original script (100-200 duplicates and
+# 1000-3000 empty cells per 17,500 rows), so the fast path dirties any n_rows alike.
+duplicate_rate = (100 / default_rows, 200 / default_rows)
+missing_rate = (1000 / default_rows, 3000 / default_rows)
+dirty_data = dirty_config(numeric_columns, duplicate_rate, missing_rate)
+
+# Natural partition key for --partition (see generate_utils.output_config).
+partition_by = ("Date", "month")
+
+# ===============================
+# Lookup arrays (index-coded symbols)
+# ===============================
+symbol_levels = np.array(symbols)
+company_levels = np.array([company_names[s] for s in symbols])
+sector_levels = np.array(sorted(set(sectors.values())))
+symbol_sector = np.searchsorted(sector_levels, [sectors[s] for s in symbols])
+symbol_price = np.array([base_prices[s] for s in symbols], dtype=np.float64)
+symbol_cap = np.array([base_caps[s] for s in symbols], dtype=np.float64) * 1e12
+
+month_days = np.array([31, 28, 31])
+month_offsets = np.concatenate([[0], np.cumsum(month_days)[:-1]])
+date_levels = np.array(
+    [f"2025-{m + 1:02d}-{d:02d}" for m in range(3) for d in range(1, month_days[m] + 1)]
+)
+
+
+# ===============================
+# Original generator (exact Q1_stock_market.csv for seed 555)
+# ===============================
+def generate_legacy(n_rows=default_rows, seed=default_seed):
+    np.random.seed(seed)
+    random.seed(seed)
 
     selected_symbols = []
     selected_companies = []
@@ -68,19 +140,6 @@ try:
         day = random.choice([d for d in days if not (month == 2 and d > 28)])
         dates.append(f"2025-{month:02d}-{day:02d}")
 
-    base_prices = {
-        "AAPL": 180, "MSFT": 380, "GOOGL": 140, "AMZN": 150, "TSLA": 220, 
-        "META": 320, "NVDA": 450, "JPM": 170, "JNJ": 155, "V": 250, 
-        "PG": 145, "UNH": 500, "HD": 330, "MA": 400, "DIS": 95, 
-        "ADBE": 520, "NFLX": 550, "PYPL": 65, "CRM": 230, "INTC": 40, 
-        "CSCO": 50, "PEP": 170, "ABT": 110, "TMO": 550, "AVGO": 1200, 
-        "QCOM": 140, "TXN": 165, "ACN": 320, "HON": 200, "IBM": 180, 
-        "ORCL": 120, "NKE": 100, "PM": 95, "LIN": 400, "AMGN": 280, 
-        "MDT": 85, "UPS": 160, "SBUX": 95, "CAT": 230, "MMM": 105, 
-        "GS": 380, "BA": 220, "RTX": 85, "GE": 130, "F": 12, 
-        "GM": 40, "AMD": 150, "MU": 85, "ATVI": 90, "EA": 130
-    }
-
     open_prices = []
     high_prices = []
     low_prices = []
@@ -108,18 +167,7 @@ try:
 
     market_caps = []
     for symbol, close in zip(selected_symbols, close_prices):
-        base_cap = {
-            "AAPL": 2.8, "MSFT": 2.5, "GOOGL": 1.8, "AMZN": 1.6, "TSLA": 0.7, 
-            "META": 1.0, "NVDA": 1.1, "JPM": 0.5, "JNJ": 0.4, "V": 0.5, 
-            "PG": 0.35, "UNH": 0.45, "HD": 0.35, "MA": 0.4, "DIS": 0.18, 
-            "ADBE": 0.25, "NFLX": 0.24, "PYPL": 0.08, "CRM": 0.22, "INTC": 0.18, 
-            "CSCO": 0.2, "PEP": 0.23, "ABT": 0.19, "TMO": 0.22, "AVGO": 0.5, 
-            "QCOM": 0.16, "TXN": 0.15, "ACN": 0.2, "HON": 0.13, "IBM": 0.16, 
-            "ORCL": 0.32, "NKE": 0.16, "PM": 0.15, "LIN": 0.2, "AMGN": 0.15, 
-            "MDT": 0.11, "UPS": 0.14, "SBUX": 0.11, "CAT": 0.12, "MMM": 0.06, 
-            "GS": 0.13, "BA": 0.14, "RTX": 0.12, "GE": 0.14, "F": 0.05, 
-            "GM": 0.06, "AMD": 0.24, "MU": 0.09, "ATVI": 0.07, "EA": 0.04
-        }[symbol] * 1e12
+        base_cap = base_caps[symbol] * 1e12
         market_caps.append(int(base_cap * (close / base_prices[symbol])))
 
     pe_ratios = np.random.normal(25, 8, n_rows)
@@ -150,21 +198,213 @@ try:
 
     duplicate_count = random.randint(100, 200)
     duplicate_indices = random.sample(range(n_rows), duplicate_count)
-    duplicates = df.iloc[duplicate_indices].copy()
-    df = pd.concat([df, duplicates], ignore_index=True)
+    df = append_rows(df, duplicate_indices)
 
-    numeric_columns = ["Open_Price", "High_Price", "Low_Price", "Close_Price", "Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]
     empty_count = random.randint(1000, 3000)
     empty_indices = random.sample(range(len(df)), empty_count)
-    for idx in empty_indices:
-        col = random.choice(numeric_columns)
-        df.at[idx, col] = np.nan
-
-    df = df.sample(frac=1, random_state=555).reset_index(drop=True)
-except BaseException as e:
-    print(f"An error occurred: {e}")
-else:
-    df.to_csv(file_name, index=False)
-finally:
-    print(f"Data generation completed. Dataset saved to {file_name}.")
-    print("Execution finished.")
\ No newline at end of file
+    empty_columns = [random.choice(numeric_columns) for _ in empty_indices]
+    df = set_missing(df, empty_indices, empty_columns)
+
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df
+
+
+# ===============================
+# Vectorized generator (fast path)
+# ===============================
+# Same marginal distributions as generate_legacy, but every column is drawn as
+# one NumPy array from a np.random.Generator, so it is not row-for-row equal to
+# the legacy output. Run `python data_generate.py --compare` to check the two
+# paths agree on per-column mean/std/min/max, missing share, symbol/sector/month
+# frequencies and duplicate count.
+def generate_chunk(rng, start, n_rows):
+    symbol_idx = rng.integers(0, len(symbols), n_rows).astype(np.int8)
+
+    month = rng.integers(0, 3, n_rows)
+    day = (rng.random(n_rows) * month_days[month]).astype(np.int64)
+    date_idx = (month_offsets[month] + day).astype(np.int8)
+
+    base_price = symbol_price[symbol_idx]
+    daily_volatility = rng.uniform(0.01, 0.04, n_rows)
+    open_price = base_price * (1 + rng.uniform(-0.02, 0.02, n_rows))
+    close_price = open_price * (1 + rng.normal(0, daily_volatility))
+    high_price = np.maximum(open_price, close_price) * (1 + rng.uniform(0.005, 0.03, n_rows))
+    low_price = np.minimum(open_price, close_price) * (1 - rng.uniform(0.005, 0.03, n_rows))
+    close_price = np.round(close_price, 2)
+
+    volume = (rng.lognormal(14, 1.2, n_rows) * 1000).astype(np.int64)
+    market_cap = (symbol_cap[symbol_idx] * (close_price / base_price)).astype(np.int64)
+
+    pe_ratios = np.clip(np.round(rng.normal(25, 8, n_rows), 1), 8, 60)
+    dividend_yields = np.round(rng.uniform(0, 4.5, n_rows), 2)
+    rsi = np.clip(np.round(rng.normal(50, 15, n_rows), 1), 0, 100)
+
+    return pd.DataFrame({
+        "Record_ID": record_ids("STK_", start, n_rows),
+        "Symbol": pd.Categorical.from_codes(symbol_idx, symbol_levels),
+        "Company_Name": pd.Categorical.from_codes(symbol_idx, company_levels),
+        "Sector": pd.Categorical.from_codes(symbol_sector[symbol_idx], sector_levels),
+        "Date": pd.Categorical.from_codes(date_idx, date_levels),
+        "Open_Price": np.round(open_price, 2),
+        "High_Price": np.round(high_price, 2),
+        "Low_Price": np.round(low_price, 2),
+        "Close_Price": close_price,
+        "Volume": volume,
+        "Market_Cap": market_cap,
+        "PE_Ratio": pe_ratios,
+        "Dividend_Yield": dividend_yields,
+        "RSI": rsi,
+    })
+
+
+def generate_fast(n_rows=default_rows, seed=default_seed, dirty=dirty_data):
+    return generate_frame(generate_chunk, n_rows, seed, dirty)
+
+
+def write_streaming(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    chunk_size=1_000_000,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_chunked(
+        generate_chunk, file_name, n_rows, seed, chunk_size, dirty, output=output
+    )
+
+
+def write_parallel(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    workers=4,
+    chunk_size=1_000_000,
+    merge=True,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_sharded(
+        generate_chunk,
+        file_name,
+        n_rows,
+        seed,
+        workers,
+        chunk_size,
+        dirty,
+        merge,
+        output=output,
+    )
+
+
+# ===============================
+# In-process API
+# ===============================
+def generate(
+    n_rows=default_rows,
+    seed=default_seed,
+    fast=False,
+    dirty=dirty_data,
+    output=None,
+    output_format=csv_output,
+):
+    # Returns the dataset as a DataFrame (the exact bundled dataset by
+    # default) and optionally also writes it to `output` (CSV unless
+    # output_format says otherwise).
+    if fast:
+        df = generate_fast(n_rows, seed, dirty)
+    else:
+        df = generate_legacy(n_rows, seed)
+    if output is not None:
+        write_frame(df, output, output_format)
+    return df
+
+
+# ===============================
+# Legacy vs fast equivalence check
+# ===============================
+def compare_paths(n_rows=default_rows, seed=default_seed):
+    legacy = generate_legacy(n_rows, seed)
+    fast = generate_fast(n_rows, seed)
+
+    stats = pd.concat(
+        {
+            "legacy_mean": legacy[numeric_columns].mean(),
+            "fast_mean": fast[numeric_columns].mean(),
+            "legacy_std": legacy[numeric_columns].std(),
+            "fast_std": fast[numeric_columns].std(),
+            "legacy_min": legacy[numeric_columns].min(),
+            "fast_min": fast[numeric_columns].min(),
+            "legacy_max": legacy[numeric_columns].max(),
+            "fast_max": fast[numeric_columns].max(),
+            "legacy_missing": legacy[numeric_columns].isna().mean(),
+            "fast_missing": fast[numeric_columns].isna().mean(),
+        },
+        axis=1,
+    )
+    stats["mean_rel_diff"] = (stats["fast_mean"] / stats["legacy_mean"] - 1).abs()
+    print("\nPer-column statistics:\n", stats.to_string())
+
+    for col in ["Symbol", "Sector"]:
+        freq = pd.concat(
+            [
+                legacy[col].astype(str).value_counts(normalize=True),
+                fast[col].astype(str).value_counts(normalize=True),
+            ],
+            axis=1,
+        ).fillna(0)
+        print(f"\nMax frequency difference for {col}:", (freq.iloc[:, 0] - freq.iloc[:, 1]).abs().max())
+
+    months = [pd.to_datetime(d["Date"].astype(str)).dt.month.value_counts(normalize=True) for d in (legacy, fast)]
+    print("\nMax frequency difference for Month:", (months[0] - months[1]).abs().max())
+
+    print("\nDuplicated rows (legacy / fast):", legacy.duplicated().sum(), "/", fast.duplicated().sum())
+    return stats
+
+
+def main():
+    parser = build_parser(
+        "Generate the synthetic stock market dataset.", file_name, default_rows, default_seed
+    )
+    parser.add_argument("--compare", action="store_true", help="compare legacy and fast path statistics")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare_paths(args.rows, args.seed)
+        return
+
+    sample = generate_chunk(np.random.default_rng(0), 0, 1)
+    legacy = not (args.fast or args.chunked or args.workers)
+    dirty = apply_dirty_args(dirty_data, args, parser, sample, legacy)
+    output = apply_output_args(args, partition_by)
+    df = None
+    try:
+        if args.workers:
+            write_parallel(
+                args.output,
+                args.rows,
+                args.seed,
+                args.workers,
+                args.chunk_size,
+                not args.parts,
+                dirty,
+                output=output,
+            )
+        elif args.chunked:
+            write_streaming(
+                args.output, args.rows, args.seed, args.chunk_size, dirty, output=output
+            )
+        else:
+            df = generate(args.rows, args.seed, args.fast, dirty)
+    except BaseException as e:
+        print(f"An error occurred: {e}")
+    else:
+        if df is not None:
+            write_frame(df, args.output, output)
+    finally:
+        print(f"Data generation completed. Dataset saved to {args.output}.")
+        print("Execution finished.")
+
+
+if __name__ == "__main__":
+    main()
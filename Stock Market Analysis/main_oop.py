@@ -5,45 +5,115 @@ import seaborn as sns
 import os
 from time import sleep as delay
 from random import randint as rand
+from data_generate import generate
+from load_utils import (
+    add_calendar,
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport, chunked_report
+from sql_analysis import sql_report
 
 
 class StockDataAnalysis:
+    # Columns each menu action reads; load_data only materializes these.
+    action_columns = {
+        "all_analysis": [
+            "Symbol",
+            "Sector",
+            "Date",
+            "Open_Price",
+            "High_Price",
+            "Low_Price",
+            "Close_Price",
+            "Volume",
+            "Market_Cap",
+            "PE_Ratio",
+            "Dividend_Yield",
+            "RSI",
+        ],
+        "all_visualizations": [
+            "Symbol",
+            "Sector",
+            "Date",
+            "Open_Price",
+            "High_Price",
+            "Low_Price",
+            "Close_Price",
+            "Volume",
+            "Market_Cap",
+            "PE_Ratio",
+            "Dividend_Yield",
+            "RSI",
+        ],
+        "append_data": [dataset_schema["key"]],
+    }
+
     def __init__(self, file_path):
         self.file_path = file_path
         self.df = None
+        self.results = ResultCache()  # memoized tables of self.df, see memo_utils
+        self.running = None  # all_analysis aggregates kept by append_data
+        self.appended = []  # frames added by append_data, see collect_appended
+        self.key_indexes = []  # KeyIndex of the loaded rows and of each append
 
     # 1. Generate Data
     def generate_data(self, file_location):
-        if os.path.exists("data_generate.py") and not os.path.exists(file_location):
-            os.system("python data_generate.py")
-            print("✅ Data generated successfully.")
-        elif not os.path.exists(file_location):
-            print("❌ data already exists!")
-        elif not os.path.exists("data_generate.py"):
-            print("❌ data_generate.py not found!")
+        persist = not os.path.exists(file_location)
+        self.df = typed_frame(generate(output=file_location if persist else None), dataset_schema)
+        self.results.bump()
+        self.running = None
+        self.appended = []
+        print("✅ Data generated successfully.")
+        print("Shape:", self.df.shape)
+        if persist:
+            print(f"✅ Data saved to {file_location}.")
+        else:
+            print("⚠️ Data file already exists, generated data kept in memory only.")
 
     # 2. Load Data
-    def load_data(self):
-        if not os.path.exists(self.file_path):
+    def load_data(self, columns=None, filters=None, workers=None):
+        if not dataset_exists(self.file_path):
             print("⚠️ Data file not found!")
             return
-        self.df = pd.read_csv(self.file_path)
+        # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+        # workers > 1 parses large CSVs in that many processes.
+        columns = needed_columns(self.action_columns) if columns is None else columns
+        self.df = read_dataset(self.file_path, dataset_schema, columns, filters, workers=workers)
+        self.results.bump()
+        self.running = None
+        self.appended = []
         print("✅ Data loaded successfully.")
         print("Shape:", self.df.shape)
+        memory_report(self.df)
 
     # 3. Basic Info
     def basic_info(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
         print("\n--- Basic Info ---")
         print("Dataset Shape:", self.df.shape)
         print("\nColumn Data Types:\n", self.df.dtypes)
-        print("\nMissing Values:\n", self.df.isna().sum())
-        print("\nMissing Values (%):\n", (self.df.isna().sum() / len(self.df)) * 100)
+        print("\nMissing Values:\n", self.results.missing(self.df))
+        print("\nMissing Values (%):\n", (self.results.missing(self.df) / len(self.df)) * 100)
 
     # 4. Handle Missing Values
     def handle_missing_values(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
@@ -63,17 +133,16 @@ class StockDataAnalysis:
                     )
                     if func in ["mean", "median"]:
                         for col in numeric_cols:
-                            if func == "mean":
-                                self.df[col] = self.df[col].fillna(self.df[col].mean())
-                            else:
-                                self.df[col] = self.df[col].fillna(
-                                    self.df[col].median()
-                                )
+                            self.df[col] = fill_missing(self.df[col], func)
+                        self.results.bump()
+                        self.running = None
                         print(f"✅ Missing values filled using {func}.")
                     else:
                         print("❌ Invalid function!")
                 case 2:
                     self.df.dropna(inplace=True)
+                    self.results.bump()
+                    self.running = None
                     print("✅ Rows with missing values dropped.")
                 case 0:
                     print("Exiting missing value handler...")
@@ -83,10 +152,15 @@ class StockDataAnalysis:
 
     # 5. All Analysis
     def all_analysis(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
-        df = self.df
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # Stats run on float64 copies of the float32 columns (see
+        # load_utils.float64_view), so they print without float32 noise.
+        df = float64_view(self.df)
         print("\n--- All Analysis ---")
 
         # ===============================
@@ -94,7 +168,7 @@ class StockDataAnalysis:
         # ===============================
         print("Dataset Shape:", df.shape)
         print("\nColumn Data Types:\n", df.dtypes)
-        print("\nMissing Values:\n", df.isna().sum())
+        print("\nMissing Values:\n", self.results.missing(df))
 
         numeric_cols = [
             "Open_Price",
@@ -108,29 +182,41 @@ class StockDataAnalysis:
             "RSI",
         ]
 
-        print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
+        print("\nSummary Statistics:\n", self.results.describe(df, numeric_cols, include="all"))
 
-        missing_percent = (df.isna().sum() / len(df)) * 100
+        missing_percent = (self.results.missing(df) / len(df)) * 100
         print("\nMissing Values (%):\n", missing_percent)
 
+        # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+        add_calendar(df, "Month")
+        has_dividend = (df["Dividend_Yield"] > 0).astype(int).rename("Has_Dividend")
+        groups = self.results.get(
+            "all_analysis groups",
+            lambda: (
+                GroupPlan(df)
+                .add("Sector", numeric_cols + [has_dividend])
+                .add("Symbol", ["Close_Price"])
+                .add("Month", ["Close_Price"])
+                .add(pd.qcut(df["Volume"], q=5), ["Close_Price"])
+                .add(pd.qcut(df["PE_Ratio"], q=5), ["Close_Price"])
+                .add(pd.cut(df["RSI"], bins=[0, 30, 70, 100]), ["Close_Price"])
+                .run()
+            ),
+        )
+
         # ===============================
         # 2. Stock Price Analysis
         # ===============================
         avg_close = df["Close_Price"].mean()
         print("\nOverall Average Close Price:", avg_close)
 
-        close_by_sector = (
-            df.groupby("Sector")["Close_Price"].mean().sort_values(ascending=False)
-        )
+        close_by_sector = groups.mean("Sector", "Close_Price").sort_values(ascending=False)
         print("\nAverage Close Price by Sector:\n", close_by_sector.head(10))
 
-        close_by_symbol = (
-            df.groupby("Symbol")["Close_Price"].mean().sort_values(ascending=False)
-        )
+        close_by_symbol = groups.mean("Symbol", "Close_Price").sort_values(ascending=False)
         print("\nAverage Close Price by Symbol:\n", close_by_symbol.head(10))
 
-        df["Month"] = pd.to_datetime(df["Date"]).dt.month
-        close_by_month = df.groupby("Month")["Close_Price"].mean()
+        close_by_month = groups.mean("Month", "Close_Price")
         print("\nAverage Close Price by Month:\n", close_by_month)
 
         # ===============================
@@ -151,7 +237,7 @@ class StockDataAnalysis:
         print("\nMaximum Recorded Market Metrics:\n", market_max)
 
         # Correlation of metrics with Close Price (by sector averages)
-        sector_means = df.groupby("Sector")[numeric_cols].mean()
+        sector_means = groups.table("Sector", numeric_cols)
         close_means = sector_means["Close_Price"]
         metrics_only = sector_means.drop(columns="Close_Price")
         metrics_vs_close = metrics_only.corrwith(close_means)
@@ -164,21 +250,19 @@ class StockDataAnalysis:
         # ===============================
         # 4. Ranges & Relationships
         # ===============================
-        avg_vol_close = df.groupby(pd.qcut(df["Volume"], q=5))["Close_Price"].mean()
+        avg_vol_close = groups.mean("Volume", "Close_Price")
         print("\nAverage Close Price by Volume Quintile:\n", avg_vol_close)
 
-        avg_pe_close = df.groupby(pd.qcut(df["PE_Ratio"], q=5))["Close_Price"].mean()
+        avg_pe_close = groups.mean("PE_Ratio", "Close_Price")
         print("\nAverage Close Price by PE Ratio Quintile:\n", avg_pe_close)
 
-        avg_rsi_close = df.groupby(pd.cut(df["RSI"], bins=[0, 30, 70, 100]))[
-            "Close_Price"
-        ].mean()
+        avg_rsi_close = groups.mean("RSI", "Close_Price")
         print("\nAverage Close Price by RSI Range:\n", avg_rsi_close)
 
         # ===============================
         # 5. Correlations
         # ===============================
-        corr_matrix = df[numeric_cols].corr()
+        corr_matrix = self.results.corr(df, numeric_cols)
         print("\nCorrelation Matrix:\n", corr_matrix)
 
         # ===============================
@@ -208,10 +292,8 @@ class StockDataAnalysis:
         print("Proportion of Oversold Days:", oversold_rate)
 
         # Example: Dividend Presence Flag
-        df["Has_Dividend"] = (df["Dividend_Yield"] > 0).astype(int)
-        dividend_rate = (
-            df.groupby("Sector")["Has_Dividend"].mean().sort_values(ascending=False)
-        )
+        df["Has_Dividend"] = has_dividend
+        dividend_rate = groups.mean("Sector", "Has_Dividend").sort_values(ascending=False)
         print(
             "\nSectors with Highest Proportion of Dividend Stocks:\n",
             dividend_rate.head(10),
@@ -219,9 +301,12 @@ class StockDataAnalysis:
 
     # 6. All Visualizations
     def all_visualizations(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
+        if missing_columns(self.df, self.action_columns["all_visualizations"]):
+            return
         df = self.df
         # ===============================
         # Numeric Columns
@@ -263,7 +348,7 @@ class StockDataAnalysis:
 
         # Correlation Heatmap
         plt.figure(figsize=(10, 6))
-        sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+        sns.heatmap(self.results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
         plt.title("Correlation Heatmap")
         plt.show()
 
@@ -278,7 +363,9 @@ class StockDataAnalysis:
 
         # Close Price distribution by Sector
         plt.figure(figsize=(12, 6))
-        sns.boxplot(data=df, x="Sector", y="Close_Price")
+        seaborn_bxp(plt.gca(), self.results.box_stats(df, "Close_Price", "Sector", df["Sector"].cat.categories))
+        plt.xlabel("Sector")
+        plt.ylabel("Close_Price")
         plt.xticks(rotation=90)
         plt.title("Close Price Distribution by Sector")
         plt.show()
@@ -286,7 +373,9 @@ class StockDataAnalysis:
         # Close Price distribution by Top 15 Symbols
         top_symbols = df["Symbol"].value_counts().head(15).index
         plt.figure(figsize=(12, 6))
-        sns.boxplot(data=df[df["Symbol"].isin(top_symbols)], x="Symbol", y="Close_Price")
+        seaborn_bxp(plt.gca(), self.results.box_stats(df, "Close_Price", "Symbol", top_symbols))
+        plt.xlabel("Symbol")
+        plt.ylabel("Close_Price")
         plt.xticks(rotation=90)
         plt.title("Close Price Distribution in Top 15 Stocks")
         plt.show()
@@ -305,8 +394,8 @@ class StockDataAnalysis:
             plt.show()
 
         # Heatmap: Average Close Price by Sector & Month
-        df["Month"] = pd.to_datetime(df["Date"]).dt.month
-        pivot = df.pivot_table(values="Close_Price", index="Sector", columns="Month", aggfunc="mean")
+        add_calendar(df, "Month")
+        pivot = df.pivot_table(values="Close_Price", index="Sector", columns="Month", aggfunc="mean", observed=True).astype(float)
         plt.figure(figsize=(12, 6))
         sns.heatmap(pivot, annot=False, cmap="YlGnBu", cbar_kws={"label": "Avg Close Price"})
         plt.title("Average Close Price by Sector & Month")
@@ -318,6 +407,74 @@ class StockDataAnalysis:
         g.set_axis_labels("RSI", "Count")
         plt.show()
 
+    # 7. All Analysis (chunked, for files larger than memory)
+    def chunked_analysis(self, chunk_size=1_000_000):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        chunked_report(self.file_path, chunk_size, self.action_columns["all_analysis"])
+
+    # 8. All Analysis (SQL store, indexed queries)
+    def sql_analysis(self, filters=None):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+        sql_report(self.file_path, self.action_columns["all_analysis"], filters)
+
+    # 9. Append Data (running all_analysis aggregates)
+    def append_data(self, source=None):
+        if self.df is None:
+            print("⚠️ Data not loaded.")
+            return
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+        if source is None:
+            source = input("Enter the data file (or glob) to append: ").strip()
+        if isinstance(source, pd.DataFrame):
+            new = typed_frame(source, dataset_schema)
+        elif dataset_exists(source):
+            new = read_dataset(source, dataset_schema, needed_columns(self.action_columns))
+        else:
+            print("⚠️ Data file not found!")
+            return
+        columns = [col for col in self.df.columns if col in dataset_schema["dtypes"]]
+        if missing_columns(new, columns):
+            return
+        key = dataset_schema["key"]
+        # The loaded rows are folded in once, on the first append; after that
+        # the report only costs the new rows (see chunked_analysis.RunningReport).
+        if self.running is None:
+            self.df = self.df[columns].reset_index(drop=True)
+            self.running = RunningReport().update(self.df)
+            self.key_indexes = [key_index(self.df, key)] if key in columns else []
+        # New rows are kept aside and concatenated by the next action that
+        # needs the whole frame (collect_appended); their row labels continue
+        # after the rows before them, as in the concatenated frame.
+        rows = len(self.df) + sum(len(frame) for frame in self.appended)
+        new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+        # New keys are probed against the hash index of each earlier block:
+        # one probe per new row and block, no pass over the loaded rows
+        # (see key_utils.KeyIndex).
+        if key in columns:
+            repeated, index = repeated_keys(self.key_indexes, new[key])
+            self.key_indexes.append(index)
+            if repeated.any():
+                print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+        self.running.update(new)
+        self.appended.append(new)
+        self.results.bump()
+        print(f"✅ {len(new)} rows appended.")
+        print("Shape:", (rows + len(new), len(columns)))
+        self.running.print("running")
+
+    def collect_appended(self):
+        # One concatenation for all the frames appended since the last call.
+        if self.appended:
+            columns = list(self.appended[0].columns)
+            self.df = concat_frames([self.df[columns], *self.appended], dataset_schema)
+            self.appended = []
 
 
 # ==========================
@@ -334,6 +491,9 @@ def main():
         4: ("Handle Missing Values", analyzer.handle_missing_values),
         5: ("All Analysis", analyzer.all_analysis),
         6: ("All Visualizations", analyzer.all_visualizations),
+        7: ("All Analysis (chunked, large files)", analyzer.chunked_analysis),
+        8: ("All Analysis (SQL store)", analyzer.sql_analysis),
+        9: ("Append Data", analyzer.append_data),
         0: ("Exit", None),
     }
 
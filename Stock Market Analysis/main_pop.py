@@ -5,53 +5,124 @@ import seaborn as sns
 import os
 from time import sleep as delay
 from random import randint as rand
+from data_generate import generate
+from load_utils import (
+    add_calendar,
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from plot_utils import seaborn_bxp
+from schema import dataset_schema
+from stats_utils import GroupPlan
+from chunked_analysis import RunningReport, chunked_report
+from sql_analysis import sql_report
 
 
 # ===============================
 # Global Variables
 # ===============================
 df = None
+results = ResultCache()  # memoized tables of df, see memo_utils
+running = None  # all_analysis aggregates kept by append_data
+appended = []  # frames added by append_data, see collect_appended
+key_indexes = []  # KeyIndex of the loaded rows and of each append
 file_path = "df.csv"  # stock dataset file
 
+# Columns each menu action reads; load_data only materializes these.
+action_columns = {
+    "all_analysis": [
+        "Symbol",
+        "Sector",
+        "Date",
+        "Open_Price",
+        "High_Price",
+        "Low_Price",
+        "Close_Price",
+        "Volume",
+        "Market_Cap",
+        "PE_Ratio",
+        "Dividend_Yield",
+        "RSI",
+    ],
+    "all_visualizations": [
+        "Symbol",
+        "Sector",
+        "Date",
+        "Open_Price",
+        "High_Price",
+        "Low_Price",
+        "Close_Price",
+        "Volume",
+        "Market_Cap",
+        "PE_Ratio",
+        "Dividend_Yield",
+        "RSI",
+    ],
+    "append_data": [dataset_schema["key"]],
+}
+
 
 # 1. Generate Data
 def generate_data(file_location):
-    if os.path.exists("data_generate.py") and not os.path.exists(file_location):
-        os.system("python data_generate.py")
-        print("✅ Data generated successfully.")
-    elif not os.path.exists(file_location):
-        print("❌ data already exists!")
-    elif not os.path.exists("data_generate.py"):
-        print("❌ data_generate.py not found!")
+    global df, running, appended
+    persist = not os.path.exists(file_location)
+    df = typed_frame(generate(output=file_location if persist else None), dataset_schema)
+    results.bump()
+    running = None
+    appended = []
+    print("✅ Data generated successfully.")
+    print("Shape:", df.shape)
+    if persist:
+        print(f"✅ Data saved to {file_location}.")
+    else:
+        print("⚠️ Data file already exists, generated data kept in memory only.")
 
 
 # 2. Load Data
-def load_data():
-    global df
-    if not os.path.exists(file_path):
+def load_data(columns=None, filters=None, workers=None):
+    global df, running, appended
+    if not dataset_exists(file_path):
         print("⚠️ Data file not found!")
         return
-    df = pd.read_csv(file_path)
+    # filters keeps matching rows, e.g. {"Date": ("2025-01-01", None)}; see load_utils.
+    # workers > 1 parses large CSVs in that many processes.
+    columns = needed_columns(action_columns) if columns is None else columns
+    df = read_dataset(file_path, dataset_schema, columns, filters, workers=workers)
+    results.bump()
+    running = None
+    appended = []
     print("✅ Data loaded successfully.")
     print("Shape:", df.shape)
+    memory_report(df)
 
 
 # 3. Basic Info
 def basic_info():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
     print("\n--- Basic Info ---")
     print("Dataset Shape:", df.shape)
     print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
-    print("\nMissing Values (%):\n", (df.isna().sum() / len(df)) * 100)
+    print("\nMissing Values:\n", results.missing(df))
+    print("\nMissing Values (%):\n", (results.missing(df) / len(df)) * 100)
 
 
 # 4. Handle Missing Values
 def handle_missing_values():
-    global df
+    global df, running
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
@@ -67,15 +138,16 @@ def handle_missing_values():
                 func = input("Enter aggregate function (mean/median): ").strip().lower()
                 if func in ["mean", "median"]:
                     for col in numeric_cols:
-                        if func == "mean":
-                            df[col] = df[col].fillna(df[col].mean())
-                        else:
-                            df[col] = df[col].fillna(df[col].median())
+                        df[col] = fill_missing(df[col], func)
+                    results.bump()
+                    running = None
                     print(f"✅ Missing values filled using {func}.")
                 else:
                     print("❌ Invalid function!")
             case 2:
                 df.dropna(inplace=True)
+                results.bump()
+                running = None
                 print("✅ Rows with missing values dropped.")
             case 0:
                 print("Exiting missing value handler...")
@@ -87,9 +159,15 @@ def handle_missing_values():
 # 5. All Analysis
 def all_analysis():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # Stats run on float64 copies of the float32 columns (see
+    # load_utils.float64_view), so they print without float32 noise.
+    data = float64_view(df)
     print("\n--- All Analysis ---")
 
     numeric_cols = [
@@ -107,54 +185,63 @@ def all_analysis():
     # ===============================
     # 1. Basic Info
     # ===============================
-    print("Dataset Shape:", df.shape)
-    print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
+    print("Dataset Shape:", data.shape)
+    print("\nColumn Data Types:\n", data.dtypes)
+    print("\nMissing Values:\n", results.missing(data))
 
-    print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
+    print("\nSummary Statistics:\n", results.describe(data, numeric_cols, include="all"))
 
-    missing_percent = (df.isna().sum() / len(df)) * 100
+    missing_percent = (results.missing(data) / len(data)) * 100
     print("\nMissing Values (%):\n", missing_percent)
 
+    # Every groupby below, one factorization per key (see stats_utils.GroupPlan)
+    add_calendar(data, "Month")
+    has_dividend = (data["Dividend_Yield"] > 0).astype(int).rename("Has_Dividend")
+    groups = results.get(
+        "all_analysis groups",
+        lambda: (
+            GroupPlan(data)
+            .add("Sector", numeric_cols + [has_dividend])
+            .add("Symbol", ["Close_Price"])
+            .add("Month", ["Close_Price"])
+            .run()
+        ),
+    )
+
     # ===============================
     # 2. Stock Price Analysis
     # ===============================
-    avg_close = df["Close_Price"].mean()
+    avg_close = data["Close_Price"].mean()
     print("\nOverall Average Close Price:", avg_close)
 
-    close_by_sector = (
-        df.groupby("Sector")["Close_Price"].mean().sort_values(ascending=False)
-    )
+    close_by_sector = groups.mean("Sector", "Close_Price").sort_values(ascending=False)
     print("\nAverage Close Price by Sector:\n", close_by_sector.head(10))
 
-    close_by_symbol = (
-        df.groupby("Symbol")["Close_Price"].mean().sort_values(ascending=False)
-    )
+    close_by_symbol = groups.mean("Symbol", "Close_Price").sort_values(ascending=False)
     print("\nAverage Close Price by Symbol:\n", close_by_symbol.head(10))
 
-    df["Month"] = pd.to_datetime(df["Date"]).dt.month
-    close_by_month = df.groupby("Month")["Close_Price"].mean()
+    close_by_month = groups.mean("Month", "Close_Price")
     print("\nAverage Close Price by Month:\n", close_by_month)
 
     # ===============================
     # 3. Market Metrics
     # ===============================
     market_means = (
-        df[["Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]]
+        data[["Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]]
         .mean()
         .sort_values(ascending=False)
     )
     print("\nMean Market Metrics:\n", market_means)
 
     market_max = (
-        df[["Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]]
+        data[["Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]]
         .max()
         .sort_values(ascending=False)
     )
     print("\nMaximum Recorded Market Metrics:\n", market_max)
 
     # Correlation with Close Price
-    sector_means = df.groupby("Sector")[numeric_cols].mean()
+    sector_means = groups.table("Sector", numeric_cols)
     close_means = sector_means["Close_Price"]
     metrics_vs_close = sector_means.drop(columns="Close_Price").corrwith(close_means)
     print(
@@ -165,24 +252,22 @@ def all_analysis():
     # ===============================
     # 4. Derived Metrics
     # ===============================
-    df["Daily_Range"] = df["High_Price"] - df["Low_Price"]
-    df["Volatility_Ratio"] = df["Daily_Range"] / df["Close_Price"].replace(0, np.nan)
+    data["Daily_Range"] = data["High_Price"] - data["Low_Price"]
+    data["Volatility_Ratio"] = data["Daily_Range"] / data["Close_Price"].replace(0, np.nan)
     print(
         "\nTop 5 Records with Highest Volatility:\n",
-        df.nlargest(5, "Volatility_Ratio")[
+        data.nlargest(5, "Volatility_Ratio")[
             ["Symbol", "Sector", "Date", "Volatility_Ratio"]
         ],
     )
 
-    df["Overbought"] = (df["RSI"] > 70).astype(int)
-    df["Oversold"] = (df["RSI"] < 30).astype(int)
-    print("\nProportion of Overbought Days:", df["Overbought"].mean())
-    print("Proportion of Oversold Days:", df["Oversold"].mean())
+    data["Overbought"] = (data["RSI"] > 70).astype(int)
+    data["Oversold"] = (data["RSI"] < 30).astype(int)
+    print("\nProportion of Overbought Days:", data["Overbought"].mean())
+    print("Proportion of Oversold Days:", data["Oversold"].mean())
 
-    df["Has_Dividend"] = (df["Dividend_Yield"] > 0).astype(int)
-    dividend_rate = (
-        df.groupby("Sector")["Has_Dividend"].mean().sort_values(ascending=False)
-    )
+    data["Has_Dividend"] = has_dividend
+    dividend_rate = groups.mean("Sector", "Has_Dividend").sort_values(ascending=False)
     print(
         "\nSectors with Highest Proportion of Dividend Stocks:\n",
         dividend_rate.head(10),
@@ -192,9 +277,12 @@ def all_analysis():
 # 6. All Visualizations
 def all_visualizations():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
+    if missing_columns(df, action_columns["all_visualizations"]):
+        return
 
     numeric_cols = [
         "Open_Price",
@@ -231,7 +319,7 @@ def all_visualizations():
 
     # Heatmap
     plt.figure(figsize=(10, 6))
-    sns.heatmap(df[numeric_cols].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+    sns.heatmap(results.corr(df, numeric_cols), annot=True, cmap="coolwarm", fmt=".2f")
     plt.title("Correlation Heatmap")
     plt.show()
 
@@ -241,14 +329,18 @@ def all_visualizations():
 
     # Sector-wise
     plt.figure(figsize=(12, 6))
-    sns.boxplot(data=df, x="Sector", y="Close_Price")
+    seaborn_bxp(plt.gca(), results.box_stats(df, "Close_Price", "Sector", df["Sector"].cat.categories))
+    plt.xlabel("Sector")
+    plt.ylabel("Close_Price")
     plt.xticks(rotation=90)
     plt.title("Close Price Distribution by Sector")
     plt.show()
 
     top_symbols = df["Symbol"].value_counts().head(15).index
     plt.figure(figsize=(12, 6))
-    sns.boxplot(data=df[df["Symbol"].isin(top_symbols)], x="Symbol", y="Close_Price")
+    seaborn_bxp(plt.gca(), results.box_stats(df, "Close_Price", "Symbol", top_symbols))
+    plt.xlabel("Symbol")
+    plt.ylabel("Close_Price")
     plt.xticks(rotation=90)
     plt.title("Close Price Distribution in Top 15 Stocks")
     plt.show()
@@ -261,10 +353,10 @@ def all_visualizations():
         plt.title(f"{col} Distribution by Sector")
         plt.show()
 
-    df["Month"] = pd.to_datetime(df["Date"]).dt.month
+    add_calendar(df, "Month")
     pivot = df.pivot_table(
-        values="Close_Price", index="Sector", columns="Month", aggfunc="mean"
-    )
+        values="Close_Price", index="Sector", columns="Month", aggfunc="mean", observed=True
+    ).astype(float)
     plt.figure(figsize=(12, 6))
     sns.heatmap(
         pivot, annot=False, cmap="YlGnBu", cbar_kws={"label": "Avg Close Price"}
@@ -279,6 +371,81 @@ def all_visualizations():
     g.set_axis_labels("RSI", "Count")
     plt.show()
 
+
+# 7. All Analysis (chunked, for files larger than memory)
+def chunked_analysis(chunk_size=1_000_000):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    chunked_report(file_path, chunk_size, action_columns["all_analysis"])
+
+
+# 8. All Analysis (SQL store, indexed queries)
+def sql_analysis(filters=None):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+    sql_report(file_path, action_columns["all_analysis"], filters)
+
+
+# 9. Append Data (running all_analysis aggregates)
+def append_data(source=None):
+    global df, running, key_indexes
+    if df is None:
+        print("⚠️ Data not loaded.")
+        return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+    if source is None:
+        source = input("Enter the data file (or glob) to append: ").strip()
+    if isinstance(source, pd.DataFrame):
+        new = typed_frame(source, dataset_schema)
+    elif dataset_exists(source):
+        new = read_dataset(source, dataset_schema, needed_columns(action_columns))
+    else:
+        print("⚠️ Data file not found!")
+        return
+    columns = [col for col in df.columns if col in dataset_schema["dtypes"]]
+    if missing_columns(new, columns):
+        return
+    key = dataset_schema["key"]
+    # The loaded rows are folded in once, on the first append; after that
+    # the report only costs the new rows (see chunked_analysis.RunningReport).
+    if running is None:
+        df = df[columns].reset_index(drop=True)
+        running = RunningReport().update(df)
+        key_indexes = [key_index(df, key)] if key in columns else []
+    # New rows are kept aside and concatenated by the next action that needs
+    # the whole frame (collect_appended); their row labels continue after the
+    # rows before them, as in the concatenated frame.
+    rows = len(df) + sum(len(frame) for frame in appended)
+    new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+    # New keys are probed against the hash index of each earlier block: one
+    # probe per new row and block, no pass over the loaded rows (see key_utils).
+    if key in columns:
+        repeated, index = repeated_keys(key_indexes, new[key])
+        key_indexes.append(index)
+        if repeated.any():
+            print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+    running.update(new)
+    appended.append(new)
+    results.bump()
+    print(f"✅ {len(new)} rows appended.")
+    print("Shape:", (rows + len(new), len(columns)))
+    running.print("running")
+
+
+def collect_appended():
+    # One concatenation for all the frames appended since the last call.
+    global df, appended
+    if appended:
+        columns = list(appended[0].columns)
+        df = concat_frames([df[columns], *appended], dataset_schema)
+        appended = []
+
+
 # ==========================
 # 🚀 Menu-driven interaction
 # ==========================
@@ -292,6 +459,9 @@ def main():
         4: ("Handle Missing Values", handle_missing_values),
         5: ("All Analysis", all_analysis),
         6: ("All Visualizations", all_visualizations),
+        7: ("All Analysis (chunked, large files)", chunked_analysis),
+        8: ("All Analysis (SQL store)", sql_analysis),
+        9: ("Append Data", append_data),
         0: ("Exit", None),
     }
 
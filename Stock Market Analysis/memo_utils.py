@@ -0,0 +1,90 @@
+import os
+import sys
+from collections import OrderedDict
+import pandas as pd
+from stats_utils import GroupQuantiles, frame_comoments
+
+# Memoized analysis results. Every table is stored under the dataset version
+# it was computed from; load_data, generate_data and handle_missing_values bump
+# the version, which drops everything computed from the old data. Repeating a
+# menu action (or running Basic Info and then All Analysis) returns the
+# stored tables instead of recomputing them. Keys that depend on the frame's
+# columns include them, so columns added by a report (Month, Daily_Range, ...)
+# never make an older result look current.
+
+
+def env_result_budget():
+    # DATA_RESULT_CACHE_MB caps the memoized tables (default 256 MB, 0 disables).
+    return int(float(os.environ.get("DATA_RESULT_CACHE_MB", "256")) * 1024**2)
+
+
+def result_bytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, list):
+        return sys.getsizeof(value) + sum(result_bytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(result_bytes(item) for item in value.values())
+    return int(getattr(value, "nbytes", sys.getsizeof(value)))
+
+
+class ResultCache:
+    def __init__(self, max_bytes=None):
+        self.max_bytes = env_result_budget() if max_bytes is None else max_bytes
+        self.version = 0
+        self.entries = OrderedDict()  # (version, key) -> (value, bytes), least recently used first
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self):
+        # The data changed: results of older versions can never be used again.
+        self.version += 1
+        self.entries.clear()
+        self.bytes = 0
+
+    def get(self, key, compute):
+        slot = (self.version, key)
+        if slot in self.entries:
+            self.entries.move_to_end(slot)
+            self.hits += 1
+            return self.entries[slot][0]
+        self.misses += 1
+        value = compute()
+        size = result_bytes(value)
+        if size <= self.max_bytes:
+            self.entries[slot] = (value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, dropped) = self.entries.popitem(last=False)
+                self.bytes -= dropped
+        return value
+
+    # The tables several menu actions share
+    def missing(self, df):
+        return self.get(("missing", tuple(df.columns)), lambda: df.isna().sum())
+
+    def describe(self, df, columns, **kwargs):
+        key = ("describe", tuple(columns), tuple(sorted(kwargs.items())))
+        return self.get(key, lambda: df[columns].describe(**kwargs))
+
+    def comoments(self, df, columns, method="pearson"):
+        # One pass over the rows serves the correlation and covariance tables.
+        key = ("comoments", tuple(columns), method)
+        return self.get(key, lambda: frame_comoments(df, columns, method))
+
+    def corr(self, df, columns, method="pearson"):
+        return self.get(("corr", tuple(columns), method), lambda: self.comoments(df, columns, method).corr())
+
+    def cov(self, df, columns):
+        return self.get(("cov", tuple(columns)), lambda: self.comoments(df, columns).cov())
+
+    def box_stats(self, df, column, by, order=None):
+        # Boxplot boxes of column per group of `by`, from per-group quantile
+        # sketches plus one pass over df for the whiskers and outliers; order
+        # picks and orders the groups to draw.
+        sketches = self.get(("group quantiles", column, by), lambda: GroupQuantiles(column).update(df, by))
+        key = ("box stats", column, by, None if order is None else tuple(order))
+        return self.get(key, lambda: sketches.box_stats(order, frame=df, keys=by))
@@ -0,0 +1,35 @@
+from data_generate import symbol_levels, company_levels, sector_levels
+
+# Column dtypes applied at parse time (see load_utils.read_typed_csv). Prices
+# and ratios have at most two decimals, well within float32's 7 significant
+# digits, so float32 halves their memory and the reports recover the exact
+# decimals as float64 (load_utils.float64_view); Market_Cap needs float64 and
+# Volume is a nullable whole count.
+dataset_schema = {
+    "dtypes": {
+        "Record_ID": "key",
+        "Symbol": "category",
+        "Company_Name": "category",
+        "Sector": "category",
+        "Date": "date",
+        "Open_Price": "float32",
+        "High_Price": "float32",
+        "Low_Price": "float32",
+        "Close_Price": "float32",
+        "Volume": "Int64",
+        "Market_Cap": "float64",
+        "PE_Ratio": "float32",
+        "Dividend_Yield": "float32",
+        "RSI": "float32",
+    },
+    "levels": {
+        "Symbol": list(symbol_levels),
+        "Company_Name": list(company_levels),
+        "Sector": list(sector_levels),
+    },
+    "date_format": "%Y-%m-%d",
+    # Row identifier; append_data reports new rows that repeat one.
+    "key": "Record_ID",
+    # Natural query keys, indexed in the SQL store (see sql_utils).
+    "indexes": [["Symbol", "Date"]],
+}
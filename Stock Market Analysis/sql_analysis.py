@@ -0,0 +1,112 @@
+import argparse
+import numpy as np
+from schema import dataset_schema
+from sql_utils import open_sql_store, sql_store_path, write_sql_store
+from stats_utils import as_scalar
+
+# StockDataAnalysis.all_analysis on the SQL store: every groupby, mean, sum
+# and correlation runs in SQLite and only the aggregated rows reach pandas.
+numeric_cols = [
+    "Open_Price",
+    "High_Price",
+    "Low_Price",
+    "Close_Price",
+    "Volume",
+    "Market_Cap",
+    "PE_Ratio",
+    "Dividend_Yield",
+    "RSI",
+]
+market_cols = ["Volume", "Market_Cap", "PE_Ratio", "Dividend_Yield", "RSI"]
+quintiles = np.linspace(0, 1, 6)
+rsi_bins = [0, 30, 70, 100]
+month = {"Month": "CAST(strftime('%m', Date) AS INTEGER)"}
+daily_range = "(High_Price - Low_Price)"
+
+
+def sql_report(file_path, columns=None, filters=None, db_path=None):
+    # columns / filters as in load_data; the store is built on first use.
+    store = open_sql_store(file_path, dataset_schema, db_path, filters, columns)
+    try:
+        rows = store.rows()
+        if rows == 0:
+            print("⚠️ No rows match.")
+            return
+        close = store.dtypes["Close_Price"]
+        stats = store.moments(numeric_cols)
+        missing = store.missing()
+        print("\n--- All Analysis (SQL) ---")
+
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", store.shape())
+        print("\nColumn Data Types:\n", store.dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", store.describe(numeric_cols))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. Stock Price Analysis
+        # ===============================
+        mean = dict(zip(numeric_cols, stats.mean))
+        print("\nOverall Average Close Price:", as_scalar(mean["Close_Price"], close))
+        close_by_sector = store.group_mean("Sector", "Close_Price").sort_values(ascending=False)
+        print("\nAverage Close Price by Sector:\n", close_by_sector.head(10))
+        close_by_symbol = store.group_mean("Symbol", "Close_Price").sort_values(ascending=False)
+        print("\nAverage Close Price by Symbol:\n", close_by_symbol.head(10))
+        by_month = store.group(month, {"Close_Price": "AVG(Close_Price)"})["Close_Price"]
+        print("\nAverage Close Price by Month:\n", by_month.astype(close))
+
+        # ===============================
+        # 3. Market Metrics Analysis
+        # ===============================
+        market = stats.series("mean")[market_cols]
+        print("\nMean Market Metrics:\n", market.astype("Float64").sort_values(ascending=False))
+        market_max = stats.series("max")[market_cols]
+        print("\nMaximum Recorded Market Metrics:\n", market_max.astype("Float64").sort_values(ascending=False))
+
+        sector_means = store.group("Sector", {col: f"AVG({col})" for col in numeric_cols})
+        metrics_vs_close = sector_means.drop(columns="Close_Price").corrwith(sector_means["Close_Price"])
+        print("\nCorrelation of Metrics with Close Price (by Sector averages):\n", metrics_vs_close)
+
+        # ===============================
+        # 4. Ranges & Relationships
+        # ===============================
+        for col, label in [("Volume", "Volume"), ("PE_Ratio", "PE Ratio")]:
+            edges = np.unique(store.quantile(col, quintiles))
+            by_bin = store.binned_mean(col, edges, "Close_Price", include_lowest=True)
+            print(f"\nAverage Close Price by {label} Quintile:\n", by_bin)
+        print("\nAverage Close Price by RSI Range:\n", store.binned_mean("RSI", rsi_bins, "Close_Price"))
+
+        # ===============================
+        # 5. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", store.corr(numeric_cols))
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        print("\nAverage Daily Price Range:", as_scalar(store.value(f"AVG{daily_range}"), close))
+        volatility = f"{daily_range} / NULLIF(Close_Price, 0)"
+        volatile = store.top(5, volatility, "Volatility_Ratio", ["Symbol", "Sector", "Date"])
+        print("\nTop 5 Records with Highest Volatility:\n", volatile)
+        print("\nProportion of Overbought Days:", store.value("AVG(CASE WHEN RSI > 70 THEN 1.0 ELSE 0 END)"))
+        print("Proportion of Oversold Days:", store.value("AVG(CASE WHEN RSI < 30 THEN 1.0 ELSE 0 END)"))
+        has_dividend = store.group("Sector", {"Has_Dividend": "AVG(CASE WHEN Dividend_Yield > 0 THEN 1.0 ELSE 0 END)"})
+        dividend_rate = has_dividend["Has_Dividend"].sort_values(ascending=False)
+        print("\nSectors with Highest Proportion of Dividend Stocks:\n", dividend_rate.head(10))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the SQL store for the stock data or report from it.")
+    parser.add_argument("command", choices=["ingest", "report"])
+    parser.add_argument("--data", default="Q1_stock_market.csv")
+    parser.add_argument("--db", default=None, help="defaults to .cache/<data>.sqlite next to the CSV")
+    args = parser.parse_args()
+    if args.command == "ingest":
+        print(f"✅ SQL store written to {write_sql_store(args.data, args.db or sql_store_path(args.data), dataset_schema)}")
+    else:
+        sql_report(args.data, db_path=args.db)
@@ -0,0 +1,135 @@
+import numpy as np
+import pandas as pd
+from load_utils import float64_view, iter_typed_csv
+from schema import dataset_schema
+from stats_utils import CoMoments, GroupSums, Moments, ValueCounts, as_scalar
+
+# Out-of-core version of TitanicDataAnalysis.all_analysis: RunningReport keeps
+# only mergeable partial aggregates, so the CSV can be streamed through it in
+# chunks and appended rows (TitanicDataAnalysis.append_data) cost O(new rows).
+numeric_cols = ["Age", "Fare", "SibSp", "Parch", "Pclass"]
+survival_keys = [("Pclass", "Passenger Class"), ("Sex", "Sex"), ("Embarked", "Embarked Port")]
+
+
+def add_derived(chunk):
+    chunk["Family_Size"] = chunk["SibSp"] + chunk["Parch"] + 1
+    chunk["Age_to_Fare"] = chunk["Age"] / chunk["Fare"].replace(0, np.nan)
+    chunk["Child"] = (chunk["Age"] < 12).astype(int)
+    chunk["Alone"] = (chunk["SibSp"] + chunk["Parch"] == 0).fillna(False).astype(int)
+    return chunk
+
+
+def describe(moments, quantiles, dtypes):
+    rows = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+    table = {}
+    for i, col in enumerate(moments.columns):
+        q = quantiles.quantile(col, [0.25, 0.5, 0.75])
+        values = [moments.count[i], moments.mean[i], moments.std()[i], moments.min[i], *q, moments.max[i]]
+        dtype = "Float64" if pd.api.types.is_extension_array_dtype(dtypes[col]) else np.float64
+        table[col] = pd.Series(values, index=rows, dtype=dtype)
+    return pd.DataFrame(table)
+
+
+class RunningReport:
+    def __init__(self):
+        self.rows, self.columns, self.dtypes, self.missing = 0, None, None, None
+        self.moments = Moments(numeric_cols)
+        self.derived = Moments(["Survived", "Age_to_Fare"])
+        self.derived_dtype = None
+        self.quantiles = ValueCounts(numeric_cols)
+        self.comoments = CoMoments([*numeric_cols, "Survived"])
+        self.by_key = {key: GroupSums(["Survived"]) for key, _ in survival_keys}
+        self.by_survival = GroupSums(["Age", "Fare"])
+        self.by_flag = {key: GroupSums(["Survived"]) for key in ("Family_Size", "Child", "Alone")}
+
+    def update(self, chunk):
+        # Columns of the first chunk define the report; later chunks are
+        # projected to them. float32 columns are summarized as float64, like
+        # all_analysis does. The caller's frame is not modified.
+        chunk = float64_view(chunk)
+        if self.columns is None:
+            self.columns, self.dtypes = list(chunk.columns), chunk.dtypes
+        chunk = chunk[self.columns]
+        self.rows += len(chunk)
+        missing = chunk.isna().sum()
+        self.missing = missing if self.missing is None else self.missing + missing
+        self.moments.update(chunk)
+        self.quantiles.update(chunk)
+        self.comoments.update(chunk)
+        for key, sums in self.by_key.items():
+            sums.update(chunk, key)
+        self.by_survival.update(chunk, "Survived")
+        chunk = add_derived(chunk.copy(deep=False))
+        self.derived.update(chunk)
+        self.derived_dtype = chunk["Age_to_Fare"].dtype
+        for key, sums in self.by_flag.items():
+            sums.update(chunk, key)
+        return self
+
+    def print(self, title="chunked", by_rate=True):
+        # by_rate lists the class / sex / port groups by survival rate, as
+        # main_oop's option 5 does; main_pop's lists them in key order.
+        if self.dtypes is None:
+            print("⚠️ No rows to report.")
+            return
+        rows, dtypes, missing = self.rows, self.dtypes, self.missing
+        mean = dict(zip(self.derived.columns, self.derived.mean))
+        print(f"\n--- All Analysis ({title}) ---")
+
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", (rows, len(dtypes)))
+        print("\nColumn Data Types:\n", dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", describe(self.moments, self.quantiles, dtypes))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. Survival Analysis
+        # ===============================
+        print("\nOverall Survival Rate:", as_scalar(mean["Survived"], dtypes["Survived"]))
+        for key, label in survival_keys:
+            survival = self.by_key[key].mean("Survived", dtypes["Survived"])
+            if by_rate:
+                survival = survival.sort_values(ascending=False)
+            print(f"\nSurvival Rate by {label}:\n", survival)
+
+        # ===============================
+        # 3. Age & Fare Analysis
+        # ===============================
+        print("\nAverage Age by Survival:\n", self.by_survival.mean("Age", dtypes["Age"]))
+        print("\nAverage Fare by Survival:\n", self.by_survival.mean("Fare", dtypes["Fare"]))
+
+        # ===============================
+        # 4. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", self.comoments.corr())
+
+        # ===============================
+        # 5. Family Analysis (SibSp + Parch)
+        # ===============================
+        family = self.by_flag["Family_Size"].mean("Survived", dtypes["Survived"])
+        print("\nSurvival Rate by Family Size:\n", family.head(10))
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        age_to_fare = as_scalar(mean["Age_to_Fare"], self.derived_dtype)
+        print("\nGlobal Average Age-to-Fare Ratio:", age_to_fare)
+        child = self.by_flag["Child"].mean("Survived", dtypes["Survived"])
+        print("\nSurvival Rate for Children vs Adults:\n", child)
+        alone = self.by_flag["Alone"].mean("Survived", dtypes["Survived"])
+        print("\nSurvival Rate for Alone vs With Family:\n", alone)
+
+
+def chunked_report(file_path, chunk_size=1_000_000, columns=None, filters=None):
+    # columns / filters as in load_utils.read_typed_csv, applied to every chunk.
+    report = RunningReport()
+    for chunk in iter_typed_csv(file_path, dataset_schema, chunk_size, columns, filters):
+        report.update(chunk)
+    if report.dtypes is None:
+        print("⚠️ Data file is empty.")
+        return
+    report.print()
+    return report
@@ -1,85 +1,153 @@
 import pandas as pd
 import numpy as np
 import random
+from generate_utils import (
+    append_rows,
+    apply_dirty_args,
+    apply_output_args,
+    build_parser,
+    csv_output,
+    dirty_config,
+    generate_frame,
+    joined_levels,
+    set_missing,
+    write_chunked,
+    write_frame,
+    write_sharded,
+)
 
 file_name = "titanic_survival_dataset.csv"
 
-try:
-    np.random.seed(123)
-    random.seed(123)
+default_rows = 15000
+default_seed = 123
 
-    n_rows = 15000
+male_first = [
+    "James",
+    "John",
+    "Robert",
+    "William",
+    "Charles",
+    "George",
+    "Joseph",
+    "Edward",
+    "Henry",
+    "Thomas",
+    "Walter",
+    "Frank",
+    "Harry",
+    "Albert",
+    "Fred",
+    "Arthur",
+    "Samuel",
+    "David",
+    "Louis",
+    "Richard",
+]
+female_first = [
+    "Mary",
+    "Anna",
+    "Elizabeth",
+    "Margaret",
+    "Ruth",
+    "Helen",
+    "Florence",
+    "Dorothy",
+    "Ethel",
+    "Alice",
+    "Edith",
+    "Marie",
+    "Catherine",
+    "Grace",
+    "Mildred",
+    "Frances",
+    "Rose",
+    "Evelyn",
+    "Gladys",
+    "Lillian",
+]
+last_names = [
+    "Smith",
+    "Johnson",
+    "Brown",
+    "Davis",
+    "Wilson",
+    "Miller",
+    "Taylor",
+    "Anderson",
+    "Thomas",
+    "Jackson",
+    "White",
+    "Harris",
+    "Martin",
+    "Thompson",
+    "Garcia",
+    "Martinez",
+    "Robinson",
+    "Clark",
+    "Rodriguez",
+    "Lewis",
+]
+
+ticket_prefixes = [
+    "A/5",
+    "PC",
+    "STON/O2",
+    "C.A",
+    "SOTON/OQ",
+    "W./C",
+    "SC/Paris",
+    "CA",
+    "SC/Paris",
+    "F.C.C",
+    "LINE",
+    "PP",
+    "SC/AH",
+    "A/4",
+    "A/S",
+]
+
+male_titles = ["Mr.", "Dr.", "Rev.", "Col.", "Major.", "Capt."]
+female_titles = ["Mrs.", "Miss.", "Ms.", "Lady.", "Countess.", "Mme."]
+decks = ["A", "B", "C", "D", "E", "F", "G"]
+
+# Name, Ticket and Cabin of the vectorized generator are categoricals over
+# every value they can take, so each row only costs integer draws. Names are
+# laid out as (title, first, last) per sex, male block first.
+sex_dtype = pd.CategoricalDtype(["male", "female"])
+male_names = joined_levels(joined_levels(male_titles, male_first, " "), last_names, " ")
+female_names = joined_levels(
+    joined_levels(female_titles, female_first, " "), last_names, " "
+)
+name_dtype = pd.CategoricalDtype(np.concatenate([male_names, female_names]))
+# ticket_prefixes repeats "SC/Paris"; drawing from the list keeps its weight.
+prefix_levels, prefix_codes = np.unique(ticket_prefixes, return_inverse=True)
+ticket_numbers = np.arange(1000, 10000)
+ticket_dtype = pd.CategoricalDtype(joined_levels(prefix_levels, ticket_numbers, " "))
+cabin_numbers = np.arange(1, 151)
+cabin_dtype = pd.CategoricalDtype(joined_levels(decks, cabin_numbers))
+embarked_dtype = pd.CategoricalDtype(["S", "C", "Q"])
+
+numeric_columns = ["Age", "SibSp", "Parch", "Fare"]
+
+# Duplicate / missing-value rates of the original script, per generated row.
+duplicate_rate = (100 / default_rows, 200 / default_rows)
+missing_rate = (1000 / default_rows, 3000 / default_rows)
+dirty_data = dirty_config(numeric_columns, duplicate_rate, missing_rate)
+
+# Natural partition key for --partition (see generate_utils.output_config).
+partition_by = ("Pclass", None)
+
+
+# ===============================
+# Original generator (exact titanic_survival_dataset.csv for seed 123)
+# ===============================
+def generate_legacy(n_rows=default_rows, seed=default_seed):
+    np.random.seed(seed)
+    random.seed(seed)
 
     passenger_ids = list(range(1, n_rows + 1))
     pclass = np.random.choice([1, 2, 3], n_rows, p=[0.15, 0.25, 0.6])
 
-    male_first = [
-        "James",
-        "John",
-        "Robert",
-        "William",
-        "Charles",
-        "George",
-        "Joseph",
-        "Edward",
-        "Henry",
-        "Thomas",
-        "Walter",
-        "Frank",
-        "Harry",
-        "Albert",
-        "Fred",
-        "Arthur",
-        "Samuel",
-        "David",
-        "Louis",
-        "Richard",
-    ]
-    female_first = [
-        "Mary",
-        "Anna",
-        "Elizabeth",
-        "Margaret",
-        "Ruth",
-        "Helen",
-        "Florence",
-        "Dorothy",
-        "Ethel",
-        "Alice",
-        "Edith",
-        "Marie",
-        "Catherine",
-        "Grace",
-        "Mildred",
-        "Frances",
-        "Rose",
-        "Evelyn",
-        "Gladys",
-        "Lillian",
-    ]
-    last_names = [
-        "Smith",
-        "Johnson",
-        "Brown",
-        "Davis",
-        "Wilson",
-        "Miller",
-        "Taylor",
-        "Anderson",
-        "Thomas",
-        "Jackson",
-        "White",
-        "Harris",
-        "Martin",
-        "Thompson",
-        "Garcia",
-        "Martinez",
-        "Robinson",
-        "Clark",
-        "Rodriguez",
-        "Lewis",
-    ]
-
     names = []
     for i in range(n_rows):
         if random.random() < 0.65:
@@ -102,23 +170,6 @@ try:
     parch = np.random.poisson(0.4, n_rows)
     parch = np.clip(parch, 0, 6)
 
-    ticket_prefixes = [
-        "A/5",
-        "PC",
-        "STON/O2",
-        "C.A",
-        "SOTON/OQ",
-        "W./C",
-        "SC/Paris",
-        "CA",
-        "SC/Paris",
-        "F.C.C",
-        "LINE",
-        "PP",
-        "SC/AH",
-        "A/4",
-        "A/S",
-    ]
     tickets = []
     for i in range(n_rows):
         tickets.append(f"{random.choice(ticket_prefixes)} {random.randint(1000, 9999)}")
@@ -163,18 +214,182 @@ try:
 
     duplicate_count = random.randint(100, 200)
     duplicate_indices = random.sample(range(n_rows), duplicate_count)
-    duplicates = df.iloc[duplicate_indices].copy()
-    df = pd.concat([df, duplicates], ignore_index=True)
+    df = append_rows(df, duplicate_indices)
 
-    numeric_columns = ["Age", "SibSp", "Parch", "Fare"]
     empty_count = random.randint(1000, 3000)
     empty_indices = random.sample(range(len(df)), empty_count)
-    for idx in empty_indices:
-        col = random.choice(numeric_columns)
-        df.at[idx, col] = np.nan
-
-    df = df.sample(frac=1, random_state=123).reset_index(drop=True)
-except BaseException as e:
-    print(f"An error occurred: {e}")
-else:
-    df.to_csv(file_name, index=False)
+    empty_columns = [random.choice(numeric_columns) for _ in empty_indices]
+    df = set_missing(df, empty_indices, empty_columns)
+
+    df = df.sample(frac=1, random_state=seed).reset_index(drop=True)
+    return df
+
+
+# ===============================
+# Vectorized generator
+# ===============================
+def generate_chunk(rng, start, n_rows):
+    pclass = rng.choice([1, 2, 3], n_rows, p=[0.15, 0.25, 0.6])
+
+    # Sex is drawn first and picks the title / first-name pools, so every
+    # name agrees with its Sex column.
+    is_male = rng.random(n_rows) < 0.65
+    n_titles = np.where(is_male, len(male_titles), len(female_titles))
+    n_first = np.where(is_male, len(male_first), len(female_first))
+    title = (rng.random(n_rows) * n_titles).astype(np.int64)
+    first = (rng.random(n_rows) * n_first).astype(np.int64)
+    last = rng.integers(0, len(last_names), n_rows)
+    name_codes = (title * n_first + first) * len(last_names) + last
+    name_codes += np.where(is_male, 0, len(male_names))
+    names = pd.Categorical.from_codes(name_codes, dtype=name_dtype)
+    sex = pd.Categorical.from_codes((~is_male).astype(np.int8), dtype=sex_dtype)
+
+    age = np.clip(np.round(rng.normal(29, 14, n_rows)), 0.5, 80)
+    sibsp = np.clip(rng.poisson(0.5, n_rows), 0, 8)
+    parch = np.clip(rng.poisson(0.4, n_rows), 0, 6)
+
+    prefix = prefix_codes[rng.integers(0, len(ticket_prefixes), n_rows)]
+    number = rng.integers(0, len(ticket_numbers), n_rows)
+    tickets = pd.Categorical.from_codes(
+        prefix * len(ticket_numbers) + number, dtype=ticket_dtype
+    )
+
+    fare = np.clip(np.round(rng.lognormal(2.5, 1.2, n_rows), 2), 0, 512)
+
+    has_cabin = rng.random(n_rows) < 0.3
+    deck = rng.integers(0, len(decks), n_rows)
+    cabin_num = rng.integers(0, len(cabin_numbers), n_rows)
+    cabins = pd.Categorical.from_codes(
+        np.where(has_cabin, deck * len(cabin_numbers) + cabin_num, -1), dtype=cabin_dtype
+    )
+
+    embarked = pd.Categorical.from_codes(
+        rng.choice(3, n_rows, p=[0.72, 0.19, 0.09]), dtype=embarked_dtype
+    )
+
+    survival_prob = np.where(is_male, 0.19, 0.74)
+    survival_prob = np.where(pclass == 1, survival_prob + 0.15, survival_prob)
+    survival_prob = np.where(age < 16, survival_prob + 0.2, survival_prob)
+    survival_prob = np.where(fare > 100, survival_prob + 0.1, survival_prob)
+    survival_prob = np.clip(survival_prob, 0.05, 0.95)
+    survived = rng.binomial(1, survival_prob)
+
+    return pd.DataFrame(
+        {
+            "PassengerId": np.arange(start + 1, start + n_rows + 1),
+            "Survived": survived,
+            "Pclass": pclass,
+            "Name": names,
+            "Sex": sex,
+            "Age": age,
+            "SibSp": sibsp,
+            "Parch": parch,
+            "Ticket": tickets,
+            "Fare": fare,
+            "Cabin": cabins,
+            "Embarked": embarked,
+        }
+    )
+
+
+def generate_fast(n_rows=default_rows, seed=default_seed, dirty=dirty_data):
+    return generate_frame(generate_chunk, n_rows, seed, dirty)
+
+
+def write_streaming(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    chunk_size=1_000_000,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_chunked(
+        generate_chunk, file_name, n_rows, seed, chunk_size, dirty, output=output
+    )
+
+
+def write_parallel(
+    file_name,
+    n_rows=default_rows,
+    seed=default_seed,
+    workers=4,
+    chunk_size=1_000_000,
+    merge=True,
+    dirty=dirty_data,
+    output=csv_output,
+):
+    return write_sharded(
+        generate_chunk,
+        file_name,
+        n_rows,
+        seed,
+        workers,
+        chunk_size,
+        dirty,
+        merge,
+        output=output,
+    )
+
+
+# ===============================
+# In-process API
+# ===============================
+def generate(
+    n_rows=default_rows,
+    seed=default_seed,
+    fast=False,
+    dirty=dirty_data,
+    output=None,
+    output_format=csv_output,
+):
+    # Returns the dataset as a DataFrame (the exact bundled dataset by
+    # default) and optionally also writes it to `output` (CSV unless
+    # output_format says otherwise).
+    if fast:
+        df = generate_fast(n_rows, seed, dirty)
+    else:
+        df = generate_legacy(n_rows, seed)
+    if output is not None:
+        write_frame(df, output, output_format)
+    return df
+
+
+def main():
+    parser = build_parser(
+        "Generate the synthetic Titanic survival dataset.", file_name, default_rows, default_seed
+    )
+    args = parser.parse_args()
+
+    sample = generate_chunk(np.random.default_rng(0), 0, 1)
+    legacy = not (args.fast or args.chunked or args.workers)
+    dirty = apply_dirty_args(dirty_data, args, parser, sample, legacy)
+    output = apply_output_args(args, partition_by)
+    df = None
+    try:
+        if args.workers:
+            write_parallel(
+                args.output,
+                args.rows,
+                args.seed,
+                args.workers,
+                args.chunk_size,
+                not args.parts,
+                dirty,
+                output=output,
+            )
+        elif args.chunked:
+            write_streaming(
+                args.output, args.rows, args.seed, args.chunk_size, dirty, output=output
+            )
+        else:
+            df = generate(args.rows, args.seed, args.fast, dirty)
+    except BaseException as e:
+        print(f"An error occurred: {e}")
+    else:
+        if df is not None:
+            write_frame(df, args.output, output)
+
+
+if __name__ == "__main__":
+    main()
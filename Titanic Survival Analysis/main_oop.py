@@ -3,48 +3,87 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from data_generate import generate
+from load_utils import (
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from schema import dataset_schema
+from chunked_analysis import RunningReport
+from sql_analysis import sql_report
 from time import sleep as delay
 from random import randint as rand
 
 class TitanicDataAnalysis:
+    # Columns each menu action reads; load_data only materializes these.
+    action_columns = {
+        "all_analysis": ["Survived", "Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"],
+        "all_visualizations": ["Survived", "Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"],
+        "append_data": [dataset_schema["key"]],
+    }
+
     def __init__(self, file_path):
         self.file_path = file_path
         self.df = None
+        self.results = ResultCache()  # memoized tables of self.df, see memo_utils
+        self.running = None  # all_analysis aggregates kept by append_data
+        self.appended = []  # frames added by append_data, see collect_appended
+        self.key_indexes = []  # KeyIndex of the loaded rows and of each append
 
     # 1. Generate Data
     def generate_data(self):
-        if os.path.exists("data_generate.py") and not os.path.exists(
-            "titanic_survival_dataset.csv"
-        ):
-            os.system("python data_generate.py")
-            print("✅ Data generated successfully.")
-        elif not os.path.exists("titanic_survival_dataset.csv"):
-            print("❌ data already exists!")
-        elif not os.path.exists("data_generate.py"):
-            print("❌ data_generate.py not found!")
+        persist = not os.path.exists(self.file_path)
+        self.df = typed_frame(generate(output=self.file_path if persist else None), dataset_schema)
+        self.results.bump()
+        self.running = None
+        self.appended = []
+        print("✅ Data generated successfully.")
+        print("Shape:", self.df.shape)
+        if persist:
+            print(f"✅ Data saved to {self.file_path}.")
+        else:
+            print("⚠️ Data file already exists, generated data kept in memory only.")
 
     # 2. Load Data
-    def load_data(self):
-        if not os.path.exists(self.file_path):
+    def load_data(self, columns=None, filters=None, workers=None):
+        if not dataset_exists(self.file_path):
             print("⚠️ Data file not found!")
             return
-        self.df = pd.read_csv(self.file_path)
+        # filters keeps matching rows, e.g. {"Pclass": [1, 2], "Age": (18, None)}; see load_utils.
+        # workers > 1 parses large CSVs in that many processes.
+        columns = needed_columns(self.action_columns) if columns is None else columns
+        self.df = read_dataset(self.file_path, dataset_schema, columns, filters, workers=workers)
+        self.results.bump()
+        self.running = None
+        self.appended = []
         print("✅ Data loaded successfully.")
         print("Shape:", self.df.shape)
+        memory_report(self.df)
 
     # 3. Basic Info
     def basic_info(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
         print("\n--- Basic Info ---")
         print("Dataset Shape:", self.df.shape)
         print("\nColumn Data Types:\n", self.df.dtypes)
-        print("\nMissing Values:\n", self.df.isna().sum())
-        print("\nMissing Values (%):\n", (self.df.isna().sum() / len(self.df)) * 100)
+        print("\nMissing Values:\n", self.results.missing(self.df))
+        print("\nMissing Values (%):\n", (self.results.missing(self.df) / len(self.df)) * 100)
 
     # 4. Handle Missing Values
     def handle_missing_values(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
@@ -60,15 +99,16 @@ class TitanicDataAnalysis:
                     func = input("Enter aggregate function (mean/median): ").strip().lower()
                     if func in ["mean", "median"]:
                         for col in numeric_cols:
-                            if func == "mean":
-                                self.df[col] = self.df[col].fillna(self.df[col].mean())
-                            else:
-                                self.df[col] = self.df[col].fillna(self.df[col].median())
+                            self.df[col] = fill_missing(self.df[col], func)
+                        self.results.bump()
+                        self.running = None
                         print(f"✅ Missing values filled using {func}.")
                     else:
                         print("❌ Invalid function!")
                 case 2:
                     self.df.dropna(inplace=True)
+                    self.results.bump()
+                    self.running = None
                     print("✅ Rows with missing values dropped.")
                 case 0:
                     print("Exiting missing value handler...")
@@ -78,21 +118,26 @@ class TitanicDataAnalysis:
 
     # 5. All Analysis
     def all_analysis(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
-        df = self.df
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # Stats run on float64 copies of the float32 columns (see
+        # load_utils.float64_view), so they print without float32 noise.
+        df = float64_view(self.df)
         # ===============================
         # 1. Basic Info
         # ===============================
         print("Dataset Shape:", df.shape)
         print("\nColumn Data Types:\n", df.dtypes)
-        print("\nMissing Values:\n", df.isna().sum())
+        print("\nMissing Values:\n", self.results.missing(df))
 
         numeric_cols = ["Age", "Fare", "SibSp", "Parch", "Pclass"]
-        print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
+        print("\nSummary Statistics:\n", self.results.describe(df, numeric_cols, include="all"))
 
-        missing_percent = (df.isna().sum() / len(df)) * 100
+        missing_percent = (self.results.missing(df) / len(df)) * 100
         print("\nMissing Values (%):\n", missing_percent)
 
         # ===============================
@@ -104,10 +149,10 @@ class TitanicDataAnalysis:
         survival_by_class = df.groupby("Pclass")["Survived"].mean().sort_values(ascending=False)
         print("\nSurvival Rate by Passenger Class:\n", survival_by_class)
 
-        survival_by_sex = df.groupby("Sex")["Survived"].mean().sort_values(ascending=False)
+        survival_by_sex = df.groupby("Sex", observed=True)["Survived"].mean().sort_values(ascending=False)
         print("\nSurvival Rate by Sex:\n", survival_by_sex)
 
-        survival_by_embarked = df.groupby("Embarked")["Survived"].mean().sort_values(ascending=False)
+        survival_by_embarked = df.groupby("Embarked", observed=True)["Survived"].mean().sort_values(ascending=False)
         print("\nSurvival Rate by Embarked Port:\n", survival_by_embarked)
 
         # ===============================
@@ -122,7 +167,7 @@ class TitanicDataAnalysis:
         # ===============================
         # 4. Correlations
         # ===============================
-        corr_matrix = df[numeric_cols + ["Survived"]].corr()
+        corr_matrix = self.results.corr(df, numeric_cols + ["Survived"])
         print("\nCorrelation Matrix:\n", corr_matrix)
 
         # ===============================
@@ -145,15 +190,18 @@ class TitanicDataAnalysis:
         print("\nSurvival Rate for Children vs Adults:\n", child_survival)
 
         # Example: Alone indicator
-        df["Alone"] = (df["SibSp"] + df["Parch"] == 0).astype(int)
+        df["Alone"] = (df["SibSp"] + df["Parch"] == 0).fillna(False).astype(int)
         alone_survival = df.groupby("Alone")["Survived"].mean()
         print("\nSurvival Rate for Alone vs With Family:\n", alone_survival)
 
     # 6. All Visualizations
     def all_visualizations(self):
+        self.collect_appended()
         if self.df is None:
             print("⚠️ Data not loaded.")
             return
+        if missing_columns(self.df, self.action_columns["all_visualizations"]):
+            return
         df = self.df
         numeric_cols = ["Age", "Fare", "SibSp", "Parch", "Pclass"]
 
@@ -197,7 +245,7 @@ class TitanicDataAnalysis:
         # Correlation heatmap
         plt.figure(figsize=(10, 6))
         sns.heatmap(
-            df[numeric_cols + ["Survived"]].corr(), annot=True, cmap="coolwarm", fmt=".2f"
+            self.results.corr(df, numeric_cols + ["Survived"]), annot=True, cmap="coolwarm", fmt=".2f"
         )
         plt.title("Correlation Heatmap")
         plt.show()
@@ -248,7 +296,7 @@ class TitanicDataAnalysis:
         plt.show()
 
         # Heatmap of survival rate by Sex & Pclass
-        pivot = df.pivot_table(values="Survived", index="Sex", columns="Pclass", aggfunc="mean")
+        pivot = df.pivot_table(values="Survived", index="Sex", columns="Pclass", aggfunc="mean", observed=True).astype(float)
         plt.figure(figsize=(8, 6))
         sns.heatmap(
             pivot, annot=True, cmap="YlGnBu", fmt=".2f", cbar_kws={"label": "Survival Rate"}
@@ -262,6 +310,69 @@ class TitanicDataAnalysis:
         g.set_axis_labels("Age", "Count")
         plt.show()
 
+    # 7. All Analysis (SQL store, indexed queries)
+    def sql_analysis(self, filters=None):
+        if not os.path.exists(self.file_path):
+            print("⚠️ Data file not found!")
+            return
+        # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+        sql_report(self.file_path, self.action_columns["all_analysis"], filters)
+
+
+    # 8. Append Data (running all_analysis aggregates)
+    def append_data(self, source=None):
+        if self.df is None:
+            print("⚠️ Data not loaded.")
+            return
+        if missing_columns(self.df, self.action_columns["all_analysis"]):
+            return
+        # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+        if source is None:
+            source = input("Enter the data file (or glob) to append: ").strip()
+        if isinstance(source, pd.DataFrame):
+            new = typed_frame(source, dataset_schema)
+        elif dataset_exists(source):
+            new = read_dataset(source, dataset_schema, needed_columns(self.action_columns))
+        else:
+            print("⚠️ Data file not found!")
+            return
+        columns = [col for col in self.df.columns if col in dataset_schema["dtypes"]]
+        if missing_columns(new, columns):
+            return
+        key = dataset_schema["key"]
+        # The loaded rows are folded in once, on the first append; after that
+        # the report only costs the new rows (see chunked_analysis.RunningReport).
+        if self.running is None:
+            self.df = self.df[columns].reset_index(drop=True)
+            self.running = RunningReport().update(self.df)
+            self.key_indexes = [key_index(self.df, key)] if key in columns else []
+        # New rows are kept aside and concatenated by the next action that
+        # needs the whole frame (collect_appended); their row labels continue
+        # after the rows before them, as in the concatenated frame.
+        rows = len(self.df) + sum(len(frame) for frame in self.appended)
+        new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+        # New keys are probed against the hash index of each earlier block:
+        # one probe per new row and block, no pass over the loaded rows
+        # (see key_utils.KeyIndex).
+        if key in columns:
+            repeated, index = repeated_keys(self.key_indexes, new[key])
+            self.key_indexes.append(index)
+            if repeated.any():
+                print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+        self.running.update(new)
+        self.appended.append(new)
+        self.results.bump()
+        print(f"✅ {len(new)} rows appended.")
+        print("Shape:", (rows + len(new), len(columns)))
+        self.running.print("running")
+
+    def collect_appended(self):
+        # One concatenation for all the frames appended since the last call.
+        if self.appended:
+            columns = list(self.appended[0].columns)
+            self.df = concat_frames([self.df[columns], *self.appended], dataset_schema)
+            self.appended = []
+
 
 # ==========================
 # 🚀 Menu-driven interaction
@@ -277,6 +388,8 @@ def main():
         4: ("Handle Missing Values", analyzer.handle_missing_values),
         5: ("All Analysis", analyzer.all_analysis),
         6: ("All Visualizations", analyzer.all_visualizations),
+        7: ("All Analysis (SQL store)", analyzer.sql_analysis),
+        8: ("Append Data", analyzer.append_data),
         0: ("Exit", None),
     }
 
@@ -3,56 +3,98 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+from data_generate import generate
+from load_utils import (
+    concat_frames,
+    dataset_exists,
+    fill_missing,
+    float64_view,
+    memory_report,
+    missing_columns,
+    needed_columns,
+    read_dataset,
+    typed_frame,
+)
+from key_utils import key_index, repeated_keys
+from memo_utils import ResultCache
+from schema import dataset_schema
+from chunked_analysis import RunningReport
+from sql_analysis import sql_report
 from time import sleep as delay
 from random import randint as rand
 
 # Global dataframe
 df = None
+results = ResultCache()  # memoized tables of df, see memo_utils
+running = None  # all_analysis aggregates kept by append_data
+appended = []  # frames added by append_data, see collect_appended
+key_indexes = []  # KeyIndex of the loaded rows and of each append
 file_path = "titanic_survival_dataset.csv"
 
+# Columns each menu action reads; load_data only materializes these.
+action_columns = {
+    "all_analysis": ["Survived", "Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"],
+    "all_visualizations": ["Survived", "Pclass", "Sex", "Age", "SibSp", "Parch", "Fare", "Embarked"],
+    "append_data": [dataset_schema["key"]],
+}
+
 # ===============================
 # 1. Generate Data
 # ===============================
 def generate_data():
-    if os.path.exists("data_generate.py") and not os.path.exists("titanic_survival_dataset.csv"):
-        os.system("python data_generate.py")
-        print("✅ Data generated successfully.")
-    elif os.path.exists("titanic_survival_dataset.csv"):
-        print("⚠️ Data already exists!")
+    global df, running, appended
+    persist = not os.path.exists(file_path)
+    df = typed_frame(generate(output=file_path if persist else None), dataset_schema)
+    results.bump()
+    running = None
+    appended = []
+    print("✅ Data generated successfully.")
+    print("Shape:", df.shape)
+    if persist:
+        print(f"✅ Data saved to {file_path}.")
     else:
-        print("❌ data_generate.py not found!")
+        print("⚠️ Data file already exists, generated data kept in memory only.")
 
 # ===============================
 # 2. Load Data
 # ===============================
-def load_data():
-    global df
-    if not os.path.exists(file_path):
+def load_data(columns=None, filters=None, workers=None):
+    global df, running, appended
+    if not dataset_exists(file_path):
         print("⚠️ Data file not found!")
         return
-    df = pd.read_csv(file_path)
+    # filters keeps matching rows, e.g. {"Pclass": [1, 2], "Age": (18, None)}; see load_utils.
+    # workers > 1 parses large CSVs in that many processes.
+    columns = needed_columns(action_columns) if columns is None else columns
+    df = read_dataset(file_path, dataset_schema, columns, filters, workers=workers)
+    results.bump()
+    running = None
+    appended = []
     print("✅ Data loaded successfully.")
     print("Shape:", df.shape)
+    memory_report(df)
 
 # ===============================
 # 3. Basic Info
 # ===============================
 def basic_info():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
     print("\n--- Basic Info ---")
     print("Dataset Shape:", df.shape)
     print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
-    print("\nMissing Values (%):\n", (df.isna().sum() / len(df)) * 100)
+    print("\nMissing Values:\n", results.missing(df))
+    print("\nMissing Values (%):\n", (results.missing(df) / len(df)) * 100)
 
 # ===============================
 # 4. Handle Missing Values
 # ===============================
 def handle_missing_values():
-    global df
+    global df, running
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
@@ -69,15 +111,16 @@ def handle_missing_values():
                 func = input("Enter aggregate function (mean/median): ").strip().lower()
                 if func in ["mean", "median"]:
                     for col in numeric_cols:
-                        if func == "mean":
-                            df[col] = df[col].fillna(df[col].mean())
-                        else:
-                            df[col] = df[col].fillna(df[col].median())
+                        df[col] = fill_missing(df[col], func)
+                    results.bump()
+                    running = None
                     print(f"✅ Missing values filled using {func}.")
                 else:
                     print("❌ Invalid function!")
             case 2:
                 df.dropna(inplace=True)
+                results.bump()
+                running = None
                 print("✅ Rows with missing values dropped.")
             case 0:
                 print("Exiting missing value handler...")
@@ -90,53 +133,62 @@ def handle_missing_values():
 # ===============================
 def all_analysis():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # Stats run on float64 copies of the float32 columns (see
+    # load_utils.float64_view), so they print without float32 noise.
+    data = float64_view(df)
     numeric_cols = ["Age", "Fare", "SibSp", "Parch", "Pclass"]
 
     # 1. Basic Info
-    print("Dataset Shape:", df.shape)
-    print("\nColumn Data Types:\n", df.dtypes)
-    print("\nMissing Values:\n", df.isna().sum())
-    print("\nSummary Statistics:\n", df[numeric_cols].describe(include="all"))
-    print("\nMissing Values (%):\n", (df.isna().sum() / len(df)) * 100)
+    print("Dataset Shape:", data.shape)
+    print("\nColumn Data Types:\n", data.dtypes)
+    print("\nMissing Values:\n", results.missing(data))
+    print("\nSummary Statistics:\n", results.describe(data, numeric_cols, include="all"))
+    print("\nMissing Values (%):\n", (results.missing(data) / len(data)) * 100)
 
     # 2. Survival Analysis
-    print("\nOverall Survival Rate:", df["Survived"].mean())
-    print("\nSurvival Rate by Passenger Class:\n", df.groupby("Pclass")["Survived"].mean())
-    print("\nSurvival Rate by Sex:\n", df.groupby("Sex")["Survived"].mean())
-    print("\nSurvival Rate by Embarked Port:\n", df.groupby("Embarked")["Survived"].mean())
+    print("\nOverall Survival Rate:", data["Survived"].mean())
+    print("\nSurvival Rate by Passenger Class:\n", data.groupby("Pclass")["Survived"].mean())
+    print("\nSurvival Rate by Sex:\n", data.groupby("Sex", observed=True)["Survived"].mean())
+    print("\nSurvival Rate by Embarked Port:\n", data.groupby("Embarked", observed=True)["Survived"].mean())
 
     # 3. Age & Fare Analysis
-    print("\nAverage Age by Survival:\n", df.groupby("Survived")["Age"].mean())
-    print("\nAverage Fare by Survival:\n", df.groupby("Survived")["Fare"].mean())
+    print("\nAverage Age by Survival:\n", data.groupby("Survived")["Age"].mean())
+    print("\nAverage Fare by Survival:\n", data.groupby("Survived")["Fare"].mean())
 
     # 4. Correlations
-    print("\nCorrelation Matrix:\n", df[numeric_cols + ["Survived"]].corr())
+    print("\nCorrelation Matrix:\n", results.corr(data, numeric_cols + ["Survived"]))
 
     # 5. Family Analysis
-    df["Family_Size"] = df["SibSp"] + df["Parch"] + 1
-    print("\nSurvival Rate by Family Size:\n", df.groupby("Family_Size")["Survived"].mean().head(10))
+    data["Family_Size"] = data["SibSp"] + data["Parch"] + 1
+    print("\nSurvival Rate by Family Size:\n", data.groupby("Family_Size")["Survived"].mean().head(10))
 
     # 6. Derived Metrics
-    df["Age_to_Fare"] = df["Age"] / df["Fare"].replace(0, np.nan)
-    print("\nGlobal Average Age-to-Fare Ratio:", df["Age_to_Fare"].mean())
+    data["Age_to_Fare"] = data["Age"] / data["Fare"].replace(0, np.nan)
+    print("\nGlobal Average Age-to-Fare Ratio:", data["Age_to_Fare"].mean())
 
-    df["Child"] = df["Age"].apply(lambda x: 1 if x < 12 else 0)
-    print("\nSurvival Rate for Children vs Adults:\n", df.groupby("Child")["Survived"].mean())
+    data["Child"] = data["Age"].apply(lambda x: 1 if x < 12 else 0)
+    print("\nSurvival Rate for Children vs Adults:\n", data.groupby("Child")["Survived"].mean())
 
-    df["Alone"] = (df["SibSp"] + df["Parch"] == 0).astype(int)
-    print("\nSurvival Rate for Alone vs With Family:\n", df.groupby("Alone")["Survived"].mean())
+    data["Alone"] = (data["SibSp"] + data["Parch"] == 0).fillna(False).astype(int)
+    print("\nSurvival Rate for Alone vs With Family:\n", data.groupby("Alone")["Survived"].mean())
 
 # ===============================
 # 6. All Visualizations
 # ===============================
 def all_visualizations():
     global df
+    collect_appended()
     if df is None:
         print("⚠️ Data not loaded.")
         return
+    if missing_columns(df, action_columns["all_visualizations"]):
+        return
     numeric_cols = ["Age", "Fare", "SibSp", "Parch", "Pclass"]
 
     # Univariate Analysis
@@ -161,7 +213,7 @@ def all_visualizations():
         plt.show()
 
     plt.figure(figsize=(10,6))
-    sns.heatmap(df[numeric_cols + ["Survived"]].corr(), annot=True, cmap="coolwarm", fmt=".2f")
+    sns.heatmap(results.corr(df, numeric_cols + ["Survived"]), annot=True, cmap="coolwarm", fmt=".2f")
     plt.title("Correlation Heatmap")
     plt.show()
 
@@ -195,7 +247,7 @@ def all_visualizations():
     plt.title("Age Distribution by Survival")
     plt.show()
 
-    pivot = df.pivot_table(values="Survived", index="Sex", columns="Pclass", aggfunc="mean")
+    pivot = df.pivot_table(values="Survived", index="Sex", columns="Pclass", aggfunc="mean", observed=True).astype(float)
     plt.figure(figsize=(8,6))
     sns.heatmap(pivot, annot=True, cmap="YlGnBu", fmt=".2f", cbar_kws={'label': 'Survival Rate'})
     plt.title("Survival Rate by Sex & Pclass")
@@ -206,6 +258,72 @@ def all_visualizations():
     g.set_axis_labels("Age", "Count")
     plt.show()
 
+# 7. All Analysis (SQL store, indexed queries)
+def sql_analysis(filters=None):
+    if not os.path.exists(file_path):
+        print("⚠️ Data file not found!")
+        return
+    # Builds the SQLite copy on first use; filters run as indexed WHERE clauses.
+    sql_report(file_path, action_columns["all_analysis"], filters, by_rate=False)
+
+
+# 8. Append Data (running all_analysis aggregates)
+def append_data(source=None):
+    global df, running, key_indexes
+    if df is None:
+        print("⚠️ Data not loaded.")
+        return
+    if missing_columns(df, action_columns["all_analysis"]):
+        return
+    # source is a data file, a directory or glob of CSVs, or a DataFrame of new rows.
+    if source is None:
+        source = input("Enter the data file (or glob) to append: ").strip()
+    if isinstance(source, pd.DataFrame):
+        new = typed_frame(source, dataset_schema)
+    elif dataset_exists(source):
+        new = read_dataset(source, dataset_schema, needed_columns(action_columns))
+    else:
+        print("⚠️ Data file not found!")
+        return
+    columns = [col for col in df.columns if col in dataset_schema["dtypes"]]
+    if missing_columns(new, columns):
+        return
+    key = dataset_schema["key"]
+    # The loaded rows are folded in once, on the first append; after that
+    # the report only costs the new rows (see chunked_analysis.RunningReport).
+    if running is None:
+        df = df[columns].reset_index(drop=True)
+        running = RunningReport().update(df)
+        key_indexes = [key_index(df, key)] if key in columns else []
+    # New rows are kept aside and concatenated by the next action that needs
+    # the whole frame (collect_appended); their row labels continue after the
+    # rows before them, as in the concatenated frame.
+    rows = len(df) + sum(len(frame) for frame in appended)
+    new = new[columns].set_axis(pd.RangeIndex(rows, rows + len(new)))
+    # New keys are probed against the hash index of each earlier block: one
+    # probe per new row and block, no pass over the loaded rows (see key_utils).
+    if key in columns:
+        repeated, index = repeated_keys(key_indexes, new[key])
+        key_indexes.append(index)
+        if repeated.any():
+            print(f"⚠️ {repeated.sum()} appended rows repeat a {key} already in the data.")
+    running.update(new)
+    appended.append(new)
+    results.bump()
+    print(f"✅ {len(new)} rows appended.")
+    print("Shape:", (rows + len(new), len(columns)))
+    running.print("running", by_rate=False)
+
+
+def collect_appended():
+    # One concatenation for all the frames appended since the last call.
+    global df, appended
+    if appended:
+        columns = list(appended[0].columns)
+        df = concat_frames([df[columns], *appended], dataset_schema)
+        appended = []
+
+
 # ==========================
 # 🚀 Menu-driven interaction
 # ==========================
@@ -217,6 +335,8 @@ def main():
         4: ("Handle Missing Values", handle_missing_values),
         5: ("All Analysis", all_analysis),
         6: ("All Visualizations", all_visualizations),
+        7: ("All Analysis (SQL store)", sql_analysis),
+        8: ("Append Data", append_data),
         0: ("Exit", None),
     }
 
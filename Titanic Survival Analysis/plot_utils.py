@@ -0,0 +1,28 @@
+import colorsys
+import seaborn as sns
+
+# Plot helpers for tables the reports compute themselves (see memo_utils),
+# drawn to look like the seaborn plots they replace.
+
+
+def seaborn_bxp(ax, stats):
+    # ax.bxp of precomputed boxes (ResultCache.box_stats) styled like
+    # sns.boxplot: one palette color per box at seaborn's 0.75 saturation,
+    # gray lines as dark as the lightest color allows, open-circle fliers.
+    colors = sns.color_palette(n_colors=len(stats), desat=0.75)
+    lum = min((colorsys.rgb_to_hls(*color)[1] for color in colors), default=0) * 0.6
+    gray = (lum, lum, lum)
+    line = {"color": gray, "linewidth": 1.0}
+    artists = ax.bxp(
+        stats,
+        widths=0.8,
+        patch_artist=True,
+        boxprops={"edgecolor": gray, "linewidth": 1.0},
+        whiskerprops=line,
+        capprops=line,
+        medianprops=line,
+        flierprops={"marker": "o", "markerfacecolor": "none", "markeredgecolor": gray},
+    )
+    for box, color in zip(artists["boxes"], colors):
+        box.set_facecolor(color)
+    return artists
@@ -0,0 +1,31 @@
+from data_generate import sex_dtype, embarked_dtype
+
+# Column dtypes applied at parse time (see load_utils.read_typed_csv). Small
+# counts and flags are nullable Int8; Name and Cabin repeat often enough to be
+# categories with levels taken from the file (Sex and Embarked sorted, as
+# read_csv would order them), while Ticket is nearly unique
+# per passenger and stays a string.
+dataset_schema = {
+    "dtypes": {
+        "PassengerId": "Int32",
+        "Survived": "Int8",
+        "Pclass": "Int8",
+        "Name": "category",
+        "Sex": "category",
+        "Age": "float32",
+        "SibSp": "Int8",
+        "Parch": "Int8",
+        "Ticket": "string",
+        "Fare": "float32",
+        "Cabin": "category",
+        "Embarked": "category",
+    },
+    "levels": {
+        "Sex": sorted(sex_dtype.categories),
+        "Embarked": sorted(embarked_dtype.categories),
+    },
+    # Row identifier; append_data reports new rows that repeat one.
+    "key": "PassengerId",
+    # Natural query keys, indexed in the SQL store (see sql_utils).
+    "indexes": [["Pclass", "Sex"]],
+}
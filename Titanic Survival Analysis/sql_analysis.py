@@ -0,0 +1,80 @@
+import argparse
+import numpy as np
+from schema import dataset_schema
+from sql_utils import open_sql_store, sql_store_path, write_sql_store
+
+# TitanicDataAnalysis.all_analysis on the SQL store: every groupby, mean and
+# correlation runs in SQLite and only the aggregated rows reach pandas.
+numeric_cols = ["Age", "Fare", "SibSp", "Parch", "Pclass"]
+family_size = {"Family_Size": "SibSp + Parch + 1"}
+child = {"Child": "CASE WHEN Age < 12 THEN 1 ELSE 0 END"}
+alone = {"Alone": "CASE WHEN SibSp + Parch = 0 THEN 1 ELSE 0 END"}
+
+
+def sql_report(file_path, columns=None, filters=None, db_path=None, by_rate=True):
+    # columns / filters as in load_data; the store is built on first use.
+    # by_rate lists the class / sex / port groups by survival rate, as
+    # main_oop's option 5 does; main_pop's lists them in key order.
+    store = open_sql_store(file_path, dataset_schema, db_path, filters, columns)
+    try:
+        rows = store.rows()
+        if rows == 0:
+            print("⚠️ No rows match.")
+            return
+        missing = store.missing()
+        # ===============================
+        # 1. Basic Info
+        # ===============================
+        print("Dataset Shape:", store.shape())
+        print("\nColumn Data Types:\n", store.dtypes)
+        print("\nMissing Values:\n", missing)
+        print("\nSummary Statistics:\n", store.describe(numeric_cols))
+        print("\nMissing Values (%):\n", (missing / rows) * 100)
+
+        # ===============================
+        # 2. Survival Analysis
+        # ===============================
+        print("\nOverall Survival Rate:", np.float64(store.value("AVG(Survived)")))
+        for key, label in (("Pclass", "Passenger Class"), ("Sex", "Sex"), ("Embarked", "Embarked Port")):
+            survival = store.group_mean(key, "Survived")
+            if by_rate:
+                survival = survival.sort_values(ascending=False)
+            print(f"\nSurvival Rate by {label}:\n", survival)
+
+        # ===============================
+        # 3. Age & Fare Analysis
+        # ===============================
+        print("\nAverage Age by Survival:\n", store.group_mean("Survived", "Age"))
+        print("\nAverage Fare by Survival:\n", store.group_mean("Survived", "Fare"))
+
+        # ===============================
+        # 4. Correlations
+        # ===============================
+        print("\nCorrelation Matrix:\n", store.corr(numeric_cols + ["Survived"]))
+
+        # ===============================
+        # 5. Family Analysis (SibSp + Parch)
+        # ===============================
+        print("\nSurvival Rate by Family Size:\n", store.group_mean(family_size, "Survived").head(10))
+
+        # ===============================
+        # 6. Derived Metrics
+        # ===============================
+        age_to_fare = store.value("AVG(Age / NULLIF(Fare, 0))")
+        print("\nGlobal Average Age-to-Fare Ratio:", np.float64(age_to_fare))
+        print("\nSurvival Rate for Children vs Adults:\n", store.group_mean(child, "Survived"))
+        print("\nSurvival Rate for Alone vs With Family:\n", store.group_mean(alone, "Survived"))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the SQL store for the Titanic data or report from it.")
+    parser.add_argument("command", choices=["ingest", "report"])
+    parser.add_argument("--data", default="titanic_survival_dataset.csv")
+    parser.add_argument("--db", default=None, help="defaults to .cache/<data>.sqlite next to the CSV")
+    args = parser.parse_args()
+    if args.command == "ingest":
+        print(f"✅ SQL store written to {write_sql_store(args.data, args.db or sql_store_path(args.data), dataset_schema)}")
+    else:
+        sql_report(args.data, db_path=args.db)
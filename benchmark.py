@@ -0,0 +1,371 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+root = os.path.dirname(os.path.abspath(__file__))
+
+datasets = {
+    "stock": "Stock Market Analysis",
+    "air": "Air Quality Analysis",
+    "covid": "COVID-19 Data Analysis and Visualization",
+    "happiness": "Global Happiness Report Analysis",
+    "titanic": "Titanic Survival Analysis",
+}
+
+default_sizes = [10_000, 100_000, 1_000_000, 10_000_000]
+default_parse_sizes = [1_000_000]
+default_formats = ["csv", "parquet", "feather"]
+results_file = "benchmark_results.json"
+parse_results_file = "benchmark_parse_results.json"
+baseline_file = "benchmark_baseline.json"
+
+
+# ===============================
+# Helpers
+# ===============================
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def disk_bytes(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for folder, _, files in os.walk(path):
+        total += sum(os.path.getsize(os.path.join(folder, f)) for f in files)
+    return total
+
+
+def core_counts(limit):
+    # 1, 2, 4, ... up to and including the number of cores.
+    counts = [1]
+    while counts[-1] * 2 < limit:
+        counts.append(counts[-1] * 2)
+    return counts + [limit] if limit > 1 else counts
+
+
+def run_worker(folder, worker_args, timeout=None):
+    # Each measurement runs in a fresh interpreter inside the dataset folder,
+    # so peak RSS is per run and the folder's own generate_utils is used.
+    cmd = [sys.executable, os.path.abspath(__file__), "--worker", *worker_args]
+    try:
+        proc = subprocess.run(
+            cmd,
+            cwd=os.path.join(root, folder),
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    lines = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not lines:
+        return {"error": (proc.stderr.strip().splitlines() or ["worker failed"])[-1]}
+    return json.loads(lines[-1])
+
+
+# ===============================
+# Worker (one generation run)
+# ===============================
+def generation_worker(args):
+    sys.path.insert(0, os.getcwd())
+    from generate_utils import extensions, output_config, write_frame
+    import data_generate
+
+    output = output_config(args.format, row_group_size=args.chunk_size)
+    tmp = tempfile.mkdtemp(prefix=".bench_", dir=args.tmp_dir)
+    target = os.path.join(tmp, "out" + extensions[args.format])
+    try:
+        start = time.perf_counter()
+        if args.mode == "fast":
+            df = data_generate.generate_fast(args.rows, args.seed)
+            rows = write_frame(df, target, output)
+            del df
+        else:
+            rows = data_generate.write_streaming(
+                target, args.rows, args.seed, args.chunk_size, output=output
+            )
+        seconds = time.perf_counter() - start
+        size = disk_bytes(target)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(
+        json.dumps(
+            {
+                "rows_written": int(rows),
+                "seconds": seconds,
+                "rows_per_second": args.rows / seconds,
+                "peak_rss_mb": peak_rss_mb(),
+                "bytes": size,
+                "bytes_per_row": size / max(rows, 1),
+            }
+        )
+    )
+
+
+# ===============================
+# Workers (parallel CSV parsing)
+# ===============================
+def prepare_worker(args):
+    sys.path.insert(0, os.getcwd())
+    import data_generate
+
+    rows = data_generate.write_streaming(args.input, args.rows, args.seed, args.chunk_size)
+    print(json.dumps({"rows_written": int(rows), "bytes": disk_bytes(args.input)}))
+
+
+def parse_worker(args):
+    # min_bytes=1 so the file is split into exactly --processes ranges.
+    sys.path.insert(0, os.getcwd())
+    from load_utils import read_parallel_csv
+    from schema import dataset_schema
+
+    start = time.perf_counter()
+    df = read_parallel_csv(args.input, dataset_schema, args.processes, min_bytes=1)
+    seconds = time.perf_counter() - start
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    children = children / (1024 * 1024) if sys.platform == "darwin" else children / 1024
+    print(
+        json.dumps(
+            {
+                "rows_read": len(df),
+                "seconds": seconds,
+                "rows_per_second": len(df) / seconds,
+                "peak_rss_mb": peak_rss_mb(),
+                "peak_child_rss_mb": children,
+            }
+        )
+    )
+
+
+def parse_benchmark(args):
+    # Each CSV is generated once, then parsed with 1, 2, 4, ... processes;
+    # speedup is relative to the single-process run of the same file.
+    results = []
+    cores = args.cores or core_counts(os.cpu_count() or 1)
+    for name in args.datasets:
+        for rows in args.sizes or default_parse_sizes:
+            tmp = tempfile.mkdtemp(prefix=".bench_", dir=args.tmp_dir)
+            path = os.path.join(tmp, "data.csv")
+            try:
+                common = ["--rows", str(rows), "--seed", str(args.seed), "--input", path]
+                prepared = run_worker(
+                    datasets[name],
+                    ["--job", "prepare", "--chunk-size", str(args.chunk_size), *common],
+                    args.timeout,
+                )
+                if "error" in prepared:
+                    print(f"❌ {name:<10} {rows:>10,} {prepared['error']}")
+                    continue
+                single = None
+                for count in cores:
+                    worker_args = ["--job", "parse", "--processes", str(count), *common]
+                    runs = [run_worker(datasets[name], worker_args, args.timeout) for _ in range(args.repeat)]
+                    ok = [run for run in runs if "error" not in run]
+                    best = min(ok, key=lambda run: run["seconds"]) if ok else runs[-1]
+                    if count == 1 and ok:
+                        single = best["seconds"]
+                    speedup = single / best["seconds"] if single and ok else None
+                    results.append(
+                        {
+                            "dataset": name,
+                            "rows": rows,
+                            "cores": count,
+                            "bytes": prepared["bytes"],
+                            "speedup": speedup,
+                            **best,
+                        }
+                    )
+                    if "error" in best:
+                        print(f"❌ {name:<10} {rows:>10,} {count:>3} cores  {best['error']}")
+                    else:
+                        print(
+                            f"✅ {name:<10} {rows:>10,} {count:>3} cores "
+                            f"{best['seconds']:>8.2f} s  "
+                            f"{best['rows_per_second']:>12,.0f} rows/s  "
+                            f"{speedup or float('nan'):>5.2f}x"
+                        )
+            finally:
+                shutil.rmtree(tmp, ignore_errors=True)
+    return results
+
+
+# ===============================
+# Baseline comparison
+# ===============================
+def compare_with_baseline(results, baseline, tolerance):
+    key = ["dataset", "rows", "format", "mode"]
+    current = pd.DataFrame(results)
+    saved = pd.DataFrame(baseline["results"])
+    if "error" in current:
+        current = current[current["error"].isna()]
+    if "error" in saved:
+        saved = saved[saved["error"].isna()]
+    if current.empty or saved.empty:
+        print("⚠️ Nothing to compare against the baseline.")
+        return pd.DataFrame()
+
+    merged = current.merge(saved, on=key, suffixes=("", "_baseline"))
+    merged["speed_ratio"] = merged["rows_per_second"] / merged["rows_per_second_baseline"]
+    merged["rss_ratio"] = merged["peak_rss_mb"] / merged["peak_rss_mb_baseline"]
+    merged["bytes_ratio"] = merged["bytes"] / merged["bytes_baseline"]
+    merged["regression"] = merged["speed_ratio"] < 1 - tolerance
+    columns = [
+        *key,
+        "rows_per_second",
+        "rows_per_second_baseline",
+        "speed_ratio",
+        "rss_ratio",
+        "bytes_ratio",
+        "regression",
+    ]
+    print("\n--- Comparison with baseline ---")
+    print(merged[columns].round(3).to_string(index=False))
+    return merged
+
+
+# ===============================
+# Command line
+# ===============================
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the data generators and the parallel CSV loader.")
+    parser.add_argument(
+        "--task",
+        choices=["generate", "parse"],
+        default="generate",
+        help="generate times the generators; parse times load_utils.read_parallel_csv against the core count",
+    )
+    parser.add_argument("--datasets", nargs="+", choices=list(datasets), default=list(datasets))
+    parser.add_argument("--sizes", nargs="+", type=int, default=None, help="rows per case (parse defaults to 1,000,000)")
+    parser.add_argument("--cores", nargs="+", type=int, default=None, help="process counts for --task parse (default 1, 2, 4, ... up to all cores)")
+    parser.add_argument("--formats", nargs="+", choices=default_formats, default=default_formats)
+    parser.add_argument(
+        "--mode",
+        choices=["chunked", "fast"],
+        default="chunked",
+        help="chunked streams with bounded memory; fast builds the whole frame first",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case; the fastest is kept")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds per run")
+    parser.add_argument("--results", default=None, help=f"defaults to {results_file} or {parse_results_file}")
+    parser.add_argument("--baseline", default=baseline_file)
+    parser.add_argument("--save-baseline", action="store_true", help="also store the results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed rows/s drop before flagging a regression")
+    parser.add_argument("--tmp-dir", default=None, help="where outputs are written during a run")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--job", default="generate", help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--format", help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    parser.add_argument("--processes", type=int, help=argparse.SUPPRESS)
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    if args.worker:
+        workers = {"generate": generation_worker, "prepare": prepare_worker, "parse": parse_worker}
+        workers[args.job](args)
+        return
+
+    if args.task == "parse":
+        results = parse_benchmark(args)
+        report = {
+            "meta": {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "pandas": pd.__version__,
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "seed": args.seed,
+            },
+            "results": results,
+        }
+        results_path = args.results or parse_results_file
+        with open(results_path, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\n✅ Results saved to {results_path}")
+        return
+
+    args.results = args.results or results_file
+    results = []
+    for name in args.datasets:
+        for rows in args.sizes or default_sizes:
+            for fmt in args.formats:
+                worker_args = [
+                    "--rows", str(rows),
+                    "--format", fmt,
+                    "--mode", args.mode,
+                    "--seed", str(args.seed),
+                    "--chunk-size", str(args.chunk_size),
+                ]
+                if args.tmp_dir:
+                    worker_args += ["--tmp-dir", os.path.abspath(args.tmp_dir)]
+                runs = [run_worker(datasets[name], worker_args, args.timeout) for _ in range(args.repeat)]
+                ok = [run for run in runs if "error" not in run]
+                best = min(ok, key=lambda run: run["seconds"]) if ok else runs[-1]
+                results.append({"dataset": name, "rows": rows, "format": fmt, "mode": args.mode, **best})
+                if "error" in best:
+                    print(f"❌ {name:<10} {rows:>10,} {fmt:<8} {best['error']}")
+                else:
+                    print(
+                        f"✅ {name:<10} {rows:>10,} {fmt:<8} "
+                        f"{best['rows_per_second']:>12,.0f} rows/s  "
+                        f"{best['peak_rss_mb']:>8.1f} MB peak  "
+                        f"{best['bytes_per_row']:>6.1f} B/row"
+                    )
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "mode": args.mode,
+            "seed": args.seed,
+            "chunk_size": args.chunk_size,
+        },
+        "results": results,
+    }
+    with open(args.results, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(f"\n✅ Results saved to {args.results}")
+
+    regressions = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as handle:
+            merged = compare_with_baseline(results, json.load(handle), args.tolerance)
+        if not merged.empty:
+            regressions = int(merged["regression"].sum())
+            if regressions:
+                print(f"\n⚠️ {regressions} case(s) slower than the baseline by more than {args.tolerance:.0%}.")
+            else:
+                print("\n✅ No regressions against the baseline.")
+    elif args.save_baseline:
+        shutil.copyfile(args.results, args.baseline)
+        print(f"✅ Baseline saved to {args.baseline}")
+    else:
+        print(f"⚠️ No baseline at {args.baseline}; run with --save-baseline to create one.")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
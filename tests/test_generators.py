@@ -0,0 +1,81 @@
+import importlib
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+folders = sorted(name for name in os.listdir(root) if os.path.isfile(os.path.join(root, name, "schema.py")))
+# Module names every project folder defines; each folder is imported on its
+# own and the modules are dropped again, so other tests keep the Stock ones.
+project_modules = ["data_generate", "generate_utils", "schema", "load_utils", "key_utils", "stats_utils"]
+
+
+def load_project(folder):
+    saved = {name: sys.modules.pop(name) for name in project_modules if name in sys.modules}
+    sys.path.insert(0, os.path.join(root, folder))
+    try:
+        return importlib.import_module("data_generate"), importlib.import_module("schema").dataset_schema
+    finally:
+        sys.path.pop(0)
+        for name in project_modules:
+            sys.modules.pop(name, None)
+        sys.modules.update(saved)
+
+
+@pytest.fixture(scope="module", params=folders)
+def paths(request):
+    generator, schema = load_project(request.param)
+    n = generator.default_rows
+    legacy = generator.generate(n, generator.default_seed, fast=False)
+    fast = generator.generate(n, generator.default_seed, fast=True)
+    return generator, schema, n, legacy, fast
+
+
+def test_numeric_columns_match(paths):
+    generator, _, _, legacy, fast = paths
+    for col in generator.numeric_columns:
+        a, b = legacy[col].astype(float), fast[col].astype(float)
+        scale = a.std()
+        assert abs(a.mean() - b.mean()) < 0.05 * scale, col
+        assert 0.85 < b.std() / scale < 1.2, col
+        # Extremes of heavy-tailed columns (Volume, SO2) vary a lot between
+        # random streams, so each path's min / max only has to fall in the
+        # other's outer 1%.
+        assert b.min() <= a.quantile(0.01) and a.min() <= b.quantile(0.01), col
+        assert b.max() >= a.quantile(0.99) and a.max() >= b.quantile(0.99), col
+
+
+def test_missing_share_matches(paths):
+    generator, _, n, legacy, fast = paths
+    low, high = generator.missing_rate
+    for df in (legacy, fast):
+        missing = df[generator.numeric_columns].isna()
+        # Both draw the number of empty cells from the same range, spread
+        # evenly over the numeric columns.
+        assert low <= missing.sum().sum() / n <= high
+        share = missing.mean()
+        assert (share < 2 * share.mean()).all() and (share > share.mean() / 2).all()
+
+
+def test_category_frequencies_match(paths):
+    _, schema, _, legacy, fast = paths
+    for col, dtype in schema["dtypes"].items():
+        if dtype != "category":
+            continue
+        freq = pd.concat(
+            [legacy[col].astype(str).value_counts(normalize=True), fast[col].astype(str).value_counts(normalize=True)],
+            axis=1,
+        ).fillna(0)
+        assert (freq.iloc[:, 0] - freq.iloc[:, 1]).abs().max() < 0.01, col
+
+
+def test_duplicate_count_matches(paths):
+    generator, _, n, legacy, fast = paths
+    low, high = generator.duplicate_rate
+    for df in (legacy, fast):
+        appended = len(df) - n
+        assert low * n <= appended <= high * n
+        # Missing cells added after duplication break some exact repeats.
+        assert appended / 2 <= df.duplicated().sum() <= appended
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Stock Market Analysis"))
+
+from key_utils import KeyDtype, KeyIndex, encode_keys, key_index, repeated_keys  # noqa: E402
+from schema import dataset_schema  # noqa: E402
+
+
+def record_ids():
+    df = pd.DataFrame({"Record_ID": pd.Series(["STK_000242", "STK_002993", None], dtype="str")})
+    return encode_keys(df, dataset_schema)["Record_ID"]
+
+
+def test_str_methods_on_keys():
+    ids = record_ids()
+    assert isinstance(ids.dtype, KeyDtype)
+    text = ids.astype(object)
+    for method, args in [("slice", (0, 3)), ("startswith", ("STK",)), ("replace", ("STK_", "S")), ("len", ())]:
+        expected = getattr(text.str, method)(*args)
+        result = getattr(ids.str, method)(*args)
+        assert result.tolist()[:2] == expected.tolist()[:2]
+        assert pd.isna(result.iloc[2])
+    assert ids.str.contains("0002").to_numpy(dtype=object)[:2].tolist() == [True, False]
+
+
+def test_unknown_attribute_still_raises():
+    ids = record_ids()
+    with pytest.raises(AttributeError):
+        ids.array.no_such_method
+    assert np.array_equal(ids.array.numbers()[:2], [242, 2993])
+
+
+def keyed(values):
+    df = pd.DataFrame({"Record_ID": pd.Series(values, dtype="str")})
+    return encode_keys(df, dataset_schema)
+
+
+def test_key_index_matches_pandas():
+    rng = np.random.default_rng(0)
+    values = [f"STK_{n:06d}" if n else None for n in rng.integers(0, 300, 2000)]
+    df = keyed(values)
+    index = key_index(df, "Record_ID")
+    assert isinstance(df["Record_ID"].dtype, KeyDtype) and index.encoded
+    for keep in ("first", "last", False):
+        assert np.array_equal(index.duplicated(keep), df["Record_ID"].astype(object).duplicated(keep).to_numpy())
+    assert not index.is_unique and key_index(df.drop_duplicates("Record_ID"), "Record_ID").is_unique
+    for key in ("STK_000007", "STK_000299", "STK_000300", "STK_7", "AQ_000007"):
+        rows = np.flatnonzero(np.array(values, dtype=object) == key)
+        assert np.array_equal(index.rows(key), rows)
+        assert (key in index) == (len(rows) > 0)
+
+
+def test_isin_and_repeated_keys():
+    loaded = key_index(keyed(["STK_000001", "STK_000002", None]), "Record_ID")
+    new = keyed(["STK_000002", "STK_000003", "STK_000003", None, None])["Record_ID"]
+    assert loaded.isin(new).tolist() == [True, False, False, False, False]
+    # Strings of another width are matched by value, and never when they would not format back.
+    assert loaded.isin(pd.Series(["STK_000001", "STK_0000001", "STK_1"], dtype=object)).tolist() == [True, False, False]
+    repeated, index = repeated_keys([loaded], new)
+    assert repeated.tolist() == [True, False, True, False, False]
+    later = keyed(["STK_000003", "STK_000004"])["Record_ID"]
+    assert repeated_keys([loaded, index], later)[0].tolist() == [True, False]
+
+
+def test_key_index_on_plain_column():
+    ids = pd.Series([5, 7, None, 7], dtype="Int32")
+    index = KeyIndex(ids)
+    assert not index.encoded and 7 in index and 6 not in index
+    assert index.rows(7).tolist() == [1, 3]
+    assert index.duplicated().tolist() == ids.duplicated().tolist()
+    assert index.isin(pd.Series([7, 6, None], dtype="Int32")).tolist() == [True, False, False]
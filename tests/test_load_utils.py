@@ -0,0 +1,82 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Stock Market Analysis")
+sys.path.insert(0, folder)
+
+from load_utils import (  # noqa: E402
+    add_calendar,
+    exact_float64,
+    float64_view,
+    parse_dates,
+    read_column_store,
+    read_parallel_csv,
+    read_typed_csv,
+    write_column_store,
+)
+from schema import dataset_schema  # noqa: E402
+
+csv_path = os.path.join(folder, "Q1_stock_market.csv")
+
+
+def test_exact_float64_recovers_read_decimals():
+    rng = np.random.default_rng(0)
+    for decimals, high in [(2, 1500), (1, 600), (3, 1), (0, 1e7)]:
+        values = np.round(rng.uniform(-high, high, 10_000), decimals)
+        restored = exact_float64(pd.Series(values.astype(np.float32)))
+        assert np.array_equal(restored.to_numpy(), values)
+    restored = exact_float64(pd.Series([np.nan, 0.0, 1333.23, 39.7], dtype=np.float32))
+    assert np.isnan(restored[0]) and restored[1:].tolist() == [0.0, 1333.23, 39.7]
+
+
+def test_float64_view_only_converts_float32():
+    df = pd.DataFrame({"a": np.array([92.42], dtype=np.float32), "b": pd.array([1], dtype="Int8"), "c": ["x"]})
+    view = float64_view(df)
+    assert view["a"].dtype == np.float64 and view["a"].iloc[0] == 92.42
+    assert view["b"].dtype == "Int8" and view["c"].tolist() == ["x"]
+    assert df["a"].dtype == np.float32
+    assert str(view["a"].describe()["max"]) == "92.42"
+
+
+def test_column_store_round_trip(tmp_path):
+    df = read_typed_csv(csv_path, dataset_schema).head(2000)
+    # Missing values in every kind of column, and a plain text column.
+    df.loc[::7, ["Date", "Sector", "Open_Price", "Volume", "Market_Cap", "Record_ID"]] = None
+    df["Note"] = pd.Series(["ok", None, "späť"] * 666 + ["ok", "ok"], dtype="str")
+    write_column_store(df, tmp_path / "store")
+    pd.testing.assert_frame_equal(read_column_store(tmp_path / "store"), df)
+    part = read_column_store(tmp_path / "store", ["Symbol", "Close_Price"], {"Sector": ["Technology"]})
+    expected = df.loc[df["Sector"] == "Technology", ["Symbol", "Close_Price"]].reset_index(drop=True)
+    pd.testing.assert_frame_equal(part, expected)
+
+
+def test_read_parallel_csv_matches_read_csv():
+    # min_bytes=1 splits even the small bundled file over the workers.
+    pd.testing.assert_frame_equal(read_parallel_csv(csv_path, dataset_schema, 3, min_bytes=1), read_typed_csv(csv_path, dataset_schema))
+    columns, filters = ["Symbol", "Date", "RSI"], {"Date": ("2025-02-01", "2025-02-28")}
+    pd.testing.assert_frame_equal(
+        read_parallel_csv(csv_path, dataset_schema, 3, columns, filters, min_bytes=1),
+        read_typed_csv(csv_path, dataset_schema, columns, filters),
+    )
+
+
+def test_parse_dates_and_calendar():
+    df = pd.DataFrame({"Date": ["2025-01-05", "not a date", None, "2025-03-31", "2025-01-05"]})
+    df = parse_dates(df, {"dtypes": {"Date": "date"}, "date_format": "%Y-%m-%d"})
+    dates = pd.to_datetime(df["Date"])
+    assert df["Date"].isna().tolist() == [False, True, True, False, False]
+    add_calendar(df, "Year", "Month", "Week", "Day_Of_Week")
+    assert df["Month"].dtype == "Int8" and df["Year"].dtype == "Int16"
+    assert df["Month"].tolist() == [1, pd.NA, pd.NA, 3, 1]
+    assert df["Week"].tolist() == [1, pd.NA, pd.NA, 14, 1]
+    assert df["Day_Of_Week"].tolist() == [6, pd.NA, pd.NA, 0, 6]
+    # Columns already on the frame are kept, not derived again.
+    df["Month"] = 0
+    add_calendar(df, "Month", "Quarter")
+    assert (df["Month"] == 0).all() and df["Quarter"].tolist() == [1, pd.NA, pd.NA, 1, 1]
+    # Without missing dates the columns are plain numpy integers.
+    full = add_calendar(pd.DataFrame({"Date": dates.dropna()}), "Month")
+    assert full["Month"].dtype == np.int8 and full["Month"].tolist() == [1, 3, 1]
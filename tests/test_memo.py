@@ -0,0 +1,74 @@
+import os
+import sys
+
+import matplotlib
+import numpy as np
+import pandas as pd
+import seaborn as sns
+from matplotlib import cbook
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Stock Market Analysis"))
+
+from memo_utils import ResultCache  # noqa: E402
+from plot_utils import seaborn_bxp  # noqa: E402
+
+
+def test_box_stats_match_matplotlib():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "Sector": pd.Categorical(rng.choice(["b", "a", "c"], 5000), categories=["a", "b", "c", "d"]),
+            "Price": rng.lognormal(3, 1, 5000),
+        }
+    )
+    stats = ResultCache().box_stats(df, "Price", "Sector", df["Sector"].cat.categories)
+    # Groups follow the categories; "d" has no rows and is skipped.
+    assert [box["label"] for box in stats] == ["a", "b", "c"]
+    for box in stats:
+        expected = cbook.boxplot_stats(df.loc[df["Sector"] == box["label"], "Price"].to_numpy())[0]
+        for name in ("q1", "med", "q3", "whislo", "whishi"):
+            assert np.isclose(box[name], expected[name], rtol=1e-2)
+        assert np.array_equal(np.sort(box["fliers"]), np.sort(expected["fliers"]))
+
+
+def test_result_cache_drops_old_versions():
+    cache = ResultCache()
+    calls = []
+    compute = lambda: calls.append(1) or pd.Series([1.0, 2.0])  # noqa: E731
+    first = cache.get("table", compute)
+    assert cache.get("table", compute) is first and len(calls) == 1
+    # New data: the stored table must not be served again.
+    cache.bump()
+    assert cache.get("table", compute) is not first and len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    # Keys that depend on the columns miss once a column is added.
+    df = pd.DataFrame({"a": [1.0, None]})
+    assert cache.missing(df).tolist() == [1]
+    df["b"] = [None, None]
+    assert cache.missing(df).tolist() == [1, 2]
+
+
+def test_result_cache_budget():
+    table = pd.Series(np.zeros(1000))
+    cache = ResultCache(max_bytes=2.5 * table.memory_usage(deep=True))
+    for key in "abc":
+        cache.get(key, lambda: table.copy())
+    # Least recently used goes first; a result over the budget is not kept.
+    assert [key for _, key in cache.entries] == ["b", "c"] and cache.bytes <= cache.max_bytes
+    cache.get("big", lambda: pd.Series(np.zeros(10_000)))
+    assert [key for _, key in cache.entries] == ["b", "c"]
+    assert ResultCache(max_bytes=0).get("a", lambda: table) is table
+
+
+def test_seaborn_bxp_colors_each_box():
+    rng = np.random.default_rng(3)
+    df = pd.DataFrame({"Sector": pd.Categorical(rng.choice(list("abcd"), 2000)), "Price": rng.normal(size=2000)})
+    ax = plt.figure().gca()
+    artists = seaborn_bxp(ax, ResultCache().box_stats(df, "Price", "Sector", ["a", "b", "c", "d"]))
+    faces = [tuple(box.get_facecolor()[:3]) for box in artists["boxes"]]
+    assert np.allclose(faces, sns.color_palette(n_colors=4, desat=0.75))
+    assert [label.get_text() for label in ax.get_xticklabels()] == ["a", "b", "c", "d"]
+    plt.close("all")
@@ -0,0 +1,50 @@
+import os
+import shutil
+import subprocess
+import sys
+
+folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Stock Market Analysis")
+sys.path.insert(0, folder)
+
+from load_utils import read_dataset  # noqa: E402
+from schema import dataset_schema  # noqa: E402
+
+def generate(tmp_path, *args):
+    output = str(tmp_path / "hive")
+    subprocess.run(
+        [sys.executable, "data_generate.py", "--fast", "--rows", "2000", "--output", output, *args],
+        cwd=folder,
+        check=True,
+        capture_output=True,
+    )
+    return output
+
+
+def test_partition_directory_and_glob(tmp_path, monkeypatch):
+    # data_generate.py --partition writes Date_Month=<month>/part-00000.csv.
+    monkeypatch.setenv("DATA_CACHE", "off")
+    output = generate(tmp_path, "--partition")
+    parts = sorted(os.listdir(output))
+    rows = sum(
+        sum(1 for _ in open(os.path.join(output, part, "part-00000.csv"))) - 1 for part in parts
+    )
+    for path in (output, os.path.join(output, "*", "*.csv")):
+        df = read_dataset(path, dataset_schema)
+        assert len(df) == rows
+        assert list(df["Source"].cat.categories) == [f"{part}/part-00000" for part in parts]
+        dated = df["Date"].notna()
+        months = df.loc[dated, "Date"].dt.strftime("%Y-%m")
+        assert (df.loc[dated, "Date_Month"].astype(str) == months).all()
+
+
+def test_partition_key_missing_for_some_files(tmp_path, monkeypatch):
+    # A file outside the key=value folders gets a missing Date_Month.
+    monkeypatch.setenv("DATA_CACHE", "off")
+    output = generate(tmp_path, "--partition")
+    parts = sorted(os.listdir(output))
+    shutil.copy(os.path.join(output, parts[0], "part-00000.csv"), os.path.join(output, "extra.csv"))
+    df = read_dataset(output, dataset_schema)
+    extra = (df["Source"] == "extra").to_numpy()
+    assert extra.any() and df.loc[extra, "Date_Month"].isna().all()
+    assert df.loc[~extra, "Date_Month"].notna().all()
+    assert list(df["Date_Month"].cat.categories) == [part.split("=", 1)[1] for part in parts]
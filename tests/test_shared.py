@@ -0,0 +1,21 @@
+import filecmp
+import os
+
+import pytest
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+canonical = "Stock Market Analysis"
+shared = ["generate_utils.py", "load_utils.py", "key_utils.py", "stats_utils.py", "memo_utils.py", "sql_utils.py", "plot_utils.py"]
+folders = sorted(
+    name
+    for name in os.listdir(root)
+    if os.path.isfile(os.path.join(root, name, "schema.py")) and name != canonical
+)
+
+
+@pytest.mark.parametrize("folder", folders)
+@pytest.mark.parametrize("module", shared)
+def test_shared_module_copies_match(folder, module):
+    # Every project folder is standalone, so the shared modules are copies of
+    # the Stock Market Analysis ones and must stay identical.
+    assert filecmp.cmp(os.path.join(root, canonical, module), os.path.join(root, folder, module), shallow=False)
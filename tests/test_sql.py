@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+folder = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Stock Market Analysis")
+sys.path.insert(0, folder)
+
+from load_utils import float64_view, read_typed_csv  # noqa: E402
+from schema import dataset_schema  # noqa: E402
+from sql_utils import SqlStore, write_sql_store  # noqa: E402
+
+csv_path = os.path.join(folder, "Q1_stock_market.csv")
+numeric = ["Open_Price", "Close_Price", "Volume", "Market_Cap", "RSI"]
+
+
+@pytest.fixture(scope="module")
+def store(tmp_path_factory):
+    db_path = write_sql_store(csv_path, str(tmp_path_factory.mktemp("sql") / "stock.sqlite"), dataset_schema)
+    # The in-memory reports summarize float32 columns as float64 too.
+    return db_path, float64_view(read_typed_csv(csv_path, dataset_schema))
+
+
+@pytest.mark.parametrize("filters", [None, {"Sector": ["Technology", "Energy"], "Date": ("2025-02-01", None)}])
+def test_sql_report_matches_in_memory(store, filters):
+    db_path, df = store
+    if filters:
+        keep = df["Sector"].isin(filters["Sector"]) & (df["Date"] >= "2025-02-01")
+        df = df[keep.to_numpy(dtype=bool)]
+    sql = SqlStore(db_path, filters)
+    try:
+        assert sql.rows() == len(df)
+        pd.testing.assert_series_equal(sql.missing(), df.isna().sum(), check_dtype=False)
+        pd.testing.assert_frame_equal(sql.describe(numeric), df[numeric].describe(), rtol=1e-9)
+        pd.testing.assert_frame_equal(sql.corr(numeric), df[numeric].corr(), rtol=1e-9)
+        expected = df.groupby("Sector", observed=True)["Close_Price"].mean()
+        result = sql.group_mean("Sector", "Close_Price")
+        assert result.index.tolist() == sorted(expected.index)
+        assert np.allclose(result.to_numpy(), expected[result.index].to_numpy(), rtol=1e-12)
+        by_day = sql.group_sum("Date", "Volume")
+        assert by_day.equals(df.groupby("Date")["Volume"].sum().rename_axis("Date").astype(by_day.dtype))
+    finally:
+        sql.close()
@@ -0,0 +1,60 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Stock Market Analysis"))
+
+from stats_utils import CoMoments, GroupSums, QuantileSketch  # noqa: E402
+
+
+def test_chunked_int16_means_match_in_memory():
+    # pandas keeps a chunk's Int16 group sums as Int16 when they fit, so
+    # adding up many small chunks would wrap around without widening.
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 500, 20_000)
+    values = pd.array(np.where(rng.random(20_000) < 0.05, None, values), dtype="Int16")
+    df = pd.DataFrame({"Month": pd.Categorical(rng.choice(["Jan", "Feb", "Mar"], 20_000)), "AQI": values})
+    sums = GroupSums(["AQI"])
+    for start in range(0, len(df), 100):
+        sums.update(df.iloc[start : start + 100], "Month")
+    expected = df.groupby("Month", observed=True)["AQI"].mean()
+    result = sums.mean("AQI", df["AQI"].dtype)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+    assert sums.sum("AQI").tolist() == df.groupby("Month", observed=True)["AQI"].sum().tolist()
+
+
+def test_quantile_sketch_rank_error():
+    # Every estimate must sit within `error` of the asked rank, for one
+    # sketch fed in chunks and for sketches of the pieces merged afterwards.
+    rng = np.random.default_rng(1)
+    values = rng.lognormal(0, 1.5, 300_000)
+    ordered = np.sort(values)
+    q = np.linspace(0.01, 0.99, 99)
+    streamed = QuantileSketch(error=0.005)
+    for start in range(0, len(values), 10_000):
+        streamed.update(values[start : start + 10_000])
+    merged = QuantileSketch(error=0.005)
+    for piece in np.array_split(values, 7):
+        merged.merge(QuantileSketch(error=0.005).update(piece))
+    for sketch in (streamed, merged):
+        assert sketch.count == len(values)
+        ranks = np.searchsorted(ordered, sketch.quantile(q)) / len(values)
+        assert np.abs(ranks - q).max() <= 0.005
+        assert sketch.quantile(0) == values.min() and sketch.quantile(1) == values.max()
+        assert len(np.concatenate(sketch.levels)) < len(values) / 100
+
+
+def test_comoments_merge_matches_corr():
+    rng = np.random.default_rng(2)
+    x = rng.normal(size=(9_000, 4)) @ rng.normal(size=(4, 4)) + [0, 1e6, -3, 50]
+    df = pd.DataFrame(x, columns=list("abcd"))
+    # Missing cells differ per column, so every pair has its own rows.
+    for col, rate in zip(df.columns, (0.0, 0.05, 0.2, 0.4)):
+        df.loc[rng.random(len(df)) < rate, col] = np.nan
+    stats = CoMoments(df.columns)
+    for piece in np.array_split(np.arange(len(df)), 5):
+        stats.merge(CoMoments.from_frame(df.iloc[piece], df.columns))
+    pd.testing.assert_frame_equal(stats.corr(), df.corr(), rtol=1e-10)
+    pd.testing.assert_frame_equal(stats.cov(), df.cov(), rtol=1e-10)